@@ -0,0 +1,85 @@
+"""Add paiement_mois coverage table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision: str = '002'
+down_revision: Union[str, Sequence[str], None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _mois_couverts(date_debut, date_fin) -> list:
+    """Expand a payment period into month indexes (year * 12 + month)"""
+    mois = []
+    year, month = date_debut.year, date_debut.month
+    while (year, month) <= (date_fin.year, date_fin.month):
+        mois.append(year * 12 + month)
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return mois
+
+
+def upgrade() -> None:
+    op.create_table('paiement_mois',
+        sa.Column('paiement_id', sa.Integer(), nullable=False),
+        sa.Column('mois', sa.Integer(), nullable=False),
+        sa.Column('contrat_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['paiement_id'], ['paiements.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['contrat_id'], ['contrats.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('paiement_id', 'mois')
+    )
+    op.create_index('idx_paiement_mois_contrat', 'paiement_mois', ['contrat_id', 'mois'])
+
+    # Generating SQL scripts (--sql): there are no rows to read
+    if context.is_offline_mode():
+        return
+
+    # Backfill from existing rent payments
+    paiements = sa.table('paiements',
+        sa.column('id', sa.Integer),
+        sa.column('contrat_id', sa.Integer),
+        sa.column('type_paiement', sa.String),
+        sa.column('date_debut_periode', sa.Date),
+        sa.column('date_fin_periode', sa.Date),
+    )
+    paiement_mois = sa.table('paiement_mois',
+        sa.column('paiement_id', sa.Integer),
+        sa.column('mois', sa.Integer),
+        sa.column('contrat_id', sa.Integer),
+    )
+
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.select(
+            paiements.c.id, paiements.c.contrat_id,
+            paiements.c.date_debut_periode, paiements.c.date_fin_periode
+        ).where(
+            paiements.c.type_paiement == 'LOYER',
+            paiements.c.date_debut_periode.is_not(None),
+            paiements.c.date_fin_periode.is_not(None)
+        )
+    )
+
+    rows = []
+    for paiement_id, contrat_id, date_debut, date_fin in result:
+        for mois in _mois_couverts(date_debut, date_fin):
+            rows.append({"paiement_id": paiement_id, "mois": mois, "contrat_id": contrat_id})
+
+    if rows:
+        op.bulk_insert(paiement_mois, rows)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_paiement_mois_contrat', 'paiement_mois')
+    op.drop_table('paiement_mois')
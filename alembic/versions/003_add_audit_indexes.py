@@ -0,0 +1,30 @@
+"""Add audit log indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+
+revision: str = '003'
+down_revision: Union[str, Sequence[str], None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_audit_action', 'audit_logs', ['action'])
+    op.create_index('idx_audit_table_nom', 'audit_logs', ['table_nom'])
+    # (created_at, id) matches the keyset used to page the history view
+    op.create_index('idx_audit_created_at', 'audit_logs', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_audit_created_at', 'audit_logs')
+    op.drop_index('idx_audit_table_nom', 'audit_logs')
+    op.drop_index('idx_audit_action', 'audit_logs')
@@ -0,0 +1,95 @@
+"""Add FTS5 search index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+
+revision: str = '004'
+down_revision: Union[str, Sequence[str], None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_INDEXES = {
+    "immeubles": ("nom", "adresse"),
+    "bureaux": ("numero", "etage", "notes"),
+    "locataires": ("nom", "email", "telephone", "cin", "raison_sociale"),
+    "paiements": ("commentaire",),
+    "documents": ("original_name", "filename", "description"),
+}
+
+FTS_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+
+def _search_document(columns) -> str:
+    """Accent-free tsvector indexed on PostgreSQL (same text as app.database.search_index)"""
+    texte = " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+    return f"to_tsvector('simple', search_unaccent({texte}))"
+
+
+def _upgrade_postgresql() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    # unaccent() is only STABLE, index expressions need an IMMUTABLE function
+    op.execute(
+        "CREATE OR REPLACE FUNCTION search_unaccent(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+        "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    )
+    for table_name, columns in SEARCH_INDEXES.items():
+        op.execute(
+            f"CREATE INDEX idx_{table_name}_search ON {table_name} "
+            f"USING gin ({_search_document(columns)})"
+        )
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        _upgrade_postgresql()
+        return
+
+    for table_name, columns in SEARCH_INDEXES.items():
+        fts = f"{table_name}_fts"
+        cols = ", ".join(columns)
+        new_cols = ", ".join(f"new.{c}" for c in columns)
+        old_cols = ", ".join(f"old.{c}" for c in columns)
+
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{cols}, content = '{table_name}', content_rowid = 'id', {FTS_OPTIONS})"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+            f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+            f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table_name} BEGIN "
+            f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+            f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+        # Index the existing rows
+        op.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        for table_name in SEARCH_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS idx_{table_name}_search")
+        op.execute("DROP FUNCTION IF EXISTS search_unaccent(text)")
+        return
+
+    for table_name in SEARCH_INDEXES:
+        fts = f"{table_name}_fts"
+        for suffix in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,43 @@
+"""Add composite and partial indexes for hot filters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '005'
+down_revision: Union[str, Sequence[str], None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Arrears, totals and grids filter payments by contract then type (then date)
+    op.create_index('idx_paiement_contrat_type', 'paiements',
+                    ['contrat_id', 'type_paiement', 'date_paiement'])
+    op.drop_index('idx_paiement_contrat_id', 'paiements')
+
+    op.create_index('idx_contrat_locataire_resilie', 'contrats', ['locataire_id', 'est_resilie'])
+    op.drop_index('idx_contrat_locataire_id', 'contrats')
+    op.create_index('idx_contrat_actif', 'contrats', ['date_debut'],
+                    sqlite_where=sa.text('est_resilie = 0'),
+                    postgresql_where=sa.text('NOT est_resilie'))
+
+    # The primary key (contrat_id, bureau_id) does not serve lookups by bureau
+    op.create_index('idx_contrat_bureau_bureau', 'contrat_bureau', ['bureau_id', 'contrat_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contrat_bureau_bureau', 'contrat_bureau')
+    op.drop_index('idx_contrat_actif', 'contrats')
+    op.create_index('idx_contrat_locataire_id', 'contrats', ['locataire_id'])
+    op.drop_index('idx_contrat_locataire_resilie', 'contrats')
+    op.create_index('idx_paiement_contrat_id', 'paiements', ['contrat_id'])
+    op.drop_index('idx_paiement_contrat_type', 'paiements')
@@ -0,0 +1,38 @@
+"""Add the audit_logs_all view on PostgreSQL
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+
+revision: str = '006'
+down_revision: Union[str, Sequence[str], None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLite builds audit_logs_all per connection over the attached yearly archives
+# (AuditArchiveService.attach_archives). A PostgreSQL server keeps the whole
+# history in audit_logs and read-only transactions cannot create temporary
+# views, so the view is permanent there. Payloads are exposed as text, like
+# the archive tiers.
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute(
+        "CREATE VIEW audit_logs_all AS SELECT id, table_nom, entite_id, action, "
+        "donnees_avant::text AS donnees_avant, donnees_apres::text AS donnees_apres, "
+        "utilisateur, ip_address, created_at FROM audit_logs"
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute("DROP VIEW IF EXISTS audit_logs_all")
@@ -0,0 +1,124 @@
+"""Change events of committed transactions: which entities were inserted, updated or deleted"""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Hashable, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_mapper, sessionmaker
+
+
+logger = logging.getLogger(__name__)
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+RELOAD = "reload"  # Bulk statement: the changed ids are unknown
+
+# Session.info key of the changes flushed since the last commit/rollback
+_PENDING_KEY = "change_bus_pending"
+
+
+@dataclass(frozen=True)
+class EntityChange:
+    """Rows of one table changed by a commit"""
+    entity: str  # Table name
+    ids: FrozenSet[Hashable]  # Primary keys (tuples for composite keys)
+    operation: str  # INSERT, UPDATE, DELETE or RELOAD (ids empty)
+
+
+class ChangeBus:
+    """
+    Publishes the changes of each commit to its subscribers.
+
+    Callbacks run in the committing thread, after the commit: they receive
+    the list of EntityChange of the transaction and must not raise (errors
+    are logged, never propagated to the writer).
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[List[EntityChange]], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[List[EntityChange]], None]) -> Callable[[], None]:
+        """Register a callback, returns the function unregistering it"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def publish(self, changes: List[EntityChange]) -> None:
+        """Send the changes of a commit to every subscriber"""
+        if not changes:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception:
+                logger.exception("Change bus subscriber failed")
+
+
+def _identity(entity) -> Tuple[str, Hashable]:
+    """Table name and primary key of an entity"""
+    mapper = object_mapper(entity)
+    key = mapper.primary_key_from_instance(entity)
+    return mapper.local_table.name, key[0] if len(key) == 1 else tuple(key)
+
+
+def _record(pending: Dict[Tuple[str, Hashable], str], key: Tuple[str, Hashable], operation: str) -> None:
+    """Merge an operation with the earlier ones of the transaction on the same row"""
+    previous = pending.get(key)
+    if previous == INSERT:
+        if operation == DELETE:
+            # Created and deleted before the commit: nobody saw it
+            del pending[key]
+        return
+    pending[key] = operation
+
+
+def install_change_hooks(factory: sessionmaker, bus: ChangeBus) -> None:
+    """Publish on bus the changes committed by the sessions created by factory"""
+
+    def pending(session: Session) -> dict:
+        return session.info.setdefault(_PENDING_KEY, {"rows": {}, "reloads": set()})
+
+    @event.listens_for(factory, "after_flush")
+    def after_flush(session, flush_context):
+        # new/dirty/deleted (and attribute history) still describe what was just flushed
+        rows = pending(session)["rows"]
+        for operation, entities in ((INSERT, session.new), (DELETE, session.deleted),
+                                    (UPDATE, [e for e in session.dirty if session.is_modified(e)])):
+            for entity in entities:
+                _record(rows, _identity(entity), operation)
+
+    @event.listens_for(factory, "do_orm_execute")
+    def do_orm_execute(orm_execute_state):
+        # Bulk insert/update/delete statements bypass the flush
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            table = getattr(orm_execute_state.statement, "table", None)
+            if table is not None:
+                pending(orm_execute_state.session)["reloads"].add(table.name)
+
+    @event.listens_for(factory, "after_commit")
+    def after_commit(session):
+        committed = session.info.pop(_PENDING_KEY, None)
+        if not committed:
+            return
+        grouped: Dict[Tuple[str, str], set] = {}
+        for (table_name, entity_id), operation in committed["rows"].items():
+            grouped.setdefault((table_name, operation), set()).add(entity_id)
+        changes = [EntityChange(table_name, frozenset(ids), operation)
+                   for (table_name, operation), ids in grouped.items()]
+        changes.extend(EntityChange(table_name, frozenset(), RELOAD)
+                       for table_name in sorted(committed["reloads"]))
+        bus.publish(changes)
+
+    @event.listens_for(factory, "after_rollback")
+    def after_rollback(session):
+        session.info.pop(_PENDING_KEY, None)
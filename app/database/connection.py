@@ -2,24 +2,107 @@
 import os
 import threading
 from pathlib import Path
+from urllib.parse import quote
 from contextlib import contextmanager
-from typing import Generator, Optional
+from typing import Generator, List, Optional
 
-from sqlalchemy import create_engine, event, Engine
+from sqlalchemy import create_engine, event, Connection, Engine, URL
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import StaticPool, QueuePool
 
 from app.models.entities import Base
+from app.database.search_index import ensure_search_index
+from app.database.change_bus import ChangeBus, install_change_hooks
+from app.database.repository_cache import (
+    CACHE_INFO_KEY, DEFAULT_MAX_ENTRIES, RepositoryCache, install_cache_hooks
+)
 from app.utils.config import Config
 
 
+DEFAULT_READ_POOL_SIZE = 4
+
+# PostgreSQL server mode (database.type: postgresql): pool shared by reads and writes
+DEFAULT_SERVER_POOL_SIZE = 5
+DEFAULT_SERVER_MAX_OVERFLOW = 10
+
+# Connection profile, overridable in config.yaml (database.profile)
+DEFAULT_PROFILE = {
+    'synchronous': 'NORMAL',   # Durable with WAL, fsync only at checkpoints
+    'cache_size': -16000,      # Negative: KiB of page cache per connection
+    'mmap_size': 67108864,     # Bytes of the file read through memory mapping
+}
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def profile_pragmas(config: Config) -> List[str]:
+    """PRAGMA statements of the connection profile configured in config.yaml"""
+    profile = dict(DEFAULT_PROFILE)
+    profile.update(config.get('database', 'profile') or {})
+    synchronous = str(profile['synchronous']).upper()
+    if synchronous not in SYNCHRONOUS_MODES:
+        synchronous = DEFAULT_PROFILE['synchronous']
+    return [
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA cache_size={int(profile['cache_size'])}",
+        f"PRAGMA mmap_size={int(profile['mmap_size'])}",
+    ]
+
+
+def database_url(config: Config) -> str:
+    """
+    SQLAlchemy URL of the database selected by database.type in config.yaml.
+
+    PostgreSQL uses database.url when set, else the database.postgresql
+    settings; without a password libpq falls back to PGPASSWORD or ~/.pgpass.
+    """
+    if config.get('database', 'type', default='sqlite') == 'postgresql':
+        url = config.get('database', 'url')
+        if url:
+            return url
+        server = config.get('database', 'postgresql') or {}
+        return URL.create(
+            "postgresql+psycopg2",
+            username=server.get('user'),
+            password=server.get('password') or None,
+            host=server.get('host', 'localhost'),
+            port=server.get('port', 5432),
+            database=server.get('name', 'gestion_locative'),
+        ).render_as_string(hide_password=False)
+    db_path = str(Path(config.get('database', 'path', default='data/gestion_locative.db'))).replace('\\', '/')
+    return f"sqlite+pysqlite:///{db_path}"
+
+
+def _pragma_listener(pragmas: List[str]):
+    """Build a connect listener running the given PRAGMA statements"""
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+    return set_sqlite_pragma
+
+
 class Database:
-    """Database manager for handling SQLAlchemy connection"""
+    """
+    Database manager for handling SQLAlchemy connection.
+
+    Writes go through a single connection (engine) and write sessions are
+    serialized by a lock. Reads can use a pool of read-only connections
+    (read_engine) which, thanks to WAL, never wait for the writer.
+
+    With database.type: postgresql, several workstations share one server:
+    engine and read_engine then use the same connection pool.
+    """
     
     _instance: Optional['Database'] = None
     _lock = threading.Lock()
     _engine: Optional[Engine] = None
     _session_factory: Optional[sessionmaker] = None
+    _read_engine: Optional[Engine] = None
+    _read_session_factory: Optional[sessionmaker] = None
+    _repository_cache: Optional[RepositoryCache] = None
+    _change_bus: Optional[ChangeBus] = None
+    _write_lock = threading.RLock()
     
     def __new__(cls) -> 'Database':
         if cls._instance is None:
@@ -34,21 +117,62 @@ class Database:
             return
             
         config = Config.get_instance()
-        db_config = config.get('database') or {}
+        if config.get('database', 'type', default='sqlite') == 'postgresql':
+            self._create_server_engines(config)
+        else:
+            self._create_sqlite_engines(config)
+
+        # Repository reads cache: only this process writes a SQLite file it
+        # serves, other workstations write to a server behind its back
+        info = {}
+        if self.is_sqlite and config.get('database', 'cache', 'enabled', default=True):
+            self._repository_cache = RepositoryCache(
+                config.get('database', 'cache', 'max_entries', default=DEFAULT_MAX_ENTRIES)
+            )
+            info[CACHE_INFO_KEY] = self._repository_cache
         
-        db_path = str(Path(db_config.get('path', 'data/gestion_locative.db'))).replace('\\','/')
+        # Session factory
+        self._session_factory = sessionmaker(
+            bind=self._engine,
+            autocommit=False,
+            autoflush=False,
+            info=info
+        )
+
+        # Audit entries are batched per flush
+        from app.services.audit_service import install_audit_hooks
+        install_audit_hooks(self._session_factory)
+        if self._repository_cache is not None:
+            install_cache_hooks(self._session_factory, self._repository_cache)
+        self._change_bus = ChangeBus()
+        install_change_hooks(self._session_factory, self._change_bus)
+
+        # Debug mode warns about statements repeated within one action (N+1)
+        if config.is_debug:
+            from app.database import query_monitor
+            query_monitor.enable(config.get('database', 'query_monitor', 'threshold',
+                                            default=query_monitor.DEFAULT_THRESHOLD))
+        
+        self._read_session_factory = sessionmaker(
+            bind=self._read_engine,
+            autocommit=False,
+            autoflush=False,
+            info=info
+        )
+
+    def _create_sqlite_engines(self, config: Config) -> None:
+        """Single writer connection plus a pool of read-only connections on the file"""
+        url = database_url(config)
+        db_path = url.split(':///', 1)[1]
         
         # Create parent directory if needed
         db_dir = os.path.dirname(db_path)
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir, exist_ok=True)
         
-        # SQLite connection URL
-        database_url = f"sqlite+pysqlite:///{db_path}"
-        
-        # Create engine - StaticPool is best for SQLite with WAL mode
+        # Writer engine - one connection shared by write sessions (StaticPool)
         self._engine = create_engine(
-            database_url,
+            url,
             connect_args={
                 'check_same_thread': False,
                 'timeout': 30,
@@ -57,22 +181,51 @@ class Database:
             echo=config.get('app', 'debug', default=False)
         )
         
-        # Session factory
-        self._session_factory = sessionmaker(
-            bind=self._engine,
-            autocommit=False,
-            autoflush=False
-        )
-        
         # Enable foreign keys and WAL mode for SQLite
-        @event.listens_for(self._engine, "connect")
-        def set_sqlite_pragma(dbapi_connection, connection_record):
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA busy_timeout=5000")
-            cursor.close()
-    
+        profile = profile_pragmas(config)
+        event.listen(self._engine, "connect", _pragma_listener([
+            "PRAGMA foreign_keys=ON",
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA busy_timeout=5000",
+            *profile
+        ]))
+        # Create the file and switch it to WAL before any reader opens it
+        with self._engine.connect():
+            pass
+        
+        # Reader engine - pool of read-only connections, one per concurrent reader
+        read_pool_size = config.get('database', 'read_pool_size', default=DEFAULT_READ_POOL_SIZE)
+        self._read_engine = create_engine(
+            f"sqlite+pysqlite:///file:{quote(db_path, safe='/:')}?mode=ro&uri=true",
+            connect_args={
+                'check_same_thread': False,
+                'timeout': 30,
+            },
+            poolclass=QueuePool,
+            pool_size=read_pool_size,
+            max_overflow=0,
+            echo=config.get('app', 'debug', default=False)
+        )
+        # Readers only wait on locks: the journal mode is set by the writer
+        event.listen(self._read_engine, "connect", _pragma_listener([
+            "PRAGMA busy_timeout=5000",
+            *profile
+        ]))
+
+    def _create_server_engines(self, config: Config) -> None:
+        """One pool on the PostgreSQL server; readonly sessions run READ ONLY transactions"""
+        server = config.get('database', 'postgresql') or {}
+        self._engine = create_engine(
+            database_url(config),
+            poolclass=QueuePool,
+            pool_size=server.get('pool_size', DEFAULT_SERVER_POOL_SIZE),
+            max_overflow=server.get('max_overflow', DEFAULT_SERVER_MAX_OVERFLOW),
+            # Connections to a remote server can be dropped while the app idles
+            pool_pre_ping=True,
+            echo=config.get('app', 'debug', default=False)
+        )
+        self._read_engine = self._engine.execution_options(postgresql_readonly=True)
+
     @property
     def engine(self) -> Engine:
         """Return SQLAlchemy engine"""
@@ -81,6 +234,33 @@ class Database:
         assert self._engine is not None
         return self._engine
     
+    @property
+    def read_engine(self) -> Engine:
+        """Return the read-only SQLAlchemy engine"""
+        if self._read_engine is None:
+            self.initialize()
+        assert self._read_engine is not None
+        return self._read_engine
+    
+    @property
+    def is_sqlite(self) -> bool:
+        """True for the local SQLite file, False for a PostgreSQL server"""
+        return self.engine.dialect.name == "sqlite"
+
+    @property
+    def repository_cache(self) -> Optional[RepositoryCache]:
+        """Cache of repository reads, None when disabled or on a server"""
+        if self._engine is None:
+            self.initialize()
+        return self._repository_cache
+
+    @property
+    def change_bus(self) -> ChangeBus:
+        """Changes published after each commit of the write sessions"""
+        if self._engine is None:
+            self.initialize()
+        return self._change_bus
+
     @property
     def session_factory(self) -> sessionmaker:
         """Return session factory"""
@@ -90,29 +270,54 @@ class Database:
         return self._session_factory
     
     def create_tables(self) -> None:
-        """Create all tables defined in models"""
+        """Create all tables defined in models and the search index"""
         Base.metadata.create_all(self.engine)
+        with self.engine.begin() as connection:
+            ensure_search_index(connection)
     
     def drop_tables(self) -> None:
         """Drop all tables (WARNING: data loss)"""
         Base.metadata.drop_all(self.engine)
     
     @contextmanager
-    def session_scope(self) -> Generator[Session, None, None]:
-        """Context manager for sessions with automatic commit/rollback"""
-        session = self.session_factory()
-        try:
-            yield session
-            session.commit()
-        except Exception:
-            session.rollback()
-            raise
-        finally:
-            session.close()
+    def session_scope(self, readonly: bool = False) -> Generator[Session, None, None]:
+        """
+        Context manager for sessions with automatic commit/rollback.
+
+        Args:
+            readonly: Use a pooled read-only connection (any write raises)
+                instead of waiting for the writer
+        """
+        if readonly:
+            if self._read_session_factory is None:
+                self.initialize()
+            session = self._read_session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+            return
+
+        with self._write_lock:
+            session = self.session_factory()
+            try:
+                yield session
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
     
-    def get_session(self) -> Session:
-        """Return a new session (must be closed manually)"""
-        return self.session_factory()
+    @contextmanager
+    def maintenance_connection(self) -> Generator[Connection, None, None]:
+        """
+        Writer connection in autocommit mode, for statements that cannot run
+        in a transaction (VACUUM, WAL checkpoints). Holds the write lock.
+        """
+        with self._write_lock:
+            with self.engine.connect() as connection:
+                yield connection.execution_options(isolation_level="AUTOCOMMIT")
 
 
 def get_database() -> Database:
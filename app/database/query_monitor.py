@@ -0,0 +1,228 @@
+"""
+N+1 query detection: counts the statements of each action (a view load, a
+UI event) by shape and warns when one shape repeats, typically a lazy
+relationship read inside a row loop.
+
+Debug mode enables it for the application; tests bound the queries of a
+block with max_queries.
+"""
+import logging
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 10  # Executions of one statement shape per action before a warning
+SITE_FRAMES = 3  # Project frames shown for a call site
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+_local = threading.local()
+_installed = False
+_install_lock = threading.Lock()
+_threshold: Optional[int] = None  # None: no warnings
+# Groups the statements of the thread that installed it until control
+# returns to its event loop (UI thread)
+_idle_scheduler: Optional[Callable[[Callable[[], None]], None]] = None
+_idle_thread: Optional[int] = None
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")  # psycopg style
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """Shape of a statement: literals and IN lists replaced by ?, whitespace collapsed"""
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _SPACES.sub(" ", statement).strip()
+    return _IN_LIST.sub("IN (?)", statement)
+
+
+def call_site() -> str:
+    """Innermost project frames of the current stack, outside this module"""
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None and len(frames) < SITE_FRAMES:
+        filename = frame.f_code.co_filename
+        if (filename.startswith(_PROJECT_ROOT) and filename != _THIS_FILE
+                and "site-packages" not in filename):
+            frames.append(f"{Path(filename).relative_to(_PROJECT_ROOT)}:{frame.f_lineno}")
+        frame = frame.f_back
+    return " < ".join(frames) or "?"
+
+
+class TooManyQueries(AssertionError):
+    """Raised by max_queries"""
+
+
+class ActionQueries:
+    """Statements run during one action, by shape, with where each shape was first run"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.statements: Counter = Counter()
+        self.sites: Dict[str, str] = {}
+        self._lock = threading.Lock()  # Loads record from worker threads
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def record(self, shape: str, site: Optional[str]) -> None:
+        with self._lock:
+            self.statements[shape] += 1
+            if site is not None:
+                self.sites.setdefault(shape, site)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int, str]]:
+        """(shape, executions, call site) of the shapes run more than threshold times"""
+        with self._lock:
+            return [(shape, count, self.sites.get(shape, "?"))
+                    for shape, count in self.statements.most_common() if count > threshold]
+
+    def report(self, threshold: int) -> None:
+        """Log a warning per repeated shape"""
+        for shape, count, site in self.repeated(threshold):
+            logger.warning("Requete N+1 probable dans %s: %d executions de\n    %s\n    depuis %s",
+                           self.name, count, shape, site)
+
+    def summary(self) -> str:
+        with self._lock:
+            lines = [f"{count:>5} x {shape}\n        depuis {self.sites.get(shape, '?')}"
+                     for shape, count in self.statements.most_common()]
+        return "\n".join(lines)
+
+
+def _stack() -> List[ActionQueries]:
+    stack = getattr(_local, "actions", None)
+    if stack is None:
+        stack = _local.actions = []
+    return stack
+
+
+def current_actions() -> Tuple[ActionQueries, ...]:
+    """Actions recording the statements of this thread, to hand over to a worker"""
+    return tuple(_stack())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stack = _stack()
+    if not stack:
+        if _idle_scheduler is None or threading.get_ident() != _idle_thread:
+            return
+        stack.append(_implicit_action())
+    shape = normalize(statement)
+    site = None
+    # Walking the stack is only paid for the first statement of a shape
+    if any(shape not in action.sites for action in stack):
+        site = call_site()
+    for action in stack:
+        action.record(shape, site)
+
+
+def _implicit_action() -> ActionQueries:
+    """Action of the statements run until the UI thread returns to its event loop"""
+    action = ActionQueries(f"evenement {call_site().split(' < ')[0]}")
+
+    def close():
+        stack = _stack()
+        if action in stack:
+            stack.remove(action)
+        if _threshold is not None:
+            action.report(_threshold)
+
+    _idle_scheduler(close)
+    return action
+
+
+def _install() -> None:
+    global _installed
+    with _install_lock:
+        if not _installed:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            _installed = True
+
+
+def enable(threshold: int = DEFAULT_THRESHOLD) -> None:
+    """Warn when a statement shape runs more than threshold times in one action"""
+    global _threshold
+    _install()
+    _threshold = threshold
+
+
+def disable() -> None:
+    global _threshold, _idle_scheduler, _idle_thread
+    _threshold = None
+    _idle_scheduler = None
+    _idle_thread = None
+
+
+def enabled() -> bool:
+    return _threshold is not None
+
+
+def group_by_event_loop(schedule: Callable[[Callable[[], None]], None]) -> None:
+    """
+    Treat the statements the calling thread runs outside any action as one
+    action per event loop turn. schedule(callback) must call callback once
+    control returns to the loop (QTimer.singleShot(0, callback)).
+    """
+    global _idle_scheduler, _idle_thread
+    _idle_scheduler = schedule
+    _idle_thread = threading.get_ident()
+
+
+@contextmanager
+def action(name: str, parents: Sequence[ActionQueries] = ()) -> Iterator[ActionQueries]:
+    """
+    Record the statements run by this thread in the block.
+
+    Args:
+        name: Shown in the warnings
+        parents: Actions of another thread that also receive the statements
+            (current_actions() of the thread that started a load)
+    """
+    queries = ActionQueries(name)
+    stack = _stack()
+    pushed = [*parents, queries]
+    stack.extend(pushed)
+    try:
+        yield queries
+    finally:
+        for pushed_action in pushed:
+            stack.remove(pushed_action)
+        if _threshold is not None:
+            queries.report(_threshold)
+
+
+@contextmanager
+def max_queries(limit: int, repeated: Optional[int] = None) -> Iterator[ActionQueries]:
+    """
+    Fail a test when its block runs more than limit statements, or one
+    shape more than repeated times. Statements of the loads started in the
+    block count once they have run (wait for them inside the block).
+
+    Raises:
+        TooManyQueries: Listing the statements and their call sites
+    """
+    _install()
+    with action("max_queries") as queries:
+        yield queries
+    if queries.count > limit:
+        raise TooManyQueries(f"{queries.count} requetes (maximum {limit}):\n{queries.summary()}")
+    if repeated is not None and queries.repeated(repeated):
+        raise TooManyQueries(f"Requete repetee plus de {repeated} fois:\n{queries.summary()}")
@@ -0,0 +1,191 @@
+"""Second-level cache of repository reads, invalidated by per-table version counters"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Dict, Hashable, Iterable, List, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, Session, make_transient_to_detached, object_mapper, sessionmaker
+from sqlalchemy.orm.attributes import instance_state
+
+from app.models.entities import Base
+
+
+DEFAULT_MAX_ENTRIES = 256
+
+# Session.info keys: the cache serving the session (set by Database on its
+# session factories) and the tables it changed since its last commit/rollback
+CACHE_INFO_KEY = "repository_cache"
+_WRITTEN_KEY = "repository_cache_tables"
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a RepositoryCache"""
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0  # Reads of sessions holding their own changes
+    evictions: int = 0
+    invalidations: int = 0  # Table version bumps
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@lru_cache(maxsize=None)
+def _layout(mapper: Mapper) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    """Column attribute keys of a mapper and the positions of its primary key among them"""
+    keys = tuple(attr.key for attr in mapper.column_attrs)
+    pk = tuple(keys.index(mapper.get_property_by_column(c).key) for c in mapper.primary_key)
+    return keys, pk
+
+
+def _cascades() -> Dict[str, Set[str]]:
+    """Table -> tables whose rows the database changes when it changes (ON DELETE)"""
+    dependents: Dict[str, Set[str]] = {}
+    for table in Base.metadata.tables.values():
+        for fk in table.foreign_keys:
+            if fk.ondelete:
+                dependents.setdefault(fk.column.table.name, set()).add(table.name)
+    return dependents
+
+
+class RepositoryCache:
+    """
+    LRU cache of the entities read by BaseRepository.
+
+    Entries hold column values only, keyed by the query and the version of
+    its table. Flushes, commits, rollbacks and bulk statements bump the
+    versions of the tables they touch (and of tables depending on them
+    through ON DELETE rules), so stale entries are never served and age out
+    of the LRU. A session holding changes of its own reads the database.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, List[tuple]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._dependents = _cascades()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, table_name: str) -> int:
+        """Current version of a table"""
+        return self._versions.get(table_name, 0)
+
+    def bump(self, table_names: Iterable[str]) -> None:
+        """Invalidate every entry read from these tables"""
+        pending = list(table_names)
+        seen = set()
+        with self._lock:
+            while pending:
+                name = pending.pop()
+                if name in seen:
+                    continue
+                seen.add(name)
+                self._versions[name] = self._versions.get(name, 0) + 1
+                pending.extend(self._dependents.get(name, ()))
+            self.stats.invalidations += len(seen)
+
+    def clear(self) -> None:
+        """Drop every entry (versions and statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def fetch(self, session: Session, model, operation: Tuple[Hashable, ...],
+              query: Callable[[], list]) -> list:
+        """
+        Read-through lookup of a repository query.
+
+        Args:
+            session: Session the returned entities belong to
+            model: Mapped class the query returns
+            operation: Hashable description of the query (name and arguments)
+            query: Runs the query, called on a miss
+
+        Returns:
+            The entities, from the session identity map when already loaded
+        """
+        if session.info.get(_WRITTEN_KEY) or session.new or session.dirty or session.deleted:
+            self.stats.bypasses += 1
+            return query()
+
+        mapper = model.__mapper__
+        # Version read before querying: a concurrent commit makes the entry unreachable
+        key = (mapper.local_table.name, self.version(mapper.local_table.name)) + operation
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+        if rows is not None:
+            return [self._materialize(session, mapper, row) for row in rows]
+
+        entities = query()
+        keys, _ = _layout(mapper)
+        rows = [tuple(instance_state(e).dict.get(k) for k in keys) for e in entities]
+        with self._lock:
+            self._entries[key] = rows
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return entities
+
+    def _materialize(self, session: Session, mapper: Mapper, row: tuple):
+        """Entity of a cached row, persistent in session without a query"""
+        keys, pk = _layout(mapper)
+        identity = mapper.identity_key_from_primary_key([row[i] for i in pk])
+        entity = session.identity_map.get(identity)
+        if entity is not None:
+            return entity
+        entity = mapper.class_manager.new_instance()
+        instance_state(entity).dict.update(zip(keys, row))
+        # Relationships stay unloaded and load lazily like after a query
+        make_transient_to_detached(entity)
+        session.add(entity)
+        return entity
+
+
+def install_cache_hooks(factory: sessionmaker, cache: RepositoryCache) -> None:
+    """Bump table versions from the writes of the sessions created by factory"""
+
+    def written(session: Session, table_names: Set[str]) -> None:
+        if table_names:
+            session.info.setdefault(_WRITTEN_KEY, set()).update(table_names)
+            cache.bump(table_names)
+
+    @event.listens_for(factory, "after_flush")
+    def after_flush(session, flush_context):
+        # new/dirty/deleted still describe what was just flushed
+        written(session, {
+            table.name
+            for entity in chain(session.new, session.dirty, session.deleted)
+            for table in object_mapper(entity).tables
+        })
+
+    @event.listens_for(factory, "do_orm_execute")
+    def do_orm_execute(orm_execute_state):
+        # Bulk insert/update/delete statements bypass the flush
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            table = getattr(orm_execute_state.statement, "table", None)
+            if table is not None:
+                written(orm_execute_state.session, {table.name})
+
+    def ended(session):
+        # Committed rows become visible to other sessions, rolled back ones vanish
+        tables = session.info.pop(_WRITTEN_KEY, None)
+        if tables:
+            cache.bump(tables)
+
+    event.listen(factory, "after_commit", ended)
+    event.listen(factory, "after_rollback", ended)
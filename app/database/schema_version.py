@@ -0,0 +1,50 @@
+"""Schema revision the build expects, checked at startup before loading Alembic"""
+import sqlite3
+from pathlib import Path
+from typing import Optional, Set
+
+from app.utils.config import Config
+
+
+# Head of alembic/versions, bumped with every new migration
+# (tests/test_schema_version.py and the PyInstaller spec check it)
+HEAD_REVISION = "006"
+
+
+def stored_revisions(config: Config) -> Optional[Set[str]]:
+    """
+    Revisions stamped in alembic_version.
+
+    Returns:
+        None when the database or its alembic_version table does not exist
+    """
+    if config.get('database', 'type', default='sqlite') != 'postgresql':
+        db_path = Path(config.database_path)
+        if not db_path.exists():
+            return None
+        # Plain sqlite3, read-only: no engine, no file created
+        connection = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+        try:
+            return {row[0] for row in connection.execute("SELECT version_num FROM alembic_version")}
+        except sqlite3.OperationalError:
+            return None
+        finally:
+            connection.close()
+
+    from sqlalchemy import create_engine, inspect, text
+    from sqlalchemy.pool import NullPool
+    from app.database.connection import database_url
+
+    engine = create_engine(database_url(config), poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            if not inspect(connection).has_table('alembic_version'):
+                return None
+            return set(connection.execute(text("SELECT version_num FROM alembic_version")).scalars())
+    finally:
+        engine.dispose()
+
+
+def is_current(config: Config) -> bool:
+    """True when the database is at HEAD_REVISION, so Alembic has nothing to run"""
+    return stored_revisions(config) == {HEAD_REVISION}
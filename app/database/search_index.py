@@ -0,0 +1,161 @@
+"""Full-text search index over the searchable text columns (SQLite FTS5 or PostgreSQL GIN)"""
+import re
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import Connection, Engine, Select, column, false, func, literal_column, select, table, text
+from sqlalchemy.orm import Session
+
+
+# Indexed table -> text columns. Each gets an external-content FTS5 table
+# <table>_fts kept in sync by triggers.
+SEARCH_INDEXES: Dict[str, Tuple[str, ...]] = {
+    "immeubles": ("nom", "adresse"),
+    "bureaux": ("numero", "etage", "notes"),
+    "locataires": ("nom", "email", "telephone", "cin", "raison_sociale"),
+    "paiements": ("commentaire",),
+    "documents": ("original_name", "filename", "description"),
+}
+
+# Case and accent insensitive ("Eloise" finds "Éloïse"), prefix indexes for
+# the 2 and 3 first characters typed in search boxes
+FTS_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+# PostgreSQL: GIN index on an accent-free tsvector of the same columns.
+# unaccent() is only STABLE while index expressions need an IMMUTABLE function.
+SERVER_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE OR REPLACE FUNCTION search_unaccent(text) RETURNS text "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+    "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$",
+]
+
+
+def fts_name(table_name: str) -> str:
+    """Name of the FTS table indexing a table"""
+    return f"{table_name}_fts"
+
+
+def create_statements(table_name: str, columns: Sequence[str]) -> List[str]:
+    """DDL creating the FTS table of a table and its synchronization triggers"""
+    fts = fts_name(table_name)
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{c}" for c in columns)
+    old_cols = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content = '{table_name}', content_rowid = 'id', {FTS_OPTIONS})",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+        f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END",
+        # Only updates of indexed columns touch the index
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table_name} BEGIN "
+        f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols}); END",
+    ]
+
+
+def search_document(columns: Sequence[str]) -> str:
+    """tsvector expression indexed on PostgreSQL; queries must repeat it verbatim to use the index"""
+    texte = " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+    return f"to_tsvector('simple', search_unaccent({texte}))"
+
+
+def server_index_name(table_name: str) -> str:
+    """Name of the GIN index of a table on PostgreSQL"""
+    return f"idx_{table_name}_search"
+
+
+def server_create_statements(table_name: str, columns: Sequence[str]) -> List[str]:
+    """DDL creating the GIN search index of a table on PostgreSQL"""
+    return [
+        f"CREATE INDEX IF NOT EXISTS {server_index_name(table_name)} "
+        f"ON {table_name} USING gin ({search_document(columns)})"
+    ]
+
+
+def ensure_search_index(connection: Connection) -> None:
+    """Create missing FTS tables and triggers, indexing the rows already present"""
+    if connection.dialect.name == "postgresql":
+        # Plain indexes: PostgreSQL fills them with the existing rows and keeps them current
+        for statement in SERVER_SETUP:
+            connection.execute(text(statement))
+        for table_name, columns in SEARCH_INDEXES.items():
+            for statement in server_create_statements(table_name, columns):
+                connection.execute(text(statement))
+        return
+
+    for table_name, columns in SEARCH_INDEXES.items():
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": fts_name(table_name)}
+        ).scalar() is not None
+        for statement in create_statements(table_name, columns):
+            connection.execute(text(statement))
+        if not exists:
+            fts = fts_name(table_name)
+            connection.execute(text(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')"))
+
+
+def match_query(term: str, columns: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    Build an FTS5 query matching every word of term as a prefix.
+
+    Args:
+        term: Text typed by the user
+        columns: Restrict the match to these indexed columns
+
+    Returns:
+        The MATCH expression, None when term holds no word
+    """
+    words = re.findall(r"\w+", term)
+    if not words:
+        return None
+    query = " ".join(f'"{word}"*' for word in words)
+    if columns:
+        query = f"{{{' '.join(columns)}}} : ({query})"
+    return query
+
+
+def prefix_query(term: str) -> Optional[str]:
+    """Build a PostgreSQL tsquery matching every word of term as a prefix, None without words"""
+    words = re.findall(r"\w+", term)
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def search_ids(bind: Union[Session, Connection, Engine], model, term: str,
+               columns: Optional[Sequence[str]] = None) -> Select:
+    """
+    Select the ids of a model's rows matching a search term.
+
+    Use as model.id.in_(search_ids(session, model, term)); bind is what the
+    query runs on and its dialect picks the index. A term without words
+    matches nothing.
+    """
+    if isinstance(bind, Session):
+        bind = bind.get_bind()
+    if bind.dialect.name == "postgresql":
+        return _server_search_ids(model, term, columns)
+
+    fts = fts_name(model.__tablename__)
+    query = match_query(term, columns)
+    fts_table = table(fts, column("rowid"))
+    stmt = select(fts_table.c.rowid)
+    if query is None:
+        return stmt.where(false())
+    return stmt.where(literal_column(fts).op("MATCH")(query))
+
+
+def _server_search_ids(model, term: str, columns: Optional[Sequence[str]] = None) -> Select:
+    """search_ids on PostgreSQL, through the GIN index when searching all indexed columns"""
+    query = prefix_query(term)
+    # Never correlated: the outer query often reads the same table
+    stmt = select(model.id).correlate(None)
+    if query is None:
+        return stmt.where(false())
+    document = search_document(columns or SEARCH_INDEXES[model.__tablename__])
+    return stmt.where(literal_column(document).op("@@")(
+        func.to_tsquery(literal_column("'simple'"), func.search_unaccent(query))
+    ))
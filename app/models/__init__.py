@@ -6,6 +6,7 @@ from app.models.entities import (
     Locataire,
     Contrat,
     Paiement,
+    PaiementMois,
     AuditLog,
     TypePaiement,
     StatutLocataire,
@@ -18,6 +19,7 @@ __all__ = [
     'Locataire',
     'Contrat',
     'Paiement',
+    'PaiementMois',
     'AuditLog',
     'TypePaiement',
     'StatutLocataire',
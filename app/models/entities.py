@@ -3,10 +3,10 @@ from decimal import Decimal
 from enum import Enum as PyEnum
 from sqlalchemy import (
     Column, Integer, String, Float, DateTime, Date, Text, 
-    ForeignKey, Enum, Numeric, Boolean, UniqueConstraint, Table, Index
+    ForeignKey, Enum, Numeric, Boolean, UniqueConstraint, Table, Index, JSON, event, text
 )
+from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import relationship, DeclarativeBase
-from sqlalchemy.dialects.sqlite import JSON
 
 
 class Base(DeclarativeBase):
@@ -18,7 +18,9 @@ contrat_bureau = Table(
     'contrat_bureau',
     Base.metadata,
     Column('contrat_id', Integer, ForeignKey('contrats.id', ondelete="CASCADE"), primary_key=True),
-    Column('bureau_id', Integer, ForeignKey('bureaux.id', ondelete="CASCADE"), primary_key=True)
+    Column('bureau_id', Integer, ForeignKey('bureaux.id', ondelete="CASCADE"), primary_key=True),
+    # The primary key only serves lookups by contrat_id
+    Index('idx_contrat_bureau_bureau', 'bureau_id', 'contrat_id')
 )
 
 
@@ -153,9 +155,12 @@ class Contrat(Base):
     paiements = relationship("Paiement", back_populates="contrat", cascade="all, delete-orphan")
 
     __table_args__ = (
-        Index('idx_contrat_locataire_id', 'locataire_id'),
+        Index('idx_contrat_locataire_resilie', 'locataire_id', 'est_resilie'),
         Index('idx_contrat_est_resilie', 'est_resilie'),
         Index('idx_contrat_date_debut', 'date_debut'),
+        # Partial: only active contracts, used by "est_resilie = 0" filters
+        Index('idx_contrat_actif', 'date_debut', sqlite_where=text('est_resilie = 0'),
+              postgresql_where=text('NOT est_resilie')),
     )
 
     def __repr__(self):
@@ -205,7 +210,7 @@ class Paiement(Base):
     contrat = relationship("Contrat", back_populates="paiements")
 
     __table_args__ = (
-        Index('idx_paiement_contrat_id', 'contrat_id'),
+        Index('idx_paiement_contrat_type', 'contrat_id', 'type_paiement', 'date_paiement'),
         Index('idx_paiement_locataire_id', 'locataire_id'),
         Index('idx_paiement_type', 'type_paiement'),
         Index('idx_paiement_date', 'date_paiement'),
@@ -245,6 +250,68 @@ class Paiement(Base):
         return mois_couverts
 
 
+class PaiementMois(Base):
+    """Mois de loyer couverts par un paiement (table matérialisée, maintenue automatiquement)"""
+    __tablename__ = "paiement_mois"
+
+    paiement_id = Column(Integer, ForeignKey("paiements.id", ondelete="CASCADE"), primary_key=True)
+    mois = Column(Integer, primary_key=True)  # year * 12 + month
+    contrat_id = Column(Integer, ForeignKey("contrats.id", ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        Index('idx_paiement_mois_contrat', 'contrat_id', 'mois'),
+    )
+
+    def __repr__(self):
+        return f"<PaiementMois(paiement_id={self.paiement_id}, contrat_id={self.contrat_id}, mois={self.mois})>"
+
+    @staticmethod
+    def to_index(year: int, month: int) -> int:
+        """Encode (year, month) as a sortable month index"""
+        return year * 12 + month
+
+    @staticmethod
+    def from_index(index: int) -> tuple:
+        """Decode a month index back to (year, month)"""
+        return ((index - 1) // 12, (index - 1) % 12 + 1)
+
+
+_COUVERTURE_ATTRS = ('type_paiement', 'contrat_id', 'date_debut_periode', 'date_fin_periode')
+
+
+def _write_paiement_mois(connection, paiement: Paiement) -> None:
+    table = PaiementMois.__table__
+    rows = [
+        {"paiement_id": paiement.id, "contrat_id": paiement.contrat_id, "mois": PaiementMois.to_index(y, m)}
+        for y, m in paiement.get_mois_couverts()
+    ]
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+def _delete_paiement_mois(connection, paiement_id: int) -> None:
+    table = PaiementMois.__table__
+    connection.execute(table.delete().where(table.c.paiement_id == paiement_id))
+
+
+@event.listens_for(Paiement, "after_insert")
+def _paiement_mois_after_insert(mapper, connection, target):
+    _write_paiement_mois(connection, target)
+
+
+@event.listens_for(Paiement, "after_update")
+def _paiement_mois_after_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[key].history.has_changes() for key in _COUVERTURE_ATTRS):
+        _delete_paiement_mois(connection, target.id)
+        _write_paiement_mois(connection, target)
+
+
+@event.listens_for(Paiement, "after_delete")
+def _paiement_mois_after_delete(mapper, connection, target):
+    _delete_paiement_mois(connection, target.id)
+
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
@@ -264,6 +331,12 @@ class AuditLog(Base):
     ip_address = Column(String(50), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index('idx_audit_action', 'action'),
+        Index('idx_audit_table_nom', 'table_nom'),
+        Index('idx_audit_created_at', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<AuditLog(id={self.id}, action={self.action}, table={self.table_nom})>"
 
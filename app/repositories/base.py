@@ -1,8 +1,9 @@
 """Base repository class with common CRUD operations"""
 import logging
-from typing import TypeVar, Generic, Optional, List, Type
+from typing import Callable, TypeVar, Generic, Optional, List, Type
 from sqlalchemy.orm import Session
 
+from app.database.repository_cache import CACHE_INFO_KEY
 from app.models.entities import Base
 
 
@@ -10,53 +11,62 @@ T = TypeVar('T', bound=Base)
 
 
 class BaseRepository(Generic[T]):
-    """Base repository class providing common CRUD operations"""
+    """
+    Base repository class providing common CRUD operations.
+
+    get_by_id, get_all and filter_by go through the repository cache of the
+    session (see RepositoryCache) when the Database enabled one.
+    """
     
     def __init__(self, session: Session, model_class: Type[T]):
         self.session = session
         self.model_class = model_class
     
+    def _cached(self, operation: tuple, query: Callable[[], List[T]]) -> List[T]:
+        """Run a query returning entities of model_class through the repository cache"""
+        cache = self.session.info.get(CACHE_INFO_KEY)
+        if cache is None:
+            return query()
+        return cache.fetch(self.session, self.model_class, operation, query)
+    
     def get_by_id(self, id: int) -> Optional[T]:
         """Get an entity by its ID"""
-        return self.session.query(self.model_class).filter(
+        entities = self._cached(("get_by_id", id), lambda: self.session.query(self.model_class).filter(
             self.model_class.id == id
-        ).first()
+        ).limit(1).all())
+        return entities[0] if entities else None
     
-    def get_all(self) -> List[T]:
-        """Get all entities"""
-        return self.session.query(self.model_class).all()
+    def get_all(self, order_by: Optional[str] = None) -> List[T]:
+        """Get all entities, optionally sorted on a column"""
+        query = self.session.query(self.model_class)
+        if order_by is not None:
+            query = query.order_by(getattr(self.model_class, order_by))
+        return self._cached(("get_all", order_by), query.all)
     
+    # Audit entries are written by the session flush hooks (see AuditService)
+
     def create(self, **kwargs) -> T:
         """Create a new entity"""
-        from app.services.audit_service import AuditService
         entity = self.model_class(**kwargs)
         self.session.add(entity)
         self.session.flush()
-        AuditService.log_create(self.session, entity)
         return entity
     
     def update(self, entity: T, **kwargs) -> T:
         """Update an existing entity"""
-        from app.services.audit_service import AuditService
-        before_state = AuditService.entity_to_dict(entity)
         for key, value in kwargs.items():
             if hasattr(entity, key):
                 setattr(entity, key, value)
         self.session.flush()
-        AuditService.log_update(self.session, entity, before_state)
         return entity
     
     def delete(self, entity: T) -> bool:
         """Delete an entity"""
-        from app.services.audit_service import AuditService
         logger = logging.getLogger(__name__)
         
         try:
-            before_state = AuditService.entity_to_dict(entity)
-            entity_id = entity.id
             self.session.delete(entity)
             self.session.flush()
-            AuditService.log_delete(self.session, self.model_class, entity_id, before_state)
             return True
         except Exception as e:
             self.session.rollback()
@@ -88,7 +98,13 @@ class BaseRepository(Generic[T]):
         for key, value in kwargs.items():
             if hasattr(self.model_class, key):
                 query = query.filter(getattr(self.model_class, key) == value)
-        return query.all()
+        operation = ("filter_by",) + tuple(sorted(kwargs.items()))
+        try:
+            hash(operation)
+        except TypeError:
+            # Unhashable criteria (lists, dicts) cannot key the cache
+            return query.all()
+        return self._cached(operation, query.all)
     
     def first(self, **kwargs) -> Optional[T]:
         """Get first entity matching criteria"""
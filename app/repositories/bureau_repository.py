@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
 from app.models.entities import Bureau
+from app.database.search_index import search_ids
 from app.repositories.base import BaseRepository
 
 
@@ -36,11 +37,9 @@ class BureauRepository(BaseRepository[Bureau]):
         return query.all()
     
     def search(self, query: str) -> List[Bureau]:
-        """Search bureaux by numero, etage or notes"""
+        """Search bureaux by numero, etage or notes (word prefixes)"""
         return self.session.query(Bureau).filter(
-            (Bureau.numero.ilike(f"%{query}%")) |
-            (Bureau.etage.ilike(f"%{query}%")) |
-            (Bureau.notes.ilike(f"%{query}%"))
+            Bureau.id.in_(search_ids(self.session, Bureau, query))
         ).all()
     
     def get_by_etage(self, etage: str) -> List[Bureau]:
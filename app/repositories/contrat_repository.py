@@ -4,6 +4,7 @@ from datetime import date
 from sqlalchemy.orm import Session
 
 from app.models.entities import Contrat, contrat_bureau, Bureau, Locataire, StatutLocataire
+from app.database.search_index import search_ids
 from app.repositories.base import BaseRepository
 
 
@@ -225,9 +226,7 @@ class ContratRepository(BaseRepository[Contrat]):
         ).all()
     
     def search(self, query: str) -> List[Contrat]:
-        """Search contrats by Locataire name or bureau numero"""
-        search_term = f"%{query}%"
-        return self.session.query(Contrat).join(Locataire).filter(
-            (Locataire.nom.ilike(search_term)) |
-            (Locataire.raison_sociale.ilike(search_term))
+        """Search contrats by Locataire name or raison_sociale (word prefixes)"""
+        return self.session.query(Contrat).filter(
+            Contrat.locataire_id.in_(search_ids(self.session, Locataire, query, ("nom", "raison_sociale")))
         ).all()
@@ -3,6 +3,7 @@ from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.models.entities import Document, DocumentTreeConfig
+from app.database.search_index import search_ids
 from app.repositories.base import BaseRepository
 
 
@@ -72,13 +73,10 @@ class DocumentRepository:
         return False
 
     def search_documents(self, entity_type: str, entity_id: int, search_term: str) -> List[Document]:
-        search_pattern = f"%{search_term}%"
         return self.session.query(Document).filter(
             Document.entity_type == entity_type,
             Document.entity_id == entity_id,
-            (Document.original_name.like(search_pattern) |
-             Document.filename.like(search_pattern) |
-             Document.description.like(search_pattern))
+            Document.id.in_(search_ids(self.session, Document, search_term))
         ).all()
 
     # Tree config operations
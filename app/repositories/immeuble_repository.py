@@ -4,6 +4,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.entities import Immeuble
+from app.database.search_index import search_ids
 from app.repositories.base import BaseRepository
 
 
@@ -22,10 +23,9 @@ class ImmeubleRepository(BaseRepository[Immeuble]):
         return self.get_all()
     
     def search(self, query: str) -> List[Immeuble]:
-        """Search immeubles by name or address"""
+        """Search immeubles by name or address (word prefixes)"""
         return self.session.query(Immeuble).filter(
-            (Immeuble.nom.ilike(f"%{query}%")) |
-            (Immeuble.adresse.ilike(f"%{query}%"))
+            Immeuble.id.in_(search_ids(self.session, Immeuble, query))
         ).all()
     
     def get_with_bureaux_count(self) -> List[Immeuble]:
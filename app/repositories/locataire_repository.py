@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.models.entities import Locataire, StatutLocataire, Contrat, Bureau
 from app.models.entities import contrat_bureau
+from app.database.search_index import search_ids
 from app.repositories.base import BaseRepository
 
 
@@ -54,14 +55,9 @@ class LocataireRepository(BaseRepository[Locataire]):
         ).distinct().all()
     
     def search(self, query: str) -> List[Locataire]:
-        """Search locataires by name, email, phone, CIN or raison_sociale"""
-        search_term = f"%{query}%"
+        """Search locataires by name, email, phone, CIN or raison_sociale (word prefixes)"""
         return self.session.query(Locataire).filter(
-            (Locataire.nom.ilike(search_term)) |
-            (Locataire.email.ilike(search_term)) |
-            (Locataire.telephone.ilike(search_term)) |
-            (Locataire.cin.ilike(search_term)) |
-            (Locataire.raison_sociale.ilike(search_term))
+            Locataire.id.in_(search_ids(self.session, Locataire, query))
         ).all()
     
     def get_by_cin(self, cin: str) -> Optional[Locataire]:
@@ -5,7 +5,8 @@ from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 
-from app.models.entities import Paiement, TypePaiement, Contrat
+from app.models.entities import Paiement, PaiementMois, TypePaiement
+from app.database.search_index import search_ids
 from app.repositories.base import BaseRepository
 
 
@@ -41,6 +42,18 @@ class PaiementRepository(BaseRepository[Paiement]):
             Paiement.type_paiement == type_paiement
         ).all()
     
+    def get_mois_payes(self, contrat_id: int) -> set:
+        """
+        Get the months covered by rent payments for a contrat.
+        
+        Returns:
+            Set of (year, month) tuples
+        """
+        rows = self.session.query(PaiementMois.mois).filter(
+            PaiementMois.contrat_id == contrat_id
+        ).distinct()
+        return {PaiementMois.from_index(mois) for (mois,) in rows}
+    
     def get_loyers_impayes(self, contrat_id: int, upto_date: date = None) -> List[tuple]:
         """
         Get unpaid months for a contrat.
@@ -48,38 +61,8 @@ class PaiementRepository(BaseRepository[Paiement]):
         Returns:
             List of (year, month) tuples representing unpaid months
         """
-        if upto_date is None:
-            upto_date = date.today()
-        
-        # Get all contrat details
-        contrat = self.session.query(Contrat).filter(Contrat.id == contrat_id).first()
-        if not contrat:
-            return []
-        
-        # Get all rent payments
-        paiements_loyer = self.get_by_contrat_and_type(contrat_id, TypePaiement.LOYER)
-        
-        # Build set of covered months
-        mois_couverts = set()
-        for paiement in paiements_loyer:
-            mois_couverts.update(paiement.get_mois_couverts())
-        
-        # Generate expected months
-        mois_impayes = []
-        current = contrat.date_debut
-        
-        while current <= upto_date:
-            if current >= contrat.date_debut:
-                if (current.year, current.month) not in mois_couverts:
-                    mois_impayes.append((current.year, current.month))
-            
-            # Move to next month
-            if current.month == 12:
-                current = date(current.year + 1, 1, 1)
-            else:
-                current = date(current.year, current.month + 1, 1)
-        
-        return mois_impayes
+        from app.services.arrears_service import ArrearsService
+        return ArrearsService(self.session).compute([contrat_id], upto_date)[contrat_id]
     
     def get_total_loyers_payes(self, contrat_id: int, year: int = None) -> Decimal:
         """Get total rent paid for a contrat (optionally for a specific year)"""
@@ -140,10 +123,9 @@ class PaiementRepository(BaseRepository[Paiement]):
         return self.filter_by(date_paiement=date_paiement)
     
     def search(self, query: str) -> List[Paiement]:
-        """Search payments by commentaire"""
-        search_term = f"%{query}%"
+        """Search payments by commentaire (word prefixes)"""
         return self.session.query(Paiement).filter(
-            Paiement.commentaire.ilike(search_term)
+            Paiement.id.in_(search_ids(self.session, Paiement, query))
         ).all()
     
     def get_montant_total_by_type(self, type_paiement: TypePaiement,
@@ -1,12 +1,22 @@
 """Services package"""
-from app.services.audit_service import AuditService
-from app.services.backup_service import BackupService
-from app.services.receipt_service import ReceiptService
-from app.services.document_service import DocumentService
-
-__all__ = [
-    'AuditService',
-    'BackupService',
-    'ReceiptService',
-    'DocumentService',
-]
+from importlib import import_module
+
+# Service -> module, imported on first access (receipts pull in reportlab,
+# backups the Google API client)
+_SERVICES = {
+    'AuditService': 'app.services.audit_service',
+    'BackupService': 'app.services.backup_service',
+    'ReceiptService': 'app.services.receipt_service',
+    'DocumentService': 'app.services.document_service',
+    'ArrearsService': 'app.services.arrears_service',
+    'DashboardService': 'app.services.dashboard_service',
+    'AuditArchiveService': 'app.services.audit_archive_service',
+}
+
+__all__ = list(_SERVICES)
+
+
+def __getattr__(name):
+    if name in _SERVICES:
+        return getattr(import_module(_SERVICES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,106 @@
+"""Arrears computation service (unpaid rent months for many contracts at once)"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select, case, and_, cast, extract, func, Integer
+from sqlalchemy.orm import Session
+
+from app.models.entities import Contrat, PaiementMois
+
+
+def _mois_index(column):
+    """SQL expression turning a date column into a month index (year * 12 + month)"""
+    # PostgreSQL's extract() returns numeric
+    return cast(extract('year', column) * 12 + extract('month', column), Integer)
+
+
+class ArrearsService:
+    """Compute unpaid rent months in a single SQL pass"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _mois_impayes_query(self, contrat_ids: Optional[Iterable[int]], upto: date):
+        """
+        Build the (contrat_id, mois) select of unpaid months.
+
+        A recursive CTE expands every contract into the months it owes, from
+        date_debut up to upto (or date_resiliation for terminated contracts),
+        and keeps the months with no matching row in paiement_mois.
+        """
+        upto_index = PaiementMois.to_index(upto.year, upto.month)
+        debut = _mois_index(Contrat.date_debut)
+        fin = case(
+            (and_(Contrat.est_resilie.is_(True),
+                  Contrat.date_resiliation.is_not(None),
+                  Contrat.date_resiliation < upto),
+             _mois_index(Contrat.date_resiliation)),
+            else_=upto_index
+        )
+
+        bornes = select(
+            Contrat.id.label('contrat_id'),
+            debut.label('mois'),
+            fin.label('fin')
+        ).where(Contrat.date_debut <= upto, debut <= fin)
+        if contrat_ids is not None:
+            bornes = bornes.where(Contrat.id.in_(contrat_ids))
+
+        serie = bornes.cte('mois_attendus', recursive=True)
+        serie = serie.union_all(
+            select(serie.c.contrat_id, serie.c.mois + 1, serie.c.fin)
+            .where(serie.c.mois < serie.c.fin)
+        )
+
+        paye = select(PaiementMois.mois).where(
+            PaiementMois.contrat_id == serie.c.contrat_id,
+            PaiementMois.mois == serie.c.mois
+        ).exists()
+
+        return select(serie.c.contrat_id, serie.c.mois).where(~paye)
+
+    def compute(self, contrat_ids: Optional[Iterable[int]] = None,
+                upto: date = None) -> Dict[int, List[tuple]]:
+        """
+        Get unpaid months for several contracts.
+
+        Args:
+            contrat_ids: Contracts to check (all contracts when None)
+            upto: Last date to take into account (defaults to today)
+
+        Returns:
+            Dict of contrat_id -> sorted list of (year, month) tuples. Requested
+            contracts are always present; with contrat_ids=None only contracts
+            with arrears appear.
+        """
+        if upto is None:
+            upto = date.today()
+        if contrat_ids is not None:
+            contrat_ids = list(contrat_ids)
+            if not contrat_ids:
+                return {}
+
+        result = {contrat_id: [] for contrat_id in contrat_ids or []}
+        query = self._mois_impayes_query(contrat_ids, upto)
+        rows = self.db.execute(query.order_by(query.selected_columns.contrat_id,
+                                              query.selected_columns.mois))
+        for contrat_id, mois in rows:
+            result.setdefault(contrat_id, []).append(PaiementMois.from_index(mois))
+        return result
+
+    def counts(self, contrat_ids: Optional[Iterable[int]] = None,
+               upto: date = None) -> Dict[int, int]:
+        """Get the number of unpaid months per contract (only contracts with arrears)"""
+        if upto is None:
+            upto = date.today()
+        if contrat_ids is not None:
+            contrat_ids = list(contrat_ids)
+            if not contrat_ids:
+                return {}
+
+        impayes = self._mois_impayes_query(contrat_ids, upto).subquery()
+        rows = self.db.execute(
+            select(impayes.c.contrat_id, func.count())
+            .group_by(impayes.c.contrat_id)
+        )
+        return {contrat_id: count for contrat_id, count in rows}
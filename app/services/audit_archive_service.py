@@ -0,0 +1,344 @@
+"""Audit log archival into per-year compressed SQLite files (SQLite backend)"""
+import json
+import re
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, DateTime, LargeBinary, Text, Index,
+    PrimaryKeyConstraint, select, insert, delete, extract, func, text, distinct
+)
+from sqlalchemy.orm import Session
+
+from app.models.entities import AuditLog
+from app.utils.config import Config
+
+
+DEFAULT_RETENTION_DAYS = 365
+# audit_<year>.db, or audit_<first>_<last>.db once older years are merged
+ARCHIVE_FILE_PATTERN = re.compile(r"^audit_(\d{4})(?:_(\d{4}))?\.db$")
+BATCH_SIZE = 5000
+# SQLite attaches at most 10 databases to a connection: older years are
+# merged so that reads never attach more archives than this
+MAX_ARCHIVE_FILES = 8
+
+archive_metadata = MetaData()
+
+# Same columns as audit_logs, payloads stored as zlib-compressed JSON.
+# Hot ids may be reused once the newest rows are archived, hence the composite key.
+audit_archive = Table(
+    "audit_archive", archive_metadata,
+    Column("id", Integer, nullable=False),
+    Column("table_nom", String(50), nullable=False),
+    Column("entite_id", Integer, nullable=False),
+    Column("action", String(20), nullable=False),
+    Column("donnees_avant", LargeBinary),
+    Column("donnees_apres", LargeBinary),
+    Column("utilisateur", String(100)),
+    Column("ip_address", String(45)),
+    Column("created_at", DateTime, nullable=False),
+    PrimaryKeyConstraint("id", "created_at"),
+    Index("idx_archive_created_at", "created_at", "id"),
+    Index("idx_archive_action", "action"),
+    Index("idx_archive_table_nom", "table_nom"),
+)
+
+# Temporary view over the hot table and every attached archive (see attach_archives)
+audit_logs_all = Table(
+    "audit_logs_all", MetaData(),
+    Column("id", Integer),
+    Column("table_nom", String(50)),
+    Column("entite_id", Integer),
+    Column("action", String(20)),
+    Column("donnees_avant", Text),
+    Column("donnees_apres", Text),
+    Column("utilisateur", String(100)),
+    Column("ip_address", String(45)),
+    Column("created_at", DateTime),
+)
+
+_COLONNES = ("id", "table_nom", "entite_id", "action", "donnees_avant", "donnees_apres",
+             "utilisateur", "ip_address", "created_at")
+
+
+def compress_payload(value) -> Optional[bytes]:
+    """Compress a JSON payload (text as stored in audit_logs)"""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False)
+    return zlib.compress(value.encode("utf-8"))
+
+
+def decompress_payload(value) -> Optional[str]:
+    """Get back the JSON text of a compressed payload"""
+    if value is None:
+        return None
+    return zlib.decompress(value).decode("utf-8")
+
+
+def _schema(first: int, last: Optional[int] = None) -> str:
+    """Name of the archive of a year or of a range of years (file name and attached schema)"""
+    if last is None or last == first:
+        return f"audit_{first}"
+    return f"audit_{first}_{last}"
+
+
+def _archive_table(schema: str) -> Table:
+    """The audit_archive table inside an attached archive"""
+    return audit_archive.to_metadata(MetaData(), schema=schema)
+
+
+class AuditArchiveService:
+    """
+    Move old audit entries out of the main database.
+
+    Entries older than the retention horizon are copied into one SQLite file
+    per year (audit_<year>.db) with compressed payloads, then deleted from
+    audit_logs. Beyond MAX_ARCHIVE_FILES files the oldest are merged into
+    one (audit_<first>_<last>.db). attach_archives() exposes every tier
+    through the temporary view audit_logs_all so history stays searchable
+    from the audit view.
+
+    ATTACH and DETACH are refused inside a write transaction: use a session
+    that has not written anything yet. archive() commits each year it moves
+    and detaches its archive afterwards. Merging closes the idle pooled
+    read-only connections first, since they hold the files they attached.
+
+    On a PostgreSQL server the history stays in audit_logs (the server
+    compresses large payloads itself) and audit_logs_all is a permanent view
+    created by migration 006: archive() moves nothing there.
+    """
+
+    def __init__(self, db: Session, archive_dir: Optional[str] = None,
+                 retention_days: Optional[int] = None):
+        self.db = db
+        config = Config.get_instance()
+        if archive_dir is None:
+            archive_dir = config.get("audit", "archive_directory")
+        if archive_dir is None:
+            db_path = self.db.get_bind().url.database
+            archive_dir = Path(db_path).parent / "archives"
+        if retention_days is None:
+            retention_days = config.get("audit", "retention_days", default=DEFAULT_RETENTION_DAYS)
+        self.archive_dir = Path(archive_dir)
+        self.retention_days = int(retention_days)
+        self.is_sqlite = self.db.get_bind().dialect.name == "sqlite"
+
+    def archive_periods(self) -> List[Tuple[int, int]]:
+        """(first, last) years of each archive file, oldest first"""
+        if not self.archive_dir.is_dir():
+            return []
+        periods = []
+        for path in self.archive_dir.iterdir():
+            match = ARCHIVE_FILE_PATTERN.match(path.name)
+            if match:
+                first = int(match.group(1))
+                periods.append((first, int(match.group(2) or first)))
+        return sorted(periods)
+
+    def cutoff(self) -> datetime:
+        """Entries created before this date belong in the archives"""
+        return datetime.utcnow() - timedelta(days=self.retention_days)
+
+    def archive(self, before: Optional[datetime] = None) -> int:
+        """
+        Move audit entries created before a date into the yearly archives.
+
+        Args:
+            before: Horizon, defaults to now minus retention_days
+
+        Returns:
+            Number of entries moved
+        """
+        if not self.is_sqlite:
+            return 0
+        before = before or self.cutoff()
+        years = self.db.execute(
+            select(distinct(extract("year", AuditLog.created_at)))
+            .where(AuditLog.created_at < before)
+        ).scalars().all()
+        if not years:
+            return 0
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._register_functions()
+        periods = self.archive_periods()
+
+        moved = 0
+        for year in sorted(int(y) for y in years):
+            # A year older than the merged ones gets its own file until the next merge
+            schema = next((_schema(first, last) for first, last in periods if first <= year <= last),
+                          _schema(year))
+            attached = self._attach(schema)
+            try:
+                moved += self._move_year(schema, year, before)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            finally:
+                if attached:
+                    self._detach(schema)
+
+        self._merge_oldest()
+        return moved
+
+    def _move_year(self, schema: str, year: int, before: datetime) -> int:
+        """Move the entries of a year created before a date into an attached archive"""
+        table = _archive_table(schema)
+        table.create(self.db.connection(), checkfirst=True)
+        debut = datetime(year, 1, 1)
+        fin = min(datetime(year + 1, 1, 1), before)
+
+        moved = 0
+        while True:
+            ids = select(AuditLog.id).where(
+                AuditLog.created_at >= debut, AuditLog.created_at < fin
+            ).order_by(AuditLog.id).limit(BATCH_SIZE)
+            source = select(
+                AuditLog.id, AuditLog.table_nom, AuditLog.entite_id, AuditLog.action,
+                func.audit_compress(AuditLog.donnees_avant),
+                func.audit_compress(AuditLog.donnees_apres),
+                AuditLog.utilisateur, AuditLog.ip_address, AuditLog.created_at
+            ).where(AuditLog.id.in_(ids.scalar_subquery()))
+
+            # OR IGNORE: an interrupted run can be replayed without duplicates
+            self.db.execute(
+                insert(table).prefix_with("OR IGNORE").from_select(_COLONNES, source)
+            )
+            result = self.db.execute(
+                delete(AuditLog).where(AuditLog.id.in_(ids.scalar_subquery())),
+                execution_options={"synchronize_session": False}
+            )
+            moved += result.rowcount
+            if result.rowcount < BATCH_SIZE:
+                return moved
+
+    def _merge_oldest(self) -> None:
+        """Merge the two oldest archives until at most MAX_ARCHIVE_FILES remain"""
+        periods = self.archive_periods()
+        while len(periods) > MAX_ARCHIVE_FILES:
+            (first, _), (_, last) = periods[0], periods[1]
+            target, source = _schema(*periods[0]), _schema(*periods[1])
+            self._attach(target)
+            self._attach(source)
+            try:
+                _archive_table(target).create(self.db.connection(), checkfirst=True)
+                if self._has_archive_table(source):
+                    self.db.execute(
+                        insert(_archive_table(target)).prefix_with("OR IGNORE")
+                        .from_select(_COLONNES, select(_archive_table(source)))
+                    )
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            finally:
+                self._detach(target)
+                self._detach(source)
+            self._release_readers()
+            (self.archive_dir / f"{target}.db").replace(self.archive_dir / f"{_schema(first, last)}.db")
+            (self.archive_dir / f"{source}.db").unlink()
+            periods = [(first, last)] + periods[2:]
+
+    def _release_readers(self) -> None:
+        """
+        Close the pooled read-only connections of this database, which keep the
+        archives they attached open: the files can then be replaced (Windows
+        refuses while they are open) and readers re-attach the merged archive
+        on their next attach_archives().
+        """
+        from app.database.connection import get_database
+
+        database = get_database()
+        if self.db.get_bind() is database.engine:
+            database.read_engine.dispose()
+
+    def attach_archives(self) -> None:
+        """Attach every archive and (re)create the audit_logs_all view over all tiers"""
+        if not self.is_sqlite:
+            return
+        self._register_functions()
+        schemas = [_schema(first, last) for first, last in self.archive_periods()]
+        # Pooled connections keep their archives attached: drop those merged since
+        stale = [schema for schema in self._attached() if schema not in schemas]
+        if stale:
+            self.db.execute(text("DROP VIEW IF EXISTS temp.audit_logs_all"))
+            for schema in stale:
+                self._detach(schema)
+        for schema in schemas:
+            self._attach(schema)
+
+        colonnes = ", ".join(_COLONNES)
+        archive_colonnes = ", ".join(
+            f"audit_payload({c})" if c in ("donnees_avant", "donnees_apres") else c
+            for c in _COLONNES
+        )
+        parties = [f"SELECT {colonnes} FROM main.audit_logs"]
+        parties += [
+            f"SELECT {archive_colonnes} FROM {schema}.audit_archive"
+            for schema in schemas if self._has_archive_table(schema)
+        ]
+        sql = "CREATE TEMP VIEW audit_logs_all AS " + " UNION ALL ".join(parties)
+
+        existing = self.db.execute(text(
+            "SELECT sql FROM sqlite_temp_master WHERE type = 'view' AND name = 'audit_logs_all'"
+        )).scalar()
+        if existing != sql:
+            self.db.execute(text("DROP VIEW IF EXISTS temp.audit_logs_all"))
+            self.db.execute(text(sql))
+
+    def detach_archives(self) -> None:
+        """Drop the cross-tier view and detach every archive"""
+        if not self.is_sqlite:
+            return
+        self.db.execute(text("DROP VIEW IF EXISTS temp.audit_logs_all"))
+        for schema in self._attached():
+            self._detach(schema)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of entries per tier ('hot' and one key per archived year)"""
+        counts = {"hot": self.db.execute(select(func.count()).select_from(AuditLog)).scalar()}
+        if not self.is_sqlite:
+            return counts
+        self.attach_archives()
+        for first, last in self.archive_periods():
+            schema = _schema(first, last)
+            if self._has_archive_table(schema):
+                counts.update(self.db.execute(text(
+                    f"SELECT substr(created_at, 1, 4), count(*) FROM {schema}.audit_archive GROUP BY 1"
+                )).all())
+        return counts
+
+    def _attached(self) -> List[str]:
+        """Schemas of the archives currently attached"""
+        rows = self.db.execute(text("PRAGMA database_list")).all()
+        return [row[1] for row in rows if re.match(r"^audit_\d{4}(_\d{4})?$", row[1])]
+
+    def _attach(self, schema: str) -> bool:
+        """Attach an archive (creating the file if needed), False when it already was"""
+        if schema in self._attached():
+            return False
+        path = str(self.archive_dir / f"{schema}.db").replace("\\", "/")
+        self.db.execute(text(f"ATTACH DATABASE :path AS {schema}"), {"path": path})
+        return True
+
+    def _detach(self, schema: str) -> None:
+        """Detach an archive if attached"""
+        if schema in self._attached():
+            self.db.execute(text(f"DETACH DATABASE {schema}"))
+
+    def _has_archive_table(self, schema: str) -> bool:
+        """Check that an attached archive holds the audit_archive table"""
+        return self.db.execute(text(
+            f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'audit_archive'"
+        )).scalar() is not None
+
+    def _register_functions(self) -> None:
+        """Register the SQL functions compressing/decompressing payloads on this connection"""
+        dbapi_connection = self.db.connection().connection.driver_connection
+        dbapi_connection.create_function("audit_compress", 1, compress_payload, deterministic=True)
+        dbapi_connection.create_function("audit_payload", 1, decompress_payload, deterministic=True)
@@ -1,68 +1,45 @@
 """Audit logging service for tracking entity changes"""
-from datetime import datetime, date
-from decimal import Decimal
-from typing import Any, Optional, Dict
-from sqlalchemy.orm import Session
+from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum as PyEnum
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional, Dict, List, Tuple
+from sqlalchemy import event, insert, Enum, Date, DateTime, Numeric
+from sqlalchemy.orm import Mapper, Session, sessionmaker
 from sqlalchemy.inspection import inspect
 
-from app.models.entities import AuditLog
+from app.models.entities import AuditLog, Immeuble, Bureau, Locataire, Contrat, Paiement
 
 
-class AuditService:
-    @staticmethod
-    def log_create(session: Session, entity) -> AuditLog:
-        """Log creation of an entity"""
-        table_name = entity.__class__.__name__.lower()
-        entity_id = entity.id
-        
-        data_after = AuditService.entity_to_dict(entity)
-        
-        audit = AuditLog(
-            table_nom=table_name,
-            entite_id=entity_id,
-            action="CREATE",
-            donnees_avant=None,
-            donnees_apres=data_after,
-            created_at=datetime.utcnow()
-        )
-        session.add(audit)
-        return audit
+# Entities whose writes are recorded by the flush hooks
+AUDITED_MODELS = (Immeuble, Bureau, Locataire, Contrat, Paiement)
+# Many-to-many collections recorded as id lists, on one side only (Bureau.contrats mirrors Contrat.bureaux)
+AUDITED_COLLECTIONS = {Contrat: ("bureaux",)}
 
-    @staticmethod
-    def log_update(session: Session, entity, before_state: Dict[str, Any]) -> AuditLog:
-        """Log update of an entity"""
-        table_name = entity.__class__.__name__.lower()
-        entity_id = entity.id
-        
-        data_after = AuditService.entity_to_dict(entity)
-        
-        audit = AuditLog(
-            table_nom=table_name,
-            entite_id=entity_id,
-            action="UPDATE",
-            donnees_avant=before_state,
-            donnees_apres=data_after,
-            created_at=datetime.utcnow()
-        )
-        session.add(audit)
-        return audit
+_PENDING_KEY = "audit_pending"
 
-    @staticmethod
-    def log_delete(session: Session, entity_class, entity_id: int, before_state: Dict[str, Any]) -> AuditLog:
-        """Log deletion of an entity"""
-        table_name = entity_class.__name__.lower()
-        
-        audit = AuditLog(
-            table_nom=table_name,
-            entite_id=entity_id,
-            action="DELETE",
-            donnees_avant=before_state,
-            donnees_apres=None,
-            created_at=datetime.utcnow()
-        )
-        session.add(audit)
-        return audit
 
+def _converter(column_type) -> Optional[Callable[[Any], Any]]:
+    """JSON converter for the values of a column type (None when already JSON-compatible)"""
+    if isinstance(column_type, Enum):
+        return lambda value: value.value if isinstance(value, PyEnum) else value
+    if isinstance(column_type, (Date, DateTime)):
+        return lambda value: value.isoformat()
+    if isinstance(column_type, Numeric):
+        return float
+    return None
+
+
+@lru_cache(maxsize=None)
+def _serializer(mapper: Mapper) -> Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...]:
+    """(attribute, converter) pairs of a mapper's columns, computed once per mapper"""
+    return tuple(
+        (attr.key, _converter(attr.columns[0].type))
+        for attr in mapper.column_attrs
+    )
+
+
+class AuditService:
     @staticmethod
     def log_receipt(session: Session, paiement_id: int, receipt_number: str, file_path: str = None) -> AuditLog:
         """Log receipt generation"""
@@ -78,45 +55,165 @@ class AuditService:
         return audit
 
     @staticmethod
-    def entity_to_dict(entity, _visited=None) -> Optional[Dict[str, Any]]:
-        """Convert an entity to a JSON-compatible dictionary"""
+    def column_values(entity, committed: bool = False) -> Dict[str, Any]:
+        """
+        Get the loaded column values of an entity, never emitting a SELECT.
+
+        Args:
+            entity: Mapped instance
+            committed: Read the values as last loaded from the database
+                instead of the pending ones
+        """
+        state = inspect(entity)
+        result = {}
+        for key, convert in _serializer(state.mapper):
+            if committed:
+                history = state.attrs[key].history
+                loaded = history.unchanged or history.deleted
+                if not loaded:
+                    continue
+                value = loaded[0]
+            elif key in state.dict:
+                value = state.dict[key]
+            else:
+                continue
+            result[key] = convert(value) if convert is not None and value is not None else value
+        return result
+
+    @staticmethod
+    def column_changes(entity) -> Dict[str, tuple]:
+        """Get {column: (before, after)} for the columns modified since the last flush"""
+        state = inspect(entity)
+        changes = {}
+        for key, convert in _serializer(state.mapper):
+            history = state.attrs[key].history
+            if not history.added and not history.deleted:
+                continue
+            before = history.deleted[0] if history.deleted else None
+            after = history.added[0] if history.added else None
+            if before != after:
+                if convert is not None:
+                    before = convert(before) if before is not None else None
+                    after = convert(after) if after is not None else None
+                changes[key] = (before, after)
+        return changes
+
+    @staticmethod
+    def collection_values(entity) -> Dict[str, List[int]]:
+        """Get the ids of the loaded audited collections of an entity"""
+        state = inspect(entity)
+        return {
+            key: sorted(item.id for item in state.dict[key])
+            for key in AUDITED_COLLECTIONS.get(type(entity), ()) if key in state.dict
+        }
+
+    @staticmethod
+    def collection_changes(entity) -> Dict[str, tuple]:
+        """Get {collection: (ids before, ids after)} for the audited collections modified since the last flush"""
+        state = inspect(entity)
+        changes = {}
+        for key in AUDITED_COLLECTIONS.get(type(entity), ()):
+            history = state.attrs[key].history
+            if not history.added and not history.deleted:
+                continue
+            kept = [item.id for item in history.unchanged]
+            before = sorted(kept + [item.id for item in history.deleted])
+            after = sorted(kept + [item.id for item in history.added])
+            if before != after:
+                changes[key] = (before, after)
+        return changes
+
+    @staticmethod
+    def entity_to_dict(entity) -> Optional[Dict[str, Any]]:
+        """
+        Convert an entity to a JSON-compatible dictionary.
+
+        Only column attributes are read, relationships appear through their
+        foreign key columns, so no lazy load is triggered.
+        """
         if entity is None:
             return None
-        
-        if _visited is None:
-            _visited = set()
-        
-        entity_id = (entity.__class__.__name__, getattr(entity, 'id', None))
-        if entity_id in _visited:
-            return {"id": entity_id[1], "__ref__": entity_id[0]}
-        _visited.add(entity_id)
-        
-        try:
-            inspector = inspect(entity)
-            result = {}
-            
-            for attr in inspector.attrs:
-                key = attr.key
-                value = attr.value
-                
-                if hasattr(value, '__dict__'):
-                    if isinstance(value, list):
-                        result[key] = [{"id": getattr(item, 'id', None)} for item in value if hasattr(item, 'id')]
-                    elif hasattr(value, 'id'):
-                        result[key] = {"id": value.id}
-                    else:
-                        result[key] = AuditService.entity_to_dict(value, _visited)
-                elif isinstance(value, datetime):
-                    result[key] = value.isoformat()
-                elif isinstance(value, date):
-                    result[key] = value.isoformat()
-                elif isinstance(value, Decimal):
-                    result[key] = float(value)
-                elif hasattr(value, 'value'):
-                    result[key] = value.value if isinstance(value.value, (str, int, float, bool, type(None))) else str(value.value)
-                elif not callable(value):
-                    result[key] = value
-            
-            return result
-        except Exception:
-            return None
+        return AuditService.column_values(entity)
+
+
+def disable_audit(session: Session) -> None:
+    """Stop recording audit entries for the writes of a session"""
+    session.info["audit"] = False
+
+
+@contextmanager
+def audit_disabled(session: Session) -> Iterator[None]:
+    """Skip the audit entries of the writes flushed in the block (e.g. backup restore)"""
+    previous = session.info.get("audit", True)
+    session.info["audit"] = False
+    try:
+        yield
+    finally:
+        session.info["audit"] = previous
+
+
+def _audited(session: Session, entity) -> bool:
+    return session.info.get("audit", True) and isinstance(entity, AUDITED_MODELS)
+
+
+def _record(table_nom: str, entite_id, action: str, avant, apres, created_at) -> Dict[str, Any]:
+    return {
+        "table_nom": table_nom,
+        "entite_id": entite_id,
+        "action": action,
+        "donnees_avant": avant,
+        "donnees_apres": apres,
+        "created_at": created_at,
+    }
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    """Snapshot deleted entities while their database state is still known"""
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for entity in session.deleted:
+        if _audited(session, entity):
+            # Columns expired by a commit are read again, the snapshot only reads loaded values
+            state = inspect(entity)
+            expired = [key for key, _ in _serializer(state.mapper) if key in state.unloaded]
+            if expired:
+                session.refresh(entity, expired)
+            pending.append((entity.__class__.__name__.lower(), inspect(entity).identity[0],
+                            AuditService.column_values(entity, committed=True)))
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    """Write the audit entries of the flush with a single executemany"""
+    now = datetime.utcnow()
+    records: List[Dict[str, Any]] = [
+        _record(table_nom, entite_id, "DELETE", avant, None, now)
+        for table_nom, entite_id, avant in session.info.pop(_PENDING_KEY, [])
+    ]
+
+    for entity in session.new:
+        if _audited(session, entity):
+            records.append(_record(entity.__class__.__name__.lower(), entity.id, "CREATE", None,
+                                   {**AuditService.column_values(entity),
+                                    **AuditService.collection_values(entity)}, now))
+
+    for entity in session.dirty:
+        if not _audited(session, entity):
+            continue
+        # Only the modified columns and collections are stored, before and after
+        changes = {**AuditService.column_changes(entity), **AuditService.collection_changes(entity)}
+        if changes:
+            records.append(_record(
+                entity.__class__.__name__.lower(), entity.id, "UPDATE",
+                {key: before for key, (before, _) in changes.items()},
+                {key: after for key, (_, after) in changes.items()},
+                now
+            ))
+
+    if records:
+        session.connection().execute(insert(AuditLog.__table__), records)
+
+
+def install_audit_hooks(factory: sessionmaker) -> None:
+    """Record audited entity writes of the sessions created by a factory"""
+    if not event.contains(factory, "before_flush", _before_flush):
+        event.listen(factory, "before_flush", _before_flush)
+        event.listen(factory, "after_flush", _after_flush)
@@ -0,0 +1,127 @@
+"""Dashboard data loading service (payment grid state in a constant number of queries)"""
+from datetime import date
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.entities import Immeuble, Bureau, Contrat, Locataire, PaiementMois, contrat_bureau
+
+
+MOIS_AFFICHES = 18
+DECALAGE_DEBUT = -12
+
+
+def mois_fenetre(cur: date = None) -> List[tuple]:
+    """Get the (year, month) columns shown by the dashboard grid"""
+    if cur is None:
+        cur = date.today()
+    debut = PaiementMois.to_index(cur.year, cur.month) + DECALAGE_DEBUT
+    return [PaiementMois.from_index(debut + i) for i in range(MOIS_AFFICHES)]
+
+
+def _filtre_statut(statut_filter: str = None) -> list:
+    """Conditions on Contrat of the contracts a status filter shows"""
+    if statut_filter == "actif":
+        return [Contrat.est_resilie.is_(False)]
+    if statut_filter == "resilie":
+        return [Contrat.est_resilie.is_(True)]
+    return []
+
+
+class DashboardService:
+    """Build the dashboard grid state as plain data, before any widget is created"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, statut_filter: str = None, cur: date = None) -> Dict[str, Any]:
+        """
+        Load immeubles, their contracts and the paid months of the grid window.
+
+        Args:
+            statut_filter: "actif", "resilie" or None for all contracts
+            cur: Reference date of the window (defaults to today)
+
+        Returns:
+            Dict with keys:
+                mois: list of (year, month) column headers
+                immeubles: list of {id, nom, adresse, contrats} where contrats is a
+                    list of {id, bureaux, locataire, date_debut, est_resilie, date_resiliation}
+                payes: dict of contrat_id -> set of paid (year, month) in the window
+                statut: the status filter, to pass to payes()
+        """
+        mois = mois_fenetre(cur)
+
+        immeubles = [
+            {"id": id, "nom": nom, "adresse": adresse, "contrats": []}
+            for id, nom, adresse in self.db.execute(
+                select(Immeuble.id, Immeuble.nom, Immeuble.adresse).order_by(Immeuble.nom)
+            )
+        ]
+        par_immeuble = {img["id"]: img for img in immeubles}
+
+        query = select(
+            Bureau.immeuble_id, Bureau.numero, Contrat.id, Locataire.nom,
+            Contrat.date_debut, Contrat.est_resilie, Contrat.date_resiliation
+        ).select_from(contrat_bureau).join(
+            Bureau, Bureau.id == contrat_bureau.c.bureau_id
+        ).join(
+            Contrat, Contrat.id == contrat_bureau.c.contrat_id
+        ).outerjoin(
+            Locataire, Locataire.id == Contrat.locataire_id
+        ).where(*_filtre_statut(statut_filter)).order_by(Bureau.immeuble_id, Bureau.id, Contrat.id)
+
+        contrats = {}
+        vus = set()
+        for immeuble_id, numero, contrat_id, locataire, date_debut, est_resilie, date_resiliation in self.db.execute(query):
+            contrat = contrats.get(contrat_id)
+            if contrat is None:
+                contrat = contrats[contrat_id] = {
+                    "id": contrat_id,
+                    "bureaux": [],
+                    "locataire": locataire,
+                    "date_debut": date_debut,
+                    "est_resilie": est_resilie,
+                    "date_resiliation": date_resiliation,
+                }
+            # A contract spanning several immeubles lists all of its bureaux on each card
+            contrat["bureaux"].append(numero)
+            if (immeuble_id, contrat_id) not in vus:
+                vus.add((immeuble_id, contrat_id))
+                par_immeuble[immeuble_id]["contrats"].append(contrat)
+
+        return {"mois": mois, "immeubles": immeubles, "payes": self.payes(contrats, mois, statut_filter),
+                "statut": statut_filter}
+
+    def payes(self, contrat_ids: Iterable[int], mois: List[tuple], statut_filter: str = None) -> Dict[int, set]:
+        """
+        Paid months of contracts within the grid window.
+
+        Args:
+            contrat_ids: Contracts shown
+            mois: (year, month) columns of the window
+            statut_filter: Status filter the contracts were selected with
+
+        Returns:
+            Dict of contrat_id -> set of paid (year, month)
+        """
+        payes = {contrat_id: set() for contrat_id in contrat_ids}
+        if payes:
+            rows = self.db.execute(
+                # Same filter as the contracts shown rather than their ids: a filtered
+                # grid does not read the whole window, and the statement stays the same
+                select(PaiementMois.contrat_id, PaiementMois.mois).join(
+                    Contrat, Contrat.id == PaiementMois.contrat_id
+                ).where(
+                    PaiementMois.mois.between(
+                        PaiementMois.to_index(*mois[0]), PaiementMois.to_index(*mois[-1])
+                    ),
+                    *_filtre_statut(statut_filter)
+                ).distinct()
+            )
+            for contrat_id, index in rows:
+                # Contracts without bureaux are not shown
+                if contrat_id in payes:
+                    payes[contrat_id].add(PaiementMois.from_index(index))
+        return payes
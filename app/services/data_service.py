@@ -2,12 +2,15 @@
 import json
 import os
 import shutil
+from contextlib import contextmanager
 from datetime import datetime, date
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from pathlib import Path
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.database.connection import get_database
+from app.services.audit_service import audit_disabled
 from app.models.entities import (
     Immeuble, Bureau, Locataire, Contrat, Paiement,
     TypePaiement, StatutLocataire, DocumentTreeConfig, Document
@@ -19,22 +22,24 @@ class DataService:
         self.db = db
         self.documents_base_path = documents_base_path or str(Path.cwd() / "data" / "documents")
 
-    def _get_session(self) -> Session:
-        if self.db is None:
-            db = get_database()
-            return db.session_factory()
-        return self.db
+    @contextmanager
+    def _session(self, readonly: bool = False) -> Iterator[Session]:
+        """The caller's session, or a session of the application database (under its write lock)"""
+        if self.db is not None:
+            yield self.db
+            return
+        with get_database().session_scope(readonly=readonly) as session:
+            yield session
 
     def export_all(self, backup_folder: Optional[str] = None) -> Dict[str, Any]:
         """Export all data to a JSON-compatible dictionary"""
-        session = self._get_session()
         data = {
             "version": "1.0",
             "export_date": datetime.utcnow().isoformat(),
             "entities": {}
         }
 
-        try:
+        with self._session(readonly=True) as session:
             data["entities"]["immeubles"] = self._export_immeubles(session)
             data["entities"]["bureaux"] = self._export_bureaux(session)
             data["entities"]["locataires"] = self._export_locataires(session)
@@ -57,9 +62,6 @@ class DataService:
                         print(f"Warning: Could not copy document file {src}: {e}")
 
             return data
-        finally:
-            if self.db is None:
-                session.close()
 
     def _export_documents(self, session: Session) -> Dict[str, Any]:
         """Export documents metadata and return file copy list"""
@@ -201,29 +203,40 @@ class DataService:
 
     def import_all(self, data: Dict[str, Any], documents_backup_folder: Optional[str] = None):
         """Import all data from a JSON dictionary"""
-        session = self._get_session()
-
-        try:
-            entities = data.get("entities", {})
-
-            self._import_immeubles(session, entities.get("immeubles", []))
-            self._import_bureaux(session, entities.get("bureaux", []))
-            self._import_locataires(session, entities.get("locataires", []))
-            self._import_contrats(session, entities.get("contrats", []))
-            self._import_paiements(session, entities.get("paiements", []))
-            self._import_document_tree_configs(session, entities.get("document_tree_configs", []))
-            self._import_documents(session, entities.get("documents", []))
-
-            if documents_backup_folder and os.path.exists(documents_backup_folder):
-                self._restore_document_files(documents_backup_folder)
-
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            if self.db is None:
-                session.close()
+        with self._session() as session:
+            try:
+                # A restore is not a user action: do not record every imported row
+                with audit_disabled(session):
+                    entities = data.get("entities", {})
+
+                    self._import_immeubles(session, entities.get("immeubles", []))
+                    self._import_bureaux(session, entities.get("bureaux", []))
+                    self._import_locataires(session, entities.get("locataires", []))
+                    self._import_contrats(session, entities.get("contrats", []))
+                    self._import_paiements(session, entities.get("paiements", []))
+                    self._import_document_tree_configs(session, entities.get("document_tree_configs", []))
+                    self._import_documents(session, entities.get("documents", []))
+
+                    if documents_backup_folder and os.path.exists(documents_backup_folder):
+                        self._restore_document_files(documents_backup_folder)
+
+                    session.flush()
+                    self._reset_sequences(session)
+                    session.commit()
+            except Exception as e:
+                session.rollback()
+                raise e
+
+    def _reset_sequences(self, session: Session):
+        """Move PostgreSQL id sequences past the imported ids (SQLite needs nothing)"""
+        if session.get_bind().dialect.name != "postgresql":
+            return
+        for model in (Immeuble, Bureau, Locataire, Contrat, Paiement, DocumentTreeConfig, Document):
+            table = model.__tablename__
+            session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"coalesce(max(id), 0) + 1, false) FROM {table}"
+            ))
 
     def _import_document_tree_configs(self, session: Session, items: List[Dict[str, Any]]):
         for item in items:
@@ -303,6 +316,8 @@ class DataService:
                 commentaires=item.get("commentaires")
             )
             session.merge(locataire)
+        # Contracts and payments look their locataire up: it must be in the database
+        session.flush()
 
     def _import_contrats(self, session: Session, items: List[Dict[str, Any]]):
         for item in items:
@@ -0,0 +1,187 @@
+"""SQLite maintenance tasks (statistics, WAL checkpoint, vacuum, audit archival)"""
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+
+from app.utils.config import Config
+
+
+# Checkpoint last: with WAL, freed pages leave the file once the WAL is copied back
+DEFAULT_TASKS = ("archive_audit", "incremental_vacuum", "optimize", "checkpoint")
+HISTORY_FILE = "maintenance_history.jsonl"
+HISTORY_MAX_LINES = 500
+
+# Free pages above this share of the file trigger the one-time switch to
+# incremental auto-vacuum (a full VACUUM)
+VACUUM_CONVERSION_RATIO = 0.10
+
+
+@dataclass
+class MaintenanceResult:
+    """Outcome of one maintenance task"""
+    execution: str  # Start of the run the task belongs to
+    tache: str
+    debut: str
+    duree_ms: float
+    octets_recuperes: int = 0
+    details: str = ""
+    erreur: Optional[str] = None
+
+
+class MaintenanceService:
+    """
+    Run maintenance on the SQLite database.
+
+    Tasks use the writer connection while holding the write lock, so they
+    never interleave with a user write; readers keep working (WAL). Each
+    run is appended to maintenance_history.jsonl next to the database.
+    """
+
+    def __init__(self, db=None):
+        if db is None:
+            from app.database.connection import get_database
+            db = get_database()
+        self.db = db
+        self.db_path = Path(self.db.engine.url.database)
+        self.history_path = self.db_path.parent / HISTORY_FILE
+
+    @property
+    def tasks(self) -> Dict[str, Callable[[], str]]:
+        """Available tasks by name, each returning a short description"""
+        return {
+            "checkpoint": self.checkpoint,
+            "optimize": self.optimize,
+            "analyze": self.analyze,
+            "incremental_vacuum": self.incremental_vacuum,
+            "archive_audit": self.archive_audit,
+        }
+
+    def file_sizes(self) -> int:
+        """Size of the database file plus its WAL, in bytes"""
+        total = 0
+        for path in (self.db_path, Path(f"{self.db_path}-wal")):
+            if path.exists():
+                total += path.stat().st_size
+        return total
+
+    def run(self, tasks: Optional[Sequence[str]] = None) -> List[MaintenanceResult]:
+        """
+        Run tasks in order and record them in the history.
+
+        Args:
+            tasks: Task names, defaults to maintenance.tasks from config.yaml
+
+        Returns:
+            One result per task; a failing task does not stop the others
+        """
+        if tasks is None:
+            tasks = Config.get_instance().get("maintenance", "tasks", default=list(DEFAULT_TASKS))
+        results = []
+        execution = datetime.now().isoformat(timespec="seconds")
+        for name in tasks:
+            task = self.tasks.get(name)
+            if task is None:
+                continue
+            debut = datetime.now().isoformat(timespec="seconds")
+            size_before = self.file_sizes()
+            start = time.perf_counter()
+            details, erreur = "", None
+            try:
+                details = task()
+            except Exception as e:
+                erreur = str(e)
+            results.append(MaintenanceResult(
+                execution=execution,
+                tache=name,
+                debut=debut,
+                duree_ms=round((time.perf_counter() - start) * 1000, 1),
+                octets_recuperes=max(0, size_before - self.file_sizes()),
+                details=details,
+                erreur=erreur
+            ))
+        self._record(results)
+        return results
+
+    def checkpoint(self) -> str:
+        """Copy the WAL into the database and truncate it"""
+        wal_path = Path(f"{self.db_path}-wal")
+        wal_size = wal_path.stat().st_size if wal_path.exists() else 0
+        busy, log_pages, checkpointed = self._execute("PRAGMA wal_checkpoint(TRUNCATE)")[0]
+        if busy:
+            return f"partiel: {checkpointed}/{log_pages} pages (lecteurs actifs)"
+        return f"journal WAL vidé ({wal_size} octets)"
+
+    def optimize(self) -> str:
+        """Refresh the statistics the query planner needs (cheap, incremental)"""
+        self._execute("PRAGMA optimize")
+        return ""
+
+    def analyze(self) -> str:
+        """Recompute the statistics of every index"""
+        self._execute("ANALYZE")
+        return ""
+
+    def incremental_vacuum(self) -> str:
+        """Give free pages back to the file system"""
+        auto_vacuum = self._scalar("PRAGMA auto_vacuum")
+        freelist = self._scalar("PRAGMA freelist_count")
+        if auto_vacuum == 2:
+            # sqlite3 steps a statement returning no rows only once, i.e. one
+            # page per call; executescript runs it to completion
+            with self.db.maintenance_connection() as connection:
+                connection.connection.driver_connection.executescript("PRAGMA incremental_vacuum")
+            return f"{freelist} pages libres"
+        page_count = self._scalar("PRAGMA page_count") or 1
+        if freelist / page_count < VACUUM_CONVERSION_RATIO:
+            return f"{freelist} pages libres, pas de VACUUM"
+        # Switching to incremental mode needs one full VACUUM, later runs are cheap
+        self._execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._execute("VACUUM")
+        return f"VACUUM complet ({freelist} pages libres), passage en auto_vacuum incrémental"
+
+    def archive_audit(self) -> str:
+        """Move old audit entries to the yearly archives"""
+        from app.services.audit_archive_service import AuditArchiveService
+
+        with self.db.session_scope() as session:
+            moved = AuditArchiveService(session).archive()
+        return f"{moved} entrée(s) archivée(s)"
+
+    def history(self, limit: int = 20) -> List[dict]:
+        """Last recorded task results, newest first"""
+        if not self.history_path.exists():
+            return []
+        with open(self.history_path, encoding="utf-8") as f:
+            lines = f.readlines()
+        return [json.loads(line) for line in reversed(lines[-limit:]) if line.strip()]
+
+    def _execute(self, sql: str) -> list:
+        """Run a statement on the writer connection, outside any transaction"""
+        with self.db.maintenance_connection() as connection:
+            result = connection.execute(text(sql))
+            return result.all() if result.returns_rows else []
+
+    def _scalar(self, sql: str):
+        """Run a statement and return the first column of its first row"""
+        rows = self._execute(sql)
+        return rows[0][0] if rows else None
+
+    def _record(self, results: List[MaintenanceResult]) -> None:
+        """Append results to the history file, keeping its last lines only"""
+        if not results:
+            return
+        lines = []
+        if self.history_path.exists():
+            with open(self.history_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        lines += [json.dumps(asdict(r), ensure_ascii=False) + "\n" for r in results]
+        tmp_path = f"{self.history_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines[-HISTORY_MAX_LINES:])
+        os.replace(tmp_path, self.history_path)
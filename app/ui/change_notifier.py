@@ -0,0 +1,56 @@
+"""Delivers the change bus events to the UI thread"""
+from typing import Iterable, List, Optional, Set
+
+from PySide6.QtCore import QObject, Signal
+
+from app.database.change_bus import DELETE, RELOAD, EntityChange
+from app.database.connection import get_database
+
+
+class ChangeNotifier(QObject):
+    """
+    Qt side of the database change bus.
+
+    changed is emitted on the UI thread with the list of EntityChange of
+    each commit, whichever thread committed it.
+    """
+
+    _instance: Optional['ChangeNotifier'] = None
+    changed = Signal(list)
+    _published = Signal(list)
+
+    def __init__(self):
+        super().__init__()
+        # Commits in other threads are queued to the thread owning the notifier
+        self._published.connect(self._deliver)
+        self._unsubscribe = get_database().change_bus.subscribe(self._published.emit)
+
+    @classmethod
+    def get_instance(cls) -> 'ChangeNotifier':
+        """Get or create the singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _deliver(self, changes: List[EntityChange]) -> None:
+        self.changed.emit(changes)
+
+
+def touches(changes: Iterable[EntityChange], *table_names: str) -> bool:
+    """True when a commit changed one of the tables"""
+    return any(change.entity in table_names for change in changes)
+
+
+def changed_ids(changes: Iterable[EntityChange], table_name: str) -> Set[int]:
+    """Ids of a table inserted or updated by a commit"""
+    return {i for c in changes if c.entity == table_name and c.operation not in (DELETE, RELOAD) for i in c.ids}
+
+
+def deleted_ids(changes: Iterable[EntityChange], table_name: str) -> Set[int]:
+    """Ids of a table deleted by a commit"""
+    return {i for c in changes if c.entity == table_name and c.operation == DELETE for i in c.ids}
+
+
+def reloaded(changes: Iterable[EntityChange], table_name: str) -> bool:
+    """True when a bulk statement changed unknown rows of a table"""
+    return any(c.entity == table_name and c.operation == RELOAD for c in changes)
@@ -1,10 +1,17 @@
 """UI Dialogs package"""
-from app.ui.dialogs.tree_config_dialog import TreeConfigDialog
-from app.ui.dialogs.document_upload_dialog import DocumentUploadDialog
-from app.ui.dialogs.document_browser_dialog import DocumentBrowserDialog
-
-__all__ = [
-    'TreeConfigDialog',
-    'DocumentUploadDialog',
-    'DocumentBrowserDialog',
-]
+from importlib import import_module
+
+# Dialog -> module, imported on first access
+_DIALOGS = {
+    'TreeConfigDialog': 'app.ui.dialogs.tree_config_dialog',
+    'DocumentUploadDialog': 'app.ui.dialogs.document_upload_dialog',
+    'DocumentBrowserDialog': 'app.ui.dialogs.document_browser_dialog',
+}
+
+__all__ = list(_DIALOGS)
+
+
+def __getattr__(name):
+    if name in _DIALOGS:
+        return getattr(import_module(_DIALOGS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -329,7 +329,7 @@ class DocumentUploadDialog(QDialog):
             from app.services.document_service import DocumentService
             
             db = get_database()
-            with db.session_scope() as session:
+            with db.session_scope(readonly=True) as session:
                 doc_service = DocumentService(session)
                 
                 docs = doc_service.get_documents_by_folder(
@@ -0,0 +1,188 @@
+"""Runs view queries on worker threads and hands plain data back to the UI thread"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, Signal
+from sqlalchemy.orm import Session
+
+from app.database import query_monitor
+from app.database.connection import DEFAULT_READ_POOL_SIZE, get_database
+from app.utils.config import Config
+
+
+# SQLite virtual machine instructions between two cancellation checks
+PROGRESS_STEPS = 1000
+
+_pool: Optional[QThreadPool] = None
+_running = 0  # Loads started and not finished yet
+_running_lock = threading.Lock()
+
+
+def loader_pool() -> QThreadPool:
+    """Thread pool of the loaders, one connection of the read pool left to the UI thread"""
+    global _pool
+    if _pool is None:
+        config = Config.get_instance()
+        _pool = QThreadPool()
+        _pool.setMaxThreadCount(max(1, config.get('database', 'read_pool_size', default=DEFAULT_READ_POOL_SIZE) - 1))
+    return _pool
+
+
+class LoadCancelled(Exception):
+    """Raised in a worker whose load was superseded"""
+
+
+class CancelToken:
+    """Cancellation flag shared by a load and its worker"""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def check(self) -> None:
+        """Raise LoadCancelled once cancelled (between two queries of a fetch)"""
+        if self.cancelled:
+            raise LoadCancelled()
+
+
+@contextmanager
+def interruptible(session: Session, token: CancelToken):
+    """Abort the SQLite statement running on session as soon as token is cancelled"""
+    if session.get_bind().dialect.name != "sqlite":
+        # A server query runs to its end, its result is dropped
+        yield
+        return
+    connection = session.connection().connection.driver_connection
+    connection.set_progress_handler(lambda: 1 if token.cancelled else 0, PROGRESS_STEPS)
+    try:
+        yield
+    finally:
+        connection.set_progress_handler(None, 0)
+
+
+class _LoadTask(QRunnable):
+    """Runs one fetch with its own read-only session"""
+
+    def __init__(self, fetch: Callable[[Session], Any], token: CancelToken, generation: int, delivered):
+        super().__init__()
+        self._fetch = fetch
+        # The load is an action of its own, counted by the actions it was started in
+        self._actions = query_monitor.current_actions()
+        self._token = token
+        self._generation = generation
+        self._delivered = delivered
+
+    def run(self):
+        global _running
+        try:
+            result, error = None, None
+            try:
+                self._token.check()
+                name = f"chargement {getattr(self._fetch, '__qualname__', type(self._fetch).__name__)}"
+                with query_monitor.action(name, self._actions), \
+                        get_database().session_scope(readonly=True) as session:
+                    with interruptible(session, self._token):
+                        result = self._fetch(session)
+            except Exception as e:
+                error = e
+            if self._token.cancelled:
+                return
+            try:
+                self._delivered.emit(self._generation, result, error)
+            except RuntimeError:
+                # The loader was deleted with its view
+                pass
+        finally:
+            with _running_lock:
+                _running -= 1
+
+
+class DataLoader(QObject):
+    """
+    Loads the data of a view off the UI thread.
+
+    fetch is called on a worker thread with its own read-only session and
+    must return plain data (rows, dicts, tuples), never ORM entities;
+    on_loaded receives it on the UI thread. Starting a load supersedes the
+    running one: its SQLite statement is interrupted and its result dropped.
+    """
+
+    _delivered = Signal(int, object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._token: Optional[CancelToken] = None
+        self._callbacks = None
+        self._delivered.connect(self._deliver)
+
+    @property
+    def is_loading(self) -> bool:
+        return self._token is not None
+
+    def load(self, fetch: Callable[[Session], Any], on_loaded: Callable[[Any], None],
+             on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        """
+        Start a load, cancelling the previous one.
+
+        Args:
+            fetch: Runs the queries (worker thread)
+            on_loaded: Receives the result of fetch (UI thread)
+            on_error: Receives the exception raised by fetch (defaults to printing it)
+        """
+        global _running
+        self.cancel()
+        self._generation += 1
+        self._token = CancelToken()
+        self._callbacks = (on_loaded, on_error)
+        with _running_lock:
+            _running += 1
+        loader_pool().start(_LoadTask(fetch, self._token, self._generation, self._delivered))
+
+    def cancel(self) -> None:
+        """Abort the running load, its callbacks are not called"""
+        if self._token is not None:
+            self._token.cancel()
+        self._token = None
+        self._callbacks = None
+
+    def _deliver(self, generation: int, result, error) -> None:
+        if generation != self._generation or self._callbacks is None:
+            return
+        on_loaded, on_error = self._callbacks
+        self._token = None
+        self._callbacks = None
+        if error is None:
+            on_loaded(result)
+        elif on_error is not None:
+            on_error(error)
+        else:
+            print(f"Erreur de chargement: {error}")
+
+
+def wait_for_loads(timeout_ms: int = 30000) -> bool:
+    """
+    Block until every started load has delivered its result, including
+    loads started by the callbacks (tests and benchmarks).
+
+    Returns:
+        False on timeout
+    """
+    deadline = time.monotonic() + timeout_ms / 1000
+    while True:
+        remaining = int((deadline - time.monotonic()) * 1000)
+        if remaining <= 0 or not loader_pool().waitForDone(remaining):
+            return False
+        # Results are queued to the UI thread
+        QCoreApplication.processEvents()
+        with _running_lock:
+            if _running == 0:
+                return True
@@ -0,0 +1,86 @@
+"""Runs database maintenance from a worker thread when the user is idle"""
+import threading
+import time
+from typing import List, Optional, Sequence
+
+from PySide6.QtCore import QObject, QEvent, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+
+from app.database.connection import get_database
+from app.utils.config import Config
+
+
+CHECK_INTERVAL_MS = 60 * 1000
+
+_ACTIVITY_EVENTS = (
+    QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.Wheel, QEvent.MouseMove,
+)
+
+
+class MaintenanceScheduler(QObject):
+    """
+    Schedule MaintenanceService runs.
+
+    When automatic, a run starts once maintenance.interval_minutes have passed
+    since the previous one and nothing was typed or clicked for
+    maintenance.idle_seconds. Runs happen on a worker thread; finished is
+    emitted on the UI thread with the list of MaintenanceResult.
+    """
+
+    finished = Signal(list)
+
+    def __init__(self, parent=None, automatic: bool = True):
+        super().__init__(parent)
+        config = Config.get_instance()
+        self.interval = config.get('maintenance', 'interval_minutes', default=360) * 60
+        self.idle_seconds = config.get('maintenance', 'idle_seconds', default=120)
+        self._last_activity = time.monotonic()
+        self._last_run = time.monotonic()
+        self._running = threading.Lock()
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._on_tick)
+        # A PostgreSQL server runs its own maintenance (autovacuum)
+        if automatic and config.get('maintenance', 'enabled', default=True) and get_database().is_sqlite:
+            app = QApplication.instance()
+            if app is not None:
+                app.installEventFilter(self)
+            self._timer.start(CHECK_INTERVAL_MS)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running.locked()
+
+    def eventFilter(self, obj, event):
+        if event.type() in _ACTIVITY_EVENTS:
+            self._last_activity = time.monotonic()
+        return False
+
+    def run_now(self, tasks: Optional[Sequence[str]] = None) -> bool:
+        """Start a run in the background, False if one is already running"""
+        if not self._running.acquire(blocking=False):
+            return False
+        thread = threading.Thread(target=self._work, args=(tasks,), daemon=True)
+        thread.start()
+        return True
+
+    def _on_tick(self):
+        now = time.monotonic()
+        if now - self._last_run < self.interval:
+            return
+        if now - self._last_activity < self.idle_seconds:
+            return
+        self.run_now()
+
+    def _work(self, tasks: Optional[Sequence[str]]):
+        from app.services.maintenance_service import MaintenanceService
+
+        results: List = []
+        try:
+            results = MaintenanceService().run(tasks)
+        except Exception as e:
+            print(f"Erreur maintenance: {e}")
+        finally:
+            self._last_run = time.monotonic()
+            self._running.release()
+        self.finished.emit(results)
@@ -2,19 +2,45 @@
 """
 Audit log history view
 """
-from datetime import datetime
-from typing import Dict, Any
-
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QGroupBox, QFormLayout, QTableWidget, QTableWidgetItem,
-    QHeaderView, QLineEdit, QComboBox, QMessageBox, QDateEdit
+    QGroupBox, QTableView, QLineEdit, QComboBox, QMessageBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QColor
+from sqlalchemy import select, or_, func, cast, String
 
 from app.ui.views.base_view import BaseView
-from app.database.connection import get_database
-from app.models.entities import AuditLog
+from app.ui.widgets.lazy_table_model import LazyQueryModel, QueryColumn
+from app.services.audit_archive_service import AuditArchiveService, audit_logs_all
+
+
+ACTION_COLORS = {
+    "CREATE": (Qt.green, Qt.white),
+    "DELETE": (Qt.red, Qt.white),
+    "UPDATE": (Qt.yellow, Qt.black),
+    "RECEIPT_GENERATED": (Qt.cyan, Qt.black),
+}
+
+APERCU_LONGUEUR = 50
+
+
+def _details(row) -> str:
+    """Format the before/after preview of an audit row"""
+    details = ""
+    if row.avant:
+        details += f"Avant: {row.avant}..."
+    if row.apres:
+        if details:
+            details += "\n"
+        details += f"Après: {row.apres}..."
+    return details if details else "-"
+
+
+def _action_color(action, index):
+    """Get the background (index 0) or foreground (index 1) color of an action"""
+    colors = ACTION_COLORS.get(action)
+    return QColor(colors[index]) if colors else None
 
 
 class AuditView(BaseView):
@@ -49,93 +75,88 @@ class AuditView(BaseView):
         filter_group.setLayout(filter_layout)
         self.layout().addWidget(filter_group)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Date", "Action", "Table", "Entité", "Détails"])
+        self.model = self.create_model()
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
-        self.table.setFrameShape(QTableWidget.NoFrame)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setFrameShape(QTableView.NoFrame)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.verticalHeader().setVisible(False)
+        # Two-line details: fixed row height instead of measuring every fetched row
+        self.table.verticalHeader().setDefaultSectionSize(44)
         self.layout().addWidget(self.table)
 
         self.layout().addStretch()
 
+    def create_model(self):
+        """Create the audit model over the hot and archived tiers, paged by keyset on (created_at, id)"""
+        columns = [
+            QueryColumn("Date", audit_logs_all.c.created_at.label("created_at"),
+                        formatter=lambda r: r.created_at.strftime('%d/%m/%Y %H:%M') if r.created_at else "-"),
+            QueryColumn("Action", audit_logs_all.c.action.label("action"), sortable=False, roles={
+                Qt.BackgroundRole: lambda r: _action_color(r.action, 0),
+                Qt.ForegroundRole: lambda r: _action_color(r.action, 1),
+            }),
+            QueryColumn("Table", audit_logs_all.c.table_nom.label("table_nom"),
+                        formatter=lambda r: r.table_nom or "-", sortable=False),
+            QueryColumn("Entité", audit_logs_all.c.entite_id.label("entite_id"),
+                        formatter=lambda r: str(r.entite_id) if r.entite_id else "-", sortable=False),
+            # Only a short preview of the JSON payloads is transferred
+            QueryColumn("Détails", func.substr(audit_logs_all.c.donnees_avant, 1, APERCU_LONGUEUR).label("avant"),
+                        formatter=_details, sortable=False),
+        ]
+        return LazyQueryModel(
+            columns, audit_logs_all.c.id, self.build_query,
+            extra_expressions=[
+                func.substr(audit_logs_all.c.donnees_apres, 1, APERCU_LONGUEUR).label("apres")
+            ],
+            sort_column=0, sort_order=Qt.DescendingOrder,
+            prepare=lambda session: AuditArchiveService(session).attach_archives(), parent=self
+        )
+
+    def build_query(self):
+        """Build the filtered audit select (the model sets columns, order and paging)"""
+        query = select(audit_logs_all.c.id)
+
+        action = self.action_filter.currentText()
+        if action != "Toutes les actions":
+            query = query.where(audit_logs_all.c.action == action)
+
+        search_text = self.search_input.text().strip()
+        if search_text:
+            search_pattern = f"%{search_text}%"
+            query = query.where(
+                or_(
+                    audit_logs_all.c.action.ilike(search_pattern),
+                    audit_logs_all.c.table_nom.ilike(search_pattern),
+                    cast(audit_logs_all.c.entite_id, String).ilike(search_pattern),
+                    audit_logs_all.c.donnees_avant.ilike(search_pattern),
+                    audit_logs_all.c.donnees_apres.ilike(search_pattern)
+                )
+            )
+        return query
+
     def setup_connections(self):
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(self.load_data)
+
         self.btn_refresh.clicked.connect(self.load_data)
         self.search_input.textChanged.connect(self.on_filter)
-        self.action_filter.currentIndexChanged.connect(self.on_filter)
+        self.action_filter.currentIndexChanged.connect(self.load_data)
         self.load_data()
 
     def load_data(self):
         try:
-            db = get_database()
-            with db.session_scope() as session:
-                logs = session.query(AuditLog).order_by(AuditLog.created_at.desc()).all()
-                self.display_logs(logs)
+            self.model.refresh()
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement: {str(e)}")
 
-    def display_logs(self, logs: list):
-        self.table.setRowCount(0)
-        for log in logs:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            date_item = QTableWidgetItem(log.created_at.strftime('%d/%m/%Y %H:%M'))
-            date_item.setData(Qt.UserRole, log.created_at)
-            self.table.setItem(row, 0, date_item)
-
-            action_item = QTableWidgetItem(log.action)
-            if log.action == "CREATE":
-                action_item.setBackground(Qt.green)
-                action_item.setForeground(Qt.white)
-            elif log.action == "DELETE":
-                action_item.setBackground(Qt.red)
-                action_item.setForeground(Qt.white)
-            elif log.action == "UPDATE":
-                action_item.setBackground(Qt.yellow)
-                action_item.setForeground(Qt.black)
-            elif log.action == "RECEIPT_GENERATED":
-                action_item.setBackground(Qt.cyan)
-                action_item.setForeground(Qt.black)
-            self.table.setItem(row, 1, action_item)
-
-            self.table.setItem(row, 2, QTableWidgetItem(log.table_nom or "-"))
-            self.table.setItem(row, 3, QTableWidgetItem(str(log.entite_id) if log.entite_id else "-"))
-
-            details = ""
-            if log.donnees_avant:
-                details += f"Avant: {str(log.donnees_avant)[:50]}..."
-            if log.donnees_apres:
-                if details:
-                    details += "\n"
-                details += f"Après: {str(log.donnees_apres)[:50]}..."
-            self.table.setItem(row, 4, QTableWidgetItem(details if details else "-"))
-
-        self.table.resizeRowsToContents()
-
     def on_filter(self, text=None):
-        search_text = self.search_input.text().lower()
-        action_filter = self.action_filter.currentText()
-
-        for row in range(self.table.rowCount()):
-            match = True
-
-            if search_text:
-                row_text = ""
-                for col in range(self.table.columnCount()):
-                    item = self.table.item(row, col)
-                    if item:
-                        row_text += item.text().lower() + " "
-                if search_text not in row_text:
-                    match = False
-
-            if action_filter != "Toutes les actions":
-                action_item = self.table.item(row, 1)
-                if action_item and action_item.text() != action_filter:
-                    match = False
-
-            self.table.setRowHidden(row, not match)
+        """Re-run the query shortly after the user stops typing"""
+        self._search_timer.stop()
+        self._search_timer.start(300)
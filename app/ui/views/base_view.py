@@ -3,7 +3,7 @@
 Base view class for all entity views
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                               QPushButton, QTableWidget, QTableWidgetItem,
+                               QPushButton, QTableWidgetItem, QTableView,
                                QHeaderView, QLineEdit, QComboBox, QDateEdit,
                                QGroupBox, QFormLayout, QGridLayout, QMessageBox,
                                QToolBar, QSpacerItem, QSizePolicy, QMenu, QAbstractItemView)
@@ -11,11 +11,15 @@ from PySide6.QtCore import Qt, QSize, QTimer
 from PySide6.QtGui import QFont, QIcon, QAction, QKeyEvent
 from typing import Optional, List
 
+from app.ui.loader import DataLoader
+
 
 class BaseView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_window = parent
+        # Runs load_data queries off the UI thread
+        self.loader = DataLoader(self)
         self.setup_ui()
         QTimer.singleShot(100, self.setup_connections)
         
@@ -37,16 +41,16 @@ class BaseView(QWidget):
 class TableSelectionHelper:
     """
     Helper class to enable multi-selection, context menu, and keyboard delete
-    for entity table widgets.
+    for entity tables (QTableWidget or any QTableView whose column 0 holds the ID).
     """
 
-    def __init__(self, table: QTableWidget, parent_view: QWidget,
+    def __init__(self, table: QTableView, parent_view: QWidget,
                  on_edit_callback, on_delete_callback, entity_name: str = "élément"):
         """
         Initialize the helper for a table widget.
 
         Args:
-            table: The QTableWidget to enhance
+            table: The table view to enhance
             parent_view: The parent view widget (for showing dialogs)
             on_edit_callback: Function to call when editing (receives list of IDs)
             on_delete_callback: Function to call when deleting (receives list of IDs)
@@ -64,8 +68,8 @@ class TableSelectionHelper:
 
     def _setup_table(self):
         """Configure table for multi-selection."""
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.ExtendedSelection)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.ExtendedSelection)
         self.table.setFocusPolicy(Qt.StrongFocus)
 
     def _setup_context_menu(self):
@@ -82,20 +86,17 @@ class TableSelectionHelper:
         if event.key() == Qt.Key_Delete:
             self._handle_delete()
         else:
-            QTableWidget.keyPressEvent(self.table, event)
+            QTableView.keyPressEvent(self.table, event)
 
     def _get_selected_ids(self) -> List[int]:
         """Get list of selected row IDs from the table."""
-        selected_rows = set()
-        for item in self.table.selectedItems():
-            selected_rows.add(item.row())
-
+        model = self.table.model()
         ids = []
-        for row in selected_rows:
-            id_item = self.table.item(row, 0)
-            if id_item:
+        for index in self.table.selectionModel().selectedRows():
+            id_value = model.index(index.row(), 0).data()
+            if id_value is not None:
                 try:
-                    ids.append(int(id_item.text()))
+                    ids.append(int(id_value))
                 except ValueError:
                     continue
         return ids
@@ -11,19 +11,19 @@ from PySide6.QtCore import Qt
 from sqlalchemy import func
 from app.models.entities import contrat_bureau, Bureau, Immeuble, Contrat
 from app.ui.views.base_view import TableSelectionHelper
+from app.ui.loader import DataLoader
 from app.database.connection import get_database
 from app.repositories.bureau_repository import BureauRepository
-from app.services.document_service import DocumentService
-from app.ui.dialogs.tree_config_dialog import TreeConfigDialog
-from app.ui.dialogs.document_browser_dialog import DocumentBrowserDialog
 from typing import List
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
 
 
 class BureauView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_window = parent
+        # Runs load_data queries off the UI thread
+        self.loader = DataLoader(self)
         self.setup_ui()
         self.setup_connections()
         self.load_data()
@@ -54,7 +54,6 @@ class BureauView(QWidget):
         
         self.immeuble_combo = QComboBox()
         self.immeuble_combo.setMinimumWidth(200)
-        self.immeuble_combo.addItem("Tous les immeubles", None)
         filter_layout.addWidget(self.immeuble_combo)
         
         self.disponible_combo = QComboBox()
@@ -116,46 +115,67 @@ class BureauView(QWidget):
             on_delete_callback=self._on_delete_items,
             entity_name="bureau"
         )
+        from app.ui.change_notifier import ChangeNotifier
+        ChangeNotifier.get_instance().changed.connect(self.on_changes)
 
         self.load_immeubles()
         self.load_data()
         
+    def on_changes(self, changes):
+        """Reload when a commit changed bureaux, their immeuble names or their availability"""
+        from app.ui.change_notifier import touches
+        if self.isVisible() and touches(changes, "bureaux", "immeubles", "contrats"):
+            self.load_data()
+        
     def load_data(self):
-        try:
-            db = get_database()
+        """Read the filtered bureaux on a loader thread (cancelling a load in progress)"""
+        immeuble_id = self.immeuble_combo.currentData()
+        disponible = self.disponible_combo.currentData()
+        self.loader.load(
+            lambda session: self.fetch_rows(session, immeuble_id, disponible),
+            self.show_rows, self.on_load_error
+        )
+    
+    @staticmethod
+    def fetch_rows(session, immeuble_id, disponible):
+        """Table rows of the bureaux matching the filters, run by the loader"""
+        # Immeuble names and contracts are read for every row: loaded with the bureaux
+        query = session.query(Bureau).outerjoin(Immeuble).options(
+            contains_eager(Bureau.immeuble), selectinload(Bureau.contrats)
+        )
+        
+        if immeuble_id is not None:
+            query = query.filter(Bureau.immeuble_id == immeuble_id)
             
-            with db.session_scope() as session:
-                query = session.query(Bureau).outerjoin(Immeuble)
-                
-                immeuble_id = self.immeuble_combo.currentData()
-                if immeuble_id is not None:
-                    query = query.filter(Bureau.immeuble_id == immeuble_id)
-                    
-                disponible = self.disponible_combo.currentData()
-                if disponible is not None:
-                    if disponible:
-                        query = query.filter(~Bureau.contrats.any(Contrat.est_resilie == False))
-                    else:
-                        query = query.filter(Bureau.contrats.any(Contrat.est_resilie == False))
-                    
-                bureaux = query.order_by(Bureau.numero).all()
-                
-                self.table.setRowCount(len(bureaux))
-                
-                for row, bur in enumerate(bureaux):
-                    self.table.setItem(row, 0, QTableWidgetItem(str(bur.id)))
-                    self.table.setItem(row, 1, QTableWidgetItem(f"#{bur.numero}"))
-                    img_name = bur.immeuble.nom if bur.immeuble else "N/A"
-                    self.table.setItem(row, 2, QTableWidgetItem(img_name))
-                    self.table.setItem(row, 3, QTableWidgetItem(bur.etage or ""))
-                    self.table.setItem(row, 4, QTableWidgetItem(f"{bur.surface_m2} m²" if bur.surface_m2 else ""))
-                    
-                    est_disponible = not any(c.est_resilie == False for c in bur.contrats)
-                    self.table.setItem(row, 5, QTableWidgetItem("Oui" if est_disponible else "Non"))
-                    self.table.setItem(row, 6, QTableWidgetItem(bur.notes or ""))
-                    
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
+        if disponible is not None:
+            if disponible:
+                query = query.filter(~Bureau.contrats.any(Contrat.est_resilie == False))
+            else:
+                query = query.filter(Bureau.contrats.any(Contrat.est_resilie == False))
+        
+        rows = []
+        for bur in query.order_by(Bureau.numero).all():
+            est_disponible = not any(c.est_resilie == False for c in bur.contrats)
+            rows.append((
+                bur.id,
+                f"#{bur.numero}",
+                bur.immeuble.nom if bur.immeuble else "N/A",
+                bur.etage or "",
+                f"{bur.surface_m2} m²" if bur.surface_m2 else "",
+                "Oui" if est_disponible else "Non",
+                bur.notes or "",
+            ))
+        return rows
+    
+    def show_rows(self, rows):
+        self.table.setRowCount(len(rows))
+        
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(str(value)))
+    
+    def on_load_error(self, error):
+        QMessageBox.critical(self, "Erreur", f"Erreur: {str(error)}")
     
     def on_search(self, text: str):
         """Filter table rows based on search text matching any column"""
@@ -174,21 +194,14 @@ class BureauView(QWidget):
             
     def load_immeubles(self):
         try:
-            db = get_database()
-            with db.session_scope() as session:
-                immeubles = session.query(Immeuble).all()
-                self.immeuble_combo.clear()
-                self.immeuble_combo.addItem("Tous les immeubles", None)
-                for img in immeubles:
-                    self.immeuble_combo.addItem(img.nom, img.id)
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo
+            bind_combo(self.immeuble_combo, ReferenceData.get_instance().immeubles, "Tous les immeubles")
         except Exception as e:
             print(f"Erreur: {e}")
             
     def on_add(self):
         dialog = BureauDialog(self)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_immeubles()
-            self.load_data()
+        dialog.exec()
             
     def on_edit(self):
         selected = self.table.selectedItems()
@@ -197,8 +210,7 @@ class BureauView(QWidget):
             return
         item_id = int(self.table.item(selected[0].row(), 0).text())
         dialog = BureauDialog(self, item_id)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_data()
+        dialog.exec()
             
     def on_delete(self):
         selected = self.table.selectedItems()
@@ -226,8 +238,6 @@ class BureauView(QWidget):
                                 return
                         
                         repo.delete(bur)
-                self.load_immeubles()
-                self.load_data()
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", str(e))
 
@@ -235,8 +245,7 @@ class BureauView(QWidget):
         """Handle edit action from context menu or keyboard."""
         if len(item_ids) == 1:
             dialog = BureauDialog(self, item_ids[0])
-            if dialog.exec() == QDialog.Accepted:
-                self.load_data()
+            dialog.exec()
         else:
             QMessageBox.information(self, "Information",
                 "Veuillez sélectionner un seul bureau pour la modification.")
@@ -258,7 +267,7 @@ class BureauView(QWidget):
                 # Check for cascade deletions and warn user
                 total_contrats = 0
                 
-                with db.session_scope() as session:
+                with db.session_scope(readonly=True) as session:
                     for item_id in item_ids:
                         total_contrats += session.query(func.count(Contrat.id)).join(contrat_bureau).filter(contrat_bureau.c.bureau_id == item_id).scalar() or 0
                 
@@ -280,25 +289,26 @@ class BureauView(QWidget):
                         if bur:
                             repo.delete(bur)
 
-                self.load_immeubles()
-                self.load_data()
-
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur lors de la suppression: {str(e)}")
 
     def on_configure_tree(self):
         try:
+            from app.services.document_service import DocumentService
+            from app.ui.dialogs.tree_config_dialog import TreeConfigDialog
+
             db = get_database()
-            with db.session_scope() as session:
-                doc_service = DocumentService(session)
-                existing_config = doc_service.get_tree_config("bureau")
+            with db.session_scope(readonly=True) as session:
+                existing_config = DocumentService(session).get_tree_config("bureau")
 
-                dialog = TreeConfigDialog("bureau", existing_config, self)
-                # Connect the save signal to actually save the configuration
-                dialog.config_saved.connect(
-                    lambda entity_type, tree_structure: doc_service.save_tree_config(entity_type, tree_structure)
-                )
-                dialog.exec()
+            def save_tree_config(entity_type, tree_structure):
+                with db.session_scope() as session:
+                    DocumentService(session).save_tree_config(entity_type, tree_structure)
+
+            dialog = TreeConfigDialog("bureau", existing_config, self)
+            # Connect the save signal to actually save the configuration
+            dialog.config_saved.connect(save_tree_config)
+            dialog.exec()
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
@@ -316,6 +326,9 @@ class BureauView(QWidget):
         
     def show_document_browser(self, item_id, item_name):
         try:
+            from app.services.document_service import DocumentService
+            from app.ui.dialogs.document_browser_dialog import DocumentBrowserDialog
+
             db = get_database()
             with db.session_scope() as session:
                 doc_service = DocumentService(session)
@@ -387,22 +400,15 @@ class BureauDialog(QDialog):
         
     def load_immeubles(self):
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Immeuble
-            db = get_database()
-            with db.session_scope() as session:
-                immeubles = session.query(Immeuble).all()
-                self.immeuble_combo.clear()
-                self.immeuble_combo.addItem("", None)
-                for img in immeubles:
-                    self.immeuble_combo.addItem(img.nom, img.id)
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo
+            bind_combo(self.immeuble_combo, ReferenceData.get_instance().immeubles)
         except Exception as e:
             print(f"Erreur: {e}")
             
     def load_data(self):
         try:
             db = get_database()
-            with db.session_scope() as session:
+            with db.session_scope(readonly=True) as session:
                 bur = session.query(Bureau).get(self.bureau_id)
                 if bur:
                     idx = self.immeuble_combo.findData(bur.immeuble_id)
@@ -3,22 +3,22 @@
 Contrat management view with red/green payment grid
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QPushButton, QTableWidget, QTableWidgetItem,
+                               QPushButton, QTableView,
                                QHeaderView, QLineEdit, QMessageBox, QGroupBox,
                                QFormLayout, QGridLayout, QTextEdit, QComboBox,
                                QDateEdit, QDoubleSpinBox, QListWidget, QListWidgetItem,
                                QScrollArea, QFrame, QCheckBox)
-from PySide6.QtCore import Qt, Signal, QSize, QDate
+from PySide6.QtCore import Qt, QSize, QDate
 from PySide6.QtGui import QFont, QColor
 from PySide6.QtWidgets import QCompleter
 
 from typing import List
 
 from app.ui.views.base_view import BaseView, TableSelectionHelper
+from app.ui.widgets.lazy_table_model import LazyQueryModel, QueryColumn
 
 
 class ContratView(BaseView):
-    data_changed = Signal()
     _is_loading = False
     
     def setup_ui(self):
@@ -50,13 +50,11 @@ class ContratView(BaseView):
         # Immeuble filter
         self.immeuble_filter = QComboBox()
         self.immeuble_filter.setMinimumWidth(180)
-        self.immeuble_filter.addItem("Tous les immeubles", None)
         filter_layout.addWidget(self.immeuble_filter)
         
         # Locataire filter
         self.locataire_combo = QComboBox()
         self.locataire_combo.setMinimumWidth(200)
-        self.locataire_combo.addItem("Tous les locataires", None)
         filter_layout.addWidget(self.locataire_combo)
         
         # Statut filter
@@ -80,14 +78,18 @@ class ContratView(BaseView):
         left_title.setObjectName("section_title")
         left_layout.addWidget(left_title)
         
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["ID", "Locataire", "Bureaux", "Date Début", "Mensuel", "Statut"])
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.model = self.create_model()
+        
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.horizontalHeader().setSortIndicator(3, Qt.DescendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
         self.table.verticalHeader().setVisible(False)
-        self.table.setFrameShape(QTableWidget.NoFrame)
+        self.table.setFrameShape(QTableView.NoFrame)
         self.table.horizontalHeader().setStretchLastSection(True)
         left_layout.addWidget(self.table)
         
@@ -151,16 +153,17 @@ class ContratView(BaseView):
         self.btn_delete.clicked.connect(self.on_delete)
         self.btn_configure_tree.clicked.connect(self.on_configure_tree)
         self.btn_browse_docs.clicked.connect(self.on_browse_documents)
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
-        self.table.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.table.doubleClicked.connect(self.on_item_double_clicked)
         # Filter connections - two-way correlation between immeuble and locataire
         self.immeuble_filter.currentIndexChanged.connect(self.on_immeuble_changed)
         self.locataire_combo.currentIndexChanged.connect(self.on_locataire_changed)
         self.statut_combo.currentIndexChanged.connect(self.load_data)
         # Search with debounce - text change triggers load_data after short delay
         self.search_edit.textChanged.connect(self.on_search_text_changed)
-        # Connect data changed signals to auto-refresh
-        self.data_changed.connect(self.refresh_current_contract_details)
+        # Committed changes patch the table and the details
+        from app.ui.change_notifier import ChangeNotifier
+        ChangeNotifier.get_instance().changed.connect(self.on_changes)
         
         # Initialize table selection helper for multi-selection support
         self.table_helper = TableSelectionHelper(
@@ -170,163 +173,161 @@ class ContratView(BaseView):
             entity_name="contrat"
         )
         
+    def create_model(self):
+        """Create the lazily fetched contracts model (SQL-side sorting and paging)"""
+        from app.models.entities import Contrat, Locataire, Bureau, contrat_bureau
+        from sqlalchemy import select, func
+        
+        # Bureau numbers are aggregated in SQL rather than loaded through Contrat.bureaux
+        bureaux = select(func.aggregate_strings(Bureau.numero, ", ")).join(
+            contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
+        ).where(
+            contrat_bureau.c.contrat_id == Contrat.id
+        ).scalar_subquery()
+        
+        columns = [
+            QueryColumn("ID", Contrat.id.label("id")),
+            QueryColumn("Locataire", Locataire.nom.label("locataire")),
+            QueryColumn("Bureaux", bureaux.label("bureaux"),
+                        formatter=lambda r: r.bureaux or "Aucun", sortable=False),
+            QueryColumn("Date Début", Contrat.date_debut.label("date_debut")),
+            QueryColumn("Mensuel", Contrat.montant_mensuel.label("montant_mensuel"),
+                        formatter=lambda r: f"{r.montant_mensuel} TND"),
+            QueryColumn("Statut", Contrat.est_resilie.label("est_resilie"),
+                        formatter=lambda r: "Résilié" if r.est_resilie else "Actif"),
+        ]
+        return LazyQueryModel(
+            columns, Contrat.id, self.build_query,
+            sort_column=3, sort_order=Qt.DescendingOrder, parent=self
+        )
+    
+    def build_query(self):
+        """Build the filtered contracts select (the model sets columns, order and paging)"""
+        from app.models.entities import Contrat, Locataire, Bureau, Immeuble, contrat_bureau
+        from app.database.connection import get_database
+        from app.database.search_index import search_ids
+        from sqlalchemy import select, or_, cast, String
+        
+        query = select(Contrat.id).join(Locataire, Contrat.locataire_id == Locataire.id)
+        
+        # Apply immeuble filter (exists, so a contract with several bureaux appears once)
+        immeuble_id = self.immeuble_filter.currentData()
+        if immeuble_id:
+            in_immeuble = select(Bureau.id).join(
+                contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
+            ).where(
+                contrat_bureau.c.contrat_id == Contrat.id,
+                Bureau.immeuble_id == immeuble_id
+            ).exists()
+            query = query.where(in_immeuble)
+        
+        # Apply locataire filter
+        loc_id = self.locataire_combo.currentData()
+        if loc_id:
+            query = query.where(Contrat.locataire_id == loc_id)
+            
+        # Apply statut filter
+        statut_value = self.statut_combo.currentData()
+        if statut_value == "actif":
+            query = query.where(Contrat.est_resilie == False)
+        elif statut_value == "resilie":
+            query = query.where(Contrat.est_resilie == True)
+        
+        # Apply search filter (case-insensitive search across multiple fields)
+        search_text = self.search_edit.text().strip().lower()
+        if search_text:
+            # The model runs the query on a reader: its dialect picks the search index
+            engine = get_database().read_engine
+            # Create exists subqueries to search in related tables without complex joins
+            # Search in bureaux numbers (full-text index)
+            has_matching_bureau = select(Bureau.id).join(
+                contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
+            ).where(
+                contrat_bureau.c.contrat_id == Contrat.id,
+                Bureau.id.in_(search_ids(engine, Bureau, search_text, ("numero",)))
+            ).exists()
+            
+            # Search in immeuble names through bureaux
+            has_matching_immeuble = select(Bureau.id).join(
+                contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
+            ).where(
+                contrat_bureau.c.contrat_id == Contrat.id,
+                Bureau.immeuble_id.in_(search_ids(engine, Immeuble, search_text, ("nom",)))
+            ).exists()
+            
+            conditions = [
+                Contrat.locataire_id.in_(search_ids(engine, Locataire, search_text, ("nom",))),
+                has_matching_bureau,
+                has_matching_immeuble
+            ]
+            # The contract id is only compared when a number is typed
+            if search_text.isdigit():
+                conditions.append(cast(Contrat.id, String).ilike(f"%{search_text}%"))
+            query = query.where(or_(*conditions))
+        return query
+    
     def load_data(self):
         if self._is_loading:
             return
         self._is_loading = True
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Contrat, Locataire, Bureau, Immeuble, contrat_bureau
-            from sqlalchemy import or_, func, String
-            from sqlalchemy.orm import joinedload
-            
-            db = get_database()
-            
-            with db.session_scope() as session:
-                query = session.query(Contrat).options(
-                    joinedload(Contrat.locataire), 
-                    joinedload(Contrat.bureaux).joinedload(Bureau.immeuble)
-                ).join(Locataire)
-                
-                # Apply immeuble filter
-                immeuble_id = self.immeuble_filter.currentData()
-                if immeuble_id:
-                    query = query.join(Contrat.bureaux).filter(Bureau.immeuble_id == immeuble_id)
-                
-                # Apply locataire filter
-                loc_id = self.locataire_combo.currentData()
-                if loc_id:
-                    query = query.filter(Contrat.locataire_id == loc_id)
-                    
-                # Apply statut filter
-                statut_value = self.statut_combo.currentData()
-                if statut_value == "actif":
-                    query = query.filter(Contrat.est_resilie == False)
-                elif statut_value == "resilie":
-                    query = query.filter(Contrat.est_resilie == True)
-                
-                # Apply search filter (case-insensitive search across multiple fields)
-                search_text = self.search_edit.text().strip().lower()
-                if search_text:
-                    search_pattern = f"%{search_text}%"
-                    # Create exists subqueries to search in related tables without complex joins
-                    # Search in bureaux numbers
-                    has_matching_bureau = session.query(Bureau.id).join(
-                        contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
-                    ).filter(
-                        contrat_bureau.c.contrat_id == Contrat.id
-                    ).filter(
-                        Bureau.numero.ilike(search_pattern)
-                    ).exists()
-                    
-                    # Search in immeuble names through bureaux
-                    has_matching_immeuble = session.query(Bureau.id).join(
-                        contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
-                    ).join(
-                        Immeuble, Bureau.immeuble_id == Immeuble.id
-                    ).filter(
-                        contrat_bureau.c.contrat_id == Contrat.id
-                    ).filter(
-                        Immeuble.nom.ilike(search_pattern)
-                    ).exists()
-                    
-                    query = query.filter(
-                        or_(
-                            Locataire.nom.ilike(search_pattern),
-                            has_matching_bureau,
-                            has_matching_immeuble,
-                            func.cast(Contrat.id, String).ilike(search_pattern)
-                        )
-                    )
-                    
-                contrats = query.order_by(Contrat.date_debut.desc()).all()
-                
-                self.table.setRowCount(len(contrats))
-                
-                for row, ctr in enumerate(contrats):
-                    self.table.setItem(row, 0, QTableWidgetItem(str(ctr.id)))
-                    self.table.setItem(row, 1, QTableWidgetItem(ctr.locataire.nom if ctr.locataire else "N/A"))
-                    
-                    nums = ", ".join([b.numero for b in ctr.bureaux]) if ctr.bureaux else "Aucun"
-                    self.table.setItem(row, 2, QTableWidgetItem(nums))
-                    
-                    self.table.setItem(row, 3, QTableWidgetItem(str(ctr.date_debut)))
-                    self.table.setItem(row, 4, QTableWidgetItem(f"{ctr.montant_mensuel} TND"))
-                    self.table.setItem(row, 5, QTableWidgetItem("Résilié" if ctr.est_resilie else "Actif"))
-                    
-                    for col in range(6):
-                        self.table.item(row, col).setFlags(
-                            Qt.ItemIsSelectable | Qt.ItemIsEnabled
-                        )
-                        
-                self.load_immeubles()
-                self.load_locataires()
-                
+            self.model.refresh()
+            self.load_immeubles()
+            self.load_locataires()
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
         finally:
             self._is_loading = False
+    
+    def on_changes(self, changes):
+        """Patch the contracts a commit changed (the view reloads when shown)"""
+        if not self.isVisible():
+            return
+        from app.models.entities import Contrat, contrat_bureau
+        from app.ui.change_notifier import touches
+        from sqlalchemy import select
+        
+        # Rows show the locataire name and the bureau numbers
+        self.model.apply_entity_changes(changes, "contrats", {
+            "locataires": Contrat.locataire_id,
+            "bureaux": lambda ids: Contrat.id.in_(
+                select(contrat_bureau.c.contrat_id).where(contrat_bureau.c.bureau_id.in_(ids))
+            ),
+        })
+        current = self._current_contrat_id
+        if current is not None and (
+                touches(changes, "paiements", "locataires", "bureaux")
+                or any(c.entity == "contrats" and (current in c.ids or not c.ids) for c in changes)):
+            self.refresh_current_contract_details()
+    
+    def selected_id(self):
+        """Get the id of the first selected contract, or None"""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.model.row_id(rows[0].row())
             
     def load_immeubles(self):
-        """Load all immeubles into the filter combo"""
+        """Bind the immeuble filter to the shared immeubles model"""
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Immeuble
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo
             
-            db = get_database()
-            with db.session_scope() as session:
-                immeubles = session.query(Immeuble).order_by(Immeuble.nom).all()
-                
-                current_data = self.immeuble_filter.currentData()
-                self.immeuble_filter.blockSignals(True)
-                self.immeuble_filter.clear()
-                self.immeuble_filter.addItem("Tous les immeubles", None)
-                
-                for imm in immeubles:
-                    self.immeuble_filter.addItem(imm.nom, imm.id)
-                    
-                if current_data is not None:
-                    idx = self.immeuble_filter.findData(current_data)
-                    if idx >= 0:
-                        self.immeuble_filter.setCurrentIndex(idx)
-                self.immeuble_filter.blockSignals(False)
-                        
+            bind_combo(self.immeuble_filter, ReferenceData.get_instance().immeubles, "Tous les immeubles")
         except Exception as e:
             print(f"Erreur load_immeubles: {e}")
     
     def load_locataires(self, immeuble_id=None):
-        """Load locataires into the filter combo. If immeuble_id is provided, only show locataires with contracts in that immeuble."""
+        """Show locataires in the filter combo. If immeuble_id is provided, only show locataires with contracts in that immeuble."""
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Locataire, Contrat, Bureau
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo, filter_combo
             
-            db = get_database()
-            with db.session_scope() as session:
-                current_data = self.locataire_combo.currentData()
-                self.locataire_combo.blockSignals(True)
-                self.locataire_combo.clear()
-                self.locataire_combo.addItem("Tous les locataires", None)
-                
-                if immeuble_id:
-                    # Get distinct locataires who have contracts in this immeuble
-                    locs = session.query(Locataire).join(Contrat).join(Contrat.bureaux).filter(
-                        Bureau.immeuble_id == immeuble_id
-                    ).distinct().order_by(Locataire.nom).all()
-                else:
-                    # Get all locataires
-                    locs = session.query(Locataire).order_by(Locataire.nom).all()
-                
-                for loc in locs:
-                    self.locataire_combo.addItem(loc.nom, loc.id)
-                    
-                # Restore selection if still valid
-                if current_data is not None:
-                    idx = self.locataire_combo.findData(current_data)
-                    if idx >= 0:
-                        self.locataire_combo.setCurrentIndex(idx)
-                
-                self.locataire_combo.blockSignals(False)
-                        
+            reference = ReferenceData.get_instance()
+            bind_combo(self.locataire_combo, reference.locataires, "Tous les locataires")
+            if immeuble_id:
+                ids = reference.locataire_ids_in_immeuble(immeuble_id)
+                filter_combo(self.locataire_combo, lambda r: r["id"] in ids)
+            else:
+                filter_combo(self.locataire_combo, None)
         except Exception as e:
             print(f"Erreur load_locataires: {e}")
     
@@ -345,38 +346,17 @@ class ContratView(BaseView):
         self.load_data()
     
     def load_immeubles_for_locataire(self, locataire_id=None):
-        """Load immeubles into the filter combo. If locataire_id is provided, only show immeubles where that locataire has contracts."""
+        """Show immeubles in the filter combo. If locataire_id is provided, only show immeubles where that locataire has contracts."""
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Immeuble, Contrat, Bureau
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo, filter_combo
             
-            db = get_database()
-            with db.session_scope() as session:
-                current_data = self.immeuble_filter.currentData()
-                self.immeuble_filter.blockSignals(True)
-                self.immeuble_filter.clear()
-                self.immeuble_filter.addItem("Tous les immeubles", None)
-                
-                if locataire_id:
-                    # Get distinct immeubles where this locataire has contracts
-                    immeubles = session.query(Immeuble).join(Bureau).join(Contrat.bureaux).filter(
-                        Contrat.locataire_id == locataire_id
-                    ).distinct().order_by(Immeuble.nom).all()
-                else:
-                    # Get all immeubles
-                    immeubles = session.query(Immeuble).order_by(Immeuble.nom).all()
-                
-                for imm in immeubles:
-                    self.immeuble_filter.addItem(imm.nom, imm.id)
-                    
-                # Restore selection if still valid
-                if current_data is not None:
-                    idx = self.immeuble_filter.findData(current_data)
-                    if idx >= 0:
-                        self.immeuble_filter.setCurrentIndex(idx)
-                
-                self.immeuble_filter.blockSignals(False)
-                        
+            reference = ReferenceData.get_instance()
+            bind_combo(self.immeuble_filter, reference.immeubles, "Tous les immeubles")
+            if locataire_id:
+                ids = reference.immeuble_ids_of_locataire(locataire_id)
+                filter_combo(self.immeuble_filter, lambda r: r["id"] in ids)
+            else:
+                filter_combo(self.immeuble_filter, None)
         except Exception as e:
             print(f"Erreur load_immeubles_for_locataire: {e}")
     
@@ -392,46 +372,19 @@ class ContratView(BaseView):
         self._search_timer.stop()
         self._search_timer.start(300)
             
-    def load_impayes(self, contrat_id, label, list_widget, date_debut, est_resilie, date_resiliation):
+    def load_impayes(self, contrat_id, label, list_widget):
         try:
             from app.database.connection import get_database
-            from app.models.entities import Contrat, Paiement, TypePaiement
-            from datetime import date
+            from app.services.arrears_service import ArrearsService
             
             db = get_database()
             
-            with db.session_scope() as session:
-                paiements = session.query(Paiement).filter(
-                    Paiement.contrat_id == contrat_id,
-                    Paiement.type_paiement == TypePaiement.LOYER
-                ).all()
-                
-                mois_payes = set()
-                for p in paiements:
-                    mois = p.get_mois_couverts()
-                    mois_payes.update(mois)
+            with db.session_scope(readonly=True) as session:
+                mois_impayes = ArrearsService(session).compute([contrat_id])[contrat_id]
                 
                 mois_noms = ["Janvier", "Février", "Mars", "Avril", "Mai", "Juin",
                              "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre"]
                 
-                mois_impayes = []
-                
-                if date_debut:
-                    start_year, start_month = date_debut.year, date_debut.month
-                    end_year, end_month = date.today().year, date.today().month
-                    
-                    if est_resilie and date_resiliation:
-                        end_year, end_month = date_resiliation.year, date_resiliation.month
-                    
-                    year, month = start_year, start_month
-                    while (year < end_year) or (year == end_year and month <= end_month):
-                        if (year, month) not in mois_payes:
-                            mois_impayes.append((year, month))
-                        month += 1
-                        if month > 12:
-                            month = 1
-                            year += 1
-                
                 count = len(mois_impayes)
                 if count > 0:
                     label.setText(f"<u>Mois impayés: {count}</u>")
@@ -454,27 +407,26 @@ class ContratView(BaseView):
             from app.models.entities import Contrat
             
             db = get_database()
-            with db.session_scope() as session:
+            with db.session_scope(readonly=True) as session:
                 ctr = session.query(Contrat).get(contrat_id)
                 if ctr:
                     current_height = list_widget.maximumHeight()
                     if current_height == 0:
                         list_widget.setMaximumHeight(150)
-                        self.load_impayes(contrat_id, label, list_widget, ctr.date_debut, ctr.est_resilie, ctr.date_resiliation)
+                        self.load_impayes(contrat_id, label, list_widget)
                     else:
                         list_widget.setMaximumHeight(0)
         except Exception as e:
             print(f"Erreur toggle: {e}")
             
     def on_selection_changed(self):
-        selected = self.table.selectedItems()
-        self.btn_browse_docs.setEnabled(bool(selected))
-        if not selected:
+        item_id = self.selected_id()
+        self.btn_browse_docs.setEnabled(item_id is not None)
+        if item_id is None:
             self.clear_details()
             self._current_contrat_id = None
             return
              
-        item_id = int(self.table.item(selected[0].row(), 0).text())
         self._current_contrat_id = item_id
         self.show_details(item_id)
         
@@ -500,12 +452,13 @@ class ContratView(BaseView):
         self.clear_details()
         try:
             from app.database.connection import get_database
-            from app.models.entities import Contrat, Paiement, TypePaiement
+            from app.models.entities import Contrat
+            from app.repositories.paiement_repository import PaiementRepository
             from datetime import datetime
             
             db = get_database()
             
-            with db.session_scope() as session:
+            with db.session_scope(readonly=True) as session:
                 ctr = session.query(Contrat).get(contrat_id)
                 if not ctr:
                     return
@@ -564,7 +517,7 @@ class ContratView(BaseView):
                 impayes_list.setStyleSheet("background-color: #f8f9fa; border-radius: 4px;")
                 self.detail_layout.addWidget(impayes_list)
                 
-                self.load_impayes(contrat_id, mois_impayes_label, impayes_list, ctr.date_debut, ctr.est_resilie, ctr.date_resiliation)
+                self.load_impayes(contrat_id, mois_impayes_label, impayes_list)
                 
                 grid_label = QLabel(f"\nGrille des Paiements:")
                 grid_label.setStyleSheet("font-weight: bold; margin-top: 15px;")
@@ -577,15 +530,7 @@ class ContratView(BaseView):
                 scroll_area.setMinimumHeight(120)
                 scroll_area.setStyleSheet("QScrollArea { border: none; background: transparent; }")
                 
-                paiements = session.query(Paiement).filter(
-                    Paiement.contrat_id == contrat_id,
-                    Paiement.type_paiement == TypePaiement.LOYER
-                ).all()
-                
-                mois_payes = set()
-                for p in paiements:
-                    mois = p.get_mois_couverts()
-                    mois_payes.update(mois)
+                mois_payes = PaiementRepository(session).get_mois_payes(contrat_id)
                     
                 grid_widget = self.create_grid_widget(ctr, mois_payes, current_year, current_month)
                 scroll_area.setWidget(grid_widget)
@@ -698,30 +643,22 @@ class ContratView(BaseView):
         
     def on_add(self):
         dialog = ContratDialog(self)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_data()
-            self.data_changed.emit()
+        dialog.exec()
             
     def on_edit(self):
-        selected = self.table.selectedItems()
-        if not selected:
+        item_id = self.selected_id()
+        if item_id is None:
             QMessageBox.warning(self, "Sélection", "Veuillez sélectionner un contrat")
             return
-            
-        item_id = int(self.table.item(selected[0].row(), 0).text())
         
         dialog = ContratDialog(self, contrat_id=item_id)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_data()
-            self.data_changed.emit()
+        dialog.exec()
             
     def on_delete(self):
-        selected = self.table.selectedItems()
-        if not selected:
+        item_id = self.selected_id()
+        if item_id is None:
             QMessageBox.warning(self, "Sélection", "Veuillez sélectionner un contrat")
             return
-            
-        item_id = int(self.table.item(selected[0].row(), 0).text())
         
         reply = QMessageBox.question(self, "Confirmation", 
                                     "Êtes-vous sûr de vouloir supprimer ce contrat?",
@@ -729,7 +666,7 @@ class ContratView(BaseView):
         if reply == QMessageBox.Yes:
             try:
                 from app.database.connection import get_database
-                from app.models.entities import Contrat, Paiement, Locataire, StatutLocataire
+                from app.models.entities import Contrat, Locataire, StatutLocataire
                 from app.repositories.contrat_repository import ContratRepository
                 from sqlalchemy import func
                 
@@ -749,9 +686,6 @@ class ContratView(BaseView):
                             loc_repo = session.query(Locataire).get(loc_id)
                             if loc_repo:
                                 loc_repo.statut = StatutLocataire.HISTORIQUE
-                                
-                self.load_data()
-                self.data_changed.emit()
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
                 
@@ -759,9 +693,7 @@ class ContratView(BaseView):
         """Handle edit action from context menu or keyboard."""
         if len(item_ids) == 1:
             dialog = ContratDialog(self, contrat_id=item_ids[0])
-            if dialog.exec() == QDialog.Accepted:
-                self.load_data()
-                self.data_changed.emit()
+            dialog.exec()
         else:
             QMessageBox.information(self, "Information", 
                 "Veuillez sélectionner un seul contrat pour la modification.")
@@ -805,17 +737,13 @@ class ContratView(BaseView):
                                 if loc:
                                     loc.statut = StatutLocataire.HISTORIQUE
 
-                self.load_data()
-                self.data_changed.emit()
-
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
         
-    def on_item_double_clicked(self, item):
-        """Handle double-click on contract table item"""
-        if item:
-            row = item.row()
-            item_id = int(self.table.item(row, 0).text())
+    def on_item_double_clicked(self, index):
+        """Handle double-click on contract table row"""
+        item_id = self.model.row_id(index.row())
+        if item_id is not None:
             self.show_details(item_id)
             
     def refresh_current_contract_details(self):
@@ -830,27 +758,26 @@ class ContratView(BaseView):
             from app.ui.dialogs.tree_config_dialog import TreeConfigDialog
 
             db = get_database()
-            with db.session_scope() as session:
-                doc_service = DocumentService(session)
-                existing_config = doc_service.get_tree_config("contrat")
+            with db.session_scope(readonly=True) as session:
+                existing_config = DocumentService(session).get_tree_config("contrat")
 
-                dialog = TreeConfigDialog("contrat", existing_config, self)
-                # Connect the save signal to actually save the configuration
-                dialog.config_saved.connect(
-                    lambda entity_type, tree_structure: doc_service.save_tree_config(entity_type, tree_structure)
-                )
-                dialog.exec()
+            def save_tree_config(entity_type, tree_structure):
+                with db.session_scope() as session:
+                    DocumentService(session).save_tree_config(entity_type, tree_structure)
+
+            dialog = TreeConfigDialog("contrat", existing_config, self)
+            # Connect the save signal to actually save the configuration
+            dialog.config_saved.connect(save_tree_config)
+            dialog.exec()
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
             
     def on_browse_documents(self):
-        selected = self.table.selectedItems()
-        if not selected:
+        item_id = self.selected_id()
+        if item_id is None:
             QMessageBox.warning(self, "Sélection", "Veuillez sélectionner un contrat pour consulter ses documents.")
             return
-            
-        item_id = int(self.table.item(selected[0].row(), 0).text())
         item_name = f"Contrat #{item_id}"
         
         self.show_document_browser(item_id, item_name)
@@ -1023,67 +950,32 @@ class ContratDialog(QDialog):
         
     def load_locataires(self):
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Locataire
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo
             
-            db = get_database()
-            with db.session_scope() as session:
-                locs = session.query(Locataire).all()
-                
-                self.locataire_combo.clear()
-                self.locataire_combo.addItem("", None)
-                
-                for loc in locs:
-                    self.locataire_combo.addItem(f"{loc.nom} ({loc.raison_sociale or loc.cin})", loc.id)
-                    
+            bind_combo(self.locataire_combo, ReferenceData.get_instance().locataires,
+                       label=lambda r: f"{r['nom']} ({r['raison_sociale'] or r['cin']})")
         except Exception as e:
             print(f"Erreur: {e}")
             
     def load_bureaux(self):
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Bureau, Immeuble, Contrat
-            from sqlalchemy.orm import joinedload
+            from app.ui.widgets.reference_models import ReferenceData
             
-            db = get_database()
-            with db.session_scope() as session:
-                if self.contrat_id:
-                    ctr = session.query(Contrat).get(self.contrat_id)
-                    if ctr:
-                        existing_bureau_ids = [b.id for b in ctr.bureaux]
-                        
-                        active_bureaux = session.query(Bureau).options(
-                            joinedload(Bureau.immeuble)
-                        ).filter(
-                            ~Bureau.contrats.any(Contrat.est_resilie == False)
-                        ).order_by(Bureau.numero).all()
-                        
-                        existing_bureaux = session.query(Bureau).options(
-                            joinedload(Bureau.immeuble)
-                        ).filter(Bureau.id.in_(existing_bureau_ids)).all()
-                        
-                        all_bureaux = active_bureaux + existing_bureaux
-                    else:
-                        all_bureaux = []
-                else:
-                    all_bureaux = session.query(Bureau).options(
-                        joinedload(Bureau.immeuble)
-                    ).filter(
-                        ~Bureau.contrats.any(Contrat.est_resilie == False)
-                    ).order_by(Bureau.numero).all()
-                
-                self.bureaux_list.clear()
-                existing_ids = set()
-                
-                for bur in all_bureaux:
-                    if bur.id in existing_ids:
-                        continue
-                    existing_ids.add(bur.id)
-                    
-                    img_name = bur.immeuble.nom if bur.immeuble else "N/A"
-                    item = QListWidgetItem(f"#{bur.numero} - {img_name} ({bur.surface_m2 or 0} m²)")
-                    item.setData(Qt.UserRole, bur.id)
-                    self.bureaux_list.addItem(item)
+            reference = ReferenceData.get_instance()
+            # Free bureaux, plus those of the edited contract
+            unavailable = reference.occupied_bureau_ids()
+            if self.contrat_id:
+                ctr = reference.contrats.record(self.contrat_id)
+                if ctr:
+                    unavailable -= ctr["bureau_ids"]
+            
+            self.bureaux_list.clear()
+            for bur in reference.bureaux.records():
+                if bur["id"] in unavailable:
+                    continue
+                item = QListWidgetItem(reference.bureau_label(bur))
+                item.setData(Qt.UserRole, bur["id"])
+                self.bureaux_list.addItem(item)
                     
         except Exception as e:
             print(f"Erreur: {e}")
@@ -1094,7 +986,7 @@ class ContratDialog(QDialog):
             from app.models.entities import Contrat
             
             db = get_database()
-            with db.session_scope() as session:
+            with db.session_scope(readonly=True) as session:
                 ctr = session.query(Contrat).get(self.contrat_id)
                 if ctr:
                     idx = self.locataire_combo.findData(ctr.locataire_id)
@@ -2,17 +2,14 @@
 """
 Dashboard view for Gestion Locative Pro - Building payment grids
 """
-from datetime import date
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QPushButton, QScrollArea, QFrame, QGridLayout,
-                               QComboBox)
+                               QPushButton, QScrollArea, QFrame, QComboBox)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
 
 from app.ui.views.base_view import BaseView
-from app.models.entities import Paiement, TypePaiement, Immeuble, Contrat, Bureau
-from app.database.connection import get_database
-from sqlalchemy.orm import joinedload
+from app.services.dashboard_service import DashboardService
+from app.ui.widgets.payment_grid import PaiementGridView
 
 
 class DashboardView(BaseView):
@@ -55,43 +52,67 @@ class DashboardView(BaseView):
         self.scroll_area.setWidget(self.content_widget)
         main_layout.addWidget(self.scroll_area)
         
+        self._cartes = {}
+        self._cles_cartes = None
+        self._donnees = None
+        
     def setup_connections(self):
         self.statut_combo.currentIndexChanged.connect(self.load_data)
+        from app.ui.change_notifier import ChangeNotifier
+        ChangeNotifier.get_instance().changed.connect(self.on_changes)
         self.load_data()
         
     def load_data(self):
-        try:
-            while self.content_layout.count():
-                item = self.content_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-                elif item.layout():
-                    self.clear_layout(item.layout())
-            
-            db = get_database()
-            
-            statut_value = self.statut_combo.currentData()
-            
-            with db.session_scope() as session:
-                immeuble_list = session.query(Immeuble).options(
-                    joinedload(Immeuble.bureaux).joinedload(Bureau.contrats).joinedload(Contrat.locataire)
-                ).order_by(Immeuble.nom).all()
-                
-                if not immeuble_list:
-                    label = QLabel("Aucun immeuble trouvé")
-                    label.setStyleSheet("padding: 20px; color: #7f8c8d; font-style: italic;")
-                    self.content_layout.addWidget(label)
-                else:
-                    for img in immeuble_list:
-                        card = self.create_card(img, session, statut_value)
-                        self.content_layout.addWidget(card)
-            
-            self.content_layout.addStretch()
-            
-        except Exception as e:
-            print(f"Erreur: {e}")
-            import traceback
-            traceback.print_exc()
+        """Read the grid state on a loader thread (cancelling a load in progress)"""
+        statut_value = self.statut_combo.currentData()
+        self.loader.load(
+            lambda session: DashboardService(session).load(statut_value),
+            self.show_donnees, self.on_load_error
+        )
+    
+    def show_donnees(self, donnees):
+        # Cards are only rebuilt when the set of immeubles changes,
+        # otherwise each grid model updates its changed cells in place
+        cles = [(img["id"], img["nom"], img["adresse"]) for img in donnees["immeubles"]]
+        if cles != self._cles_cartes:
+            self.rebuild_cards(donnees["immeubles"])
+            self._cles_cartes = cles
+        
+        for img in donnees["immeubles"]:
+            self.update_card(self._cartes[img["id"]], img, donnees["mois"], donnees["payes"])
+        self._donnees = donnees
+    
+    def on_load_error(self, error):
+        print(f"Erreur: {error}")
+    
+    def on_changes(self, changes):
+        """Update the cards a commit changed (the view reloads when shown)"""
+        from app.ui.change_notifier import touches
+        
+        if not self.isVisible():
+            return
+        if touches(changes, "immeubles", "bureaux", "contrats", "locataires"):
+            self.load_data()
+        elif touches(changes, "paiements", "paiement_mois"):
+            self.refresh_payes()
+    
+    def refresh_payes(self):
+        """Read the paid months again, updating only the cards whose contracts changed"""
+        if self._donnees is None or self.loader.is_loading:
+            self.load_data()
+            return
+        donnees = self._donnees
+        contrat_ids = list(donnees["payes"])
+        self.loader.load(
+            lambda session: DashboardService(session).payes(contrat_ids, donnees["mois"], donnees["statut"]),
+            lambda payes: self.show_payes(donnees, payes), self.on_load_error
+        )
+    
+    def show_payes(self, donnees, payes):
+        for img in donnees["immeubles"]:
+            if any(payes[c["id"]] != donnees["payes"][c["id"]] for c in img["contrats"]):
+                self.update_card(self._cartes[img["id"]], img, donnees["mois"], payes)
+        donnees["payes"] = payes
             
     def clear_layout(self, layout):
         while layout.count():
@@ -101,133 +122,59 @@ class DashboardView(BaseView):
             elif item.layout():
                 self.clear_layout(item.layout())
                 
-    def create_card(self, immeuble, session, statut_filter=None):
+    def rebuild_cards(self, immeubles):
+        self.clear_layout(self.content_layout)
+        self._cartes = {}
+        
+        if not immeubles:
+            label = QLabel("Aucun immeuble trouvé")
+            label.setStyleSheet("padding: 20px; color: #7f8c8d; font-style: italic;")
+            self.content_layout.addWidget(label)
+        else:
+            for img in immeubles:
+                card, parts = self.create_card(img)
+                self._cartes[img["id"]] = parts
+                self.content_layout.addWidget(card)
+        
+        self.content_layout.addStretch()
+        
+    def create_card(self, immeuble):
         card = QFrame()
-        card.setStyleSheet("background: white; border: 1px solid #bdc3c7; border-radius: 6px;")
+        card.setObjectName("dashboard_card")
+        card.setStyleSheet("#dashboard_card { background: white; border: 1px solid #bdc3c7; border-radius: 6px; }")
         
         layout = QVBoxLayout(card)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
         
-        title = QLabel(immeuble.nom)
+        title = QLabel(immeuble["nom"])
         title.setStyleSheet("font-size: 16px; font-weight: bold; color: #2c3e50;")
         layout.addWidget(title)
         
-        if immeuble.adresse:
-            addr = QLabel(immeuble.adresse)
+        if immeuble["adresse"]:
+            addr = QLabel(immeuble["adresse"])
             addr.setStyleSheet("font-size: 12px; color: #7f8c8d;")
             layout.addWidget(addr)
         
-        contrats = []
-        for bureau in immeuble.bureaux:
-            for contrat in bureau.contrats:
-                if contrat not in contrats:
-                    if statut_filter == "actif" and not contrat.est_resilie:
-                        contrats.append(contrat)
-                    elif statut_filter == "resilie" and contrat.est_resilie:
-                        contrats.append(contrat)
-                    elif statut_filter is None:
-                        contrats.append(contrat)
-        
-        if not contrats:
-            msg = QLabel("Aucun contrat")
-            msg.setStyleSheet("color: #95a5a6; font-style: italic; padding: 10px;")
-            layout.addWidget(msg)
-            return card
-        
-        grid = self.create_grid(contrats, session)
-        layout.addWidget(grid)
+        msg = QLabel("Aucun contrat")
+        msg.setStyleSheet("color: #95a5a6; font-style: italic; padding: 10px;")
+        layout.addWidget(msg)
         
-        legend = self.create_legend()
-        layout.addLayout(legend)
+        grid = PaiementGridView()
+        layout.addWidget(grid)
         
-        return card
+        legend = QWidget()
+        legend.setLayout(self.create_legend())
+        layout.addWidget(legend)
         
-    def create_grid(self, contrats, session):
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(3)
-        
-        grid_layout = QGridLayout()
-        grid_layout.setSpacing(2)
-        
-        mois_noms = ["Jan", "Fév", "Mar", "Avr", "Mai", "Jui", "Juil", "Aoû", "Sep", "Oct", "Nov", "Déc"]
-        
-        cur = date.today()
-        months_to_show = 18
-        start_offset = -12
-        
-        headers = []
-        for i in range(months_to_show):
-            m = cur.month + start_offset + i
-            if m <= 0:
-                y, m = cur.year - 1, 12 + m
-            elif m > 12:
-                y, m = cur.year + 1, m - 12
-            else:
-                y = cur.year
-            headers.append((y, m))
-        
-        for col, (y, m) in enumerate(headers):
-            lbl = QLabel(f"{mois_noms[m-1]} {y}")
-            if (y, m) == (cur.year, cur.month):
-                lbl.setStyleSheet("font-size: 10px; color: #2c3e50; font-weight: bold;")
-            else:
-                lbl.setStyleSheet("font-size: 10px; color: #7f8c8d;")
-            lbl.setAlignment(Qt.AlignCenter)
-            grid_layout.addWidget(lbl, 0, col + 1)
-        
-        grid_layout.addWidget(QLabel("Contrat"), 0, 0)
-        
-        for row, contrat in enumerate(contrats, 1):
-            nums = ", ".join([b.numero for b in contrat.bureaux])
-            nom = contrat.locataire.nom if contrat.locataire else "?"
-            
-            info = QLabel(f"{nums}\n{nom}")
-            info.setStyleSheet("font-size: 9px; color: #2c3e50;")
-            info.setWordWrap(True)
-            grid_layout.addWidget(info, row, 0)
-            
-            paiements = session.query(Paiement).filter(
-                Paiement.contrat_id == contrat.id,
-                Paiement.type_paiement == TypePaiement.LOYER
-            ).all()
-            
-            payes = set()
-            for p in paiements:
-                payes.update(p.get_mois_couverts())
-            
-            start = contrat.date_debut
-            resilie = contrat.est_resilie
-            date_resil = contrat.date_resiliation
-            
-            for col, (y, m) in enumerate(headers):
-                key = (y, m)
-                
-                covered = False
-                if start:
-                    if key >= (start.year, start.month):
-                        if resilie and date_resil:
-                            if key <= (date_resil.year, date_resil.month):
-                                covered = True
-                        elif not resilie:
-                            covered = True
-                
-                if key in payes:
-                    color = "#2ecc71"
-                elif covered:
-                    color = "#bdc3c7"
-                else:
-                    color = "#e74c3c"
-                
-                cell = QLabel()
-                cell.setFixedSize(40, 30)
-                cell.setStyleSheet(f"background: {color}; border-radius: 3px;")
-                grid_layout.addWidget(cell, row, col + 1)
+        return card, {"msg": msg, "grid": grid, "legend": legend}
         
-        layout.addLayout(grid_layout)
-        return widget
+    def update_card(self, parts, immeuble, headers, payes):
+        contrats = immeuble["contrats"]
+        parts["msg"].setVisible(not contrats)
+        parts["grid"].setVisible(bool(contrats))
+        parts["legend"].setVisible(bool(contrats))
+        parts["grid"].set_donnees(contrats, headers, payes)
         
     def create_legend(self):
         layout = QHBoxLayout()
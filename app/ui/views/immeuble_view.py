@@ -7,7 +7,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QHeaderView, QLineEdit, QMessageBox, QGroupBox,
                                QFormLayout, QGridLayout, QSpinBox, QTextEdit,
                                QSplitter, QFrame, QDialog, QDialogButtonBox)
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 from typing import List
 
@@ -15,14 +15,10 @@ from app.ui.views.base_view import BaseView, TableSelectionHelper
 from app.database.connection import get_database
 from app.models.entities import Immeuble, Bureau, Contrat, Paiement
 from app.repositories.immeuble_repository import ImmeubleRepository
-from app.services.document_service import DocumentService
-from app.ui.dialogs.tree_config_dialog import TreeConfigDialog
-from app.ui.dialogs.document_browser_dialog import DocumentBrowserDialog
 from sqlalchemy import func
 
 
 class ImmeubleView(BaseView):
-    data_changed = Signal()
     
     def setup_ui(self):
         super().setup_ui()
@@ -110,40 +106,47 @@ class ImmeubleView(BaseView):
             on_delete_callback=self._on_delete_items,
             entity_name="immeuble"
         )
+        from app.ui.change_notifier import ChangeNotifier
+        ChangeNotifier.get_instance().changed.connect(self.on_changes)
 
         self.load_data()
         
+    def on_changes(self, changes):
+        """Reload when a commit changed immeubles or their bureau counts"""
+        from app.ui.change_notifier import touches
+        if self.isVisible() and touches(changes, "immeubles", "bureaux"):
+            self.load_data()
+        
     def load_data(self):
-        try:
-            db = get_database()
-            
-            with db.session_scope() as session:
-                immeubles = session.query(Immeuble).all()
-                
-                self.table.setRowCount(len(immeubles))
-                
-                for row, img in enumerate(immeubles):
-                    bureau_count = session.query(func.count(Bureau.id)).filter(Bureau.immeuble_id == img.id).scalar()
-                    
-                    self.table.setItem(row, 0, QTableWidgetItem(str(img.id)))
-                    self.table.setItem(row, 1, QTableWidgetItem(img.nom))
-                    self.table.setItem(row, 2, QTableWidgetItem(img.adresse or ""))
-                    self.table.setItem(row, 3, QTableWidgetItem(str(bureau_count)))
-                    self.table.setItem(row, 4, QTableWidgetItem(img.notes or ""))
-                    
-                    for col in range(5):
-                        self.table.item(row, col).setFlags(
-                            Qt.ItemIsSelectable | Qt.ItemIsEnabled
-                        )
-                        
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement: {str(e)}")
+        """Read the immeubles on a loader thread (cancelling a load in progress)"""
+        self.loader.load(self.fetch_rows, self.show_rows, self.on_load_error)
+    
+    @staticmethod
+    def fetch_rows(session):
+        """Table rows (id, nom, adresse, bureau count, notes), run by the loader"""
+        bureau_counts = dict(
+            session.query(Bureau.immeuble_id, func.count(Bureau.id)).group_by(Bureau.immeuble_id).all()
+        )
+        rows = []
+        for img in ImmeubleRepository(session).get_all():
+            rows.append((img.id, img.nom, img.adresse or "", bureau_counts.get(img.id, 0), img.notes or ""))
+        return rows
+    
+    def show_rows(self, rows):
+        self.table.setRowCount(len(rows))
+        
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+                self.table.setItem(row, col, item)
+    
+    def on_load_error(self, error):
+        QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement: {str(error)}")
             
     def on_add(self):
         dialog = ImmeubleDialog(self)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_data()
-            self.data_changed.emit()
+        dialog.exec()
             
     def on_edit(self):
         selected = self.table.selectedItems()
@@ -154,9 +157,7 @@ class ImmeubleView(BaseView):
         item_id = int(self.table.item(selected[0].row(), 0).text())
         
         dialog = ImmeubleDialog(self, item_id)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_data()
-            self.data_changed.emit()
+        dialog.exec()
             
     def on_delete(self):
         selected = self.table.selectedItems()
@@ -194,8 +195,6 @@ class ImmeubleView(BaseView):
                                     session.delete(contrat)
                         
                         repo.delete(img)
-                    self.load_data()
-                    self.data_changed.emit()
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur lors de la suppression: {str(e)}")
 
@@ -203,9 +202,7 @@ class ImmeubleView(BaseView):
         """Handle edit action from context menu or keyboard."""
         if len(item_ids) == 1:
             dialog = ImmeubleDialog(self, item_ids[0])
-            if dialog.exec() == QDialog.Accepted:
-                self.load_data()
-                self.data_changed.emit()
+            dialog.exec()
         else:
             QMessageBox.information(self, "Information", 
                 "Veuillez sélectionner un seul immeuble pour la modification.")
@@ -227,7 +224,7 @@ class ImmeubleView(BaseView):
                 # Check for cascade deletions and warn user
                 total_bureaux = 0
                 
-                with db.session_scope() as session:
+                with db.session_scope(readonly=True) as session:
                     for item_id in item_ids:
                         total_bureaux += session.query(func.count(Bureau.id)).filter(Bureau.immeuble_id == item_id).scalar() or 0
                 
@@ -249,9 +246,6 @@ class ImmeubleView(BaseView):
                         if img:
                             repo.delete(img)
 
-                self.load_data()
-                self.data_changed.emit()
-
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur lors de la suppression: {str(e)}")
 
@@ -278,23 +272,30 @@ class ImmeubleView(BaseView):
         
     def on_configure_tree(self):
         try:
+            from app.services.document_service import DocumentService
+            from app.ui.dialogs.tree_config_dialog import TreeConfigDialog
+
             db = get_database()
-            with db.session_scope() as session:
-                doc_service = DocumentService(session)
-                existing_config = doc_service.get_tree_config("immeuble")
+            with db.session_scope(readonly=True) as session:
+                existing_config = DocumentService(session).get_tree_config("immeuble")
 
-                dialog = TreeConfigDialog("immeuble", existing_config, self)
-                # Connect the save signal to actually save the configuration
-                dialog.config_saved.connect(
-                    lambda entity_type, tree_structure: doc_service.save_tree_config(entity_type, tree_structure)
-                )
-                dialog.exec()
+            def save_tree_config(entity_type, tree_structure):
+                with db.session_scope() as session:
+                    DocumentService(session).save_tree_config(entity_type, tree_structure)
+
+            dialog = TreeConfigDialog("immeuble", existing_config, self)
+            # Connect the save signal to actually save the configuration
+            dialog.config_saved.connect(save_tree_config)
+            dialog.exec()
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
             
     def show_document_browser(self, item_id, item_name):
         try:
+            from app.services.document_service import DocumentService
+            from app.ui.dialogs.document_browser_dialog import DocumentBrowserDialog
+
             db = get_database()
             with db.session_scope() as session:
                 doc_service = DocumentService(session)
@@ -362,7 +363,7 @@ class ImmeubleDialog(QDialog):
     def load_data(self):
         try:
             db = get_database()
-            with db.session_scope() as session:
+            with db.session_scope(readonly=True) as session:
                 img = session.query(Immeuble).get(self.immeuble_id)
                 if img:
                     self.existing_data = img
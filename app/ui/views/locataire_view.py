@@ -6,7 +6,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QPushButton, QTableWidget, QTableWidgetItem,
                                QHeaderView, QLineEdit, QMessageBox, QGroupBox,
                                QFormLayout, QGridLayout, QTextEdit, QComboBox)
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 
 from typing import List
@@ -14,8 +14,6 @@ from app.ui.views.base_view import BaseView, TableSelectionHelper
 
 
 class LocataireView(BaseView):
-    data_changed = Signal()
-    _is_loading = False
     
     def setup_ui(self):
         super().setup_ui()
@@ -115,126 +113,104 @@ class LocataireView(BaseView):
             on_delete_callback=self._on_delete_items,
             entity_name="locataire"
         )
+        from app.ui.change_notifier import ChangeNotifier
+        ChangeNotifier.get_instance().changed.connect(self.on_changes)
         self.load_data()
         
+    def on_changes(self, changes):
+        """Reload when a commit changed locataires or the contracts they are filtered on"""
+        from app.ui.change_notifier import touches
+        if self.isVisible() and touches(changes, "locataires", "contrats", "bureaux"):
+            self.load_data()
+        
     def load_immeubles(self):
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Immeuble
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo
             
-            db = get_database()
-            with db.session_scope() as session:
-                immeubles = session.query(Immeuble).order_by(Immeuble.nom).all()
-                
-                # Block signals to prevent triggering load_data during initialization
-                self.immeuble_filter.blockSignals(True)
-                current_data = self.immeuble_filter.currentData()
-                self.immeuble_filter.clear()
-                self.immeuble_filter.addItem("Tous les immeubles", None)
-                for immeuble in immeubles:
-                    self.immeuble_filter.addItem(immeuble.nom, immeuble.id)
-                # Restore previous selection if it still exists
-                if current_data is not None:
-                    idx = self.immeuble_filter.findData(current_data)
-                    if idx >= 0:
-                        self.immeuble_filter.setCurrentIndex(idx)
-                self.immeuble_filter.blockSignals(False)
+            bind_combo(self.immeuble_filter, ReferenceData.get_instance().immeubles, "Tous les immeubles")
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement des immeubles: {str(e)}")
             
     def load_data(self, search_text: str = None):
-        if self._is_loading:
-            return
-        self._is_loading = True
-        try:
-            from app.database.connection import get_database
-            from app.models.entities import Locataire, StatutLocataire, Contrat, Bureau, Immeuble, contrat_bureau
-            from sqlalchemy import or_, func, exists
-            from sqlalchemy.orm import joinedload
+        """Read the filtered locataires on a loader thread (cancelling a load in progress)"""
+        if search_text is None:
+            search_text = self.search_edit.text().strip()
+        statut = self.statut_combo.currentData()
+        immeuble_id = self.immeuble_filter.currentData()
+        self.loader.load(
+            lambda session: self.fetch_rows(session, statut, immeuble_id, search_text),
+            self.show_rows, self.on_load_error
+        )
+    
+    @staticmethod
+    def fetch_rows(session, statut, immeuble_id, search_text):
+        """Table rows of the locataires matching the filters, run by the loader"""
+        from app.models.entities import Locataire, StatutLocataire, Contrat, Bureau, Immeuble, contrat_bureau
+        from app.database.search_index import search_ids
+        from sqlalchemy import or_
+        
+        # Start with base query - don't eager load to avoid conflicts with filtering
+        query = session.query(Locataire)
+        
+        if statut:
+            query = query.filter(Locataire.statut == StatutLocataire[statut.upper()])
+        
+        if immeuble_id:
+            # Filter locataires who have at least one contract with bureaux in the selected immeuble
+            # Use a simple exists subquery without complex joins
+            locataire_has_contract_in_immeuble = session.query(Contrat.id).join(
+                contrat_bureau, Contrat.id == contrat_bureau.c.contrat_id
+            ).join(
+                Bureau, contrat_bureau.c.bureau_id == Bureau.id
+            ).filter(
+                Contrat.locataire_id == Locataire.id
+            ).filter(
+                Bureau.immeuble_id == immeuble_id
+            ).exists()
             
-            db = get_database()
+            query = query.filter(locataire_has_contract_in_immeuble)
+        
+        if search_text:
+            # Search in locataire fields and immeuble names (full-text index)
+            # Create exists subquery to search in immeuble names through contracts
+            has_matching_immeuble = session.query(Contrat.id).join(
+                contrat_bureau, Contrat.id == contrat_bureau.c.contrat_id
+            ).join(
+                Bureau, contrat_bureau.c.bureau_id == Bureau.id
+            ).filter(
+                Contrat.locataire_id == Locataire.id
+            ).filter(
+                Bureau.immeuble_id.in_(search_ids(session, Immeuble, search_text, ("nom",)))
+            ).exists()
             
-            with db.session_scope() as session:
-                # Start with base query - don't eager load to avoid conflicts with filtering
-                query = session.query(Locataire)
-                
-                statut = self.statut_combo.currentData()
-                if statut:
-                    query = query.filter(Locataire.statut == StatutLocataire[statut.upper()])
-                
-                immeuble_id = self.immeuble_filter.currentData()
-                if immeuble_id:
-                    # Filter locataires who have at least one contract with bureaux in the selected immeuble
-                    # Use a simple exists subquery without complex joins
-                    locataire_has_contract_in_immeuble = session.query(Contrat.id).join(
-                        contrat_bureau, Contrat.id == contrat_bureau.c.contrat_id
-                    ).join(
-                        Bureau, contrat_bureau.c.bureau_id == Bureau.id
-                    ).filter(
-                        Contrat.locataire_id == Locataire.id
-                    ).filter(
-                        Bureau.immeuble_id == immeuble_id
-                    ).exists()
-                    
-                    query = query.filter(locataire_has_contract_in_immeuble)
-                
-                # Search text filtering
-                if search_text is None:
-                    search_text = self.search_edit.text().strip()
-                
-                if search_text:
-                    search_pattern = f"%{search_text}%"
-                    # Search in locataire fields and immeuble names
-                    # Create exists subquery to search in immeuble names through contracts
-                    has_matching_immeuble = session.query(Contrat.id).join(
-                        contrat_bureau, Contrat.id == contrat_bureau.c.contrat_id
-                    ).join(
-                        Bureau, contrat_bureau.c.bureau_id == Bureau.id
-                    ).join(
-                        Immeuble, Bureau.immeuble_id == Immeuble.id
-                    ).filter(
-                        Contrat.locataire_id == Locataire.id
-                    ).filter(
-                        Immeuble.nom.ilike(search_pattern)
-                    ).exists()
-                    
-                    query = query.filter(
-                        or_(
-                            Locataire.nom.ilike(search_pattern),
-                            Locataire.email.ilike(search_pattern),
-                            Locataire.cin.ilike(search_pattern),
-                            has_matching_immeuble
-                        )
-                    ).distinct()
-                    
-                locataires = query.order_by(Locataire.nom).all()
-                
-                self.table.setRowCount(len(locataires))
-                
-                for row, loc in enumerate(locataires):
-                    self.table.setItem(row, 0, QTableWidgetItem(str(loc.id)))
-                    self.table.setItem(row, 1, QTableWidgetItem(loc.nom))
-                    self.table.setItem(row, 2, QTableWidgetItem(loc.telephone or ""))
-                    self.table.setItem(row, 3, QTableWidgetItem(loc.email or ""))
-                    self.table.setItem(row, 4, QTableWidgetItem(loc.cin or ""))
-                    self.table.setItem(row, 5, QTableWidgetItem(loc.raison_sociale or ""))
-                    self.table.setItem(row, 6, QTableWidgetItem(loc.statut.value))
-                    
-                    for col in range(7):
-                        self.table.item(row, col).setFlags(
-                            Qt.ItemIsSelectable | Qt.ItemIsEnabled
-                        )
-                        
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
-        finally:
-            self._is_loading = False
+            query = query.filter(
+                or_(
+                    Locataire.id.in_(search_ids(session, Locataire, search_text, ("nom", "email", "cin"))),
+                    has_matching_immeuble
+                )
+            ).distinct()
+        
+        return [
+            (loc.id, loc.nom, loc.telephone or "", loc.email or "", loc.cin or "",
+             loc.raison_sociale or "", loc.statut.value)
+            for loc in query.order_by(Locataire.nom).all()
+        ]
+    
+    def show_rows(self, rows):
+        self.table.setRowCount(len(rows))
+        
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+                self.table.setItem(row, col, item)
+    
+    def on_load_error(self, error):
+        QMessageBox.critical(self, "Erreur", f"Erreur: {str(error)}")
             
     def on_add(self):
         dialog = LocataireDialog(self)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_data()
-            self.data_changed.emit()
+        dialog.exec()
             
     def on_edit(self):
         selected = self.table.selectedItems()
@@ -245,9 +221,7 @@ class LocataireView(BaseView):
         item_id = int(self.table.item(selected[0].row(), 0).text())
         
         dialog = LocataireDialog(self, locataire_id=item_id)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_data()
-            self.data_changed.emit()
+        dialog.exec()
             
     def on_delete(self):
         selected = self.table.selectedItems()
@@ -286,8 +260,6 @@ class LocataireView(BaseView):
                                 return
                         
                         repo.delete(loc)
-                self.load_data()
-                self.data_changed.emit()
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
 
@@ -295,9 +267,7 @@ class LocataireView(BaseView):
         """Handle edit action from context menu or keyboard."""
         if len(item_ids) == 1:
             dialog = LocataireDialog(self, locataire_id=item_ids[0])
-            if dialog.exec() == QDialog.Accepted:
-                self.load_data()
-                self.data_changed.emit()
+            dialog.exec()
         else:
             QMessageBox.information(self, "Information", 
                 "Veuillez sélectionner un seul locataire pour la modification.")
@@ -325,7 +295,7 @@ class LocataireView(BaseView):
                 total_contrats = 0
                 total_paiements = 0
                 
-                with db.session_scope() as session:
+                with db.session_scope(readonly=True) as session:
                     for item_id in item_ids:
                         total_contrats += session.query(func.count(Contrat.id)).filter(Contrat.locataire_id == item_id).scalar() or 0
                         total_paiements += session.query(func.count(Paiement.id)).filter(Paiement.locataire_id == item_id).scalar() or 0
@@ -348,9 +318,6 @@ class LocataireView(BaseView):
                         if loc:
                             repo.delete(loc)
 
-                self.load_data()
-                self.data_changed.emit()
-
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
             
@@ -365,16 +332,17 @@ class LocataireView(BaseView):
             from app.ui.dialogs.tree_config_dialog import TreeConfigDialog
 
             db = get_database()
-            with db.session_scope() as session:
-                doc_service = DocumentService(session)
-                existing_config = doc_service.get_tree_config("locataire")
+            with db.session_scope(readonly=True) as session:
+                existing_config = DocumentService(session).get_tree_config("locataire")
 
-                dialog = TreeConfigDialog("locataire", existing_config, self)
-                # Connect the save signal to actually save the configuration
-                dialog.config_saved.connect(
-                    lambda entity_type, tree_structure: doc_service.save_tree_config(entity_type, tree_structure)
-                )
-                dialog.exec()
+            def save_tree_config(entity_type, tree_structure):
+                with db.session_scope() as session:
+                    DocumentService(session).save_tree_config(entity_type, tree_structure)
+
+            dialog = TreeConfigDialog("locataire", existing_config, self)
+            # Connect the save signal to actually save the configuration
+            dialog.config_saved.connect(save_tree_config)
+            dialog.exec()
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
@@ -480,7 +448,7 @@ class LocataireDialog(QDialog):
             from app.models.entities import Locataire
             
             db = get_database()
-            with db.session_scope() as session:
+            with db.session_scope(readonly=True) as session:
                 loc = session.query(Locataire).get(self.locataire_id)
                 if loc:
                     self.existing_data = loc
@@ -7,22 +7,21 @@ import os
 from datetime import date
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                               QPushButton, QTableWidget, QTableWidgetItem,
+                               QPushButton, QTableView,
                                QHeaderView, QLineEdit, QMessageBox, QGroupBox,
                                QFormLayout, QGridLayout, QTextEdit, QComboBox,
                                QDateEdit, QDoubleSpinBox, QSpinBox, QFileDialog,
                                QDialog)
-from PySide6.QtCore import Qt, Signal, QDate
+from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QFont, QColor
 
 from typing import List
 from app.ui.views.base_view import BaseView, TableSelectionHelper
-from app.services.receipt_service import ReceiptService
+from app.ui.widgets.lazy_table_model import LazyQueryModel, QueryColumn
 from app.services.audit_service import AuditService
 
 
 class PaiementView(BaseView):
-    data_changed = Signal()
     _is_loading = False
     
     def setup_ui(self):
@@ -51,12 +50,10 @@ class PaiementView(BaseView):
         
         self.immeuble_filter = QComboBox()
         self.immeuble_filter.setMinimumWidth(180)
-        self.immeuble_filter.addItem("Tous les immeubles", None)
         filter_layout.addWidget(self.immeuble_filter)
         
         self.locataire_filter = QComboBox()
         self.locataire_filter.setMinimumWidth(180)
-        self.locataire_filter.addItem("Tous les locataires", None)
         filter_layout.addWidget(self.locataire_filter)
         
         self.type_combo = QComboBox()
@@ -69,16 +66,19 @@ class PaiementView(BaseView):
         
         table_layout = QVBoxLayout()
         
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels(["ID", "Locataire", "Contrat", "Type", "Montant", "Date", "Période", "Commentaire"])
+        self.model = self.create_model()
+        
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setSortIndicator(5, Qt.DescendingOrder)
+        self.table.setSortingEnabled(True)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
-        self.table.setFrameShape(QTableWidget.NoFrame)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setFrameShape(QTableView.NoFrame)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.verticalHeader().setVisible(False)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
         
         table_layout.addWidget(self.table)
         
@@ -139,171 +139,153 @@ class PaiementView(BaseView):
             on_delete_callback=self._on_delete_items,
             entity_name="paiement"
         )
+        from app.ui.change_notifier import ChangeNotifier
+        ChangeNotifier.get_instance().changed.connect(self.on_changes)
         self.load_data()
         
 
+    def create_model(self):
+        """Create the lazily fetched payments model (SQL-side sorting and paging)"""
+        from app.models.entities import Paiement, Locataire
+        from sqlalchemy import func, literal
+        
+        columns = [
+            QueryColumn("ID", Paiement.id.label("id")),
+            QueryColumn("Locataire", Locataire.nom.label("locataire")),
+            QueryColumn("Contrat", Paiement.contrat_id.label("contrat_id"),
+                        formatter=lambda r: f"#{r.contrat_id}" if r.contrat_id else "N/A",
+                        sort_expression=func.coalesce(Paiement.contrat_id, 0)),
+            QueryColumn("Type", Paiement.type_paiement.label("type_paiement"),
+                        formatter=lambda r: r.type_paiement.value if r.type_paiement else "N/A"),
+            QueryColumn("Montant", Paiement.montant_total.label("montant_total"),
+                        formatter=lambda r: f"{r.montant_total} TND"),
+            QueryColumn("Date", Paiement.date_paiement.label("date_paiement")),
+            QueryColumn("Période", Paiement.date_debut_periode.label("date_debut_periode"),
+                        formatter=lambda r: f"{r.date_debut_periode} au {r.date_fin_periode}"
+                        if r.date_debut_periode and r.date_fin_periode else "",
+                        sort_expression=func.coalesce(Paiement.date_debut_periode, literal(date.min))),
+            QueryColumn("Commentaire", Paiement.commentaire.label("commentaire"),
+                        sort_expression=func.coalesce(Paiement.commentaire, "")),
+        ]
+        return LazyQueryModel(
+            columns, Paiement.id, self.build_query,
+            extra_expressions=[Paiement.date_fin_periode.label("date_fin_periode")],
+            sort_column=5, sort_order=Qt.DescendingOrder, parent=self
+        )
+    
+    def build_query(self):
+        """Build the filtered payments select (the model sets columns, order and paging)"""
+        from app.models.entities import Paiement, Locataire, TypePaiement, Bureau, Immeuble, contrat_bureau
+        from app.database.connection import get_database
+        from app.database.search_index import search_ids
+        from sqlalchemy import select, or_, cast, String
+        
+        query = select(Paiement.id).join(Locataire, Paiement.locataire_id == Locataire.id)
+        
+        # Apply immeuble filter
+        # Filter payments by the immeuble of the bureaux attached to their contract
+        immeuble_id = self.immeuble_filter.currentData()
+        if immeuble_id:
+            # Use exists subquery to filter payments where contract has bureaux in selected immeuble
+            contract_in_immeuble = select(Bureau.id).join(
+                contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
+            ).where(
+                contrat_bureau.c.contrat_id == Paiement.contrat_id,
+                Bureau.immeuble_id == immeuble_id
+            ).exists()
+            query = query.where(contract_in_immeuble)
+        
+        # Apply locataire filter
+        locataire_id = self.locataire_filter.currentData()
+        if locataire_id:
+            query = query.where(Paiement.locataire_id == locataire_id)
+            
+        # Apply type filter
+        type_paiement = self.type_combo.currentData()
+        if type_paiement is not None:
+            query = query.where(Paiement.type_paiement == TypePaiement[type_paiement])
+        
+        # Apply search text filter
+        search_text = self.search_edit.text().strip().lower()
+        if search_text:
+            # The model runs the query on a reader: its dialect picks the search index
+            engine = get_database().read_engine
+            # Text goes through the full-text index
+            # Create exists subquery to search in immeuble names through contract's bureaux
+            has_matching_immeuble = select(Bureau.id).join(
+                contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
+            ).where(
+                contrat_bureau.c.contrat_id == Paiement.contrat_id,
+                Bureau.immeuble_id.in_(search_ids(engine, Immeuble, search_text, ("nom",)))
+            ).exists()
+            
+            conditions = [
+                Paiement.locataire_id.in_(search_ids(engine, Locataire, search_text, ("nom",))),
+                has_matching_immeuble,
+                Paiement.id.in_(search_ids(engine, Paiement, search_text))
+            ]
+            # Numbers (contract id, amount) are only compared when a number is typed
+            if search_text.replace(".", "", 1).isdigit():
+                search_pattern = f"%{search_text}%"
+                conditions += [
+                    cast(Paiement.contrat_id, String).ilike(search_pattern),
+                    cast(Paiement.montant_total, String).ilike(search_pattern)
+                ]
+            query = query.where(or_(*conditions))
+        return query
+
     def load_data(self):
         if self._is_loading:
             return
         self._is_loading = True
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Paiement, Locataire, Contrat, TypePaiement, Bureau, Immeuble, contrat_bureau
-            from sqlalchemy import or_, cast, String
-            from sqlalchemy.orm import joinedload
-            
-            db = get_database()
-            
-            with db.session_scope() as session:
-                # Base query without eager loading to avoid conflicts
-                query = session.query(Paiement).join(Locataire).outerjoin(Contrat)
-                
-                # Apply immeuble filter
-                # Filter payments by the immeuble of the bureaux attached to their contract
-                immeuble_id = self.immeuble_filter.currentData()
-                if immeuble_id:
-                    # Use exists subquery to filter payments where contract has bureaux in selected immeuble
-                    contract_in_immeuble = session.query(Bureau.id).join(
-                        contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
-                    ).filter(
-                        contrat_bureau.c.contrat_id == Paiement.contrat_id
-                    ).filter(
-                        Bureau.immeuble_id == immeuble_id
-                    ).exists()
-                    query = query.filter(contract_in_immeuble)
-                
-                # Apply locataire filter
-                locataire_id = self.locataire_filter.currentData()
-                if locataire_id:
-                    query = query.filter(Paiement.locataire_id == locataire_id)
-                    
-                # Apply type filter
-                type_paiement = self.type_combo.currentData()
-                if type_paiement is not None:
-                    query = query.filter(Paiement.type_paiement == TypePaiement[type_paiement])
-                
-                # Apply search text filter
-                search_text = self.search_edit.text().strip().lower()
-                if search_text:
-                    search_pattern = f"%{search_text}%"
-                    # Create exists subquery to search in immeuble names through contract's bureaux
-                    has_matching_immeuble = session.query(Bureau.id).join(
-                        contrat_bureau, Bureau.id == contrat_bureau.c.bureau_id
-                    ).join(
-                        Immeuble, Bureau.immeuble_id == Immeuble.id
-                    ).filter(
-                        contrat_bureau.c.contrat_id == Paiement.contrat_id
-                    ).filter(
-                        Immeuble.nom.ilike(search_pattern)
-                    ).exists()
-                    
-                    query = query.filter(
-                        or_(
-                            Locataire.nom.ilike(search_pattern),
-                            has_matching_immeuble,
-                            cast(Paiement.contrat_id, String).ilike(search_pattern),
-                            cast(Paiement.montant_total, String).ilike(search_pattern),
-                            Paiement.commentaire.ilike(search_pattern)
-                        )
-                    )
-                    
-                paiements = query.order_by(Paiement.date_paiement.desc()).all()
-                
-                self.table.setRowCount(len(paiements))
-                
-                total = 0
-                
-                for row, p in enumerate(paiements):
-                    self.table.setItem(row, 0, QTableWidgetItem(str(p.id)))
-                    self.table.setItem(row, 1, QTableWidgetItem(p.locataire.nom if p.locataire else "N/A"))
-                    self.table.setItem(row, 2, QTableWidgetItem(f"#{p.contrat_id}" if p.contrat_id else "N/A"))
-                    
-                    type_str = p.type_paiement.value if p.type_paiement else "N/A"
-                    self.table.setItem(row, 3, QTableWidgetItem(type_str))
-                    
-                    self.table.setItem(row, 4, QTableWidgetItem(f"{p.montant_total} TND"))
-                    total += float(p.montant_total or 0)
-                    
-                    self.table.setItem(row, 5, QTableWidgetItem(str(p.date_paiement)))
-                    
-                    periode = ""
-                    if p.date_debut_periode and p.date_fin_periode:
-                        periode = f"{p.date_debut_periode} au {p.date_fin_periode}"
-                    self.table.setItem(row, 6, QTableWidgetItem(periode))
-                    
-                    self.table.setItem(row, 7, QTableWidgetItem(p.commentaire or ""))
-                    
-                    for col in range(8):
-                        self.table.item(row, col).setFlags(
-                            Qt.ItemIsSelectable | Qt.ItemIsEnabled
-                        )
-                                        
-                self.load_types()
-                
+            self.model.refresh()
+            self.load_types()
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
         finally:
             self._is_loading = False
     
+    def on_changes(self, changes):
+        """Patch the payments a commit changed (the view reloads when shown)"""
+        if not self.isVisible():
+            return
+        from app.models.entities import Paiement
+        
+        # Rows show the locataire name and are filtered on the contract's bureaux
+        self.model.apply_entity_changes(changes, "paiements", {
+            "locataires": Paiement.locataire_id,
+            "contrats": Paiement.contrat_id,
+        })
+    
+    def selected_id(self):
+        """Get the id of the first selected payment, or None"""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.model.row_id(rows[0].row())
+    
     def load_immeubles(self):
-        """Load all immeubles into the filter combo"""
+        """Bind the immeuble filter to the shared immeubles model"""
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Immeuble
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo
             
-            db = get_database()
-            with db.session_scope() as session:
-                immeubles = session.query(Immeuble).order_by(Immeuble.nom).all()
-                
-                current_data = self.immeuble_filter.currentData()
-                self.immeuble_filter.blockSignals(True)
-                self.immeuble_filter.clear()
-                self.immeuble_filter.addItem("Tous les immeubles", None)
-                
-                for immeuble in immeubles:
-                    self.immeuble_filter.addItem(immeuble.nom, immeuble.id)
-                    
-                if current_data is not None:
-                    idx = self.immeuble_filter.findData(current_data)
-                    if idx >= 0:
-                        self.immeuble_filter.setCurrentIndex(idx)
-                self.immeuble_filter.blockSignals(False)
-                        
+            bind_combo(self.immeuble_filter, ReferenceData.get_instance().immeubles, "Tous les immeubles")
         except Exception as e:
             print(f"Erreur loading immeubles: {e}")
     
     def load_locataires_for_filter(self, immeuble_id=None):
-        """Load locataires into filter, optionally filtered by immeuble"""
+        """Show locataires in the filter, optionally only those with contracts in an immeuble"""
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Locataire, Contrat, Bureau
-            from sqlalchemy.orm import joinedload
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo, filter_combo
             
-            db = get_database()
-            with db.session_scope() as session:
-                query = session.query(Locataire).distinct()
-                
-                # If immeuble selected, only show locataires with contracts in that immeuble
-                if immeuble_id:
-                    query = query.join(Contrat).join(Contrat.bureaux).filter(Bureau.immeuble_id == immeuble_id)
-                
-                locataires = query.order_by(Locataire.nom).all()
-                
-                current_data = self.locataire_filter.currentData()
-                self.locataire_filter.blockSignals(True)
-                self.locataire_filter.clear()
-                self.locataire_filter.addItem("Tous les locataires", None)
-                
-                for loc in locataires:
-                    self.locataire_filter.addItem(loc.nom, loc.id)
-                    
-                # Restore selection if still valid
-                if current_data is not None:
-                    idx = self.locataire_filter.findData(current_data)
-                    if idx >= 0:
-                        self.locataire_filter.setCurrentIndex(idx)
-                self.locataire_filter.blockSignals(False)
-                        
+            reference = ReferenceData.get_instance()
+            bind_combo(self.locataire_filter, reference.locataires, "Tous les locataires")
+            if immeuble_id:
+                ids = reference.locataire_ids_in_immeuble(immeuble_id)
+                filter_combo(self.locataire_filter, lambda r: r["id"] in ids)
+            else:
+                filter_combo(self.locataire_filter, None)
         except Exception as e:
             print(f"Erreur loading locataires: {e}")
     
@@ -321,30 +303,22 @@ class PaiementView(BaseView):
                 
     def on_add(self):
         dialog = PaiementDialog(self)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_data()
-            self.data_changed.emit()
+        dialog.exec()
             
     def on_edit(self):
-        selected = self.table.selectedItems()
-        if not selected:
+        item_id = self.selected_id()
+        if item_id is None:
             QMessageBox.warning(self, "Sélection", "Veuillez sélectionner un paiement")
             return
-            
-        item_id = int(self.table.item(selected[0].row(), 0).text())
         
         dialog = PaiementDialog(self, paiement_id=item_id)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_data()
-            self.data_changed.emit()
+        dialog.exec()
             
     def on_delete(self):
-        selected = self.table.selectedItems()
-        if not selected:
+        item_id = self.selected_id()
+        if item_id is None:
             QMessageBox.warning(self, "Sélection", "Veuillez sélectionner un paiement")
             return
-            
-        item_id = int(self.table.item(selected[0].row(), 0).text())
         
         reply = QMessageBox.question(self, "Confirmation", 
                                     "Êtes-vous sûr de vouloir supprimer ce paiement?",
@@ -361,8 +335,6 @@ class PaiementView(BaseView):
                     p = repo.get_by_id(item_id)
                     if p:
                         repo.delete(p)
-                self.load_data()
-                self.data_changed.emit()
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
 
@@ -370,9 +342,7 @@ class PaiementView(BaseView):
         """Handle edit action from context menu or keyboard."""
         if len(item_ids) == 1:
             dialog = PaiementDialog(self, paiement_id=item_ids[0])
-            if dialog.exec() == QDialog.Accepted:
-                self.load_data()
-                self.data_changed.emit()
+            dialog.exec()
         else:
             QMessageBox.information(self, "Information", 
                 "Veuillez sélectionner un seul paiement pour la modification.")
@@ -405,20 +375,15 @@ class PaiementView(BaseView):
                             repo.delete(p)
                             deleted_count += 1
 
-                self.load_data()
-                self.data_changed.emit()
-
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
                 
     def on_receipt(self):
-        selected = self.table.selectedItems()
-        if not selected:
+        paiement_id = self.selected_id()
+        if paiement_id is None:
             QMessageBox.warning(self, "Sélection", "Veuillez sélectionner un paiement")
             return
 
-        paiement_id = int(self.table.item(selected[0].row(), 0).text())
-
         # Show receipt options dialog
         from app.ui.dialogs.receipt_options_dialog import ReceiptOptionsDialog
         options_dialog = ReceiptOptionsDialog(self)
@@ -430,6 +395,7 @@ class PaiementView(BaseView):
 
         try:
             from app.database.connection import get_database
+            from app.services.receipt_service import ReceiptService
             db = get_database()
             with db.session_scope() as session:
                 service = ReceiptService(session)
@@ -473,27 +439,26 @@ class PaiementView(BaseView):
             from app.ui.dialogs.tree_config_dialog import TreeConfigDialog
 
             db = get_database()
-            with db.session_scope() as session:
-                doc_service = DocumentService(session)
-                existing_config = doc_service.get_tree_config("paiement")
+            with db.session_scope(readonly=True) as session:
+                existing_config = DocumentService(session).get_tree_config("paiement")
 
-                dialog = TreeConfigDialog("paiement", existing_config, self)
-                # Connect the save signal to actually save the configuration
-                dialog.config_saved.connect(
-                    lambda entity_type, tree_structure: doc_service.save_tree_config(entity_type, tree_structure)
-                )
-                dialog.exec()
+            def save_tree_config(entity_type, tree_structure):
+                with db.session_scope() as session:
+                    DocumentService(session).save_tree_config(entity_type, tree_structure)
+
+            dialog = TreeConfigDialog("paiement", existing_config, self)
+            # Connect the save signal to actually save the configuration
+            dialog.config_saved.connect(save_tree_config)
+            dialog.exec()
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
             
     def on_browse_documents(self):
-        selected = self.table.selectedItems()
-        if not selected:
+        item_id = self.selected_id()
+        if item_id is None:
             QMessageBox.warning(self, "Sélection", "Veuillez sélectionner un paiement pour consulter ses documents.")
             return
-            
-        item_id = int(self.table.item(selected[0].row(), 0).text())
         item_name = f"Paiement #{item_id}"
         
         self.show_document_browser(item_id, item_name)
@@ -558,7 +523,6 @@ class PaiementDialog(QDialog):
         
         self.contrat_combo = QComboBox()
         self.contrat_combo.setObjectName("contrat_combo")
-        self.contrat_combo.addItem("", None)
         form_layout.addRow("Contrat*:", self.contrat_combo)
         
         self.type_combo = QComboBox()
@@ -674,19 +638,9 @@ class PaiementDialog(QDialog):
         
     def load_locataires(self):
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Locataire
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo
             
-            db = get_database()
-            with db.session_scope() as session:
-                locs = session.query(Locataire).all()
-                
-                self.locataire_combo.clear()
-                self.locataire_combo.addItem("", None)
-                
-                for loc in locs:
-                    self.locataire_combo.addItem(f"{loc.nom}", loc.id)
-                    
+            bind_combo(self.locataire_combo, ReferenceData.get_instance().locataires)
         except Exception as e:
             print(f"Erreur: {e}")
             
@@ -708,33 +662,13 @@ class PaiementDialog(QDialog):
         loc_id = self.locataire_combo.currentData()
         if loc_id is None:
             loc_id = self.locataire_combo.itemData(self.locataire_combo.currentIndex())
-        if not loc_id:
-            self.contrat_combo.clear()
-            self.contrat_combo.addItem("", None)
-            return
             
         try:
-            from app.database.connection import get_database
-            from app.models.entities import Contrat
+            from app.ui.widgets.reference_models import ReferenceData, bind_combo, filter_combo
             
-            db = get_database()
-            with db.session_scope() as session:
-                contrats = session.query(Contrat).filter(
-                    Contrat.locataire_id == loc_id,
-                    Contrat.est_resilie == False
-                ).all()
-                
-                current_data = self.contrat_combo.currentData()
-                self.contrat_combo.clear()
-                self.contrat_combo.addItem("", None)
-                
-                for ctr in contrats:
-                    self.contrat_combo.addItem(f"#{ctr.id} - {ctr.date_debut}", ctr.id)
-                    
-                if current_data is not None:
-                    idx = self.contrat_combo.findData(current_data)
-                    if idx >= 0:
-                        self.contrat_combo.setCurrentIndex(idx)
+            bind_combo(self.contrat_combo, ReferenceData.get_instance().contrats)
+            # Running contracts of the selected locataire (none without locataire)
+            filter_combo(self.contrat_combo, lambda r: r["locataire_id"] == loc_id and not r["est_resilie"])
                         
         except Exception as e:
             print(f"Erreur: {e}")
@@ -745,7 +679,7 @@ class PaiementDialog(QDialog):
             from app.models.entities import Paiement, TypePaiement
             
             db = get_database()
-            with db.session_scope() as session:
+            with db.session_scope(readonly=True) as session:
                 p = session.query(Paiement).get(self.paiement_id)
                 if p:
                     loc_id = p.locataire_id
@@ -807,7 +741,7 @@ class PaiementDialog(QDialog):
         
         try:
             db = get_database()
-            with db.session_scope() as session:
+            with db.session_scope(readonly=True) as session:
                 contrat = session.query(Contrat).get(contrat_id)
                 if not contrat:
                     QMessageBox.warning(self, "Validation", "Le contrat sélectionné n'existe pas")
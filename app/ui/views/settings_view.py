@@ -18,7 +18,7 @@ from PySide6.QtCore import Qt, QTimer
 
 from app.ui.views.base_view import BaseView
 from app.services.data_service import DataService
-from app.services.backup_service import BackupService
+from app.ui.maintenance_scheduler import MaintenanceScheduler
 from app.utils.config import Config
 
 
@@ -73,6 +73,46 @@ class SettingsView(BaseView):
         import_group.setLayout(import_layout)
         container_layout.addWidget(import_group)
 
+        audit_group = QGroupBox("Historique des actions")
+        audit_layout = QFormLayout()
+
+        self.btn_archive_audit = QPushButton("Archiver l'historique ancien")
+        self.btn_archive_audit.setStyleSheet("background-color: #8e44ad; color: white; padding: 12px 24px; border-radius: 4px; border: none;")
+        audit_layout.addRow("", self.btn_archive_audit)
+
+        retention_days = Config.get_instance().get('audit', 'retention_days', default=365)
+        self.audit_info = QLabel(
+            f"Déplace les actions de plus de {retention_days} jours dans des archives annuelles compressées, "
+            "toujours consultables depuis l'Historique"
+        )
+        self.audit_info.setWordWrap(True)
+        self.audit_info.setStyleSheet("color: #7f8c8d; font-size: 13px;")
+        audit_layout.addRow("", self.audit_info)
+
+        audit_group.setLayout(audit_layout)
+        container_layout.addWidget(audit_group)
+
+        maintenance_group = QGroupBox("Maintenance de la base de données")
+        maintenance_layout = QFormLayout()
+
+        self.btn_maintenance = QPushButton("Optimiser maintenant")
+        self.btn_maintenance.setStyleSheet("background-color: #16a085; color: white; padding: 12px 24px; border-radius: 4px; border: none;")
+        maintenance_layout.addRow("", self.btn_maintenance)
+
+        self.maintenance_info = QLabel()
+        self.maintenance_info.setWordWrap(True)
+        self.maintenance_info.setStyleSheet("color: #7f8c8d; font-size: 13px;")
+        maintenance_layout.addRow("", self.maintenance_info)
+
+        maintenance_group.setLayout(maintenance_layout)
+        container_layout.addWidget(maintenance_group)
+
+        # Archives and file maintenance only apply to the local SQLite database
+        from app.database.connection import get_database
+        if not get_database().is_sqlite:
+            audit_group.hide()
+            maintenance_group.hide()
+
         signature_group = QGroupBox("Signatures sur les reçus")
         signature_layout = QVBoxLayout()
 
@@ -165,6 +205,10 @@ class SettingsView(BaseView):
     def setup_connections(self):
         self.btn_export.clicked.connect(self.on_export)
         self.btn_import.clicked.connect(self.on_import)
+        self.btn_archive_audit.clicked.connect(self.on_archive_audit)
+        self.maintenance_scheduler = MaintenanceScheduler(self, automatic=False)
+        self.maintenance_scheduler.finished.connect(self.on_maintenance_finished)
+        self.btn_maintenance.clicked.connect(self.on_run_maintenance)
         self.btn_import_signature.clicked.connect(self.on_import_signature)
         self.btn_delete_signature.clicked.connect(self.on_delete_signature)
         self.signatures_list.currentRowChanged.connect(self.on_signature_selected)
@@ -174,6 +218,7 @@ class SettingsView(BaseView):
         self.btn_google_list.clicked.connect(self.on_google_list)
         self._load_signature_status()
         self._update_google_drive_status()
+        self._update_maintenance_status()
 
     def on_export(self):
         folder_path = QFileDialog.getExistingDirectory(
@@ -266,9 +311,6 @@ class SettingsView(BaseView):
                 "Succès",
                 "Données importées avec succès!"
             )
-
-            if self.parent_window:
-                self.parent_window.views.get("dashboard").load_data()
         except json.JSONDecodeError as e:
             QMessageBox.critical(
                 self,
@@ -276,6 +318,60 @@ class SettingsView(BaseView):
                 f"Erreur lors de l'importation:\n{str(e)}"
             )
 
+    def on_archive_audit(self):
+        from app.database.connection import get_database
+        from app.services.audit_archive_service import AuditArchiveService
+
+        try:
+            db = get_database()
+            with db.session_scope() as session:
+                moved = AuditArchiveService(session).archive()
+            QMessageBox.information(
+                self,
+                "Succès",
+                f"{moved} action(s) déplacée(s) dans les archives de l'historique."
+            )
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Erreur",
+                f"Erreur lors de l'archivage:\n{str(e)}"
+            )
+
+    def on_run_maintenance(self):
+        if self.maintenance_scheduler.run_now():
+            self.btn_maintenance.setEnabled(False)
+            self.maintenance_info.setText("Maintenance en cours...")
+
+    def on_maintenance_finished(self, results):
+        self.btn_maintenance.setEnabled(True)
+        self._update_maintenance_status()
+
+    def _update_maintenance_status(self):
+        from app.services.maintenance_service import MaintenanceService
+
+        try:
+            history = MaintenanceService().history(limit=10)
+        except Exception:
+            history = []
+        if not history:
+            self.maintenance_info.setText(
+                "Optimise la base (statistiques, journal WAL, espace libre) "
+                "automatiquement lorsque l'application est inactive"
+            )
+            return
+        last = [r for r in history if r["execution"] == history[0]["execution"]]
+        reclaimed = sum(r["octets_recuperes"] for r in last)
+        duration = sum(r["duree_ms"] for r in last)
+        errors = [r["tache"] for r in last if r.get("erreur")]
+        text = (
+            f"Dernière maintenance: {history[0]['execution'].replace('T', ' ')} - "
+            f"{len(last)} tâche(s) en {duration:.0f} ms, {reclaimed / 1024:.0f} Ko récupérés"
+        )
+        if errors:
+            text += f"\nÉchec: {', '.join(errors)}"
+        self.maintenance_info.setText(text)
+
     def _load_signature_status(self):
         """Load all signatures into the list widget"""
         config = Config.get_instance()
@@ -421,6 +517,7 @@ class SettingsView(BaseView):
     def _do_authenticate(self, client_id: str, client_secret: str):
         """Perform the actual authentication with credentials"""
         try:
+            from app.services.backup_service import BackupService
             self.backup_service = BackupService()
             if self.backup_service.google_drive.authenticate_with_credentials(client_id, client_secret):
                 # Clear the credential fields for security
@@ -455,6 +552,7 @@ class SettingsView(BaseView):
 
     def _update_google_drive_status(self):
         """Update Google Drive connection status"""
+        from app.services.backup_service import BackupService
         self.backup_service = BackupService()
 
         auth_status = self.backup_service.is_authenticated()
@@ -492,6 +590,7 @@ class SettingsView(BaseView):
     def _do_reauthenticate(self):
         """Re-authenticate using saved OAuth token"""
         try:
+            from app.services.backup_service import BackupService
             self.backup_service = BackupService()
             if self.backup_service.google_drive.authenticate():
                 QMessageBox.information(
@@ -539,6 +638,7 @@ class SettingsView(BaseView):
 
     def _do_google_backup(self):
         try:
+            from app.services.backup_service import BackupService
             self.backup_service = BackupService()
             result = self.backup_service.backup_to_google_drive()
 
@@ -576,6 +676,7 @@ class SettingsView(BaseView):
 
     def _do_google_list(self):
         try:
+            from app.services.backup_service import BackupService
             self.backup_service = BackupService()
             backups = self.backup_service.list_google_drive_backups()
 
@@ -1,6 +1,10 @@
 """UI Widgets package"""
 from app.ui.widgets.document_viewer_widget import DocumentViewerWidget
+from app.ui.widgets.payment_grid import PaiementGridView, PaiementGridModel, PaiementGridDelegate
 
 __all__ = [
     'DocumentViewerWidget',
+    'PaiementGridView',
+    'PaiementGridModel',
+    'PaiementGridDelegate',
 ]
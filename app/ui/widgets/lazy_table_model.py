@@ -0,0 +1,370 @@
+"""Lazily fetched table model backed by a keyset-paginated SQL query"""
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import Label
+
+from app.database.change_bus import DELETE, RELOAD, EntityChange
+from app.database.connection import get_database
+from app.ui.loader import DataLoader
+
+
+PAGE_SIZE = 200
+
+
+class QueryColumn:
+    """A displayed column: header, projected SQL expression and formatting"""
+
+    def __init__(self, header: str, expression, formatter: Callable[[Any], str] = None,
+                 sort_expression=None, sortable: bool = True,
+                 roles: Dict[int, Callable[[Any], Any]] = None):
+        """
+        Args:
+            header: Column title
+            expression: Projected SQL expression (only what is displayed is selected)
+            formatter: Called with the result row (labeled expressions are
+                available as attributes), returns the display text. Defaults to
+                str() of this column's value, "" for NULL
+            sort_expression: Non-NULL expression used for ORDER BY and keyset
+                comparisons (defaults to expression; wrap nullable columns in coalesce)
+            sortable: Whether clicking the header sorts on this column
+            roles: Extra item data roles (e.g. Qt.BackgroundRole) computed from the row
+        """
+        self.header = header
+        self.expression = expression
+        self.formatter = formatter
+        self.sort_expression = sort_expression
+        self.sortable = sortable
+        self.roles = roles or {}
+
+    def sort_key(self):
+        """Expression to order and page on"""
+        key = self.sort_expression if self.sort_expression is not None else self.expression
+        return key.element if isinstance(key, Label) else key
+
+
+class LazyQueryModel(QAbstractTableModel):
+    """
+    Table model fetching rows page by page with canFetchMore/fetchMore.
+
+    Pages are read with keyset pagination on (sort key, id), so fetching a
+    page costs the same whatever its position. Sorting is done in SQL and
+    only the columns' expressions are selected, no ORM entities are loaded.
+    Pages are read on a loader thread and a refresh cancels the page being
+    read. Committed changes are patched into the loaded rows (apply_changes).
+    """
+
+    def __init__(self, columns: List[QueryColumn], id_expression,
+                 query_factory: Callable[[], Select], extra_expressions: Sequence = (),
+                 sort_column: int = 0,
+                 sort_order: Qt.SortOrder = Qt.DescendingOrder,
+                 page_size: int = PAGE_SIZE,
+                 prepare: Optional[Callable[[Session], None]] = None, parent=None):
+        """
+        Args:
+            columns: Displayed columns
+            id_expression: Unique id expression, used as tie-breaker for paging
+            query_factory: Returns a select() carrying the joins and filters;
+                its columns are replaced by the model's projection
+            extra_expressions: Labeled expressions selected for formatters only
+            sort_column: Initial sort column index
+            sort_order: Initial sort order
+            page_size: Number of rows fetched per page
+            prepare: Called with the session before each page query
+                (e.g. to attach databases or create temporary views)
+        """
+        super().__init__(parent)
+        self._columns = columns
+        self._id_expression = id_expression
+        self._query_factory = query_factory
+        self._extra_expressions = list(extra_expressions)
+        self._sort_column = sort_column
+        self._sort_order = sort_order
+        self._page_size = page_size
+        self._prepare = prepare
+
+        self._ids: List[int] = []
+        self._keys: List[tuple] = []  # (sort key, id) of each row
+        self._rows: List[Sequence[str]] = []
+        self._row_roles: List[Dict[tuple, Any]] = []
+        self._last_key = None
+        self._exhausted = True
+        self._loader = DataLoader(self)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        return self._row_roles[index.row()].get((index.column(), role))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._columns[section].header
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def row_id(self, row: int) -> Optional[int]:
+        """Get the entity id shown on a row"""
+        if 0 <= row < len(self._ids):
+            return self._ids[row]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._loader.is_loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Read the next page on a loader thread, its rows are appended when delivered"""
+        if parent.isValid() or self._exhausted or self._loader.is_loading:
+            return
+        # Built here: the query factory reads the filter widgets
+        statement, prepare = self._page_statement(), self._prepare
+
+        def fetch(session):
+            if prepare is not None:
+                prepare(session)
+            return session.execute(statement).all()
+
+        self._loader.load(fetch, self._append, self._load_failed)
+
+    @property
+    def is_loading(self) -> bool:
+        """True while a page is being read"""
+        return self._loader.is_loading
+
+    def _append(self, rows) -> None:
+        if len(rows) < self._page_size:
+            self._exhausted = True
+        if not rows:
+            return
+
+        self._last_key = (rows[-1][1], rows[-1][0])
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for row in rows:
+            self._ids.append(row[0])
+            self._keys.append((row[1], row[0]))
+            self._rows.append(self._display(row))
+            self._row_roles.append(self._roles(row))
+        self.endInsertRows()
+
+    def _load_failed(self, error: Exception) -> None:
+        print(f"Erreur fetchMore: {error}")
+        self._exhausted = True
+
+    def apply_changes(self, ids: Iterable[int] = (), deleted: Iterable[int] = (),
+                      conditions: Sequence = ()) -> None:
+        """
+        Patch the loaded rows after a commit instead of reloading them.
+
+        Args:
+            ids: Ids of rows inserted or updated; they are read again through
+                the filters and inserted, moved, updated or removed
+            deleted: Ids of rows deleted
+            conditions: Conditions on the row table selecting more rows to
+                read again (e.g. the rows showing a renamed related entity)
+        """
+        ids, deleted = set(ids), set(deleted)
+        if not ids and not deleted and not conditions:
+            return
+        if self._loader.is_loading:
+            # The page being read may predate the commit
+            self.refresh()
+            return
+        try:
+            db = get_database()
+            with db.session_scope(readonly=True) as session:
+                if self._prepare is not None:
+                    self._prepare(session)
+                if conditions:
+                    ids.update(session.execute(
+                        select(self._id_expression).where(or_(*conditions))
+                    ).scalars())
+                ids -= deleted
+                if len(ids) + len(deleted) > self._page_size:
+                    # More changed rows than a page (imports): reading the first page is cheaper
+                    rows = None
+                elif ids:
+                    stmt = self._projection(self._query_factory()).where(self._id_expression.in_(ids))
+                    rows = session.execute(stmt).all()
+                else:
+                    rows = []
+        except Exception as e:
+            print(f"Erreur apply_changes: {e}")
+            return
+        if rows is None:
+            self.refresh()
+            return
+
+        try:
+            found = {row[0] for row in rows}
+            for entity_id in deleted | (ids - found):
+                self._remove(entity_id)
+            for row in rows:
+                self._place(row)
+        except TypeError:
+            # Sort keys Python cannot compare like SQL does
+            self.refresh()
+
+    def apply_entity_changes(self, changes: List[EntityChange], table_name: str,
+                             references: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Patch the rows touched by the changes of a commit.
+
+        Args:
+            changes: Changes published by the change bus
+            table_name: Table whose ids the rows show
+            references: Table name -> column of the row table holding its ids,
+                or function of the ids returning a condition on the rows; rows
+                referencing an updated entity are read again
+        """
+        references = references or {}
+        if any(c.operation == RELOAD and (c.entity == table_name or c.entity in references)
+               for c in changes):
+            self.refresh()
+            return
+        ids, deleted, referenced = set(), set(), {}
+        for change in changes:
+            if change.entity == table_name:
+                (deleted if change.operation == DELETE else ids).update(change.ids)
+            elif change.entity in references and change.operation != DELETE:
+                referenced.setdefault(change.entity, set()).update(change.ids)
+        self.apply_changes(ids, deleted, [
+            references[name](entity_ids) if callable(references[name]) else references[name].in_(entity_ids)
+            for name, entity_ids in referenced.items()
+        ])
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if not self._columns[column].sortable:
+            return
+        if (column, order) == (self._sort_column, self._sort_order):
+            return
+        self._sort_column, self._sort_order = column, order
+        self.refresh()
+
+    def refresh(self):
+        """Drop loaded rows and fetch the first page again (cancelling a page being read)"""
+        self._loader.cancel()
+        self.beginResetModel()
+        self._ids, self._keys, self._rows, self._row_roles = [], [], [], []
+        self._last_key = None
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def _format(self, column: QueryColumn, row, i: int) -> str:
+        """Get the display text of a column for a result row"""
+        if column.formatter is not None:
+            return column.formatter(row)
+        # The first two selected values are the row id and the sort key
+        value = row[i + 2]
+        return "" if value is None else str(value)
+
+    def _display(self, row) -> List[str]:
+        return [self._format(column, row, i) for i, column in enumerate(self._columns)]
+
+    def _roles(self, row) -> Dict[tuple, Any]:
+        return {
+            (i, role): compute(row)
+            for i, column in enumerate(self._columns)
+            for role, compute in column.roles.items()
+        }
+
+    def _precedes(self, key: tuple, other: tuple) -> bool:
+        """True when a (sort key, id) is displayed before another"""
+        return key > other if self._sort_order == Qt.DescendingOrder else key < other
+
+    def _position(self, key: tuple) -> int:
+        """Row where a (sort key, id) belongs among the loaded rows"""
+        low, high = 0, len(self._keys)
+        while low < high:
+            middle = (low + high) // 2
+            if self._precedes(self._keys[middle], key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _remove(self, entity_id: int) -> None:
+        if entity_id not in self._ids:
+            return
+        row = self._ids.index(entity_id)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for values in (self._ids, self._keys, self._rows, self._row_roles):
+            del values[row]
+        self.endRemoveRows()
+
+    def _place(self, row) -> None:
+        """Insert, move or update the row of a result at its sorted position"""
+        entity_id, key = row[0], (row[1], row[0])
+        # Rows past the last fetched one arrive with the next pages
+        if not self._exhausted and self._last_key is not None and not (
+                key == self._last_key or self._precedes(key, self._last_key)):
+            self._remove(entity_id)
+            return
+
+        current = self._ids.index(entity_id) if entity_id in self._ids else None
+        if current is None:
+            target = self._position(key)
+            self.beginInsertRows(QModelIndex(), target, target)
+            self._ids.insert(target, entity_id)
+            self._keys.insert(target, key)
+            self._rows.insert(target, self._display(row))
+            self._row_roles.insert(target, self._roles(row))
+            self.endInsertRows()
+            return
+
+        del self._keys[current]
+        target = self._position(key)
+        self._keys.insert(current, key)
+        if target != current:
+            # Moved rather than removed/inserted: the view keeps it selected
+            self.beginMoveRows(QModelIndex(), current, current, QModelIndex(),
+                               target if target < current else target + 1)
+            for values in (self._ids, self._keys, self._rows, self._row_roles):
+                values.insert(target, values.pop(current))
+            self.endMoveRows()
+        self._keys[target] = key
+        self._rows[target] = self._display(row)
+        self._row_roles[target] = self._roles(row)
+        self.dataChanged.emit(self.index(target, 0), self.index(target, len(self._columns) - 1))
+
+    def _projection(self, stmt: Select) -> Select:
+        """Replace the columns of the query by the row id, sort key and displayed values"""
+        return stmt.with_only_columns(
+            self._id_expression.label('_row_id'),
+            self._columns[self._sort_column].sort_key().label('_sort_key'),
+            *[column.expression for column in self._columns],
+            *self._extra_expressions
+        )
+
+    def _page_statement(self) -> Select:
+        """Build the select of the next page"""
+        key = self._columns[self._sort_column].sort_key()
+        id_expression = self._id_expression
+        descending = self._sort_order == Qt.DescendingOrder
+
+        stmt = self._projection(self._query_factory())
+
+        if self._last_key is not None:
+            last_value, last_id = self._last_key
+            if descending:
+                stmt = stmt.where(or_(key < last_value, and_(key == last_value, id_expression < last_id)))
+            else:
+                stmt = stmt.where(or_(key > last_value, and_(key == last_value, id_expression > last_id)))
+
+        if descending:
+            stmt = stmt.order_by(key.desc(), id_expression.desc())
+        else:
+            stmt = stmt.order_by(key.asc(), id_expression.asc())
+        return stmt.limit(self._page_size)
@@ -0,0 +1,179 @@
+"""Painted payment grid (contracts x months) for the dashboard"""
+from datetime import date
+from typing import Any, Dict, List
+
+from PySide6.QtWidgets import QTableView, QStyledItemDelegate, QHeaderView, QAbstractItemView, QFrame
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRectF, QSize
+from PySide6.QtGui import QColor, QPainter, QFont
+
+
+MOIS_COURTS = ["Jan", "Fév", "Mar", "Avr", "Mai", "Jui", "Juil", "Aoû", "Sep", "Oct", "Nov", "Déc"]
+
+PAYE = "paye"
+NON_PAYE = "non_paye"
+NON_COUVERT = "non_couvert"
+
+COULEURS = {
+    PAYE: QColor("#2ecc71"),
+    NON_PAYE: QColor("#bdc3c7"),
+    NON_COUVERT: QColor("#e74c3c"),
+}
+
+LIBELLES = {
+    PAYE: "Payé",
+    NON_PAYE: "Non payé",
+    NON_COUVERT: "Non couvert",
+}
+
+CELL_WIDTH = 40
+CELL_HEIGHT = 30
+
+StatutRole = Qt.UserRole + 1
+
+
+def statut_cellule(contrat: Dict[str, Any], key: tuple, payes: set) -> str:
+    """Get the grid status of a (year, month) cell for a contract"""
+    if key in payes:
+        return PAYE
+    start = contrat["date_debut"]
+    if start and key >= (start.year, start.month):
+        date_resil = contrat["date_resiliation"]
+        if not contrat["est_resilie"]:
+            return NON_PAYE
+        if date_resil and key <= (date_resil.year, date_resil.month):
+            return NON_PAYE
+    return NON_COUVERT
+
+
+class PaiementGridModel(QAbstractTableModel):
+    """Table model exposing one status per (contract, month) cell"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._contrats: List[Dict[str, Any]] = []
+        self._mois: List[tuple] = []
+        self._statuts: List[List[str]] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._contrats)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._mois)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        statut = self._statuts[index.row()][index.column()]
+        if role == StatutRole:
+            return statut
+        if role == Qt.ToolTipRole:
+            year, month = self._mois[index.column()]
+            return f"{MOIS_COURTS[month - 1]} {year}: {LIBELLES[statut]}"
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            year, month = self._mois[section]
+            if role == Qt.DisplayRole:
+                return f"{MOIS_COURTS[month - 1]}\n{year}"
+            if role == Qt.FontRole:
+                font = QFont()
+                font.setPointSize(7)
+                font.setBold((year, month) == (date.today().year, date.today().month))
+                return font
+        else:
+            contrat = self._contrats[section]
+            if role == Qt.DisplayRole:
+                return f"{', '.join(contrat['bureaux'])}\n{contrat['locataire'] or '?'}"
+            if role == Qt.FontRole:
+                font = QFont()
+                font.setPointSize(7)
+                return font
+        return None
+
+    def set_donnees(self, contrats: List[Dict[str, Any]], mois: List[tuple], payes: Dict[int, set]):
+        """
+        Replace the grid content.
+
+        When contracts and months are unchanged only the cells whose status
+        changed are signalled, so the view repaints just those cells.
+        """
+        statuts = [
+            [statut_cellule(contrat, key, payes.get(contrat["id"], set())) for key in mois]
+            for contrat in contrats
+        ]
+
+        meme_structure = (
+            mois == self._mois
+            and [c["id"] for c in contrats] == [c["id"] for c in self._contrats]
+        )
+        if not meme_structure:
+            self.beginResetModel()
+            self._contrats, self._mois, self._statuts = contrats, mois, statuts
+            self.endResetModel()
+            return
+
+        anciens = self._statuts
+        self._contrats, self._statuts = contrats, statuts
+        if contrats:
+            self.headerDataChanged.emit(Qt.Vertical, 0, len(contrats) - 1)
+        for row, (avant, apres) in enumerate(zip(anciens, statuts)):
+            for col, (a, b) in enumerate(zip(avant, apres)):
+                if a != b:
+                    index = self.index(row, col)
+                    self.dataChanged.emit(index, index, [StatutRole, Qt.ToolTipRole])
+
+
+class PaiementGridDelegate(QStyledItemDelegate):
+    """Paints each cell as a rounded colored box"""
+
+    def paint(self, painter, option, index):
+        couleur = COULEURS.get(index.data(StatutRole))
+        if couleur is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(couleur)
+        painter.drawRoundedRect(QRectF(option.rect).adjusted(1, 1, -1, -1), 3, 3)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(CELL_WIDTH, CELL_HEIGHT)
+
+
+class PaiementGridView(QTableView):
+    """Non-scrolling table view sized to show the whole grid"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setModel(PaiementGridModel(self))
+        self.setItemDelegate(PaiementGridDelegate(self))
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setShowGrid(False)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setStyleSheet("QTableView { background: transparent; border: none; }")
+
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.horizontalHeader().setDefaultSectionSize(CELL_WIDTH + 2)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(CELL_HEIGHT + 2)
+        self.verticalHeader().setDefaultAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+
+        self.model().modelReset.connect(self._ajuster_taille)
+        self.model().headerDataChanged.connect(self._ajuster_taille)
+
+    def set_donnees(self, contrats: List[Dict[str, Any]], mois: List[tuple], payes: Dict[int, set]):
+        """Update the grid content"""
+        self.model().set_donnees(contrats, mois, payes)
+
+    def _ajuster_taille(self):
+        """Resize the view to its content since it never scrolls"""
+        model = self.model()
+        width = self.verticalHeader().sizeHint().width() + model.columnCount() * self.horizontalHeader().defaultSectionSize()
+        height = self.horizontalHeader().sizeHint().height() + model.rowCount() * self.verticalHeader().defaultSectionSize()
+        self.setFixedSize(width + 2, height + 2)
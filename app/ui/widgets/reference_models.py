@@ -0,0 +1,320 @@
+"""Shared list models of the reference entities, bound to every combo box"""
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QSortFilterProxyModel
+from PySide6.QtWidgets import QComboBox
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.change_bus import EntityChange
+from app.database.connection import get_database
+from app.models.entities import Immeuble, Bureau, Locataire, Contrat, contrat_bureau
+from app.ui.change_notifier import ChangeNotifier, changed_ids, deleted_ids, reloaded
+
+
+IdRole = Qt.UserRole  # Entity id, what QComboBox.currentData() returns
+RecordRole = Qt.UserRole + 1  # Dict of the loaded columns
+
+
+class ReferenceListModel(QAbstractListModel):
+    """
+    Rows of one entity table, loaded once and sorted on sort_key.
+
+    Each row is a dict of the selected columns. Row 0 is the empty
+    selection (id None) whose text each combo sets (see ReferenceComboModel).
+    Commits patch the rows in place (see ReferenceData).
+    """
+
+    def __init__(self, model_class, columns: Sequence, label: Callable[[dict], str],
+                 sort_key: Callable[[dict], Any], parent=None):
+        """
+        Args:
+            model_class: Mapped class listed
+            columns: Selected columns (the id first)
+            label: Display text of a row
+            sort_key: Order of the rows
+        """
+        super().__init__(parent)
+        self.model_class = model_class
+        self._columns = list(columns)
+        self._label = label
+        self._sort_key = sort_key
+        self._records: List[dict] = []
+        self._keys: List[Any] = []
+        self._loaded = False
+
+    @property
+    def table_name(self) -> str:
+        return self.model_class.__tablename__
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records) + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row() - 1] if index.row() > 0 else None
+        if role == Qt.DisplayRole:
+            return self._label(record) if record is not None else ""
+        if role == IdRole:
+            return record["id"] if record is not None else None
+        if role == RecordRole:
+            return record
+        return None
+
+    def ensure_loaded(self) -> None:
+        """Read the table on first use"""
+        if not self._loaded:
+            self.reload()
+
+    def reload(self) -> None:
+        """Read the whole table again"""
+        with get_database().session_scope(readonly=True) as session:
+            records = self._fetch(session)
+        self.beginResetModel()
+        records.sort(key=self._key)
+        self._records = records
+        self._keys = [self._key(r) for r in records]
+        self._loaded = True
+        self.endResetModel()
+
+    def records(self) -> List[dict]:
+        """Every row, in display order"""
+        self.ensure_loaded()
+        return list(self._records)
+
+    def record(self, entity_id: int) -> Optional[dict]:
+        """Row of an entity, None when unknown"""
+        row = self._row(entity_id)
+        return self._records[row] if row is not None else None
+
+    def upsert(self, ids: Iterable[int]) -> None:
+        """Read rows created or modified by a commit and patch them in"""
+        ids = set(ids)
+        if not self._loaded or not ids:
+            return
+        with get_database().session_scope(readonly=True) as session:
+            records = {r["id"]: r for r in self._fetch(session, ids)}
+        for entity_id in ids:
+            if entity_id in records:
+                self._put(records[entity_id])
+            else:
+                self.remove([entity_id])
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """Drop the rows of deleted entities"""
+        if not self._loaded:
+            return
+        for entity_id in ids:
+            row = self._row(entity_id)
+            if row is None:
+                continue
+            self.beginRemoveRows(QModelIndex(), row + 1, row + 1)
+            del self._records[row]
+            del self._keys[row]
+            self.endRemoveRows()
+
+    def _fetch(self, session: Session, ids: Optional[Set[int]] = None) -> List[dict]:
+        """Rows of the table (or of some ids) as dicts"""
+        query = select(*self._columns)
+        if ids is not None:
+            query = query.where(self.model_class.id.in_(ids))
+        return [dict(row._mapping) for row in session.execute(query)]
+
+    def _key(self, record: dict):
+        # The id breaks ties so that every row has a distinct position
+        return (self._sort_key(record), record["id"])
+
+    def _row(self, entity_id: int) -> Optional[int]:
+        self.ensure_loaded()
+        for row, record in enumerate(self._records):
+            if record["id"] == entity_id:
+                return row
+        return None
+
+    def _put(self, record: dict) -> None:
+        key = self._key(record)
+        row = self._row(record["id"])
+        if row is None:
+            target = bisect_left(self._keys, key)
+            self.beginInsertRows(QModelIndex(), target + 1, target + 1)
+            self._records.insert(target, record)
+            self._keys.insert(target, key)
+            self.endInsertRows()
+            return
+
+        others = self._keys[:row] + self._keys[row + 1:]
+        target = bisect_left(others, key)
+        if target != row:
+            # Moved rather than removed/inserted: combos keep it selected
+            destination = target + 1 if target < row else target + 2
+            self.beginMoveRows(QModelIndex(), row + 1, row + 1, QModelIndex(), destination)
+            del self._records[row]
+            del self._keys[row]
+            self._records.insert(target, record)
+            self._keys.insert(target, key)
+            self.endMoveRows()
+        else:
+            self._records[row] = record
+            self._keys[row] = key
+        index = self.index(target + 1)
+        self.dataChanged.emit(index, index)
+
+
+class ContratListModel(ReferenceListModel):
+    """Contrats with the ids of their bureaux (bureau_ids)"""
+
+    def _fetch(self, session: Session, ids: Optional[Set[int]] = None) -> List[dict]:
+        records = super()._fetch(session, ids)
+        query = select(contrat_bureau.c.contrat_id, contrat_bureau.c.bureau_id)
+        if ids is not None:
+            query = query.where(contrat_bureau.c.contrat_id.in_(ids))
+        bureaux: Dict[int, Set[int]] = {}
+        for contrat_id, bureau_id in session.execute(query):
+            bureaux.setdefault(contrat_id, set()).add(bureau_id)
+        for record in records:
+            record["bureau_ids"] = frozenset(bureaux.get(record["id"], ()))
+        return records
+
+
+class ReferenceComboModel(QSortFilterProxyModel):
+    """
+    What one combo box shows of a shared ReferenceListModel: the text of the
+    empty selection, an optional label and an optional row filter.
+    """
+
+    def __init__(self, source: ReferenceListModel, placeholder: str = "",
+                 label: Optional[Callable[[dict], str]] = None, parent=None):
+        super().__init__(parent)
+        self._placeholder = placeholder
+        self._label = label
+        self._accept: Optional[Callable[[dict], bool]] = None
+        self.setSourceModel(source)
+
+    def set_filter(self, accept: Optional[Callable[[dict], bool]]) -> None:
+        """Show only the rows accepted by a predicate on their record (None: every row)"""
+        self._accept = accept
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if source_row == 0 or self._accept is None:
+            return True
+        record = self.sourceModel().index(source_row).data(RecordRole)
+        return self._accept(record)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            record = super().data(index, RecordRole)
+            if record is None:
+                return self._placeholder
+            if self._label is not None:
+                return self._label(record)
+        return super().data(index, role)
+
+
+def bind_combo(combo: QComboBox, source: ReferenceListModel, placeholder: str = "",
+               label: Optional[Callable[[dict], str]] = None) -> ReferenceComboModel:
+    """Show a shared reference model in a combo box (on its empty selection when newly bound)"""
+    model = combo.model()
+    if isinstance(model, ReferenceComboModel) and model.sourceModel() is source:
+        return model
+    source.ensure_loaded()
+    combo.blockSignals(True)
+    model = ReferenceComboModel(source, placeholder, label, parent=combo)
+    combo.setModel(model)
+    combo.setCurrentIndex(0)
+    combo.blockSignals(False)
+    return model
+
+
+def filter_combo(combo: QComboBox, accept: Optional[Callable[[dict], bool]]) -> None:
+    """Change the rows of a bound combo, keeping its selection when still shown"""
+    combo.blockSignals(True)
+    current = combo.currentData()
+    combo.model().set_filter(accept)
+    index = combo.findData(current) if current is not None else 0
+    combo.setCurrentIndex(max(index, 0))
+    combo.blockSignals(False)
+
+
+class ReferenceData(QObject):
+    """
+    The application-wide reference models: immeubles, locataires, contrats
+    and bureaux. Each table is read the first time a combo shows it, then
+    every commit of the write sessions patches the rows it changed.
+    """
+
+    _instance: Optional['ReferenceData'] = None
+
+    def __init__(self):
+        super().__init__()
+        self.immeubles = ReferenceListModel(
+            Immeuble, (Immeuble.id, Immeuble.nom),
+            label=lambda r: r["nom"], sort_key=lambda r: r["nom"] or "", parent=self)
+        self.locataires = ReferenceListModel(
+            Locataire, (Locataire.id, Locataire.nom, Locataire.raison_sociale, Locataire.cin),
+            label=lambda r: r["nom"], sort_key=lambda r: r["nom"] or "", parent=self)
+        self.contrats = ContratListModel(
+            Contrat, (Contrat.id, Contrat.locataire_id, Contrat.date_debut, Contrat.est_resilie),
+            label=lambda r: f"#{r['id']} - {r['date_debut']}", sort_key=lambda r: r["id"], parent=self)
+        self.bureaux = ReferenceListModel(
+            Bureau, (Bureau.id, Bureau.numero, Bureau.immeuble_id, Bureau.surface_m2),
+            label=lambda r: f"#{r['numero']}", sort_key=lambda r: r["numero"] or "", parent=self)
+        self._models = {m.table_name: m for m in (self.immeubles, self.locataires, self.contrats, self.bureaux)}
+
+        ChangeNotifier.get_instance().changed.connect(self._apply)
+
+    @classmethod
+    def get_instance(cls) -> 'ReferenceData':
+        """Get or create the singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def bureau_label(self, record: dict) -> str:
+        """Bureau with its immeuble and surface, as listed in contract forms"""
+        immeuble = self.immeubles.record(record["immeuble_id"])
+        nom = immeuble["nom"] if immeuble else "N/A"
+        return f"#{record['numero']} - {nom} ({record['surface_m2'] or 0} m²)"
+
+    def occupied_bureau_ids(self) -> Set[int]:
+        """Bureaux of the contracts still running"""
+        return {b for c in self.contrats.records() if not c["est_resilie"] for b in c["bureau_ids"]}
+
+    def locataire_ids_in_immeuble(self, immeuble_id: int) -> Set[int]:
+        """Locataires having (or having had) a contract in an immeuble"""
+        bureaux = {b["id"] for b in self.bureaux.records() if b["immeuble_id"] == immeuble_id}
+        return {c["locataire_id"] for c in self.contrats.records() if c["bureau_ids"] & bureaux}
+
+    def immeuble_ids_of_locataire(self, locataire_id: int) -> Set[int]:
+        """Immeubles where a locataire has (or had) a contract"""
+        bureaux = set()
+        for contrat in self.contrats.records():
+            if contrat["locataire_id"] == locataire_id:
+                bureaux |= contrat["bureau_ids"]
+        return {b["immeuble_id"] for b in self.bureaux.records() if b["id"] in bureaux}
+
+    def _apply(self, changes: List[EntityChange]) -> None:
+        """Patch the models with the rows a commit wrote"""
+        reloads = {name for name in self._models if reloaded(changes, name)}
+        for table_name in reloads:
+            if self._models[table_name].is_loaded:
+                self._models[table_name].reload()
+
+        deletes = {name: deleted_ids(changes, name) for name in self._models}
+        for table_name, ids in deletes.items():
+            self._models[table_name].remove(ids)
+        # Rows the database deletes with their parent (ON DELETE CASCADE)
+        if deletes["immeubles"] and self.bureaux.is_loaded:
+            self.bureaux.remove([b["id"] for b in self.bureaux.records() if b["immeuble_id"] in deletes["immeubles"]])
+        if deletes["locataires"] and self.contrats.is_loaded:
+            self.contrats.remove([c["id"] for c in self.contrats.records() if c["locataire_id"] in deletes["locataires"]])
+
+        for table_name, model in self._models.items():
+            if table_name not in reloads:
+                model.upsert(changed_ids(changes, table_name))
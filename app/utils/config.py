@@ -58,7 +58,45 @@ class Config:
             },
             'database': {
                 'type': 'sqlite',
-                'path': 'data/gestion_locative.db'
+                'path': 'data/gestion_locative.db',
+                # Used with type: postgresql (or set url to a full SQLAlchemy URL)
+                'postgresql': {
+                    'host': 'localhost',
+                    'port': 5432,
+                    'name': 'gestion_locative',
+                    'user': 'gestion_locative',
+                    'password': '',
+                    'pool_size': 5,
+                    'max_overflow': 10
+                },
+                # Repository reads cache (SQLite only)
+                'cache': {
+                    'enabled': True,
+                    'max_entries': 256
+                },
+                # Debug mode: warn when one statement runs more than threshold times in a UI action
+                'query_monitor': {
+                    'threshold': 10
+                },
+                'profile': {
+                    'synchronous': 'NORMAL',
+                    'cache_size': -16000,
+                    'mmap_size': 67108864
+                }
+            },
+            'ui': {
+                # Build every view in the background after startup
+                'warm_up_views': False
+            },
+            'maintenance': {
+                'enabled': True,
+                'interval_minutes': 360,
+                'idle_seconds': 120,
+                'tasks': ['archive_audit', 'incremental_vacuum', 'optimize', 'checkpoint']
+            },
+            'audit': {
+                'retention_days': 365,
+                'archive_directory': 'data/archives'
             },
             'export': {
                 'default_format': 'json',
@@ -0,0 +1,166 @@
+"""Startup timing report: duration of each startup phase and of each module import"""
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+PROFILE_FLAG = "--profile-startup"
+EXIT_FLAG = "--exit-after-startup"  # Quit once the report is written (benchmarks)
+DEFAULT_REPORT_PATH = "logs/startup_profile.txt"
+TOP_IMPORTS = 40
+
+
+class _TimedLoader:
+    """Loader proxy timing exec_module, removed from the module once loaded"""
+
+    def __init__(self, loader, profile: 'StartupProfile'):
+        self._loader = loader
+        self._profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        spec = module.__spec__
+        self._profile._enter_import()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profile._leave_import(spec.name)
+            spec.loader = self._loader
+            if getattr(module, "__loader__", None) is self:
+                module.__loader__ = self._loader
+
+
+class _ImportTimer:
+    """Meta path finder wrapping the loaders found by the other finders"""
+
+    def __init__(self, profile: 'StartupProfile'):
+        self._profile = profile
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profile)
+        return spec
+
+
+class StartupProfile:
+    """
+    Records how long each startup phase and each first import takes.
+
+    Disabled profiles record nothing, so the startup code can call mark()
+    unconditionally. Import times are cumulative (with the modules they
+    import) and self (without them), like python -X importtime.
+    """
+
+    def __init__(self, enabled: bool = True, report_path: str = DEFAULT_REPORT_PATH,
+                 exit_after_startup: bool = False):
+        self.enabled = enabled
+        self.report_path = Path(report_path)
+        self.exit_after_startup = exit_after_startup
+        self._start = self._last = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self._threads = threading.local()
+        self._timer: Optional[_ImportTimer] = None
+        if enabled:
+            self._timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._timer)
+
+    @classmethod
+    def from_argv(cls, argv: List[str]) -> 'StartupProfile':
+        """
+        Profile enabled by --profile-startup[=path] (JSON when path ends in
+        .json), with --exit-after-startup to quit once written. The flags
+        are removed from argv.
+        """
+        exit_after_startup = EXIT_FLAG in argv
+        if exit_after_startup:
+            argv.remove(EXIT_FLAG)
+        for i, arg in enumerate(argv):
+            if arg == PROFILE_FLAG or arg.startswith(PROFILE_FLAG + "="):
+                del argv[i]
+                path = arg.partition("=")[2]
+                return cls(report_path=path or DEFAULT_REPORT_PATH, exit_after_startup=exit_after_startup)
+        return cls(enabled=False)
+
+    def mark(self, phase: str) -> None:
+        """End a phase: records the time since the previous mark"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def _import_stack(self) -> List[List[float]]:
+        # [start, time spent in nested imports] of the imports running in this thread
+        if not hasattr(self._threads, "stack"):
+            self._threads.stack = []
+        return self._threads.stack
+
+    def _enter_import(self) -> None:
+        self._import_stack().append([time.perf_counter(), 0.0])
+
+    def _leave_import(self, name: str) -> None:
+        stack = self._import_stack()
+        start, nested = stack.pop()
+        cumulative = (time.perf_counter() - start) * 1000
+        self.imports[name] = (cumulative, cumulative - nested)
+        if stack:
+            stack[-1][1] += cumulative
+
+    def stop(self) -> None:
+        """Stop timing imports"""
+        if self._timer in sys.meta_path:
+            sys.meta_path.remove(self._timer)
+        self._timer = None
+
+    def report(self, top: int = TOP_IMPORTS) -> str:
+        """Text report: phases in order, then the slowest imports"""
+        total = (self._last - self._start) * 1000
+        lines = [f"Startup profile - {datetime.now():%Y-%m-%d %H:%M:%S}", "",
+                 f"{'Phase':<30}{'ms':>10}"]
+        lines += [f"{phase:<30}{ms:>10.1f}" for phase, ms in self.phases]
+        lines += [f"{'total':<30}{total:>10.1f}", ""]
+
+        lines.append(f"Imports: {len(self.imports)} modules, {top} slowest (cumulative)")
+        lines.append(f"{'Module':<60}{'cumul. ms':>12}{'self ms':>10}")
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        lines += [f"{name:<60}{cumulative:>12.1f}{own:>10.1f}" for name, (cumulative, own) in slowest]
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict:
+        """Phases and every import, in milliseconds"""
+        return {
+            "phases": dict(self.phases),
+            "total_ms": (self._last - self._start) * 1000,
+            "imports": {name: {"cumulative_ms": cumulative, "self_ms": own}
+                        for name, (cumulative, own) in self.imports.items()},
+        }
+
+    def write(self) -> Path:
+        """Stop timing and write the report (text or JSON), returns its path"""
+        self.stop()
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.report_path.suffix == ".json":
+            content = json.dumps(self.to_dict(), indent=2)
+        else:
+            content = self.report()
+        self.report_path.write_text(content, encoding="utf-8")
+        return self.report_path
@@ -0,0 +1 @@
+"""Performance benchmarks run against synthetic portfolios"""
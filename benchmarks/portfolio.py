@@ -0,0 +1,373 @@
+#!/usr/bin/env python
+"""
+Synthetic portfolios for benchmarks, bulk inserted with Core statements.
+
+Run: python benchmarks/portfolio.py portefeuille.db [--scale 10] [--seed 0]
+     [--immeubles N] [--bureaux-par-immeuble N] [--locataires N] [--annees N]
+     [--irregularite 0.1] [--force]
+"""
+import argparse
+import heapq
+import random
+import sys
+import time
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+
+from app.models.entities import (
+    Immeuble, Bureau, Locataire, Contrat, Paiement, PaiementMois, AuditLog, Document,
+    StatutLocataire, TypePaiement, contrat_bureau
+)
+
+
+@dataclass(frozen=True)
+class PortfolioSize:
+    """Scale of a synthetic portfolio"""
+    immeubles: int
+    bureaux_par_immeuble: int
+    locataires: int
+    annees: int  # Years of payment history before today
+    irregularite: float = 0.1  # Share of rent months left unpaid, and of months paid late
+
+    def scaled(self, factor: int) -> "PortfolioSize":
+        """Same buildings and history with factor times more immeubles and tenants"""
+        return replace(self, immeubles=self.immeubles * factor, locataires=self.locataires * factor)
+
+
+# Order of magnitude of a real install, --scale multiplies it
+PRODUCTION = PortfolioSize(immeubles=3, bureaux_par_immeuble=12, locataires=40, annees=4)
+
+SIZES = {
+    "small": PortfolioSize(immeubles=5, bureaux_par_immeuble=8, locataires=30, annees=2),
+    "medium": PortfolioSize(immeubles=20, bureaux_par_immeuble=15, locataires=250, annees=3),
+    "large": PortfolioSize(immeubles=60, bureaux_par_immeuble=25, locataires=1200, annees=5),
+}
+
+# Shares of contracts and payments, fixed so that only the size knobs vary
+MULTI_BUREAU = 0.15  # Contracts renting 2 or 3 bureaux of the same immeuble
+RESILIATION = 0.25  # Contracts terminated before today, their bureaux are let again
+PAS_DE_PORTE = 0.3  # Contracts with a key money payment
+FRAIS = 0.3  # Rent payments also covering cleaning, water or electricity
+AUGMENTATION_ANS = 3  # Rent raised by 5% every 3 years
+RECU = 0.05  # Rent payments with a scanned receipt
+
+MOTIFS = ["Fin d'activite", "Demenagement", "Impayes", "Regroupement des locaux"]
+
+
+def create_schema(db_path: Path) -> None:
+    """Create an empty database at the Alembic head, like a real install"""
+    from alembic import command
+    from alembic.config import Config as AlembicConfig
+
+    alembic_cfg = AlembicConfig(str(project_root / "alembic.ini"))
+    alembic_cfg.set_main_option('script_location', str(project_root / "alembic"))
+    alembic_cfg.set_main_option('sqlalchemy.url', f"sqlite:///{db_path}".replace('%', '%%'))
+    command.upgrade(alembic_cfg, "head")
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _json(value: Any) -> Any:
+    """Value as stored in the audit columns by AuditService"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _moment(day: date, rng: random.Random) -> datetime:
+    """A working hour of day"""
+    return datetime(day.year, day.month, day.day, rng.randrange(8, 18), rng.randrange(60))
+
+
+class _Portfolio:
+    """Rows of every table, ids assigned in insertion order"""
+
+    def __init__(self, size: PortfolioSize, rng: random.Random, today: date):
+        self.size = size
+        self.rng = rng
+        self.today = today
+        self.immeubles: List[dict] = []
+        self.bureaux: List[dict] = []
+        self.locataires: List[dict] = []
+        self.contrats: List[dict] = []
+        self.liens: List[dict] = []
+        self.paiements: List[dict] = []
+        self.mois: List[dict] = []
+        self.documents: List[dict] = []
+        self.audit: List[dict] = []
+
+    def tables(self) -> list:
+        return [(Immeuble.__table__, self.immeubles), (Bureau.__table__, self.bureaux),
+                (Locataire.__table__, self.locataires), (Contrat.__table__, self.contrats),
+                (contrat_bureau, self.liens), (Paiement.__table__, self.paiements),
+                (PaiementMois.__table__, self.mois), (Document.__table__, self.documents),
+                (AuditLog.__table__, self.audit)]
+
+    def log(self, table_nom: str, row: dict, action: str = "CREATE", avant: Optional[dict] = None,
+            apres: Optional[dict] = None, created_at: Optional[datetime] = None) -> None:
+        """Audit entry of a write, as the flush hooks would record it"""
+        if action == "CREATE":
+            apres = row
+        self.audit.append({
+            "id": len(self.audit) + 1, "table_nom": table_nom, "entite_id": row["id"], "action": action,
+            "donnees_avant": {key: _json(value) for key, value in avant.items()} if avant else None,
+            "donnees_apres": {key: _json(value) for key, value in apres.items()},
+            "utilisateur": None, "created_at": created_at or row["created_at"],
+        })
+
+    def document(self, entity_type: str, entity_id: int, folder_path: str, name: str,
+                 created_at: datetime) -> None:
+        rng = self.rng
+        self.documents.append({
+            "id": len(self.documents) + 1, "entity_type": entity_type, "entity_id": entity_id,
+            "folder_path": folder_path, "filename": name, "original_name": name,
+            "file_type": "application/pdf", "file_size": rng.randrange(40_000, 2_000_000),
+            "description": None, "created_at": created_at, "updated_at": created_at,
+        })
+
+    def build_immeubles(self, debut: date) -> None:
+        rng, size = self.rng, self.size
+        for i in range(size.immeubles):
+            created_at = _moment(debut, rng)
+            immeuble = {"id": i + 1, "nom": f"Immeuble {i + 1}", "adresse": f"{i + 1} avenue Habib Bourguiba",
+                        "created_at": created_at, "updated_at": created_at}
+            self.immeubles.append(immeuble)
+            self.log("immeuble", immeuble)
+            self.document("immeuble", immeuble["id"], "Plans", f"plan_immeuble_{i + 1}.pdf", created_at)
+            for b in range(size.bureaux_par_immeuble):
+                bureau = {"id": len(self.bureaux) + 1, "immeuble_id": immeuble["id"],
+                          "numero": f"{b // 10 + 1}{b % 10:02d}", "etage": f"Etage {b // 10 + 1}",
+                          "surface_m2": float(rng.randrange(20, 120)), "est_disponible": True,
+                          "created_at": created_at, "updated_at": created_at}
+                self.bureaux.append(bureau)
+                self.log("bureau", bureau)
+
+    def build_contrats(self, debut_historique: date) -> None:
+        """Let the bureaux to the tenants in the order they arrive"""
+        rng, size = self.rng, self.size
+        libres = list(range(len(self.bureaux)))
+        rng.shuffle(libres)
+        liberes = []  # (date they are free again, bureau index) of terminated contracts
+        arrivees = sorted(_add_months(debut_historique, rng.randrange(12 * size.annees)) + timedelta(days=rng.randrange(28))
+                          for _ in range(size.locataires))
+
+        for debut in arrivees:
+            while liberes and liberes[0][0] <= debut:
+                libres.append(heapq.heappop(liberes)[1])
+            if not libres:
+                continue  # Full buildings: the tenant goes elsewhere
+            bureaux = [self.bureaux[libres.pop(rng.randrange(len(libres)))]]
+            if rng.random() < MULTI_BUREAU:
+                voisins = [i for i in libres if self.bureaux[i]["immeuble_id"] == bureaux[0]["immeuble_id"]]
+                for i in voisins[:rng.randrange(1, 3)]:
+                    libres.remove(i)
+                    bureaux.append(self.bureaux[i])
+
+            contrat, locataire = self.add_contrat(debut, bureaux)
+            if contrat["est_resilie"]:
+                libre_le = contrat["date_resiliation"] + timedelta(days=1)
+                for bureau in bureaux:
+                    heapq.heappush(liberes, (libre_le, bureau["id"] - 1))
+                self.resilier(contrat, locataire, bureaux)
+
+    def add_contrat(self, debut: date, bureaux: List[dict]):
+        rng, today = self.rng, self.today
+        created_at = _moment(debut, rng)
+        n = len(self.locataires) + 1
+        locataire = {"id": n, "nom": f"Locataire {n}", "telephone": f"+216 {rng.randrange(20000000, 99999999)}",
+                     "email": f"locataire{n}@exemple.tn", "cin": f"{n:08d}",
+                     "raison_sociale": f"Societe {n} SARL" if rng.random() < 0.6 else None,
+                     "statut": StatutLocataire.ACTIF, "created_at": created_at, "updated_at": created_at}
+        self.locataires.append(locataire)
+        self.log("locataire", locataire)
+        self.document("locataire", n, "Pièce d'identité", f"cin_{n}.pdf", created_at)
+
+        loyer = Decimal(sum(rng.randrange(300, 3000) for _ in bureaux))
+        pas_de_porte = Decimal(rng.randrange(2000, 20000)) if rng.random() < PAS_DE_PORTE else Decimal(0)
+        fin = today
+        resiliation = None
+        if rng.random() < RESILIATION:
+            resiliation = debut + timedelta(days=rng.randrange(180, 1500))
+            if resiliation < today:
+                fin = resiliation
+            else:
+                resiliation = None
+
+        # Rent raised every few years, the contract keeps the last amount
+        augmentations = []
+        montant = loyer
+        raise_day = _add_months(debut, 12 * AUGMENTATION_ANS)
+        while raise_day <= fin:
+            montant = (montant * Decimal("1.05")).quantize(Decimal(1))
+            augmentations.append((raise_day, montant))
+            raise_day = _add_months(raise_day, 12 * AUGMENTATION_ANS)
+
+        contrat = {"id": len(self.contrats) + 1, "locataire_id": n, "date_debut": debut,
+                   "date_derniere_augmentation": augmentations[-1][0] if augmentations else None,
+                   "montant_premier_mois": loyer, "montant_mensuel": montant, "montant_caution": loyer * 2,
+                   "montant_pas_de_porte": pas_de_porte, "compteur_steg": f"STEG-{n:06d}",
+                   "compteur_sonede": f"SONEDE-{n:06d}", "est_resilie": False, "date_resiliation": None,
+                   "motif_resiliation": None, "created_at": created_at, "updated_at": created_at}
+        self.contrats.append(contrat)
+        self.log("contrat", contrat)
+        self.document("contrat", contrat["id"], "Contrat Signé", f"contrat_{contrat['id']}.pdf", created_at)
+        for bureau in bureaux:
+            self.liens.append({"contrat_id": contrat["id"], "bureau_id": bureau["id"]})
+            bureau["est_disponible"] = False
+            self.log("bureau", bureau, "UPDATE", {"est_disponible": True}, {"est_disponible": False}, created_at)
+
+        self.add_paiement(contrat, TypePaiement.CAUTION, contrat["montant_caution"], debut)
+        if pas_de_porte:
+            self.add_paiement(contrat, TypePaiement.PAS_DE_PORTE, pas_de_porte, debut)
+        self.add_loyers(contrat, loyer, augmentations, fin)
+        if resiliation:
+            contrat["est_resilie"] = True
+            contrat["date_resiliation"] = resiliation
+            contrat["motif_resiliation"] = rng.choice(MOTIFS)
+        return contrat, locataire
+
+    def add_loyers(self, contrat: dict, loyer: Decimal, augmentations: list, fin: date) -> None:
+        """Monthly rent until fin, some months unpaid and some paid late several at once"""
+        rng, irregularite = self.rng, self.size.irregularite
+        periode = _add_months(contrat["date_debut"], 0)
+        while periode <= fin:
+            while augmentations and augmentations[0][0] <= periode:
+                loyer = augmentations.pop(0)[1]
+            if rng.random() < irregularite:
+                periode = _add_months(periode, 1)  # Never paid
+                continue
+            mois = rng.randrange(2, 4) if rng.random() < irregularite else 1
+            mois = max(1, min(mois, (fin.year - periode.year) * 12 + fin.month - periode.month + 1))
+            fin_periode = _add_months(periode, mois) - timedelta(days=1)
+            paye_le = min(_add_months(periode, mois - 1) + timedelta(days=rng.randrange(10)), self.today)
+            montant = loyer * mois
+            if periode <= contrat["date_debut"]:  # First month
+                montant += contrat["montant_premier_mois"] - loyer
+            frais = [Decimal(0)] * 3
+            if rng.random() < FRAIS:
+                frais = [Decimal(rng.randrange(0, 80)) for _ in range(3)]
+            paiement = self.add_paiement(contrat, TypePaiement.LOYER, montant + sum(frais), paye_le,
+                                         periode, fin_periode, frais)
+            for offset in range(mois):
+                month = _add_months(periode, offset)
+                self.mois.append({"paiement_id": paiement["id"], "contrat_id": contrat["id"],
+                                  "mois": PaiementMois.to_index(month.year, month.month)})
+            if rng.random() < RECU:
+                self.document("paiement", paiement["id"], "Reçus", f"recu_{paiement['id']}.pdf",
+                              paiement["created_at"])
+            periode = _add_months(periode, mois)
+
+    def add_paiement(self, contrat: dict, type_paiement: TypePaiement, montant: Decimal, paye_le: date,
+                     debut: Optional[date] = None, fin: Optional[date] = None, frais: Optional[list] = None) -> dict:
+        menage, sonede, steg = frais or [Decimal(0)] * 3
+        created_at = _moment(paye_le, self.rng)
+        paiement = {"id": len(self.paiements) + 1, "locataire_id": contrat["locataire_id"],
+                    "contrat_id": contrat["id"], "type_paiement": type_paiement, "montant_total": montant,
+                    "frais_menage": menage, "frais_sonede": sonede, "frais_steg": steg,
+                    "date_paiement": paye_le, "date_debut_periode": debut, "date_fin_periode": fin,
+                    "commentaire": None, "created_at": created_at, "updated_at": created_at}
+        self.paiements.append(paiement)
+        self.log("paiement", paiement)
+        return paiement
+
+    def resilier(self, contrat: dict, locataire: dict, bureaux: List[dict]) -> None:
+        """Audit entries of ContratRepository.resilier, the rows already hold the final state"""
+        at = _moment(contrat["date_resiliation"], self.rng)
+        contrat["updated_at"] = locataire["updated_at"] = at
+        changes = {key: contrat[key] for key in ("est_resilie", "date_resiliation", "motif_resiliation")}
+        self.log("contrat", contrat, "UPDATE", {"est_resilie": False, "date_resiliation": None,
+                                                "motif_resiliation": None}, changes, at)
+        for bureau in bureaux:
+            bureau["est_disponible"] = True
+            self.log("bureau", bureau, "UPDATE", {"est_disponible": False}, {"est_disponible": True}, at)
+        locataire["statut"] = StatutLocataire.HISTORIQUE
+        self.log("locataire", locataire, "UPDATE", {"statut": StatutLocataire.ACTIF},
+                 {"statut": StatutLocataire.HISTORIQUE}, at)
+
+
+def build_portfolio(db_path: Path, size: PortfolioSize, seed: int = 0,
+                    today: Optional[date] = None) -> Dict[str, int]:
+    """
+    Create a database holding a portfolio of the given size.
+
+    Tenants arrive over the years of history and rent one bureau, or two or
+    three of the same immeuble. A quarter of the contracts are terminated
+    and their bureaux let again; tenants arriving when every bureau is taken
+    are left out. Each contract has its caution, sometimes a pas de porte,
+    and rent paid monthly until today or its termination, with frais and
+    a raise every few years. size.irregularite of the months stay unpaid
+    and as many are paid late, two or three at once. Documents rows point
+    to no file. The same seed and today give the same rows.
+
+    Returns:
+        Number of rows inserted per table
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    create_schema(db_path)
+
+    portfolio = _Portfolio(size, rng, today)
+    debut_historique = _add_months(today, -12 * size.annees)
+    portfolio.build_immeubles(debut_historique)
+    portfolio.build_contrats(debut_historique)
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        with engine.begin() as connection:
+            for table, rows in portfolio.tables():
+                if rows:
+                    connection.execute(table.insert(), rows)
+    finally:
+        engine.dispose()
+    return {table.name: len(rows) for table, rows in portfolio.tables()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genere un portefeuille synthetique reproductible")
+    parser.add_argument("database", type=Path, help="Base SQLite a creer")
+    parser.add_argument("--size", choices=list(SIZES), help="Taille predefinie (defaut: production)")
+    parser.add_argument("--scale", type=int, default=1, help="Multiplie immeubles et locataires")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du generateur")
+    parser.add_argument("--immeubles", type=int)
+    parser.add_argument("--bureaux-par-immeuble", type=int)
+    parser.add_argument("--locataires", type=int)
+    parser.add_argument("--annees", type=int, help="Annees d'historique")
+    parser.add_argument("--irregularite", type=float, help="Part des mois impayes et des mois payes en retard")
+    parser.add_argument("--force", action="store_true", help="Remplace la base si elle existe")
+    args = parser.parse_args()
+
+    size = (SIZES[args.size] if args.size else PRODUCTION).scaled(args.scale)
+    knobs = {name: getattr(args, name) for name in
+             ("immeubles", "bureaux_par_immeuble", "locataires", "annees", "irregularite")}
+    size = replace(size, **{name: value for name, value in knobs.items() if value is not None})
+
+    if args.database.exists():
+        if not args.force:
+            parser.error(f"{args.database} existe deja (--force pour la remplacer)")
+        args.database.unlink()
+
+    start = time.perf_counter()
+    rows = build_portfolio(args.database, size, seed=args.seed)
+    print(f"Portefeuille genere en {time.perf_counter() - start:.1f} s dans {args.database}")
+    for table, count in rows.items():
+        print(f"  {table:<20}{count:>10}")
+
+
+if __name__ == "__main__":
+    main()
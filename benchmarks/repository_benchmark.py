@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+"""
+Repository and service micro-benchmarks: times the hot data-layer paths
+against synthetic portfolios and compares them with the baseline stored in
+benchmarks/baselines/.
+
+Run: python benchmarks/repository_benchmark.py [--sizes small medium] [--runs 7]
+     [--threshold 10] [--update-baseline] [--fail-on-regression]
+"""
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from benchmarks.portfolio import SIZES, build_portfolio, create_schema
+from benchmarks.startup_benchmark import RESULTS_DIR, git_commit
+from app.models.entities import Bureau, Contrat, Immeuble, Locataire, Paiement
+
+
+BASELINE = project_root / "benchmarks" / "baselines" / "repositories.json"
+DEFAULT_THRESHOLD = 10.0  # Percent: smaller changes are reported as noise
+# Portfolios are built as of this day so that arrears do not grow with the calendar
+PORTFOLIO_DAY = date(2026, 1, 1)
+SAMPLE = 50  # Contracts per get_loyers_impayes / resilier run
+SEARCHES = ["Locataire 12", "societe", "exemple", "0000"]
+
+
+@dataclass
+class Case:
+    """A timed operation: setup and teardown run outside the measure"""
+    name: str
+    run: Callable[[Any], None]
+    setup: Callable[[], Any] = lambda: None
+    teardown: Callable[[Any], None] = lambda state: None
+
+
+class Bench:
+    """Sessions on a generated portfolio, the contracts sampled and its export"""
+
+    def __init__(self, directory: Path, db_path: Path, seed: int):
+        self.directory = directory
+        self.engine = _engine(db_path)
+        self.sessions = _session_factory(self.engine)
+        self.documents = str(directory / "documents")
+        rng = random.Random(seed)
+        with self.sessions() as session:
+            actifs = session.scalars(select(Contrat.id).where(Contrat.est_resilie.is_(False))).all()
+            self.contrats = rng.sample(actifs, min(SAMPLE, len(actifs)))
+            from app.services.data_service import DataService
+            self.export = DataService(session, self.documents).export_all()
+
+        # Empty database at the Alembic head, copied for each import
+        self.empty = directory / "empty.db"
+        create_schema(self.empty)
+
+    def session(self) -> Session:
+        return self.sessions()
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+def _engine(db_path: Path):
+    """Writer engine configured like the application's"""
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+    return engine
+
+
+def _session_factory(engine) -> sessionmaker:
+    """Sessions with the audit hooks, without the repository cache: reads hit the database"""
+    from app.services.audit_service import install_audit_hooks
+    factory = sessionmaker(bind=engine, autoflush=False)
+    install_audit_hooks(factory)
+    return factory
+
+
+def _rolled_back(session: Session) -> None:
+    session.rollback()
+    session.close()
+
+
+def cases(bench: Bench) -> List[Case]:
+    """The benchmarked operations, writes are rolled back"""
+    from app.repositories.contrat_repository import ContratRepository
+    from app.repositories.locataire_repository import LocataireRepository
+    from app.repositories.paiement_repository import PaiementRepository
+    from app.services.audit_service import AuditService
+    from app.services.data_service import DataService
+
+    def loyers_impayes(session):
+        repo = PaiementRepository(session)
+        for contrat_id in bench.contrats:
+            repo.get_loyers_impayes(contrat_id, PORTFOLIO_DAY)
+
+    def new_tenants():
+        """A new immeuble and SAMPLE tenants without contract, each gets one of its bureaux"""
+        session = bench.session()
+        immeuble = Immeuble(nom="Immeuble benchmark")
+        bureaux = [Bureau(immeuble=immeuble, numero=f"B{i}") for i in range(SAMPLE)]
+        locataires = [Locataire(nom=f"Nouveau locataire {i}") for i in range(SAMPLE)]
+        session.add_all(bureaux + locataires)
+        session.flush()
+        return session, list(zip(locataires, bureaux))
+
+    def create_with_validation(state):
+        session, pairs = state
+        repo = ContratRepository(session)
+        for locataire, bureau in pairs:
+            repo.create_with_validation(locataire.id, PORTFOLIO_DAY, 800, bureaux=[bureau],
+                                        montant_premier_mois=800)
+
+    def resilier(session):
+        repo = ContratRepository(session)
+        for contrat_id in bench.contrats:
+            repo.resilier(contrat_id, PORTFOLIO_DAY, "Benchmark")
+
+    def search(session):
+        repo = LocataireRepository(session)
+        for term in SEARCHES:
+            repo.search(term)
+
+    def export_all(session):
+        DataService(session, bench.documents).export_all()
+
+    def import_setup():
+        path = bench.directory / "import.db"
+        shutil.copyfile(bench.empty, path)
+        engine = _engine(path)
+        return engine, _session_factory(engine)()
+
+    def import_all(state):
+        DataService(state[1], bench.documents).import_all(bench.export)
+
+    def import_teardown(state):
+        engine, session = state
+        session.close()
+        engine.dispose()
+        (bench.directory / "import.db").unlink()
+
+    def entities_setup():
+        session = bench.session()
+        return session, session.scalars(select(Paiement).limit(1000)).all()
+
+    def entity_to_dict(state):
+        for paiement in state[1]:
+            AuditService.entity_to_dict(paiement)
+
+    return [
+        Case("paiement.get_loyers_impayes", loyers_impayes, bench.session, Session.close),
+        Case("contrat.create_with_validation", create_with_validation, new_tenants,
+             lambda state: _rolled_back(state[0])),
+        Case("contrat.resilier", resilier, bench.session, _rolled_back),
+        Case("locataire.search", search, bench.session, Session.close),
+        Case("data.export_all", export_all, bench.session, Session.close),
+        Case("data.import_all", import_all, import_setup, import_teardown),
+        Case("audit.entity_to_dict", entity_to_dict, entities_setup, lambda state: state[0].close()),
+    ]
+
+
+def measure(case: Case, runs: int, warmup: int) -> Dict[str, float]:
+    """Median, min and max duration of a case in ms"""
+    samples = []
+    for i in range(warmup + runs):
+        state = case.setup()
+        try:
+            start = time.perf_counter()
+            case.run(state)
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            case.teardown(state)
+        if i >= warmup:
+            samples.append(elapsed)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "max_ms": max(samples)}
+
+
+def benchmark_size(name: str, runs: int, warmup: int, seed: int) -> dict:
+    """Build the portfolio of a size and time every case against it"""
+    with tempfile.TemporaryDirectory(prefix=f"repositories_{name}_") as tmp:
+        directory = Path(tmp)
+        db_path = directory / "portfolio.db"
+        rows = build_portfolio(db_path, SIZES[name], seed=seed, today=PORTFOLIO_DAY)
+        bench = Bench(directory, db_path, seed)
+        try:
+            timings = {case.name: measure(case, runs, warmup) for case in cases(bench)}
+        finally:
+            bench.close()
+    return {"rows": rows, "runs": runs, "cases": timings}
+
+
+def compare(current: float, baseline: float, threshold: float) -> str:
+    """Relative change against the baseline, or noise when under threshold percent"""
+    change = (current - baseline) / baseline * 100 if baseline else 0.0
+    if abs(change) < threshold:
+        return f"{change:+.1f}% (bruit)"
+    return f"{change:+.1f}% {'REGRESSION' if change > 0 else 'amelioration'}"
+
+
+def regressions(results: dict, baseline: Optional[dict], threshold: float) -> List[str]:
+    """Cases slower than the baseline by more than threshold percent"""
+    slower = []
+    for name, size in results["sizes"].items():
+        previous = (baseline or {}).get("sizes", {}).get(name, {}).get("cases", {})
+        for case, timing in size["cases"].items():
+            before = previous.get(case, {}).get("median_ms")
+            if before and (timing["median_ms"] - before) / before * 100 >= threshold:
+                slower.append(f"{name}/{case}")
+    return slower
+
+
+def print_results(results: dict, baseline: Optional[dict], threshold: float) -> None:
+    for name, size in results["sizes"].items():
+        previous = (baseline or {}).get("sizes", {}).get(name, {}).get("cases", {})
+        print(f"\n  {name} ({size['rows']['paiements']} paiements)")
+        for case, timing in size["cases"].items():
+            line = f"    {case:<34}{timing['median_ms']:>10.2f} ms"
+            before = previous.get(case, {}).get("median_ms")
+            if before is not None:
+                line += f"   (reference {before:.2f} ms, {compare(timing['median_ms'], before, threshold)})"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks des repositories et services")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"],
+                        help="Tailles de portefeuille a mesurer")
+    parser.add_argument("--runs", type=int, default=7, help="Mesures par operation")
+    parser.add_argument("--warmup", type=int, default=1, help="Mesures ignorees par operation")
+    parser.add_argument("--seed", type=int, default=0, help="Graine des portefeuilles")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Variation en %% en dessous de laquelle un ecart est du bruit")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="Resultats de reference")
+    parser.add_argument("--update-baseline", action="store_true", help="Ecrit les resultats comme reference")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Code de sortie 1 si une operation ralentit au-dela du seuil")
+    parser.add_argument("--output", type=Path, help="Fichier JSON des resultats")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    print(f"Micro-benchmarks ({args.runs} mesures par operation, seuil de bruit {args.threshold:g}%)")
+    results = {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "sizes": {name: benchmark_size(name, args.runs, args.warmup, args.seed) for name in args.sizes},
+    }
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else None
+    print_results(results, baseline, args.threshold)
+
+    output = args.baseline if args.update_baseline else args.output or RESULTS_DIR / f"repositories_{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\nResultats ecrits dans {output}")
+
+    slower = regressions(results, baseline, args.threshold)
+    if slower and not args.update_baseline:
+        print(f"\nRegressions au-dela de {args.threshold:g}%: {', '.join(slower)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
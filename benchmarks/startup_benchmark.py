@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Startup benchmark: launches main.py under the offscreen Qt platform against
+synthetic portfolios and records its --profile-startup phases.
+
+Run: python benchmarks/startup_benchmark.py [--sizes small medium] [--runs 5]
+     [--output results.json] [--compare previous.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import yaml
+
+from benchmarks.portfolio import SIZES, build_portfolio
+
+
+RESULTS_DIR = project_root / "benchmarks" / "results"
+WALL_PHASE = "wall"  # Process launch to exit, interpreter startup included
+TIMEOUT_S = 120
+
+
+def write_config(directory: Path, db_path: Path) -> None:
+    """config.yaml of the repository pointing at db_path, without SQL echo"""
+    with open(project_root / "config.yaml", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    config.setdefault('app', {})['debug'] = False
+    config.setdefault('database', {}).update({'type': 'sqlite', 'path': str(db_path)})
+    config.setdefault('maintenance', {})['enabled'] = False
+    with open(directory / "config.yaml", "w", encoding="utf-8") as f:
+        yaml.dump(config, f, allow_unicode=True, default_flow_style=False)
+
+
+def launch(directory: Path) -> Dict[str, float]:
+    """Start the application once, returns its phase timings in ms"""
+    report = directory / "profile.json"
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    start = time.perf_counter()
+    # The working directory holds config.yaml: the app finds it there
+    subprocess.run(
+        [sys.executable, str(project_root / "main.py"), f"--profile-startup={report}", "--exit-after-startup"],
+        cwd=directory, env=env, check=True, timeout=TIMEOUT_S,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    wall = (time.perf_counter() - start) * 1000
+    phases = json.loads(report.read_text(encoding="utf-8"))["phases"]
+    report.unlink()
+    return {**phases, WALL_PHASE: wall}
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Median, min and max of each phase"""
+    return {
+        phase: {
+            "median_ms": statistics.median(sample[phase] for sample in samples),
+            "min_ms": min(sample[phase] for sample in samples),
+            "max_ms": max(sample[phase] for sample in samples),
+        }
+        for phase in samples[0]
+    }
+
+
+def benchmark_size(name: str, runs: int, warmup: int, seed: int) -> dict:
+    """Build the portfolio of a size and time runs startups against it"""
+    with tempfile.TemporaryDirectory(prefix=f"startup_{name}_") as tmp:
+        directory = Path(tmp)
+        db_path = directory / "portfolio.db"
+        start = time.perf_counter()
+        rows = build_portfolio(db_path, SIZES[name], seed=seed)
+        print(f"  {name}: portefeuille genere en {time.perf_counter() - start:.1f} s ({rows['paiements']} paiements)")
+        write_config(directory, db_path)
+
+        for _ in range(warmup):
+            launch(directory)
+        samples = [launch(directory) for _ in range(runs)]
+    return {"rows": rows, "runs": runs, "phases": summarize(samples)}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict, baseline: Optional[dict] = None) -> None:
+    """Median of each phase per size, with the change against baseline"""
+    for name, size in results["sizes"].items():
+        previous = (baseline or {}).get("sizes", {}).get(name, {}).get("phases", {})
+        print(f"\n  {name}")
+        for phase, timing in size["phases"].items():
+            line = f"    {phase:<20}{timing['median_ms']:>10.1f} ms"
+            if phase in previous:
+                before = previous[phase]["median_ms"]
+                change = (timing["median_ms"] - before) / before * 100 if before else 0.0
+                line += f"   (avant {before:.1f} ms, {change:+.1f}%)"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du demarrage de l'application")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES),
+                        help="Tailles de portefeuille a mesurer")
+    parser.add_argument("--runs", type=int, default=5, help="Demarrages mesures par taille")
+    parser.add_argument("--warmup", type=int, default=1, help="Demarrages ignores par taille")
+    parser.add_argument("--seed", type=int, default=0, help="Graine des portefeuilles")
+    parser.add_argument("--output", type=Path, help="Fichier JSON des resultats")
+    parser.add_argument("--compare", type=Path, help="Resultats precedents a comparer")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    print(f"Benchmark de demarrage ({args.runs} mesures par taille)")
+    results = {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "sizes": {name: benchmark_size(name, args.runs, args.warmup, args.seed) for name in args.sizes},
+    }
+
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    print_results(results, baseline)
+
+    output = args.output or RESULTS_DIR / f"startup_{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\nResultats ecrits dans {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,19 @@ block_cipher = None
 
 spec_dir = SPECPATH
 
+# main.py skips Alembic when the database is at the revision baked into the
+# build: refuse to build if it does not match the migrations shipped
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+import sys
+sys.path.insert(0, spec_dir)
+from app.database.schema_version import HEAD_REVISION
+_alembic_cfg = AlembicConfig(os.path.join(spec_dir, 'alembic.ini'))
+_alembic_cfg.set_main_option('script_location', os.path.join(spec_dir, 'alembic'))
+_head = ScriptDirectory.from_config(_alembic_cfg).get_current_head()
+if _head != HEAD_REVISION:
+    raise SystemExit(f"app/database/schema_version.py: HEAD_REVISION is {HEAD_REVISION}, alembic head is {_head}")
+
 a = Analysis(
     [os.path.join(spec_dir, 'main.py')],
     pathex=[spec_dir],
@@ -36,6 +49,15 @@ a = Analysis(
         'dateutil',
         'logging.config',
         'mako',
+        # Views are imported by name on first display (main.VIEWS)
+        'app.ui.views.dashboard_view',
+        'app.ui.views.immeuble_view',
+        'app.ui.views.bureau_view',
+        'app.ui.views.locataire_view',
+        'app.ui.views.contrat_view',
+        'app.ui.views.paiement_view',
+        'app.ui.views.audit_view',
+        'app.ui.views.settings_view',
     ],
     hookspath=[],
     hooksconfig={},
@@ -5,19 +5,19 @@ Run: python main.py
 """
 import sys
 import os
-import subprocess
-import tempfile
-import ssl
 import json
 import threading
-import urllib.request
-import urllib.error
+from importlib import import_module
 from pathlib import Path
 from datetime import datetime
 
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
+# Started before the other imports so that they are timed
+from app.utils.startup_profile import StartupProfile
+startup_profile = StartupProfile.from_argv(sys.argv)
+
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QListWidget, QListWidgetItem, QStackedWidget,
                                QLabel, QFrame, QMessageBox, QMenuBar, QMenu, QPushButton)
@@ -29,14 +29,23 @@ from PySide6.QtGui import QIcon, QPixmap
 APP_VERSION = "0.2"
 GITHUB_REPO = "FayalaMohamed/gestion_locative"
 
-from app.ui.views.dashboard_view import DashboardView
-from app.ui.views.immeuble_view import ImmeubleView
-from app.ui.views.bureau_view import BureauView
-from app.ui.views.locataire_view import LocataireView
-from app.ui.views.contrat_view import ContratView
-from app.ui.views.paiement_view import PaiementView
-from app.ui.views.audit_view import AuditView
-from app.ui.views.settings_view import SettingsView
+from app.ui.maintenance_scheduler import MaintenanceScheduler
+
+# Content pages in sidebar order: MainWindow attribute, view module and class
+# (a view module is imported when its page is first built)
+VIEWS = [
+    ("dashboard", "app.ui.views.dashboard_view", "DashboardView"),
+    ("immeuble_view", "app.ui.views.immeuble_view", "ImmeubleView"),
+    ("bureau_view", "app.ui.views.bureau_view", "BureauView"),
+    ("locataire_view", "app.ui.views.locataire_view", "LocataireView"),
+    ("contrat_view", "app.ui.views.contrat_view", "ContratView"),
+    ("paiement_view", "app.ui.views.paiement_view", "PaiementView"),
+    ("audit_view", "app.ui.views.audit_view", "AuditView"),
+    ("settings_view", "app.ui.views.settings_view", "SettingsView"),
+]
+
+# Delay between the first paint and the warm-up of the other views
+WARM_UP_DELAY_MS = 1000
 
 
 def migrate_config():
@@ -63,12 +72,17 @@ def migrate_config():
 
 
 def run_database_migrations():
-    """Run Alembic migrations on startup"""
+    """Run Alembic migrations on startup (Alembic is only loaded when the schema is behind)"""
     import sys
     try:
+        from app.database.schema_version import is_current
+        from app.utils.config import Config
+        if is_current(Config()):
+            return
+        
         from alembic import command
         from alembic.config import Config as AlembicConfig
-        from sqlalchemy import create_engine, text
+        from sqlalchemy import create_engine, inspect
         
         # Determine the correct path to alembic.ini and alembic folder
         if getattr(sys, 'frozen', False):
@@ -86,30 +100,29 @@ def run_database_migrations():
         
         # Check if database exists and has tables but no alembic_version
         # This handles databases created before Alembic was set up
-        from app.utils.config import Config
+        from app.database.connection import database_url
         config = Config()
-        db_path = Path(config.database_path)
-        
-        # Ensure data directory exists
-        db_path.parent.mkdir(parents=True, exist_ok=True)
+        is_sqlite = config.get('database', 'type', default='sqlite') != 'postgresql'
+        if is_sqlite:
+            db_path = Path(config.database_path)
+            # Ensure data directory exists
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            url = f'sqlite:///{db_path}'
+        else:
+            url = database_url(config)
         
-        # Set the correct database URL for Alembic
-        alembic_cfg.set_main_option('sqlalchemy.url', f'sqlite:///{db_path}')
+        # Set the correct database URL for Alembic (% is an interpolation character there)
+        alembic_cfg.set_main_option('sqlalchemy.url', url.replace('%', '%%'))
         
-        if db_path.exists():
-            engine = create_engine(f"sqlite:///{db_path}")
+        if not is_sqlite or db_path.exists():
+            engine = create_engine(url)
             with engine.connect() as conn:
                 # Check if immeubles table exists (main table)
-                result = conn.execute(text(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name='immeubles'"
-                ))
-                table_exists = result.fetchone() is not None
+                table_exists = inspect(conn).has_table('immeubles')
                 
                 # Check if alembic_version table exists
-                result = conn.execute(text(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name='alembic_version'"
-                ))
-                alembic_version_exists = result.fetchone() is not None
+                alembic_version_exists = inspect(conn).has_table('alembic_version')
+            engine.dispose()
             
             # If tables exist but alembic_version doesn't, this is a v0.1 database
             # created without Alembic. Stamp it with the first migration revision
@@ -334,6 +347,9 @@ class MainWindow(QMainWindow):
         
     def check_for_updates(self):
         """Check for updates from GitHub"""
+        import ssl
+        import urllib.request
+        
         checking_msg = None
         try:
             # Show checking message
@@ -435,6 +451,12 @@ class MainWindow(QMainWindow):
     
     def download_and_install_update(self, download_url: str):
         """Download update and auto-restart"""
+        import ssl
+        import subprocess
+        import tempfile
+        import urllib.error
+        import urllib.request
+        
         try:
             # Check if running as compiled executable
             if not getattr(sys, 'frozen', False):
@@ -732,6 +754,9 @@ del "%~f0" 2>>"%LOG_FILE%"
     def check_for_updates_silent(self):
         """Check for updates silently in the background"""
         def check_update_worker():
+            import ssl
+            import urllib.request
+            
             try:
                 # Fetch latest release from GitHub
                 url = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
@@ -881,35 +906,11 @@ del "%~f0" 2>>"%LOG_FILE%"
         self.content = QStackedWidget()
         layout.addWidget(self.content)
         
-        self.dashboard = DashboardView()
-        self.content.addWidget(self.dashboard)
-        
-        self.immeuble_view = ImmeubleView()
-        self.content.addWidget(self.immeuble_view)
-        
-        self.bureau_view = BureauView()
-        self.content.addWidget(self.bureau_view)
-        
-        self.locataire_view = LocataireView()
-        self.content.addWidget(self.locataire_view)
-        
-        self.contrat_view = ContratView()
-        self.content.addWidget(self.contrat_view)
-        
-        self.paiement_view = PaiementView()
-        self.content.addWidget(self.paiement_view)
-        
-        self.audit_view = AuditView()
-        self.content.addWidget(self.audit_view)
-        
-        self.settings_view = SettingsView()
-        self.content.addWidget(self.settings_view)
-        
-        self.immeuble_view.data_changed.connect(self.refresh_current_view)
-        self.locataire_view.data_changed.connect(self.refresh_current_view)
-        self.contrat_view.data_changed.connect(self.refresh_current_view)
-        self.paiement_view.data_changed.connect(self.refresh_current_view)
-        self.paiement_view.data_changed.connect(self.contrat_view.refresh_current_contract_details)
+        # One placeholder per page, replaced by its view on first navigation
+        self._views = {}
+        for _ in VIEWS:
+            self.content.addWidget(QWidget())
+        self.view(0)
         
         self.sidebar.currentRowChanged.connect(self._on_sidebar_changed)
         self.sidebar_bottom.currentRowChanged.connect(self._on_bottom_sidebar_changed)
@@ -917,21 +918,66 @@ del "%~f0" 2>>"%LOG_FILE%"
         # Check for updates after 5 seconds (give UI time to load)
         QTimer.singleShot(5000, self.check_for_updates_silent)
         
+        # Database maintenance in the background while the user is idle
+        self.maintenance_scheduler = MaintenanceScheduler(self)
+        
+        # Build the other views once the window is painted
+        from app.utils.config import Config
+        if Config.get_instance().get('ui', 'warm_up_views', default=False):
+            QTimer.singleShot(WARM_UP_DELAY_MS, self._warm_up_next_view)
+        
+    def __getattr__(self, name):
+        # self.dashboard, self.contrat_view... build their view on first access
+        for index, (attribute, _, _) in enumerate(VIEWS):
+            if attribute == name:
+                return self.view(index)
+        raise AttributeError(name)
+    
+    def view(self, index):
+        """View of a content page, built (and loaded) on first use"""
+        view = self._views.get(index)
+        if view is None:
+            placeholder = self.content.widget(index)
+            is_current = self.content.currentIndex() == index
+            _, module, class_name = VIEWS[index]
+            view = getattr(import_module(module), class_name)()
+            self._views[index] = view
+            self.content.insertWidget(index, view)
+            self.content.removeWidget(placeholder)
+            placeholder.deleteLater()
+            if is_current:
+                self.content.setCurrentIndex(index)
+        return view
+    
+    def _warm_up_next_view(self):
+        """Build one view not opened yet, one per event loop turn"""
+        for index in range(len(VIEWS)):
+            if index not in self._views:
+                self.view(index)
+                QTimer.singleShot(0, self._warm_up_next_view)
+                return
+    
+    def _show_page(self, index):
+        # A view built now loads its data itself
+        built = index in self._views
+        self.view(index)
+        self.content.setCurrentIndex(index)
+        if built:
+            self.refresh_current_view()
+    
     def _on_sidebar_changed(self, row):
         if row >= 0:
             self.sidebar_bottom.blockSignals(True)
             self.sidebar_bottom.setCurrentRow(-1)
             self.sidebar_bottom.blockSignals(False)
-            self.content.setCurrentIndex(row)
-            self.refresh_current_view()
+            self._show_page(row)
     
     def _on_bottom_sidebar_changed(self, row):
         if row >= 0:
             self.sidebar.blockSignals(True)
             self.sidebar.setCurrentRow(-1)
             self.sidebar.blockSignals(False)
-            self.content.setCurrentIndex(6 + row)
-            self.refresh_current_view()
+            self._show_page(6 + row)
         
     def refresh_current_view(self):
         current_widget = self.content.currentWidget()
@@ -940,16 +986,37 @@ del "%~f0" 2>>"%LOG_FILE%"
         elif hasattr(current_widget, 'refresh_data'):
             current_widget.refresh_data()
         
-        if current_widget == self.contrat_view and hasattr(current_widget, 'refresh_current_contract_details'):
+        if hasattr(current_widget, 'refresh_current_contract_details'):
             current_widget.refresh_current_contract_details()
 
 
 if __name__ == "__main__":
+    startup_profile.mark("imports")
     # Run migrations first
     run_database_migrations()
+    startup_profile.mark("migrations")
     migrate_config()
+    startup_profile.mark("config")
     
     app = QApplication(sys.argv)
+    startup_profile.mark("qapplication")
+    from app.utils.config import Config
+    if Config().is_debug:
+        # Statements of one UI event are counted together by the N+1 detector
+        from app.database import query_monitor
+        query_monitor.group_by_event_loop(lambda close: QTimer.singleShot(0, close))
     window = MainWindow()
+    startup_profile.mark("main_window")
     window.show()
+    
+    if startup_profile.enabled:
+        app.processEvents()
+        startup_profile.mark("first_paint")
+        from app.ui.loader import wait_for_loads
+        wait_for_loads()
+        startup_profile.mark("dashboard_data")
+        print(f"Profil de démarrage écrit dans {startup_profile.write()}")
+        if startup_profile.exit_after_startup:
+            sys.exit(0)
+    
     sys.exit(app.exec())
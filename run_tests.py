@@ -13,7 +13,25 @@ TEST_FILES = [
     ('test_crud.py', 'CRUD Operations'),
     ('test_backup.py', 'Backup Functionality'),
     ('test_relation.py', 'Relationship Tests'),
+    ('test_paiement_mois.py', 'Paiement Coverage'),
+    ('test_arrears_service.py', 'Arrears Service'),
+    ('test_dashboard_service.py', 'Dashboard Loading'),
+    ('test_search_index.py', 'Search Index'),
+    ('test_query_plans.py', 'Query Plans'),
+    ('test_postgresql.py', 'PostgreSQL Backend'),
+    ('test_connection_routing.py', 'Connection Routing'),
+    ('test_repository_cache.py', 'Repository Cache'),
+    ('test_change_bus.py', 'Change Bus'),
+    ('test_maintenance.py', 'Database Maintenance'),
+    ('test_audit_hooks.py', 'Audit Hooks'),
+    ('test_audit_archive.py', 'Audit Archive'),
     ('test_update_system.py', 'Update System'),
+    ('test_startup_profile.py', 'Startup Profile'),
+    ('test_schema_version.py', 'Schema Version'),
+    ('test_portfolio.py', 'Synthetic Portfolio'),
+    ('test_startup_benchmark.py', 'Startup Benchmark'),
+    ('test_repository_benchmark.py', 'Repository Benchmark'),
+    ('test_query_monitor.py', 'Query Monitor'),
 ]
 
 # Non-test utilities (not run as tests)
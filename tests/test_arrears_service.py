@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Arrears service test script
+Verifies unpaid months computed for several contracts in one pass
+"""
+import sys
+from pathlib import Path
+from datetime import date
+from decimal import Decimal
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database.connection import get_database
+from app.models.entities import Locataire, Contrat
+from app.repositories.paiement_repository import PaiementRepository
+from app.services.arrears_service import ArrearsService
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def test_arrears(locataire_id: int, actif_id: int, resilie_id: int):
+    """Test batch arrears for an active and a terminated contract"""
+    print_section("MOIS IMPAYES (CALCUL GROUPE)")
+
+    db = get_database()
+    upto = date(2024, 6, 15)
+
+    with db.session_scope() as session:
+        repo = PaiementRepository(session)
+        repo.create_paiement_loyer(
+            locataire_id=locataire_id,
+            contrat_id=actif_id,
+            montant_total=Decimal("2000.000"),
+            date_paiement=date(2024, 2, 1),
+            date_debut_periode=date(2024, 2, 1),
+            date_fin_periode=date(2024, 3, 31)
+        )
+
+        service = ArrearsService(session)
+
+        print("\n1. Calcul pour les deux contrats...")
+        impayes = service.compute([actif_id, resilie_id], upto=upto)
+        print(f"   Actif: {impayes[actif_id]}")
+        print(f"   Resilie: {impayes[resilie_id]}")
+        assert impayes[actif_id] == [(2024, 1), (2024, 4), (2024, 5), (2024, 6)]
+        # Terminated in March: nothing is owed after the resiliation month
+        assert impayes[resilie_id] == [(2024, 1), (2024, 2), (2024, 3)]
+
+        print("\n2. Nombre de mois impayes...")
+        counts = service.counts([actif_id, resilie_id], upto=upto)
+        print(f"   {counts}")
+        assert counts == {actif_id: 4, resilie_id: 3}
+
+        print("\n3. Coherence avec le repository...")
+        assert repo.get_loyers_impayes(actif_id, upto) == impayes[actif_id]
+
+        print("\n4. Contrat pas encore commence...")
+        assert service.compute([actif_id], upto=date(2023, 12, 31)) == {actif_id: []}
+        assert service.compute([]) == {}
+
+        print("\n   [OK] Calcul des impayes correct")
+
+
+def main():
+    """Run arrears service tests"""
+    db = get_database()
+    locataire_id = None
+
+    try:
+        with db.session_scope() as session:
+            locataire = Locataire(nom="Test Impayes")
+            session.add(locataire)
+            session.flush()
+            actif = Contrat(
+                locataire_id=locataire.id,
+                date_debut=date(2024, 1, 10),
+                montant_premier_mois=Decimal("1000.000"),
+                montant_mensuel=Decimal("1000.000")
+            )
+            resilie = Contrat(
+                locataire_id=locataire.id,
+                date_debut=date(2024, 1, 1),
+                montant_premier_mois=Decimal("1000.000"),
+                montant_mensuel=Decimal("1000.000"),
+                est_resilie=True,
+                date_resiliation=date(2024, 3, 31)
+            )
+            session.add_all([actif, resilie])
+            session.flush()
+            locataire_id, actif_id, resilie_id = locataire.id, actif.id, resilie.id
+
+        test_arrears(locataire_id, actif_id, resilie_id)
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        if locataire_id:
+            with db.session_scope() as session:
+                locataire = session.get(Locataire, locataire_id)
+                if locataire:
+                    session.delete(locataire)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+"""
+Audit archive test script
+Verifies old audit entries move to compressed yearly archives and stay queryable
+"""
+import sys
+import json
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import select, func
+
+from app.database.connection import get_database
+from app.models.entities import AuditLog
+from app.services.audit_archive_service import (
+    MAX_ARCHIVE_FILES, AuditArchiveService, audit_logs_all, decompress_payload
+)
+
+TEST_TABLE = "test_audit_archive"
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def test_archive(archive_dir: str):
+    """Test moving entries of two old years and querying across tiers"""
+    print_section("ARCHIVAGE DE L'HISTORIQUE")
+
+    db = get_database()
+    before = datetime(2002, 1, 1)
+
+    print("\n1. Archivage des entrees anterieures a 2002...")
+    with db.session_scope() as session:
+        moved = AuditArchiveService(session, archive_dir=archive_dir).archive(before=before)
+    print(f"   {moved} entree(s) archivee(s)")
+    assert moved == 4
+
+    with db.session_scope() as session:
+        hot = session.execute(
+            select(func.count()).select_from(AuditLog).where(AuditLog.table_nom == TEST_TABLE)
+        ).scalar()
+    assert hot == 1, f"Expected 1 hot entry, got {hot}"
+
+    print("\n2. Fichiers d'archive annuels compresses...")
+    files = sorted(p.name for p in Path(archive_dir).iterdir())
+    print(f"   {files}")
+    assert files == ["audit_2000.db", "audit_2001.db"]
+    with sqlite3.connect(str(Path(archive_dir) / "audit_2001.db")) as connection:
+        payload = connection.execute(
+            "SELECT donnees_avant FROM audit_archive WHERE entite_id = 3"
+        ).fetchone()[0]
+    assert isinstance(payload, bytes)
+    assert json.loads(decompress_payload(payload)) == {"nom": "Entree 3", "note": "x" * 200}
+
+    print("\n3. Requete sur tous les niveaux...")
+    with db.session_scope() as session:
+        service = AuditArchiveService(session, archive_dir=archive_dir)
+        service.attach_archives()
+        rows = session.execute(
+            select(audit_logs_all.c.entite_id, audit_logs_all.c.created_at, audit_logs_all.c.donnees_avant)
+            .where(audit_logs_all.c.table_nom == TEST_TABLE)
+            .order_by(audit_logs_all.c.created_at)
+        ).all()
+        assert [r.entite_id for r in rows] == [0, 1, 2, 3, 4]
+        assert rows[0].created_at == datetime(2000, 3, 1, 12, 0)
+        assert json.loads(rows[3].donnees_avant)["nom"] == "Entree 3"
+
+        found = session.execute(
+            select(audit_logs_all.c.entite_id)
+            .where(audit_logs_all.c.donnees_avant.ilike('%Entree 2"%'))
+        ).scalars().all()
+        assert found == [2], f"Unexpected search result {found}"
+        assert service.counts()["2001"] == 2
+        service.detach_archives()
+
+    print("\n4. Nouvel archivage sans doublons...")
+    with db.session_scope() as session:
+        assert AuditArchiveService(session, archive_dir=archive_dir).archive(before=before) == 0
+
+    print("\n   [OK] Archivage de l'historique correct")
+
+
+def test_many_years(archive_dir: str):
+    """Test that more years than SQLite can attach are merged and stay queryable"""
+    print_section("ARCHIVES DE NOMBREUSES ANNEES")
+
+    db = get_database()
+    years = list(range(1980, 1992))
+    with db.session_scope() as session:
+        session.add_all([
+            AuditLog(table_nom=TEST_TABLE, entite_id=year, action="UPDATE",
+                     donnees_avant={"annee": year}, created_at=datetime(year, 6, 1))
+            for year in years
+        ])
+
+    print(f"\n1. Archivage de {len(years)} annees...")
+    with db.session_scope() as session:
+        service = AuditArchiveService(session, archive_dir=archive_dir)
+        assert service.archive(before=datetime(1992, 1, 1)) == len(years)
+        # Archives are detached once written
+        assert service._attached() == []
+    files = sorted(p.name for p in Path(archive_dir).iterdir())
+    print(f"   {files}")
+    assert len(files) == MAX_ARCHIVE_FILES
+    assert files[0] == "audit_1980_1984.db"
+
+    print("\n2. Entree tardive d'une annee fusionnee...")
+    with db.session_scope() as session:
+        session.add(AuditLog(table_nom=TEST_TABLE, entite_id=0, action="UPDATE",
+                             created_at=datetime(1981, 2, 1)))
+    with db.session_scope() as session:
+        assert AuditArchiveService(session, archive_dir=archive_dir).archive(before=datetime(1992, 1, 1)) == 1
+    assert len(list(Path(archive_dir).iterdir())) == MAX_ARCHIVE_FILES
+
+    print("\n3. Requete sur toutes les annees...")
+    with db.session_scope(readonly=True) as session:
+        service = AuditArchiveService(session, archive_dir=archive_dir)
+        service.attach_archives()
+        found = session.execute(
+            select(audit_logs_all.c.entite_id).where(
+                audit_logs_all.c.table_nom == TEST_TABLE, audit_logs_all.c.created_at < datetime(1992, 1, 1)
+            ).order_by(audit_logs_all.c.created_at)
+        ).scalars().all()
+        assert found == [1980, 0, *years[1:]], found
+        counts = service.counts()
+        assert counts["1981"] == 2 and counts["1991"] == 1, counts
+        service.detach_archives()
+
+    print("\n4. Fusion avec des lecteurs ayant attache les archives...")
+    with db.session_scope(readonly=True) as session:
+        AuditArchiveService(session, archive_dir=archive_dir).attach_archives()
+        reader = session.connection().connection.driver_connection
+    with db.session_scope() as session:
+        session.add(AuditLog(table_nom=TEST_TABLE, entite_id=1979, action="UPDATE",
+                             created_at=datetime(1979, 6, 1)))
+    with db.session_scope() as session:
+        assert AuditArchiveService(session, archive_dir=archive_dir).archive(before=datetime(1992, 1, 1)) == 1
+    files = sorted(p.name for p in Path(archive_dir).iterdir())
+    assert len(files) == MAX_ARCHIVE_FILES and files[0] == "audit_1979_1984.db", files
+    # The pooled reader holding audit_1980_1984.db was closed before the merge
+    try:
+        reader.execute("SELECT 1")
+        raise AssertionError("Pooled reader still open")
+    except sqlite3.ProgrammingError:
+        pass
+    with db.session_scope(readonly=True) as session:
+        service = AuditArchiveService(session, archive_dir=archive_dir)
+        service.attach_archives()
+        found = session.execute(
+            select(audit_logs_all.c.entite_id).where(
+                audit_logs_all.c.table_nom == TEST_TABLE, audit_logs_all.c.created_at < datetime(1981, 1, 1)
+            ).order_by(audit_logs_all.c.created_at)
+        ).scalars().all()
+        assert found == [1979, 1980], found
+        service.detach_archives()
+
+    print("\n   [OK] Annees fusionnees")
+
+
+def main():
+    """Run audit archive tests"""
+    db = get_database()
+    archive_dir = tempfile.mkdtemp(prefix="audit_archives_")
+    many_years_dir = tempfile.mkdtemp(prefix="audit_archives_")
+
+    try:
+        with db.session_scope() as session:
+            session.add_all([
+                AuditLog(
+                    table_nom=TEST_TABLE,
+                    entite_id=i,
+                    action="UPDATE",
+                    donnees_avant={"nom": f"Entree {i}", "note": "x" * 200},
+                    created_at=created_at
+                )
+                for i, created_at in enumerate([
+                    datetime(2000, 3, 1, 12, 0),
+                    datetime(2000, 11, 5, 9, 30),
+                    datetime(2001, 1, 1, 0, 0),
+                    datetime(2001, 12, 31, 23, 59),
+                    datetime(2002, 1, 1, 0, 0),
+                ])
+            ])
+
+        test_archive(archive_dir)
+        test_many_years(many_years_dir)
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        with db.session_scope() as session:
+            AuditArchiveService(session, archive_dir=archive_dir).detach_archives()
+            session.query(AuditLog).filter(AuditLog.table_nom == TEST_TABLE).delete()
+        shutil.rmtree(archive_dir, ignore_errors=True)
+        shutil.rmtree(many_years_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
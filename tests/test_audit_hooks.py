@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+"""
+Audit hooks test script
+Verifies audit entries are collected per flush and written in one executemany,
+that entity snapshots never lazy-load relationships and that the bureaux of a
+contract are recorded
+"""
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import and_, event, func, inspect, or_
+
+from app.database.connection import get_database
+from app.models.entities import AuditLog, Bureau, Contrat, Immeuble, Locataire
+from app.repositories.locataire_repository import LocataireRepository
+from app.services.audit_service import AuditService, disable_audit
+
+TEST_NOM = "Test Audit Hooks"
+FIRST_AUDIT_ID = 0
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def executed_statements(db, action):
+    """Run action and return the (statement, executemany) pairs it executed"""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, executemany))
+
+    event.listen(db.engine, "before_cursor_execute", on_execute)
+    try:
+        action()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", on_execute)
+    return statements
+
+
+def audit_entries(session, ids):
+    """Get the audit entries of the given locataires written by this test, oldest first"""
+    # Ids of deleted rows are reused: ignore entries left by earlier tests
+    return session.query(AuditLog).filter(
+        AuditLog.table_nom == "locataire", AuditLog.entite_id.in_(ids),
+        AuditLog.id > FIRST_AUDIT_ID
+    ).order_by(AuditLog.id).all()
+
+
+def test_audit_hooks(ids: list):
+    """Test batched creation, column-level updates and deletion entries"""
+    print_section("JOURNAL D'AUDIT PAR FLUSH")
+
+    db = get_database()
+
+    print("\n1. Creation de 20 locataires en un flush...")
+
+    def create():
+        with db.session_scope() as session:
+            locataires = [Locataire(nom=TEST_NOM, telephone=str(i)) for i in range(20)]
+            session.add_all(locataires)
+            session.flush()
+            ids.extend(l.id for l in locataires)
+
+    inserts = [(statement, many) for statement, many in executed_statements(db, create)
+               if statement.startswith("INSERT INTO audit_logs")]
+    print(f"   {len(inserts)} insertion(s) dans audit_logs")
+    assert len(inserts) == 1 and inserts[0][1], "Expected a single executemany"
+    with db.session_scope() as session:
+        entries = audit_entries(session, ids)
+        assert len(entries) == 20
+        assert entries[0].action == "CREATE"
+        assert entries[0].donnees_apres["telephone"] == "0"
+
+    print("\n2. Modification: seules les colonnes changees...")
+    with db.session_scope() as session:
+        repo = LocataireRepository(session)
+        locataire = repo.get_by_id(ids[0])
+        repo.update(locataire, telephone="99", nom=TEST_NOM)
+        # No change at all: nothing is recorded
+        repo.update(repo.get_by_id(ids[1]), nom=TEST_NOM)
+    with db.session_scope() as session:
+        updates = [e for e in audit_entries(session, ids) if e.action == "UPDATE"]
+        assert len(updates) == 1, f"Expected 1 update entry, got {len(updates)}"
+        assert updates[0].donnees_avant["telephone"] == "0"
+        assert updates[0].donnees_apres["telephone"] == "99"
+        assert "nom" not in updates[0].donnees_apres
+        print(f"   {updates[0].donnees_avant} -> {updates[0].donnees_apres}")
+
+    print("\n3. Suppression avec l'etat enregistre...")
+    with db.session_scope() as session:
+        LocataireRepository(session).delete_by_id(ids[0])
+    with db.session_scope() as session:
+        deletes = [e for e in audit_entries(session, ids) if e.action == "DELETE"]
+        assert len(deletes) == 1
+        assert deletes[0].entite_id == ids[0]
+        assert deletes[0].donnees_avant["telephone"] == "99"
+
+    print("\n4. Session sans audit...")
+    with db.session_scope() as session:
+        disable_audit(session)
+        LocataireRepository(session).delete_by_id(ids[1])
+    with db.session_scope() as session:
+        deletes = [e for e in audit_entries(session, ids) if e.action == "DELETE"]
+        assert len(deletes) == 1
+
+    print("\n5. Audit retabli apres une restauration dans la session...")
+    from app.services.data_service import DataService
+    with db.session_scope() as session:
+        DataService(session).import_all({"entities": {}})
+        assert session.info.get("audit", True), "import_all left the session unaudited"
+        LocataireRepository(session).update(session.get(Locataire, ids[3]), telephone="42")
+    with db.session_scope() as session:
+        updates = [e for e in audit_entries(session, ids) if e.action == "UPDATE" and e.entite_id == ids[3]]
+        assert len(updates) == 1 and updates[0].donnees_apres["telephone"] == "42"
+
+    print("\n   [OK] Journal d'audit correct")
+
+
+def test_collection_changes(created: dict):
+    """Test that the bureaux of a contract are recorded as id lists and an expired bureau's deletion in full"""
+    print_section("BUREAUX D'UN CONTRAT")
+
+    db = get_database()
+    with db.session_scope() as session:
+        immeuble = Immeuble(nom=TEST_NOM)
+        bureaux = [Bureau(immeuble=immeuble, numero=f"AUD-{i}") for i in range(3)]
+        locataire = Locataire(nom=TEST_NOM)
+        contrat = Contrat(locataire=locataire, date_debut=date(2024, 1, 1),
+                          montant_premier_mois=Decimal("500"), montant_mensuel=Decimal("500"),
+                          bureaux=bureaux[:2])
+        session.add(contrat)
+        session.flush()
+        created.update(immeuble=immeuble.id, contrat=contrat.id, bureaux=[b.id for b in bureaux])
+    b1, b2, b3 = created["bureaux"]
+
+    def contrat_entries(session, action):
+        return session.query(AuditLog).filter(
+            AuditLog.table_nom == "contrat", AuditLog.entite_id == created["contrat"],
+            AuditLog.action == action, AuditLog.id > FIRST_AUDIT_ID
+        ).order_by(AuditLog.id).all()
+
+    print("\n1. Creation avec ses bureaux...")
+    with db.session_scope() as session:
+        creates = contrat_entries(session, "CREATE")
+        assert len(creates) == 1 and creates[0].donnees_apres["bureaux"] == sorted([b1, b2])
+
+    print("\n2. Bureau remplace...")
+    with db.session_scope() as session:
+        contrat = session.get(Contrat, created["contrat"])
+        contrat.bureaux.remove(session.get(Bureau, b1))
+        contrat.bureaux.append(session.get(Bureau, b3))
+    with db.session_scope() as session:
+        updates = contrat_entries(session, "UPDATE")
+        assert len(updates) == 1, f"Expected 1 update entry, got {len(updates)}"
+        # Ids are sorted (the bureaux are not inserted in creation order)
+        assert updates[0].donnees_avant == {"bureaux": sorted([b1, b2])}
+        assert updates[0].donnees_apres == {"bureaux": sorted([b2, b3])}
+        print(f"   {updates[0].donnees_avant} -> {updates[0].donnees_apres}")
+
+    print("\n3. Suppression d'un bureau expire par un commit...")
+    with db.session_scope() as session:
+        bureau = session.get(Bureau, b1)
+        session.commit()
+        assert inspect(bureau).expired_attributes
+        session.delete(bureau)
+    with db.session_scope() as session:
+        deletes = session.query(AuditLog).filter(
+            AuditLog.table_nom == "bureau", AuditLog.entite_id == b1,
+            AuditLog.action == "DELETE", AuditLog.id > FIRST_AUDIT_ID
+        ).all()
+        assert len(deletes) == 1
+        assert deletes[0].donnees_avant["numero"] == "AUD-0", deletes[0].donnees_avant
+        assert deletes[0].donnees_avant["immeuble_id"] == created["immeuble"]
+
+    print("\n   [OK] Bureaux enregistres")
+
+
+def test_snapshot_serializer(ids: list):
+    """Test that snapshots read columns only and never lazy-load relationships"""
+    print_section("INSTANTANES SANS CHARGEMENT")
+
+    db = get_database()
+    with db.session_scope() as session:
+        locataire = session.get(Locataire, ids[2])
+        snapshot = {}
+
+        print("\n1. Instantane d'un locataire...")
+        executed = executed_statements(db, lambda: snapshot.update(AuditService.entity_to_dict(locataire)))
+        print(f"   {snapshot}")
+        assert executed == [], f"Snapshot ran {len(executed)} statement(s)"
+        assert "contrats" not in snapshot and "paiements" not in snapshot
+        assert snapshot["statut"] == "actif"
+        assert isinstance(snapshot["created_at"], str)
+
+    print("\n   [OK] Instantanes limites aux colonnes")
+
+
+def main():
+    """Run audit hooks tests"""
+    global FIRST_AUDIT_ID
+    db = get_database()
+    ids = []
+    created = {}
+
+    with db.session_scope() as session:
+        FIRST_AUDIT_ID = session.query(func.max(AuditLog.id)).scalar() or 0
+
+    try:
+        test_audit_hooks(ids)
+        test_snapshot_serializer(ids)
+        test_collection_changes(created)
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        with db.session_scope() as session:
+            disable_audit(session)
+            if "contrat" in created:
+                session.delete(session.get(Contrat, created["contrat"]))
+                session.delete(session.get(Immeuble, created["immeuble"]))
+                session.flush()
+                session.query(AuditLog).filter(
+                    AuditLog.id > FIRST_AUDIT_ID,
+                    or_(and_(AuditLog.table_nom == "contrat", AuditLog.entite_id == created["contrat"]),
+                        and_(AuditLog.table_nom == "immeuble", AuditLog.entite_id == created["immeuble"]),
+                        and_(AuditLog.table_nom == "bureau", AuditLog.entite_id.in_(created["bureaux"])))
+                ).delete()
+            session.query(Locataire).filter(Locataire.nom == TEST_NOM).delete()
+            session.query(AuditLog).filter(
+                AuditLog.table_nom == "locataire", AuditLog.entite_id.in_(ids),
+                AuditLog.id > FIRST_AUDIT_ID
+            ).delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ This script demonstrates how to backup and restore the database
 """
 import sys
 import os
+import threading
 from pathlib import Path
 
 # Add the project root to the path
@@ -71,6 +72,33 @@ def test_data_export():
         return False
 
 
+def test_restore_waits_for_writer():
+    """Test that a restore on the application database waits for the open write session"""
+    print("\nTesting restore while another write session is open...")
+    from app.database.connection import get_database
+
+    errors = []
+
+    def restore():
+        try:
+            DataService().import_all({"entities": {}})
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=restore)
+    with get_database().session_scope():
+        thread.start()
+        thread.join(0.5)
+        waited = thread.is_alive()
+    thread.join(30)
+
+    if not waited or thread.is_alive() or errors:
+        print(f"[FAIL] Restore did not wait for the writer (waited={waited}, errors={errors})")
+        return False
+    print("[OK] Restore ran once the write session was closed")
+    return True
+
+
 def test_google_drive_connection():
     """Test Google Drive connection (will fail without credentials)"""
     print("\nTesting Google Drive connection...")
@@ -99,6 +127,7 @@ def main():
         results = {
             'local_backup': test_local_backup(),
             'data_export': test_data_export(),
+            'restore_lock': test_restore_waits_for_writer(),
             'google_drive': test_google_drive_connection()
         }
 
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Change bus test script
+Verifies each commit publishes the entities it inserted, updated or deleted,
+and that rolled back or intermediate changes are never published
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import delete, update
+
+from app.database.change_bus import DELETE, INSERT, RELOAD, UPDATE, ChangeBus, EntityChange
+from app.database.connection import get_database
+from app.models.entities import Immeuble, Locataire
+
+TEST_NOM = "Test Change Bus"
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+class Recorder:
+    """Subscriber keeping the changes of each commit"""
+
+    def __init__(self, bus: ChangeBus):
+        self.commits = []
+        self.unsubscribe = bus.subscribe(self.commits.append)
+
+    def last(self, table_name: str) -> set:
+        """(operation, ids) of a table in the last commit"""
+        return {(c.operation, c.ids) for c in self.commits[-1] if c.entity == table_name}
+
+
+def test_operations():
+    """Test the operations published for inserts, updates and deletes"""
+    print_section("OPERATIONS PUBLIEES")
+
+    db = get_database()
+    recorder = Recorder(db.change_bus)
+    try:
+        print("\n1. Creation...")
+        with db.session_scope() as session:
+            immeuble = Immeuble(nom=TEST_NOM)
+            session.add(immeuble)
+            session.flush()
+            immeuble_id = immeuble.id
+            # Modified after its insert flush: still published as an insert
+            immeuble.adresse = "1 rue du Bus"
+        assert recorder.last("immeubles") == {(INSERT, frozenset([immeuble_id]))}, recorder.commits[-1]
+
+        print("\n2. Modification...")
+        with db.session_scope() as session:
+            session.get(Immeuble, immeuble_id).notes = "Modifie"
+        assert recorder.last("immeubles") == {(UPDATE, frozenset([immeuble_id]))}
+
+        print("\n3. Lecture sans modification...")
+        commits = len(recorder.commits)
+        with db.session_scope() as session:
+            immeuble = session.get(Immeuble, immeuble_id)
+            immeuble.notes = immeuble.notes
+        assert len(recorder.commits) == commits, recorder.commits[-1]
+
+        print("\n4. Creation puis suppression dans la transaction...")
+        with db.session_scope() as session:
+            locataire = Locataire(nom=TEST_NOM)
+            session.add(locataire)
+            session.flush()
+            session.delete(locataire)
+        assert len(recorder.commits) == commits
+
+        print("\n5. Suppression...")
+        with db.session_scope() as session:
+            session.delete(session.get(Immeuble, immeuble_id))
+        assert recorder.last("immeubles") == {(DELETE, frozenset([immeuble_id]))}
+        print("\n   [OK] Operations correctes")
+    finally:
+        recorder.unsubscribe()
+
+
+def test_bulk_and_rollback():
+    """Test that bulk statements ask for a reload and rollbacks publish nothing"""
+    print_section("MASSE ET ANNULATION")
+
+    db = get_database()
+    recorder = Recorder(db.change_bus)
+    try:
+        print("\n1. Modification en masse...")
+        with db.session_scope() as session:
+            session.execute(update(Locataire).where(Locataire.nom == TEST_NOM).values(email="bus@test"))
+        assert recorder.last("locataires") == {(RELOAD, frozenset())}
+
+        print("\n2. Annulation...")
+        commits = len(recorder.commits)
+        try:
+            with db.session_scope() as session:
+                session.add(Locataire(nom=TEST_NOM))
+                session.flush()
+                raise RuntimeError("rollback")
+        except RuntimeError:
+            pass
+        with db.session_scope() as session:
+            session.add(Immeuble(nom=TEST_NOM))
+        # The rolled back locataire is not carried over to the next commit
+        assert len(recorder.commits) == commits + 1
+        assert recorder.last("locataires") == set()
+        print("\n   [OK] Masse rechargee, annulation ignoree")
+    finally:
+        recorder.unsubscribe()
+
+
+def test_subscriber_errors():
+    """Test that a failing subscriber neither breaks the commit nor the others"""
+    print_section("ABONNE EN ERREUR")
+
+    bus = ChangeBus()
+    received = []
+
+    def failing(changes):
+        raise ValueError("subscriber")
+
+    bus.subscribe(failing)
+    unsubscribe = bus.subscribe(received.append)
+    change = EntityChange("immeubles", frozenset([1]), UPDATE)
+    bus.publish([change])
+    assert received == [[change]]
+    unsubscribe()
+    bus.publish([change])
+    assert len(received) == 1
+    print("\n   [OK] Erreurs isolees")
+
+
+def main():
+    """Run change bus tests"""
+    db = get_database()
+
+    try:
+        test_operations()
+        test_bulk_and_rollback()
+        test_subscriber_errors()
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        with db.session_scope() as session:
+            session.execute(delete(Locataire).where(Locataire.nom == TEST_NOM))
+            session.execute(delete(Immeuble).where(Immeuble.nom == TEST_NOM))
+
+
+if __name__ == "__main__":
+    main()
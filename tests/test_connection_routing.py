@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Connection routing test script
+Verifies read-only sessions use pooled reader connections that do not wait
+for the writer, and that write sessions are serialized
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import select, func
+from sqlalchemy.exc import OperationalError
+
+from app.database.connection import get_database
+from app.models.entities import Locataire
+
+TEST_NOM = "Test Routage Connexions"
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def count_test_rows(session) -> int:
+    return session.execute(
+        select(func.count()).select_from(Locataire).where(Locataire.nom == TEST_NOM)
+    ).scalar()
+
+
+def test_readonly_sessions():
+    """Test that readonly sessions read committed data and refuse writes"""
+    print_section("SESSIONS EN LECTURE SEULE")
+
+    db = get_database()
+
+    print("\n1. Lecture des donnees validees...")
+    with db.session_scope() as session:
+        session.add(Locataire(nom=TEST_NOM))
+    with db.session_scope(readonly=True) as session:
+        assert count_test_rows(session) == 1
+
+    print("\n2. Ecriture refusee...")
+    try:
+        with db.session_scope(readonly=True) as session:
+            session.add(Locataire(nom=TEST_NOM))
+            session.flush()
+        raise AssertionError("Write accepted on a readonly session")
+    except OperationalError as e:
+        print(f"   Refusee: {e.orig}")
+
+    print("\n   [OK] Lecture seule respectee")
+
+
+def test_readers_do_not_wait_for_writer():
+    """Test that a read completes while another thread holds an open write transaction"""
+    print_section("LECTEURS CONCURRENTS")
+
+    db = get_database()
+    written = threading.Event()
+    release = threading.Event()
+
+    def writer():
+        with db.session_scope() as session:
+            session.add(Locataire(nom=TEST_NOM))
+            session.flush()
+            written.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert written.wait(10), "Writer did not start"
+
+        print("\n1. Lecture pendant une transaction d'ecriture...")
+        start = time.perf_counter()
+        with db.session_scope(readonly=True) as session:
+            # The uncommitted row is not visible yet
+            assert count_test_rows(session) == 1
+        elapsed = time.perf_counter() - start
+        print(f"   {elapsed * 1000:.1f} ms")
+        assert elapsed < 1, f"Reader waited {elapsed:.2f}s"
+
+        print("\n2. Lecteurs sur des connexions distinctes...")
+        connections = set()
+
+        def reader():
+            with db.session_scope(readonly=True) as session:
+                connections.add(id(session.connection().connection.driver_connection))
+                count_test_rows(session)
+                time.sleep(0.2)
+
+        readers = [threading.Thread(target=reader) for _ in range(3)]
+        for t in readers:
+            t.start()
+        for t in readers:
+            t.join()
+        assert len(connections) == 3, f"Expected 3 connections, got {len(connections)}"
+    finally:
+        release.set()
+        thread.join()
+
+    with db.session_scope(readonly=True) as session:
+        assert count_test_rows(session) == 2
+
+    print("\n   [OK] Lectures sans attente")
+
+
+def test_writers_are_serialized():
+    """Test that a second write session waits for the first one"""
+    print_section("ECRITURES SERIALISEES")
+
+    db = get_database()
+    events = []
+    inside = threading.Event()
+
+    def first():
+        with db.session_scope() as session:
+            inside.set()
+            events.append("debut 1")
+            time.sleep(0.3)
+            session.add(Locataire(nom=TEST_NOM))
+            events.append("fin 1")
+
+    def second():
+        inside.wait(10)
+        with db.session_scope() as session:
+            events.append("debut 2")
+            session.add(Locataire(nom=TEST_NOM))
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"\n   {events}")
+    assert events == ["debut 1", "fin 1", "debut 2"]
+    print("\n   [OK] Ecritures serialisees")
+
+
+def main():
+    """Run connection routing tests"""
+    db = get_database()
+
+    try:
+        test_readonly_sessions()
+        test_readers_do_not_wait_for_writer()
+        test_writers_are_serialized()
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        with db.session_scope() as session:
+            for locataire in session.query(Locataire).filter(Locataire.nom == TEST_NOM).all():
+                session.delete(locataire)
+
+
+if __name__ == "__main__":
+    main()
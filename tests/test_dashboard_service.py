@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Dashboard service test script
+Verifies the grid state is loaded in a constant number of queries
+"""
+import sys
+from pathlib import Path
+from datetime import date
+from decimal import Decimal
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import event
+
+from app.database.connection import get_database
+from app.models.entities import Immeuble, Bureau, Locataire, Contrat
+from app.repositories.paiement_repository import PaiementRepository
+from app.services.dashboard_service import DashboardService, mois_fenetre
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def count_queries(db, func):
+    """Run func and return (result, number of SQL statements executed)"""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", on_execute)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", on_execute)
+    return result, len(statements)
+
+
+def add_contrat(session, immeuble_id: int, numero: str, mois_payes: list) -> int:
+    """Create a bureau, a tenant and a contract paid for the given months"""
+    bureau = Bureau(immeuble_id=immeuble_id, numero=numero)
+    locataire = Locataire(nom=f"Locataire {numero}")
+    session.add_all([bureau, locataire])
+    session.flush()
+    contrat = Contrat(
+        locataire_id=locataire.id,
+        date_debut=date(2024, 1, 1),
+        montant_premier_mois=Decimal("800.000"),
+        montant_mensuel=Decimal("800.000"),
+        bureaux=[bureau]
+    )
+    session.add(contrat)
+    session.flush()
+    repo = PaiementRepository(session)
+    for year, month in mois_payes:
+        repo.create_paiement_loyer(
+            locataire_id=locataire.id,
+            contrat_id=contrat.id,
+            montant_total=Decimal("800.000"),
+            date_paiement=date(year, month, 1),
+            date_debut_periode=date(year, month, 1),
+            date_fin_periode=date(year, month, 28)
+        )
+    return contrat.id
+
+
+def test_dashboard(immeuble_id: int):
+    """Test grid state and query count"""
+    print_section("CHARGEMENT DU TABLEAU DE BORD")
+
+    db = get_database()
+    cur = date(2025, 3, 15)
+
+    print("\n1. Fenetre de 18 mois...")
+    mois = mois_fenetre(cur)
+    assert len(mois) == 18
+    assert mois[0] == (2024, 3) and mois[-1] == (2025, 8), mois
+
+    with db.session_scope() as session:
+        contrat_id = add_contrat(session, immeuble_id, "DB-1", [(2023, 12), (2024, 5), (2025, 2)])
+
+        print("\n2. Chargement avec un contrat...")
+        donnees, queries_1 = count_queries(db, lambda: DashboardService(session).load(cur=cur))
+        immeuble = next(i for i in donnees["immeubles"] if i["id"] == immeuble_id)
+        assert [c["id"] for c in immeuble["contrats"]] == [contrat_id]
+        assert immeuble["contrats"][0]["bureaux"] == ["DB-1"]
+        # Months outside the window are not loaded
+        assert donnees["payes"][contrat_id] == {(2024, 5), (2025, 2)}, donnees["payes"][contrat_id]
+        print(f"   Requetes: {queries_1}")
+
+        print("\n3. Chargement avec plus de contrats...")
+        for i in range(2, 6):
+            add_contrat(session, immeuble_id, f"DB-{i}", [(2024, 6)])
+        donnees, queries_5 = count_queries(db, lambda: DashboardService(session).load(cur=cur))
+        immeuble = next(i for i in donnees["immeubles"] if i["id"] == immeuble_id)
+        assert len(immeuble["contrats"]) == 5
+        print(f"   Requetes: {queries_5}")
+        assert queries_5 == queries_1, (queries_1, queries_5)
+
+        print("\n4. Filtre resilies...")
+        donnees = DashboardService(session).load("resilie", cur=cur)
+        immeuble = next(i for i in donnees["immeubles"] if i["id"] == immeuble_id)
+        assert immeuble["contrats"] == []
+
+        print("\n   [OK] Nombre de requetes constant")
+
+
+def main():
+    """Run dashboard service tests"""
+    db = get_database()
+    immeuble_id = None
+
+    try:
+        with db.session_scope() as session:
+            immeuble = Immeuble(nom="Test Tableau de Bord")
+            session.add(immeuble)
+            session.flush()
+            immeuble_id = immeuble.id
+
+        test_dashboard(immeuble_id)
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        if immeuble_id:
+            with db.session_scope() as session:
+                for locataire in session.query(Locataire).filter(Locataire.nom.like("Locataire DB-%")):
+                    session.delete(locataire)
+                immeuble = session.get(Immeuble, immeuble_id)
+                if immeuble:
+                    session.delete(immeuble)
+
+
+if __name__ == "__main__":
+    main()
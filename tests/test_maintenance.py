@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Maintenance service test script
+Verifies WAL checkpoints, space reclaiming and the recorded history
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database.connection import get_database, profile_pragmas
+from app.models.entities import Locataire
+from app.services.audit_service import disable_audit
+from app.services.maintenance_service import MaintenanceService
+
+TEST_NOM = "Test Maintenance"
+
+
+class ProfileConfig:
+    """Minimal stand-in for Config.get used by profile_pragmas"""
+
+    def __init__(self, profile):
+        self.profile = profile
+
+    def get(self, *keys, default=None):
+        return self.profile if keys == ('database', 'profile') else default
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def test_profile():
+    """Test the connection profile read from the configuration"""
+    print_section("PROFIL DE CONNEXION")
+
+    pragmas = profile_pragmas(ProfileConfig({'synchronous': 'full', 'cache_size': '-2000'}))
+    print(f"\n   {pragmas}")
+    assert pragmas == ["PRAGMA synchronous=FULL", "PRAGMA cache_size=-2000", "PRAGMA mmap_size=67108864"]
+    # Unknown modes fall back to the default instead of reaching SQLite
+    assert profile_pragmas(ProfileConfig({'synchronous': 'NORMAL; DROP'}))[0] == "PRAGMA synchronous=NORMAL"
+    print("\n   [OK] Profil applique")
+
+
+def test_maintenance_run():
+    """Test a run reclaiming the space of deleted rows"""
+    print_section("MAINTENANCE DE LA BASE")
+
+    db = get_database()
+    service = MaintenanceService(db)
+    page_count = service._scalar("PRAGMA page_count")
+
+    print("\n1. Creation puis suppression de donnees volumineuses...")
+    with db.session_scope() as session:
+        disable_audit(session)
+        # About half of the current file, to leave many free pages behind
+        nb = max(200, page_count * 4096 // 2 // 2000)
+        session.add_all([Locataire(nom=TEST_NOM, raison_sociale="x" * 2000) for _ in range(nb)])
+    with db.session_scope() as session:
+        disable_audit(session)
+        session.query(Locataire).filter(Locataire.nom == TEST_NOM).delete()
+    assert service._scalar("PRAGMA freelist_count") > 0
+
+    print("\n2. Execution des taches...")
+    results = service.run(["incremental_vacuum", "optimize", "checkpoint", "inconnue"])
+    for result in results:
+        print(f"   {result.tache}: {result.duree_ms} ms, {result.octets_recuperes} octets, {result.details}")
+    assert [r.tache for r in results] == ["incremental_vacuum", "optimize", "checkpoint"]
+    assert all(r.erreur is None for r in results), [r.erreur for r in results]
+    assert sum(r.octets_recuperes for r in results) > 0, "Nothing reclaimed"
+    assert service._scalar("PRAGMA freelist_count") == 0
+    assert service._scalar("PRAGMA auto_vacuum") == 2
+
+    print("\n3. Historique enregistre...")
+    history = service.history(limit=3)
+    assert [h["tache"] for h in history] == ["checkpoint", "optimize", "incremental_vacuum"]
+    assert len({h["execution"] for h in history}) == 1
+
+    print("\n   [OK] Maintenance correcte")
+
+
+def main():
+    """Run maintenance tests"""
+    db = get_database()
+
+    try:
+        test_profile()
+        test_maintenance_run()
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        with db.session_scope() as session:
+            disable_audit(session)
+            session.query(Locataire).filter(Locataire.nom == TEST_NOM).delete()
+
+
+if __name__ == "__main__":
+    main()
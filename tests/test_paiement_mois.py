@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Paiement coverage test script
+Verifies that the paiement_mois table follows rent payment changes
+"""
+import sys
+from pathlib import Path
+from datetime import date
+from decimal import Decimal
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database.connection import get_database
+from app.models.entities import Locataire, Contrat, PaiementMois, TypePaiement
+from app.repositories.paiement_repository import PaiementRepository
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def mois_du_paiement(session, paiement_id: int) -> list:
+    """Return the (year, month) tuples stored for a payment"""
+    rows = session.query(PaiementMois.mois).filter(
+        PaiementMois.paiement_id == paiement_id
+    ).order_by(PaiementMois.mois).all()
+    return [PaiementMois.from_index(mois) for (mois,) in rows]
+
+
+def test_couverture(contrat_id: int, locataire_id: int):
+    """Test that coverage rows are created, updated and deleted"""
+    print_section("COUVERTURE DES PAIEMENTS")
+
+    db = get_database()
+
+    with db.session_scope() as session:
+        repo = PaiementRepository(session)
+
+        print("\n1. Creation d'un loyer trimestriel...")
+        paiement = repo.create_paiement_loyer(
+            locataire_id=locataire_id,
+            contrat_id=contrat_id,
+            montant_total=Decimal("3000.000"),
+            date_paiement=date(2024, 11, 1),
+            date_debut_periode=date(2024, 11, 1),
+            date_fin_periode=date(2025, 1, 31)
+        )
+        mois = mois_du_paiement(session, paiement.id)
+        print(f"   Mois couverts: {mois}")
+        assert mois == [(2024, 11), (2024, 12), (2025, 1)], mois
+
+        print("\n2. Mois payes du contrat...")
+        payes = repo.get_mois_payes(contrat_id)
+        assert payes == {(2024, 11), (2024, 12), (2025, 1)}, payes
+        impayes = repo.get_loyers_impayes(contrat_id)
+        assert (2024, 10) in impayes and (2024, 11) not in impayes
+        print(f"   {len(payes)} payes, {len(impayes)} impayes")
+
+        print("\n3. Modification de la periode...")
+        repo.update(paiement, date_fin_periode=date(2024, 11, 30))
+        mois = mois_du_paiement(session, paiement.id)
+        print(f"   Mois couverts: {mois}")
+        assert mois == [(2024, 11)], mois
+
+        print("\n4. Paiement de caution (non couvert)...")
+        caution = repo.create_paiement_autre(
+            locataire_id=locataire_id,
+            contrat_id=contrat_id,
+            type_paiement=TypePaiement.CAUTION,
+            montant_total=Decimal("2000.000"),
+            date_paiement=date(2024, 10, 1)
+        )
+        assert mois_du_paiement(session, caution.id) == []
+
+        print("\n5. Suppression du loyer...")
+        paiement_id = paiement.id
+        repo.delete(paiement)
+        assert mois_du_paiement(session, paiement_id) == []
+        assert repo.get_mois_payes(contrat_id) == set()
+
+        print("\n   [OK] Couverture synchronisee")
+
+
+def main():
+    """Run paiement coverage tests"""
+    db = get_database()
+    locataire_id = None
+
+    try:
+        with db.session_scope() as session:
+            locataire = Locataire(nom="Test Couverture")
+            session.add(locataire)
+            session.flush()
+            contrat = Contrat(
+                locataire_id=locataire.id,
+                date_debut=date(2024, 10, 1),
+                montant_premier_mois=Decimal("1000.000"),
+                montant_mensuel=Decimal("1000.000")
+            )
+            session.add(contrat)
+            session.flush()
+            locataire_id, contrat_id = locataire.id, contrat.id
+
+        test_couverture(contrat_id, locataire_id)
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        if locataire_id:
+            with db.session_scope() as session:
+                locataire = session.get(Locataire, locataire_id)
+                if locataire:
+                    session.delete(locataire)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Synthetic portfolio test script
+Verifies the generator is reproducible and that its bulk inserted rows are
+consistent with what the application would have written
+"""
+import sqlite3
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.portfolio import PRODUCTION, SIZES, build_portfolio
+from app.models.entities import Paiement, PaiementMois
+
+TODAY = date(2026, 6, 15)
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def dump(db_path: Path, query: str) -> list:
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute(query).fetchall()
+    finally:
+        connection.close()
+
+
+def test_reproducible(directory: Path):
+    """Test that a seed gives the same portfolio and another seed a different one"""
+    print_section("REPRODUCTIBILITE")
+
+    query = "SELECT contrat_id, type_paiement, montant_total, date_paiement FROM paiements ORDER BY id"
+    first = build_portfolio(directory / "a.db", SIZES["small"], seed=7, today=TODAY)
+    second = build_portfolio(directory / "b.db", SIZES["small"], seed=7, today=TODAY)
+    other = build_portfolio(directory / "c.db", SIZES["small"], seed=8, today=TODAY)
+    assert first == second, (first, second)
+    assert dump(directory / "a.db", query) == dump(directory / "b.db", query)
+    assert dump(directory / "a.db", query) != dump(directory / "c.db", query)
+    # The size fixes the entities, the seed only their payments and bureaux
+    fixed = ("immeubles", "bureaux", "locataires", "contrats")
+    assert {k: other[k] for k in fixed} == {k: first[k] for k in fixed}, (other, first)
+    assert first["bureaux"] == SIZES["small"].immeubles * SIZES["small"].bureaux_par_immeuble
+    print(f"\n   [OK] {first['paiements']} paiements reproductibles")
+
+
+def test_consistency(directory: Path):
+    """Test the rows against the rules the repositories enforce"""
+    print_section("COHERENCE DU PORTEFEUILLE")
+
+    db_path = directory / "production.db"
+    size = PRODUCTION.scaled(2)
+    rows = build_portfolio(db_path, size, seed=3, today=TODAY)
+    print(f"\n   {rows}")
+
+    print("\n1. Tous les types de donnees presents...")
+    types = {row[0] for row in dump(db_path, "SELECT DISTINCT type_paiement FROM paiements")}
+    assert types == {"LOYER", "CAUTION", "PAS_DE_PORTE"}, types
+    assert dump(db_path, "SELECT COUNT(*) FROM paiements WHERE frais_steg > 0")[0][0] > 0
+    assert rows["contrat_bureau"] > rows["contrats"], "No multi-bureau contract"
+    assert rows["documents"] > 0 and rows["audit_logs"] > rows["paiements"]
+
+    print("\n2. Resiliations...")
+    resilies = dump(db_path, "SELECT COUNT(*) FROM contrats WHERE est_resilie")[0][0]
+    assert resilies > 0
+    assert dump(db_path, "SELECT COUNT(*) FROM locataires WHERE statut = 'HISTORIQUE'")[0][0] == resilies
+    # A bureau is available exactly when no active contract holds it
+    loues = dump(db_path, "SELECT DISTINCT cb.bureau_id FROM contrat_bureau cb "
+                          "JOIN contrats c ON c.id = cb.contrat_id WHERE NOT c.est_resilie")
+    non_disponibles = dump(db_path, "SELECT id FROM bureaux WHERE NOT est_disponible")
+    assert sorted(loues) == sorted(non_disponibles)
+    assert dump(db_path, "SELECT COUNT(*) FROM paiements p JOIN contrats c ON c.id = p.contrat_id "
+                         "WHERE c.est_resilie AND p.date_debut_periode > c.date_resiliation")[0][0] == 0
+
+    print("\n3. Mois payes identiques a ceux des listeners ORM...")
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        with Session(engine) as session:
+            expected = sorted(
+                (paiement.id, PaiementMois.to_index(year, month))
+                for paiement in session.query(Paiement)
+                for year, month in paiement.get_mois_couverts()
+            )
+            stored = sorted(session.query(PaiementMois.paiement_id, PaiementMois.mois).all())
+            assert expected == [tuple(row) for row in stored]
+
+            print("\n4. Impayes selon l'irregularite...")
+            from app.services.arrears_service import ArrearsService
+            contrats = [row[0] for row in dump(db_path, "SELECT id FROM contrats")]
+            impayes = sum(len(months) for months in ArrearsService(session).compute(contrats, TODAY).values())
+            ratio = impayes / (impayes + rows["paiement_mois"])
+            assert 0.03 < ratio < 0.25, ratio
+            print(f"\n   {impayes} mois impayes ({ratio:.0%})")
+    finally:
+        engine.dispose()
+    print("\n   [OK] Portefeuille coherent")
+
+
+def main():
+    """Run synthetic portfolio tests"""
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            test_reproducible(Path(directory))
+            test_consistency(Path(directory))
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
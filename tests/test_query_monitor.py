@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+Query monitor test script
+Verifies repeated statements are grouped by shape per action, reported with
+their call site, and that view loads stay free of N+1 queries
+"""
+import logging
+import sys
+import tempfile
+import threading
+from datetime import date
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, joinedload
+
+from app.database import query_monitor
+from app.database.query_monitor import TooManyQueries, max_queries, normalize
+from app.models.entities import Paiement, TypePaiement
+from benchmarks.portfolio import SIZES, build_portfolio
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def cautions(session: Session):
+    """One payment per contract: each reads another locataire and contrat"""
+    return session.query(Paiement).filter(Paiement.type_paiement == TypePaiement.CAUTION)
+
+
+def test_normalize():
+    """Test that statements differing only by their values share a shape"""
+    print_section("FORME DES REQUETES")
+
+    assert normalize("SELECT * FROM t WHERE id = 12 AND nom = 'O''Brien'") == \
+        normalize("SELECT *\n  FROM t WHERE id = 7 AND nom = 'x'")
+    assert normalize("SELECT * FROM t WHERE id IN (?, ?, ?)") == normalize("SELECT * FROM t WHERE id IN (?)")
+    assert normalize("SELECT * FROM t WHERE id = %(id_1)s") == normalize("SELECT * FROM t WHERE id = ?")
+    assert normalize("SELECT anon_1.x FROM t1 AS anon_1") == "SELECT anon_1.x FROM t1 AS anon_1"
+    print("\n   [OK] Valeurs et listes IN ignorees")
+
+
+def test_max_queries(session: Session):
+    """Test the assertion on a lazy relationship read in a loop"""
+    print_section("NOMBRE MAXIMAL DE REQUETES")
+
+    print("\n1. Chargement paresseux dans une boucle...")
+    try:
+        with max_queries(limit=100, repeated=5):
+            for paiement in cautions(session):
+                paiement.locataire.nom
+        raise AssertionError("N+1 not detected")
+    except TooManyQueries as e:
+        message = str(e)
+        assert "FROM locataires" in message, message
+        assert "tests/test_query_monitor.py:" in message, message
+    session.expunge_all()
+
+    print("\n2. Chargement joint...")
+    with max_queries(limit=1) as queries:
+        for paiement in cautions(session).options(joinedload(Paiement.locataire)):
+            paiement.locataire.nom
+    assert queries.count == 1, queries.summary()
+    print("\n   [OK] Requetes bornees")
+
+
+def test_warnings(session: Session):
+    """Test the warning of an action and the loads counted by their caller"""
+    print_section("AVERTISSEMENTS")
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger(query_monitor.__name__)
+    logger.addHandler(handler)
+    query_monitor.enable(threshold=3)
+    try:
+        print("\n1. Action avec une requete repetee...")
+        with query_monitor.action("liste des paiements"):
+            for paiement in cautions(session).limit(5):
+                paiement.contrat.date_debut
+        assert len(records) == 1, [r.getMessage() for r in records]
+        message = records[0].getMessage()
+        assert "liste des paiements" in message and "5 executions" in message, message
+        assert "FROM contrats" in message and "tests/test_query_monitor.py:" in message, message
+
+        print("\n2. Requetes d'un chargement comptees par l'action qui l'a lance...")
+        records.clear()
+        with query_monitor.action("navigation") as parent:
+            actions = query_monitor.current_actions()
+
+            def load():
+                with query_monitor.action("chargement", actions), Session(session.get_bind()) as worker:
+                    worker.query(Paiement).limit(1).all()
+
+            thread = threading.Thread(target=load)
+            thread.start()
+            thread.join()
+        assert parent.count == 1, parent.summary()
+        assert not records
+    finally:
+        query_monitor.disable()
+        logger.removeHandler(handler)
+    print("\n   [OK] Site d'appel signale")
+
+
+def test_views(session: Session):
+    """Test that the list views read their rows with a fixed number of queries"""
+    print_section("VUES SANS N+1")
+
+    from app.ui.views.bureau_view import BureauView
+    from app.ui.views.immeuble_view import ImmeubleView
+
+    with max_queries(limit=3, repeated=1):
+        rows = BureauView.fetch_rows(session, None, None)
+    assert rows
+    with max_queries(limit=2, repeated=1):
+        rows = ImmeubleView.fetch_rows(session)
+    assert rows and all(row[3] > 0 for row in rows)
+    print("\n   [OK] Bureaux et immeubles")
+
+
+def main():
+    """Run query monitor tests"""
+    try:
+        test_normalize()
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = Path(directory) / "portfolio.db"
+            build_portfolio(db_path, SIZES["small"], today=date(2026, 6, 15))
+            engine = create_engine(f"sqlite:///{db_path}")
+            try:
+                with Session(engine) as session:
+                    test_max_queries(session)
+                    test_warnings(session)
+                    test_views(session)
+            finally:
+                engine.dispose()
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
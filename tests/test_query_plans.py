@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+"""
+Query plan test script
+Runs the repository hot queries against a seeded database and fails when
+SQLite answers one of them with a full table scan
+"""
+import re
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app.models.entities import (
+    Base, Immeuble, Bureau, Locataire, Contrat, Paiement, TypePaiement
+)
+from app.repositories.bureau_repository import BureauRepository
+from app.repositories.contrat_repository import ContratRepository
+from app.repositories.locataire_repository import LocataireRepository
+from app.repositories.paiement_repository import PaiementRepository
+from app.services.arrears_service import ArrearsService
+
+# "SCAN contrats" is a full scan; "SCAN contrats USING INDEX ..." walks an
+# index (a partial one only holds the matching rows) and CTE scans are fine
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def seed(session: Session):
+    """Insert a small portfolio: enough rows for the planner to prefer indexes"""
+    immeubles = [Immeuble(nom=f"Immeuble {i}", adresse=f"{i} avenue Habib Bourguiba") for i in range(5)]
+    session.add_all(immeubles)
+    session.flush()
+    bureaux = [
+        Bureau(immeuble_id=immeubles[i % 5].id, numero=f"B{i}", est_disponible=i % 3 == 0)
+        for i in range(60)
+    ]
+    locataires = [Locataire(nom=f"Locataire {i}", cin=f"{i:08d}") for i in range(40)]
+    session.add_all(bureaux + locataires)
+    session.flush()
+    for i in range(50):
+        contrat = Contrat(
+            locataire_id=locataires[i % 40].id,
+            date_debut=date(2023, 1 + i % 12, 1),
+            montant_premier_mois=Decimal("500.000"),
+            montant_mensuel=Decimal("500.000"),
+            est_resilie=i % 4 == 0,
+            bureaux=[bureaux[i]]
+        )
+        session.add(contrat)
+        session.flush()
+        session.add_all([
+            Paiement(
+                locataire_id=contrat.locataire_id,
+                contrat_id=contrat.id,
+                type_paiement=TypePaiement.LOYER if m % 5 else TypePaiement.AUTRE,
+                montant_total=Decimal("500.000"),
+                date_paiement=date(2023 + m // 12, 1 + m % 12, 5),
+                date_debut_periode=date(2023 + m // 12, 1 + m % 12, 1),
+                date_fin_periode=date(2023 + m // 12, 1 + m % 12, 28),
+            )
+            for m in range(20)
+        ])
+    session.flush()
+
+
+@contextmanager
+def capture_statements(engine):
+    """Collect (sql, parameters) of every statement run on the engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def full_scans(connection, statement: str, parameters) -> list:
+    """Tables the plan of a statement reads with a full table scan"""
+    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    tables = Base.metadata.tables
+    return [
+        match.group(1)
+        for match in (FULL_SCAN.match(detail) for _, _, _, detail in plan)
+        if match and match.group(1) in tables
+    ]
+
+
+def hot_queries(session: Session, ids: dict) -> dict:
+    """Repository calls on the hot paths, by name"""
+    contrats = ContratRepository(session)
+    paiements = PaiementRepository(session)
+    bureaux = BureauRepository(session)
+    locataires = LocataireRepository(session)
+    return {
+        "contrats actifs": contrats.get_actifs,
+        "contrats d'un locataire": lambda: contrats.get_by_locataire(ids["locataire"]),
+        "contrats actifs d'un locataire": lambda: contrats.get_actifs_by_locataire(ids["locataire"]),
+        "contrats d'un bureau": lambda: contrats.get_by_bureau(ids["bureau"]),
+        "contrat actif d'un bureau": lambda: contrats.get_contrat_actif_for_bureau(ids["bureau"]),
+        "bureaux d'un contrat": lambda: contrats.get_by_id(ids["contrat"]).bureaux,
+        "contrats d'un bureau (relation)": lambda: bureaux.get_by_id(ids["bureau"]).contrats,
+        "paiements d'un contrat": lambda: paiements.get_by_contrat(ids["contrat"]),
+        "paiements d'un contrat par type": lambda: paiements.get_by_contrat_and_type(
+            ids["contrat"], TypePaiement.LOYER),
+        "total des loyers d'une annee": lambda: paiements.get_total_loyers_payes(ids["contrat"], 2023),
+        "mois payes": lambda: paiements.get_mois_payes(ids["contrat"]),
+        "paiements d'un locataire": lambda: paiements.get_by_locataire(ids["locataire"]),
+        "paiements d'une periode": lambda: paiements.get_by_periode(date(2023, 3, 1), date(2023, 3, 31)),
+        "arrieres d'un contrat": lambda: ArrearsService(session).compute([ids["contrat"]], date(2024, 6, 30)),
+        "bureaux d'un immeuble": lambda: bureaux.get_by_immeuble(ids["immeuble"]),
+        "bureaux disponibles d'un immeuble": lambda: bureaux.get_disponibles(ids["immeuble"]),
+        "locataire par CIN": lambda: locataires.get_by_cin("00000007"),
+        "locataires d'un immeuble": lambda: locataires.get_by_immeuble(ids["immeuble"]),
+    }
+
+
+def test_hot_query_plans():
+    """Test that no hot query falls back to a full table scan"""
+    print_section("PLANS DES REQUETES FREQUENTES")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'plans.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            seed(session)
+            session.commit()
+            ids = {
+                "immeuble": session.query(Immeuble.id).order_by(Immeuble.id).first()[0],
+                "bureau": session.query(Bureau.id).order_by(Bureau.id).first()[0],
+                "locataire": session.query(Locataire.id).order_by(Locataire.id).first()[0],
+                "contrat": session.query(Contrat.id).order_by(Contrat.id).first()[0],
+            }
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+
+        failures = []
+        with Session(engine) as session:
+            for name, query in hot_queries(session, ids).items():
+                session.expunge_all()
+                with capture_statements(engine) as statements:
+                    query()
+                assert statements, f"{name}: no statement executed"
+                connection = session.connection()
+                scans = sorted({t for sql, params in statements for t in full_scans(connection, sql, params)})
+                status = "SCAN " + ", ".join(scans) if scans else "OK"
+                print(f"   {name}: {len(statements)} requete(s), {status}")
+                if scans:
+                    failures.append(f"{name} ({', '.join(scans)})")
+        engine.dispose()
+
+    assert not failures, f"Full table scans: {failures}"
+    print("\n   [OK] Aucun parcours complet de table")
+
+
+def test_detects_full_scan():
+    """Test that the harness reports a query with no usable index"""
+    print_section("DETECTION D'UN PARCOURS COMPLET")
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        scans = full_scans(connection, "SELECT id FROM bureaux WHERE surface_m2 > ?", (10.0,))
+        assert scans == ["bureaux"], scans
+        assert full_scans(connection, "SELECT id FROM bureaux WHERE immeuble_id = ?", (1,)) == []
+    print("\n   [OK] Parcours complet detecte")
+
+
+def main():
+    """Run query plan tests"""
+    try:
+        test_detects_full_scan()
+        test_hot_query_plans()
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Repository benchmark test script
+Verifies every micro-benchmark runs against a small portfolio, that a
+restore brings back every row and that changes under the noise threshold
+are not reported as regressions
+"""
+import json
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.portfolio import SIZES, build_portfolio
+from benchmarks.repository_benchmark import (
+    BASELINE, PORTFOLIO_DAY, Bench, cases, compare, measure, regressions
+)
+
+TABLES = ["immeubles", "bureaux", "locataires", "contrats", "contrat_bureau", "paiements", "paiement_mois"]
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def counts(db_path: Path) -> dict:
+    connection = sqlite3.connect(db_path)
+    try:
+        return {table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES}
+    finally:
+        connection.close()
+
+
+def test_cases(directory: Path):
+    """Test that each case runs and leaves the portfolio unchanged"""
+    print_section("OPERATIONS MESUREES")
+
+    db_path = directory / "portfolio.db"
+    build_portfolio(db_path, SIZES["small"], seed=1, today=PORTFOLIO_DAY)
+    before = counts(db_path)
+    bench = Bench(directory, db_path, seed=1)
+    try:
+        for case in cases(bench):
+            timing = measure(case, runs=1, warmup=0)
+            assert timing["median_ms"] > 0, case.name
+            print(f"   {case.name:<34}{timing['median_ms']:>10.2f} ms")
+
+        print("\n1. Ecritures annulees...")
+        assert counts(db_path) == before, (counts(db_path), before)
+
+        print("\n2. Restauration complete dans une base vide...")
+        state = next(case for case in cases(bench) if case.name == "data.import_all").setup()
+        try:
+            from app.services.data_service import DataService
+            DataService(state[1], bench.documents).import_all(bench.export)
+            assert counts(directory / "import.db") == before, counts(directory / "import.db")
+        finally:
+            state[1].close()
+            state[0].dispose()
+    finally:
+        bench.close()
+    print("\n   [OK] Operations mesurees")
+
+
+def test_comparison():
+    """Test the noise threshold against a baseline"""
+    print_section("COMPARAISON A LA REFERENCE")
+
+    assert "bruit" in compare(104, 100, threshold=10)
+    assert "REGRESSION" in compare(120, 100, threshold=10)
+    assert "amelioration" in compare(50, 100, threshold=10)
+
+    def results(median):
+        return {"sizes": {"small": {"cases": {"locataire.search": {"median_ms": median}}}}}
+
+    assert regressions(results(108), results(100), threshold=10) == []
+    assert regressions(results(130), results(100), threshold=10) == ["small/locataire.search"]
+    assert regressions(results(130), None, threshold=10) == []
+
+    print("\n   Reference versionnee...")
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
+    assert set(baseline["sizes"]) >= {"small", "medium"}, list(baseline["sizes"])
+    assert "paiement.get_loyers_impayes" in baseline["sizes"]["small"]["cases"]
+    print("\n   [OK] Seuil de bruit applique")
+
+
+def main():
+    """Run repository benchmark tests"""
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            test_cases(Path(directory))
+        test_comparison()
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+"""
+Repository cache test script
+Verifies repository reads are served from the cache until a write touches
+their table, and that the cache never serves rows a session cannot see
+"""
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import delete, event, update
+
+from app.database.connection import get_database
+from app.database.repository_cache import CACHE_INFO_KEY, RepositoryCache
+from app.models.entities import Immeuble, Locataire
+from app.repositories import ImmeubleRepository, LocataireRepository
+
+TEST_NOM = "Test Cache Repositories"
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+@contextmanager
+def count_selects(engine):
+    """Collect the SELECT statements run on an engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_hits_without_queries():
+    """Test that a repeated read is served without touching the database"""
+    print_section("LECTURES SERVIES PAR LE CACHE")
+
+    db = get_database()
+    cache = db.repository_cache
+    assert cache is not None, "Cache disabled in config.yaml"
+    with db.session_scope() as session:
+        session.add(Immeuble(nom=TEST_NOM, adresse="1 rue du Cache"))
+
+    print("\n1. Premiere lecture (absente du cache)...")
+    with db.session_scope(readonly=True) as session:
+        expected = [(i.id, i.nom, i.adresse) for i in ImmeubleRepository(session).get_all(order_by="nom")]
+    assert any(nom == TEST_NOM for _, nom, _ in expected)
+
+    print("\n2. Lecture suivante sans requete...")
+    hits = cache.stats.hits
+    with count_selects(db.read_engine) as statements:
+        with db.session_scope(readonly=True) as session:
+            immeubles = ImmeubleRepository(session).get_all(order_by="nom")
+            assert [(i.id, i.nom, i.adresse) for i in immeubles] == expected
+            assert all(i in session for i in immeubles)
+    assert statements == [], statements
+    assert cache.stats.hits == hits + 1
+
+    print("\n3. Relations chargees a la demande...")
+    with db.session_scope(readonly=True) as session:
+        immeuble = ImmeubleRepository(session).filter_by(nom=TEST_NOM)[0]
+        assert ImmeubleRepository(session).filter_by(nom=TEST_NOM)[0] is immeuble
+        assert immeuble.bureaux == []
+
+    print("\n4. Objet deja charge dans la session reutilise...")
+    with db.session_scope(readonly=True) as session:
+        immeuble = session.get(Immeuble, expected[0][0])
+        ImmeubleRepository(session).get_by_id(expected[0][0])
+        assert ImmeubleRepository(session).get_by_id(expected[0][0]) is immeuble
+        assert ImmeubleRepository(session).get_by_id(-1) is None
+
+    print(f"\n   {cache.stats}")
+    print("\n   [OK] Lectures repetees servies par le cache")
+
+
+def test_writes_invalidate():
+    """Test that updates, deletes and bulk statements invalidate their table"""
+    print_section("INVALIDATION PAR LES ECRITURES")
+
+    db = get_database()
+
+    def lire_noms():
+        with db.session_scope(readonly=True) as session:
+            return sorted(l.email or "" for l in LocataireRepository(session).filter_by(nom=TEST_NOM))
+
+    print("\n1. Creation...")
+    lire_noms()
+    with db.session_scope() as session:
+        LocataireRepository(session).create(nom=TEST_NOM, email="a@cache.test")
+    assert lire_noms() == ["a@cache.test"]
+
+    print("\n2. Modification...")
+    with db.session_scope() as session:
+        locataire = LocataireRepository(session).filter_by(nom=TEST_NOM)[0]
+        LocataireRepository(session).update(locataire, email="b@cache.test")
+    assert lire_noms() == ["b@cache.test"]
+
+    print("\n3. Modification en masse...")
+    with db.session_scope() as session:
+        session.execute(update(Locataire).where(Locataire.nom == TEST_NOM).values(email="c@cache.test"))
+    assert lire_noms() == ["c@cache.test"]
+
+    print("\n4. Suppression en masse...")
+    with db.session_scope() as session:
+        session.execute(delete(Locataire).where(Locataire.nom == TEST_NOM))
+    assert lire_noms() == []
+
+    print("\n5. Annulation...")
+    try:
+        with db.session_scope() as session:
+            LocataireRepository(session).create(nom=TEST_NOM, email="annule@cache.test")
+            # The session sees its own pending row, bypassing the cache
+            assert len(LocataireRepository(session).filter_by(nom=TEST_NOM)) == 1
+            raise RuntimeError("rollback")
+    except RuntimeError:
+        pass
+    assert lire_noms() == []
+
+    print("\n6. Suppression en cascade...")
+    cache = db.repository_cache
+    version = cache.version("bureaux")
+    cache.bump(["immeubles"])
+    assert cache.version("bureaux") == version + 1
+    print("\n   [OK] Ecritures invalidant le cache")
+
+
+def test_uncommitted_rows_not_cached():
+    """Test that a read during another write transaction is not served after its commit"""
+    print_section("TRANSACTION EN COURS")
+
+    db = get_database()
+    flushed = threading.Event()
+    release = threading.Event()
+
+    def writer():
+        with db.session_scope() as session:
+            LocataireRepository(session).create(nom=TEST_NOM, email="concurrent@cache.test")
+            flushed.set()
+            release.wait(10)
+
+    def count():
+        with db.session_scope(readonly=True) as session:
+            return len(LocataireRepository(session).filter_by(nom=TEST_NOM))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert flushed.wait(10), "Writer did not start"
+        # Cached while the row is not committed yet
+        assert count() == 0
+        assert count() == 0
+    finally:
+        release.set()
+        thread.join()
+    assert count() == 1
+    print("\n   [OK] Version changee au commit")
+
+
+def test_lru_eviction():
+    """Test that the least recently used entries are evicted"""
+    print_section("EVICTION LRU")
+
+    db = get_database()
+    cache = RepositoryCache(max_entries=2)
+    with db.session_scope(readonly=True) as session:
+        session.info[CACHE_INFO_KEY] = cache
+        repo = ImmeubleRepository(session)
+        repo.filter_by(nom="a")
+        repo.filter_by(nom="b")
+        repo.filter_by(nom="a")
+        repo.filter_by(nom="c")  # Evicts b, the least recently used
+        assert len(cache) == 2 and cache.stats.evictions == 1
+        misses = cache.stats.misses
+        repo.filter_by(nom="a")
+        assert cache.stats.misses == misses
+        repo.filter_by(nom="b")
+        assert cache.stats.misses == misses + 1
+
+    print(f"\n   {cache.stats} ratio={cache.stats.hit_ratio:.2f}")
+    print("\n   [OK] Entrees les plus anciennes evincees")
+
+
+def main():
+    """Run repository cache tests"""
+    db = get_database()
+
+    try:
+        test_hits_without_queries()
+        test_writes_invalidate()
+        test_uncommitted_rows_not_cached()
+        test_lru_eviction()
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        with db.session_scope() as session:
+            session.execute(delete(Locataire).where(Locataire.nom == TEST_NOM))
+            session.execute(delete(Immeuble).where(Immeuble.nom == TEST_NOM))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Schema version test script
+Verifies the revision baked into the build matches the Alembic head and
+that startup only loads Alembic when the database is behind
+"""
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database.schema_version import HEAD_REVISION, is_current, stored_revisions
+from app.utils.config import Config
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def test_head_revision():
+    """Test that HEAD_REVISION was bumped with the last migration"""
+    print_section("REVISION DE REFERENCE")
+
+    from alembic.config import Config as AlembicConfig
+    from alembic.script import ScriptDirectory
+
+    alembic_cfg = AlembicConfig(str(project_root / "alembic.ini"))
+    alembic_cfg.set_main_option('script_location', str(project_root / "alembic"))
+    head = ScriptDirectory.from_config(alembic_cfg).get_current_head()
+    assert head == HEAD_REVISION, f"HEAD_REVISION is {HEAD_REVISION}, alembic head is {head}"
+    print(f"\n   [OK] Revision {HEAD_REVISION}")
+
+
+def test_startup_check(directory: Path):
+    """Test the stored revision check and the migrations run at startup"""
+    print_section("VERIFICATION AU DEMARRAGE")
+
+    import main
+
+    config = Config()
+    db_path = directory / "schema.db"
+    config.set(str(db_path), 'database', 'path')
+
+    print("\n1. Base absente...")
+    assert stored_revisions(config) is None
+    assert not db_path.exists(), "The check created the database"
+
+    print("\n2. Base sans alembic_version...")
+    sqlite3.connect(db_path).close()
+    assert stored_revisions(config) is None
+    assert not is_current(config)
+
+    print("\n3. Migration complete...")
+    db_path.unlink()
+    main.run_database_migrations()
+    assert stored_revisions(config) == {HEAD_REVISION}
+    assert is_current(config)
+
+    print("\n4. Base a jour: Alembic n'est pas charge...")
+    # Importing alembic now fails: run_database_migrations would exit
+    hidden = {name: module for name, module in sys.modules.items()
+              if name == "alembic" or name.startswith("alembic.")}
+    sys.modules["alembic"] = None
+    try:
+        main.run_database_migrations()
+    finally:
+        del sys.modules["alembic"]
+        sys.modules.update(hidden)
+
+    print("\n5. Base en retard...")
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.execute("UPDATE alembic_version SET version_num = '005'")
+    connection.close()
+    assert stored_revisions(config) == {"005"}
+    assert not is_current(config)
+    print("\n   [OK] Alembic charge uniquement si necessaire")
+
+
+def main():
+    """Run schema version tests"""
+    config = Config()
+    original_path = config.get('database', 'path')
+
+    try:
+        test_head_revision()
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                test_startup_check(Path(directory))
+            finally:
+                config.set(original_path, 'database', 'path')
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
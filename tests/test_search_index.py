@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Search index test script
+Verifies the FTS5 tables follow writes and serve accent-insensitive searches
+"""
+import sys
+from pathlib import Path
+from datetime import date
+from decimal import Decimal
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, text
+
+from app.database.connection import get_database
+from app.database.search_index import ensure_search_index, match_query
+from app.models.entities import Immeuble, Bureau, Locataire, Contrat, Paiement, TypePaiement
+from app.repositories.bureau_repository import BureauRepository
+from app.repositories.contrat_repository import ContratRepository
+from app.repositories.immeuble_repository import ImmeubleRepository
+from app.repositories.locataire_repository import LocataireRepository
+from app.repositories.paiement_repository import PaiementRepository
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def test_match_query():
+    """Test the FTS query built from user input"""
+    print_section("REQUETES FTS")
+
+    assert match_query("Dupré  j-p") == '"Dupré"* "j"* "p"*'
+    assert match_query('"; DROP') == '"DROP"*'
+    assert match_query("  ") is None
+    assert match_query("dup", ("nom",)) == '{nom} : ("dup"*)'
+    print("\n   [OK] Requetes construites")
+
+
+def test_repository_search(ids: dict):
+    """Test accent-insensitive prefix search and index maintenance"""
+    print_section("RECHERCHE PLEIN TEXTE")
+
+    db = get_database()
+    with db.session_scope() as session:
+        locataires = LocataireRepository(session)
+
+        print("\n1. Recherche sans accents ni majuscules...")
+        found = [l.id for l in locataires.search("eloise zephy")]
+        assert found == [ids["locataire"]], f"Unexpected result {found}"
+        assert [l.id for l in locataires.search("ZÉPHYRIN")] == [ids["locataire"]]
+        assert [i.id for i in ImmeubleRepository(session).search("residence orangers")] == [ids["immeuble"]]
+        assert [b.id for b in BureauRepository(session).search("Zephyr-12")] == [ids["bureau"]]
+        assert [c.id for c in ContratRepository(session).search("zéphyrin")] == [ids["contrat"]]
+        assert [p.id for p in PaiementRepository(session).search("régularisation")] == [ids["paiement"]]
+        assert locataires.search("!!") == []
+
+        print("\n2. Index mis a jour par les triggers...")
+        locataire = locataires.get_by_id(ids["locataire"])
+        locataires.update(locataire, nom="Éloïse Quenelle")
+        assert locataires.search("zephyrin") == []
+        assert [l.id for l in locataires.search("quenelle")] == [ids["locataire"]]
+
+    with db.session_scope() as session:
+        LocataireRepository(session).delete_by_id(ids.pop("locataire"))
+    with db.session_scope() as session:
+        assert LocataireRepository(session).search("quenelle") == []
+        # ON DELETE CASCADE removed the payment: its trigger fired too
+        assert PaiementRepository(session).search("régularisation") == []
+
+    print("\n   [OK] Recherche plein texte correcte")
+
+
+def test_rebuild_existing_rows():
+    """Test that creating the index on a populated database indexes its rows"""
+    print_section("CONSTRUCTION SUR UNE BASE EXISTANTE")
+
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE immeubles (id INTEGER PRIMARY KEY, nom TEXT, adresse TEXT)"))
+        connection.execute(text("CREATE TABLE bureaux (id INTEGER PRIMARY KEY, numero TEXT, etage TEXT, notes TEXT)"))
+        connection.execute(text(
+            "CREATE TABLE locataires (id INTEGER PRIMARY KEY, nom TEXT, email TEXT, "
+            "telephone TEXT, cin TEXT, raison_sociale TEXT)"
+        ))
+        connection.execute(text("CREATE TABLE paiements (id INTEGER PRIMARY KEY, commentaire TEXT)"))
+        connection.execute(text(
+            "CREATE TABLE documents (id INTEGER PRIMARY KEY, original_name TEXT, filename TEXT, description TEXT)"
+        ))
+        connection.execute(text("INSERT INTO immeubles (id, nom) VALUES (7, 'Tour Émeraude')"))
+        ensure_search_index(connection)
+        # Idempotent: a second call neither fails nor duplicates rows
+        ensure_search_index(connection)
+        rowids = connection.execute(
+            text("SELECT rowid FROM immeubles_fts WHERE immeubles_fts MATCH :q"), {"q": match_query("emeraude")}
+        ).scalars().all()
+    assert rowids == [7], f"Unexpected rowids {rowids}"
+    print("\n   [OK] Lignes existantes indexees")
+
+
+def main():
+    """Run search index tests"""
+    db = get_database()
+    ids = {}
+
+    try:
+        with db.session_scope() as session:
+            immeuble = Immeuble(nom="Résidence des Orangers", adresse="12 rue Zéphyr")
+            session.add(immeuble)
+            session.flush()
+            bureau = Bureau(immeuble_id=immeuble.id, numero="Zéphyr-12")
+            locataire = Locataire(nom="Éloïse Zéphyrin", email="eloise@example.tn")
+            session.add_all([bureau, locataire])
+            session.flush()
+            contrat = Contrat(
+                locataire_id=locataire.id,
+                date_debut=date(2024, 1, 1),
+                montant_premier_mois=Decimal("900.000"),
+                montant_mensuel=Decimal("900.000"),
+                bureaux=[bureau]
+            )
+            session.add(contrat)
+            session.flush()
+            paiement = Paiement(
+                locataire_id=locataire.id,
+                contrat_id=contrat.id,
+                type_paiement=TypePaiement.CAUTION,
+                montant_total=Decimal("900.000"),
+                date_paiement=date(2024, 1, 1),
+                commentaire="Régularisation caution"
+            )
+            session.add(paiement)
+            session.flush()
+            ids.update(immeuble=immeuble.id, bureau=bureau.id, locataire=locataire.id,
+                       contrat=contrat.id, paiement=paiement.id)
+
+        test_match_query()
+        test_repository_search(ids)
+        test_rebuild_existing_rows()
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        with db.session_scope() as session:
+            if "locataire" in ids:
+                locataire = session.get(Locataire, ids["locataire"])
+                if locataire:
+                    session.delete(locataire)
+            if "immeuble" in ids:
+                immeuble = session.get(Immeuble, ids["immeuble"])
+                if immeuble:
+                    session.delete(immeuble)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Startup benchmark test script
+Verifies one launch benchmarked against a synthetic portfolio reports every
+startup phase
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.portfolio import SIZES, build_portfolio
+from benchmarks.startup_benchmark import WALL_PHASE, launch, summarize, write_config
+
+PHASES = ["imports", "migrations", "config", "qapplication", "main_window", "first_paint", "dashboard_data"]
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def test_launch(directory: Path):
+    """Test one startup measured against a portfolio"""
+    print_section("DEMARRAGE MESURE")
+
+    db_path = directory / "portfolio.db"
+    build_portfolio(db_path, SIZES["small"])
+    write_config(directory, db_path)
+    sample = launch(directory)
+    assert list(sample) == PHASES + [WALL_PHASE], list(sample)
+    assert sample[WALL_PHASE] > sample["imports"] > 0
+    summary = summarize([sample, sample])
+    assert summary["imports"]["median_ms"] == sample["imports"]
+    print(f"\n   [OK] Demarrage en {sample[WALL_PHASE]:.0f} ms")
+
+
+def main():
+    """Run startup benchmark tests"""
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            test_launch(Path(directory))
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Startup profile test script
+Verifies heavy dependencies stay out of the startup imports and the
+--profile-startup report times phases and imports
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.startup_profile import StartupProfile
+
+# Imported at first use only: receipts, Google Drive backups, migrations
+HEAVY_MODULES = ["reportlab", "googleapiclient", "google.auth", "alembic"]
+
+
+def print_section(title: str):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def imported_modules(code: str) -> set:
+    """Modules loaded by running code in a fresh interpreter"""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys; print('\\n'.join(sys.modules))"],
+        cwd=project_root, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+def test_deferred_imports():
+    """Test that importing the window and the views loads no heavy dependency"""
+    print_section("IMPORTS DIFFERES")
+
+    print("\n1. Import de main...")
+    modules = imported_modules("import main")
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, f"Imported at startup: {loaded}"
+    views = sorted(name for name in modules if name.startswith("app.ui.views."))
+    assert views == [], f"Views imported before their first display: {views}"
+
+    print("\n2. Import de toutes les vues...")
+    modules = imported_modules(
+        "import main\n"
+        "from importlib import import_module\n"
+        "for _, module, _ in main.VIEWS: import_module(module)"
+    )
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, f"Imported by the views: {loaded}"
+    print("\n   [OK] Aucune dependance lourde au demarrage")
+
+
+def test_profile_report():
+    """Test the phases and the nested import times of a profile"""
+    print_section("RAPPORT DE DEMARRAGE")
+
+    with tempfile.TemporaryDirectory() as directory:
+        package = Path(directory) / "profil_demarrage_test"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "parent.py").write_text("import time\nfrom profil_demarrage_test import enfant\ntime.sleep(0.02)\n")
+        (package / "enfant.py").write_text("import time\ntime.sleep(0.03)\n")
+        sys.path.insert(0, directory)
+
+        argv = ["main.py", f"--profile-startup={directory}/profil.txt", "-style", "fusion"]
+        profile = StartupProfile.from_argv(argv)
+        try:
+            print("\n1. Drapeau de ligne de commande...")
+            assert profile.enabled
+            assert argv == ["main.py", "-style", "fusion"], argv
+            assert not StartupProfile.from_argv(["main.py"]).enabled
+            assert not profile.exit_after_startup
+            argv = ["main.py", "--exit-after-startup", "--profile-startup=profil.json"]
+            benchmark_profile = StartupProfile.from_argv(argv)
+            benchmark_profile.stop()
+            assert benchmark_profile.exit_after_startup and argv == ["main.py"], argv
+
+            print("\n2. Temps des imports imbriques...")
+            import profil_demarrage_test.parent  # noqa: F401
+            profile.mark("imports")
+            cumulative, own = profile.imports["profil_demarrage_test.parent"]
+            child_cumulative, child_own = profile.imports["profil_demarrage_test.enfant"]
+            assert child_cumulative >= 30, child_cumulative
+            assert cumulative >= child_cumulative + 20, (cumulative, child_cumulative)
+            assert 20 <= own < child_cumulative, own
+            # The loader proxy does not stay on the module
+            module = sys.modules["profil_demarrage_test.parent"]
+            assert type(module.__loader__).__name__ == "SourceFileLoader", module.__loader__
+
+            print("\n3. Rapport...")
+            path = profile.write()
+            report = path.read_text(encoding="utf-8")
+            assert path == Path(directory) / "profil.txt"
+            assert "imports" in report and "profil_demarrage_test.parent" in report, report
+            assert profile.phases[0][0] == "imports"
+            print(report)
+        finally:
+            profile.stop()
+            sys.path.remove(directory)
+            for name in [m for m in sys.modules if m.startswith("profil_demarrage_test")]:
+                del sys.modules[name]
+    print("\n   [OK] Rapport de demarrage complet")
+
+
+def main():
+    """Run startup profile tests"""
+    try:
+        test_deferred_imports()
+        test_profile_report()
+
+        print("\n" + "=" * 60)
+        print("  TOUS LES TESTS REUSSIS!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERREUR] {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from PySide6.QtWidgets import (
-    QApplication, QDialog, QTableWidget, QLineEdit, QPushButton, 
+    QApplication, QDialog, QTableView, QLineEdit, QPushButton, 
     QMessageBox, QTextEdit, QComboBox, QDateEdit, QWidget, QDoubleSpinBox,
     QSpinBox, QListWidget, QCheckBox
 )
@@ -324,6 +324,14 @@ class TestRunner:
         Database._instance = None
         Database._engine = None
         Database._session_factory = None
+        Database._read_engine = None
+        Database._read_session_factory = None
+        Database._repository_cache = None
+        Database._change_bus = None
+        from app.ui.change_notifier import ChangeNotifier
+        ChangeNotifier._instance = None
+        from app.ui.widgets.reference_models import ReferenceData
+        ReferenceData._instance = None
         
         from app.database.connection import get_database
         db = get_database()
@@ -367,6 +375,14 @@ class TestRunner:
         Database._instance = None
         Database._engine = None
         Database._session_factory = None
+        Database._read_engine = None
+        Database._read_session_factory = None
+        Database._repository_cache = None
+        Database._change_bus = None
+        from app.ui.change_notifier import ChangeNotifier
+        ChangeNotifier._instance = None
+        from app.ui.widgets.reference_models import ReferenceData
+        ReferenceData._instance = None
         
         if self.temp_dir and os.path.exists(self.temp_dir):
             try:
@@ -403,9 +419,16 @@ class TestRunner:
         
         self.app.processEvents()
         QTest.qWait(300)
+        self.wait_for_loads()
         
         return self.main_window.content.currentWidget()
     
+    def wait_for_loads(self):
+        """Wait until the views have received the data of their background loads"""
+        from app.ui.loader import wait_for_loads
+        if not wait_for_loads():
+            raise TimeoutError("View data still loading")
+    
     def click_button(self, button_text):
         current_view = self.main_window.content.currentWidget()
         buttons = current_view.findChildren(QPushButton)
@@ -415,6 +438,7 @@ class TestRunner:
                 QTest.mouseClick(btn, Qt.MouseButton.LeftButton)
                 self.app.processEvents()
                 QTest.qWait(300)
+                self.wait_for_loads()
                 return True
         
         return False
@@ -505,8 +529,8 @@ class TestRunner:
 
     def get_table_row_count(self):
         current_view = self.main_window.content.currentWidget()
-        tables = current_view.findChildren(QTableWidget)
-        return tables[0].rowCount() if tables else 0
+        tables = current_view.findChildren(QTableView)
+        return tables[0].model().rowCount() if tables else 0
     
     def open_dialog_and_fill(self, button_text, dialog_title, field_values, list_selections=None, timeout_ms=15000):
         interactor = DialogInteractor()
@@ -544,6 +568,7 @@ class TestRunner:
             return False
         
         QTest.qWait(500)
+        self.wait_for_loads()
         return True
     
     def run_test(self, test_name, test_func):
@@ -559,11 +584,11 @@ class TestRunner:
             return True
         except Exception as e:
             result = {"name": test_name, "status": "FAILED", "error": str(e)}
-        print(f"  ✗ FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        self.test_results.append(result)
-        return False
+            print(f"  ✗ FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            self.test_results.append(result)
+            return False
     
     def print_report(self):
         print(f"\n{'='*60}")
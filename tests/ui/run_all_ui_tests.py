@@ -17,6 +17,13 @@ from tests.ui.test_locataire_crud import run_locataire_tests
 from tests.ui.test_bureau_crud import run_bureau_tests
 from tests.ui.test_contrat_crud import run_contrat_tests
 from tests.ui.test_paiement_crud import run_paiement_tests
+from tests.ui.test_dashboard_grid import run_dashboard_tests
+from tests.ui.test_lazy_loading import run_lazy_loading_tests
+from tests.ui.test_reference_models import run_reference_model_tests
+from tests.ui.test_change_events import run_change_event_tests
+from tests.ui.test_data_loader import run_data_loader_tests
+from tests.ui.test_main_window import run_main_window_tests
+from tests.ui.test_audit_view import run_audit_tests
 from tests.ui.test_deletion_constraints import run_deletion_constraint_tests
 
 
@@ -40,6 +47,13 @@ def run_all_ui_tests():
         run_bureau_tests(runner)
         run_contrat_tests(runner)
         run_paiement_tests(runner)
+        run_dashboard_tests(runner)
+        run_lazy_loading_tests(runner)
+        run_reference_model_tests(runner)
+        run_change_event_tests(runner)
+        run_data_loader_tests(runner)
+        run_main_window_tests(runner)
+        run_audit_tests(runner)
         
         # Run deletion constraint tests
         run_deletion_constraint_tests(runner)
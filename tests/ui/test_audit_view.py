@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Audit History UI Tests
+Tests paging and SQL filtering of the audit history view
+"""
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtTest import QTest
+
+from tests.ui.base_ui_test import TestRunner
+from app.ui.widgets.lazy_table_model import PAGE_SIZE
+
+
+class TestAuditView:
+    """Test suite for the audit history view"""
+
+    TEST_TABLE = "test_audit_pagination"
+    NB_LOGS = PAGE_SIZE + 60
+
+    @staticmethod
+    def setup_test_data():
+        """Create more audit logs than one page, alternating actions"""
+        from app.database.connection import get_database
+        from app.models.entities import AuditLog
+
+        db = get_database()
+        base = datetime(2030, 1, 1)
+        with db.session_scope() as session:
+            session.add_all([
+                AuditLog(
+                    table_nom=TestAuditView.TEST_TABLE,
+                    entite_id=i,
+                    action="DELETE" if i % 4 == 0 else "UPDATE",
+                    donnees_avant={"nom": f"Avant {i}"},
+                    # Same timestamp for pairs of rows: paging must break ties on id
+                    created_at=base + timedelta(minutes=i // 2)
+                )
+                for i in range(TestAuditView.NB_LOGS)
+            ])
+
+    @staticmethod
+    def cleanup_test_data():
+        """Remove the audit logs created by setup_test_data"""
+        from app.database.connection import get_database
+        from app.models.entities import AuditLog
+
+        db = get_database()
+        with db.session_scope() as session:
+            session.query(AuditLog).filter(AuditLog.table_nom == TestAuditView.TEST_TABLE).delete()
+
+    @staticmethod
+    def test_audit_paging_and_filters(runner: TestRunner):
+        """Test keyset paging and SQL-side action/text filters"""
+        print("\n  Test: Audit paging and filters")
+
+        TestAuditView.setup_test_data()
+        try:
+            view = runner.navigate_to_view("historique")
+            view.search_input.setText(TestAuditView.TEST_TABLE)
+            QTest.qWait(500)
+            runner.wait_for_loads()
+            model = view.model
+
+            assert model.rowCount() == PAGE_SIZE, f"Expected one page, got {model.rowCount()}"
+            while model.canFetchMore():
+                model.fetchMore()
+                runner.wait_for_loads()
+            ids = [model.row_id(row) for row in range(model.rowCount())]
+            assert len(ids) == TestAuditView.NB_LOGS, f"Expected {TestAuditView.NB_LOGS}, got {len(ids)}"
+            assert len(set(ids)) == len(ids), "Duplicate rows across pages"
+            print(f"    ✓ {len(ids)} logs paged without duplicates")
+
+            view.action_filter.setCurrentText("DELETE")
+            runner.app.processEvents()
+            runner.wait_for_loads()
+            actions = {model.index(row, 1).data() for row in range(model.rowCount())}
+            assert actions == {"DELETE"}, f"Unexpected actions {actions}"
+            assert model.rowCount() == TestAuditView.NB_LOGS // 4
+            print(f"    ✓ Action filter returned {model.rowCount()} rows")
+
+            view.search_input.setText('Avant 136"')
+            QTest.qWait(500)
+            runner.wait_for_loads()
+            assert model.rowCount() == 1, f"Expected 1 row, got {model.rowCount()}"
+            print("    ✓ Text filter applied in SQL")
+
+            view.action_filter.setCurrentText("Toutes les actions")
+            view.search_input.setText("")
+            QTest.qWait(500)
+        finally:
+            TestAuditView.cleanup_test_data()
+
+
+def run_audit_tests(runner: TestRunner):
+    """Run all audit history tests"""
+    print("\n" + "="*60)
+    print("  AUDIT HISTORY TESTS")
+    print("="*60)
+
+    runner.run_test("Audit Paging And Filters", TestAuditView.test_audit_paging_and_filters)
+
+
+if __name__ == "__main__":
+    print("Audit History Tests - Use run_all_ui_tests.py to execute")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Change Events UI Tests
+Tests that committed changes patch only the affected rows and dashboard cells
+"""
+import sys
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import event
+
+from tests.ui.base_ui_test import TestRunner
+
+
+@contextmanager
+def count_selects():
+    """Collect the SELECT statements run on both engines"""
+    from app.database.connection import get_database
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    db = get_database()
+    for engine in (db.engine, db.read_engine):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in (db.engine, db.read_engine):
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class ModelSignals:
+    """Records the row signals of a table model"""
+
+    def __init__(self, model):
+        self.events = []
+        model.modelReset.connect(lambda: self.events.append("reset"))
+        model.rowsInserted.connect(lambda parent, first, last: self.events.append(("insert", first)))
+        model.rowsRemoved.connect(lambda parent, first, last: self.events.append(("remove", first)))
+        model.rowsMoved.connect(lambda *args: self.events.append("move"))
+        model.dataChanged.connect(
+            lambda top_left, bottom_right, roles=None: self.events.append(("update", top_left.row())))
+
+
+class TestChangeEvents:
+    """Test suite for the change bus driven refreshes"""
+
+    TEST_IMMEUBLE = "Immeuble Test Evenements"
+    TEST_LOCATAIRE = "Test Locataire Evenements"
+    NB_PAIEMENTS = 5
+
+    @staticmethod
+    def setup_test_data():
+        """Create a contract with a few payments on distinct dates"""
+        from app.database.connection import get_database
+        from app.models.entities import Immeuble, Bureau, Locataire, Contrat, Paiement, TypePaiement
+
+        db = get_database()
+        with db.session_scope() as session:
+            immeuble = Immeuble(nom=TestChangeEvents.TEST_IMMEUBLE)
+            locataire = Locataire(nom=TestChangeEvents.TEST_LOCATAIRE)
+            session.add_all([immeuble, locataire])
+            session.flush()
+            bureau = Bureau(immeuble_id=immeuble.id, numero="EVT-1")
+            session.add(bureau)
+            session.flush()
+            contrat = Contrat(
+                locataire_id=locataire.id,
+                date_debut=date(2021, 1, 1),
+                montant_premier_mois=Decimal("700.000"),
+                montant_mensuel=Decimal("700.000"),
+                bureaux=[bureau]
+            )
+            session.add(contrat)
+            session.flush()
+            paiements = [
+                Paiement(
+                    locataire_id=locataire.id,
+                    contrat_id=contrat.id,
+                    type_paiement=TypePaiement.CAUTION,
+                    montant_total=Decimal(100 + i),
+                    date_paiement=date(2021, 1, 1 + i),
+                    commentaire="evenements"
+                )
+                for i in range(TestChangeEvents.NB_PAIEMENTS)
+            ]
+            session.add_all(paiements)
+            session.flush()
+            return immeuble.id, locataire.id, contrat.id, [p.id for p in paiements]
+
+    @staticmethod
+    def cleanup_test_data(immeuble_id, locataire_id):
+        """Remove the data created by setup_test_data"""
+        from app.database.connection import get_database
+        from app.models.entities import Immeuble, Locataire
+
+        db = get_database()
+        with db.session_scope() as session:
+            for entity in (session.get(Locataire, locataire_id), session.get(Immeuble, immeuble_id)):
+                if entity:
+                    session.delete(entity)
+
+    @staticmethod
+    def test_paiement_rows_patched(runner: TestRunner):
+        """Test that editing, creating and deleting payments touches one row each"""
+        print("\n  Test: Paiement rows patched")
+        from app.database.connection import get_database
+        from app.models.entities import Paiement, Locataire
+
+        immeuble_id, locataire_id, contrat_id, paiement_ids = TestChangeEvents.setup_test_data()
+        try:
+            view = runner.navigate_to_view("paiements")
+            view.search_edit.setText("Evenements")
+            runner.app.processEvents()
+            runner.wait_for_loads()
+            model = view.model
+            ids = [model.row_id(row) for row in range(model.rowCount())]
+            # Most recent payment first
+            assert ids == paiement_ids[::-1], ids
+            signals = ModelSignals(model)
+
+            with count_selects() as statements:
+                with get_database().session_scope() as session:
+                    session.get(Paiement, paiement_ids[2]).montant_total = Decimal("999.000")
+            row = ids.index(paiement_ids[2])
+            assert signals.events == [("update", row)], signals.events
+            assert model.index(row, 4).data() == "999.000 TND"
+            print(f"    ✓ Edited payment updated in place ({len(statements)} SELECT)")
+
+            signals.events.clear()
+            with get_database().session_scope() as session:
+                session.get(Paiement, paiement_ids[0]).date_paiement = date(2021, 1, 10)
+            assert signals.events == ["move", ("update", 0)], signals.events
+            assert model.row_id(0) == paiement_ids[0]
+            print("    ✓ Payment moved to its new sorted position")
+
+            signals.events.clear()
+            with get_database().session_scope() as session:
+                paiement = session.get(Paiement, paiement_ids[1])
+                session.delete(paiement)
+            assert signals.events == [("remove", model.rowCount())], signals.events
+            assert paiement_ids[1] not in [model.row_id(r) for r in range(model.rowCount())]
+            print("    ✓ Deleted payment removed")
+
+            signals.events.clear()
+            with get_database().session_scope() as session:
+                session.get(Locataire, locataire_id).nom = "Test Locataire Evenements Renomme"
+            assert "reset" not in signals.events, signals.events
+            assert all(model.index(r, 1).data().endswith("Renomme") for r in range(model.rowCount()))
+            print("    ✓ Renamed locataire patched into its payment rows")
+
+            view.search_edit.setText("")
+            runner.app.processEvents()
+        finally:
+            TestChangeEvents.cleanup_test_data(immeuble_id, locataire_id)
+
+    @staticmethod
+    def test_dashboard_payes_only(runner: TestRunner):
+        """Test that a new payment only reads the paid months of the dashboard"""
+        print("\n  Test: Dashboard paid months only")
+        from app.database.connection import get_database
+        from app.repositories.paiement_repository import PaiementRepository
+        from app.ui.widgets.payment_grid import StatutRole, PAYE
+
+        immeuble_id, locataire_id, contrat_id, paiement_ids = TestChangeEvents.setup_test_data()
+        try:
+            view = runner.navigate_to_view("dashboard")
+            view.load_data()
+            runner.wait_for_loads()
+            grid = view._cartes[immeuble_id]["grid"]
+            today = date.today()
+
+            with get_database().session_scope() as session:
+                PaiementRepository(session).create_paiement_loyer(
+                    locataire_id=locataire_id,
+                    contrat_id=contrat_id,
+                    montant_total=Decimal("700.000"),
+                    date_paiement=today,
+                    date_debut_periode=date(today.year, today.month, 1),
+                    date_fin_periode=date(today.year, today.month, 28)
+                )
+                session.flush()
+                with count_selects() as statements:
+                    session.commit()
+                    runner.wait_for_loads()
+
+            assert view._cartes[immeuble_id]["grid"] is grid, "Card was rebuilt"
+            assert len(statements) == 1, statements
+            assert grid.model().index(0, 12).data(StatutRole) == PAYE
+            print("    ✓ One query refreshed the paid cell")
+        finally:
+            TestChangeEvents.cleanup_test_data(immeuble_id, locataire_id)
+
+
+def run_change_event_tests(runner: TestRunner):
+    """Run all change event tests"""
+    print("\n" + "="*60)
+    print("  CHANGE EVENT TESTS")
+    print("="*60)
+
+    runner.run_test("Paiement Rows Patched", TestChangeEvents.test_paiement_rows_patched)
+    runner.run_test("Dashboard Paid Months Only", TestChangeEvents.test_dashboard_payes_only)
+
+
+if __name__ == "__main__":
+    print("Change Event Tests - Use run_all_ui_tests.py to execute")
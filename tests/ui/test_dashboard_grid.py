@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Dashboard Grid UI Tests
+Tests the painted payment grid of the dashboard view
+"""
+import sys
+from pathlib import Path
+from datetime import date
+from decimal import Decimal
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.ui.base_ui_test import TestRunner
+
+
+class TestDashboardGrid:
+    """Test suite for the dashboard payment grid"""
+
+    TEST_IMMEUBLE = "Immeuble Test Dashboard"
+    TEST_LOCATAIRE = "Test Locataire Dashboard"
+
+    @staticmethod
+    def setup_test_data():
+        """Create an immeuble with one contract paid for the current month"""
+        from app.database.connection import get_database
+        from app.models.entities import Immeuble, Bureau, Locataire, Contrat
+        from app.repositories.paiement_repository import PaiementRepository
+
+        db = get_database()
+        today = date.today()
+
+        with db.session_scope() as session:
+            immeuble = Immeuble(nom=TestDashboardGrid.TEST_IMMEUBLE)
+            locataire = Locataire(nom=TestDashboardGrid.TEST_LOCATAIRE)
+            session.add_all([immeuble, locataire])
+            session.flush()
+            bureau = Bureau(immeuble_id=immeuble.id, numero="DSH-1")
+            session.add(bureau)
+            session.flush()
+            contrat = Contrat(
+                locataire_id=locataire.id,
+                date_debut=date(today.year - 1, today.month, 1),
+                montant_premier_mois=Decimal("900.000"),
+                montant_mensuel=Decimal("900.000"),
+                bureaux=[bureau]
+            )
+            session.add(contrat)
+            session.flush()
+            PaiementRepository(session).create_paiement_loyer(
+                locataire_id=locataire.id,
+                contrat_id=contrat.id,
+                montant_total=Decimal("900.000"),
+                date_paiement=date(today.year, today.month, 1),
+                date_debut_periode=date(today.year, today.month, 1),
+                date_fin_periode=date(today.year, today.month, 28)
+            )
+            return immeuble.id, locataire.id, contrat.id
+
+    @staticmethod
+    def cleanup_test_data(immeuble_id, locataire_id):
+        """Remove the data created by setup_test_data"""
+        from app.database.connection import get_database
+        from app.models.entities import Immeuble, Locataire
+
+        db = get_database()
+        with db.session_scope() as session:
+            for entity in (session.get(Locataire, locataire_id), session.get(Immeuble, immeuble_id)):
+                if entity:
+                    session.delete(entity)
+
+    @staticmethod
+    def test_grid_statuses(runner: TestRunner):
+        """Test that the grid model exposes one status per cell"""
+        print("\n  Test: Grid statuses")
+        from app.ui.widgets.payment_grid import StatutRole, PAYE, NON_PAYE
+
+        immeuble_id, locataire_id, contrat_id = TestDashboardGrid.setup_test_data()
+        try:
+            view = runner.navigate_to_view("dashboard")
+            view.load_data()
+            runner.wait_for_loads()
+
+            grid = view._cartes[immeuble_id]["grid"]
+            model = grid.model()
+            assert model.rowCount() == 1, f"Expected 1 contract row, got {model.rowCount()}"
+            assert model.columnCount() == 18, f"Expected 18 months, got {model.columnCount()}"
+
+            # The current month is the 13th column of the window
+            assert model.index(0, 12).data(StatutRole) == PAYE
+            assert model.index(0, 11).data(StatutRole) == NON_PAYE
+            print(f"    ✓ Grid has {model.rowCount()}x{model.columnCount()} painted cells")
+        finally:
+            TestDashboardGrid.cleanup_test_data(immeuble_id, locataire_id)
+
+    @staticmethod
+    def test_incremental_refresh(runner: TestRunner):
+        """Test that a reload only signals the cells that changed"""
+        print("\n  Test: Incremental refresh")
+        from app.database.connection import get_database
+        from app.repositories.paiement_repository import PaiementRepository
+        from app.ui.widgets.payment_grid import StatutRole, PAYE
+
+        immeuble_id, locataire_id, contrat_id = TestDashboardGrid.setup_test_data()
+        try:
+            view = runner.navigate_to_view("dashboard")
+            view.load_data()
+            runner.wait_for_loads()
+            grid = view._cartes[immeuble_id]["grid"]
+            model = grid.model()
+
+            changes = []
+            model.dataChanged.connect(lambda top_left, bottom_right, roles=None: changes.append(top_left.column()))
+            model.modelReset.connect(lambda: changes.append("reset"))
+
+            view.load_data()
+            runner.wait_for_loads()
+            assert changes == [], f"Unchanged reload emitted {changes}"
+
+            today = date.today()
+            previous = date(today.year - 1, 12, 1) if today.month == 1 else date(today.year, today.month - 1, 1)
+            with get_database().session_scope() as session:
+                PaiementRepository(session).create_paiement_loyer(
+                    locataire_id=locataire_id,
+                    contrat_id=contrat_id,
+                    montant_total=Decimal("900.000"),
+                    date_paiement=previous,
+                    date_debut_periode=previous,
+                    date_fin_periode=previous.replace(day=28)
+                )
+
+            view.load_data()
+            runner.wait_for_loads()
+            assert view._cartes[immeuble_id]["grid"] is grid, "Card was rebuilt"
+            assert changes == [11], f"Expected only column 11 to change, got {changes}"
+            assert model.index(0, 11).data(StatutRole) == PAYE
+            print("    ✓ Only the newly paid cell was updated")
+        finally:
+            TestDashboardGrid.cleanup_test_data(immeuble_id, locataire_id)
+
+
+def run_dashboard_tests(runner: TestRunner):
+    """Run all dashboard grid tests"""
+    print("\n" + "="*60)
+    print("  DASHBOARD GRID TESTS")
+    print("="*60)
+
+    runner.run_test("Dashboard Grid Statuses", TestDashboardGrid.test_grid_statuses)
+    runner.run_test("Dashboard Incremental Refresh", TestDashboardGrid.test_incremental_refresh)
+
+
+if __name__ == "__main__":
+    print("Dashboard Grid Tests - Use run_all_ui_tests.py to execute")
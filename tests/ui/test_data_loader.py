@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Data Loader UI Tests
+Tests that view queries run off the UI thread and that superseded loads are aborted
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+
+from tests.ui.base_ui_test import TestRunner
+
+# Runs for minutes unless interrupted
+SLOW_QUERY = text(
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000) "
+    "SELECT count(*) FROM n"
+)
+
+
+class TestDataLoader:
+    """Test suite for the background data loader"""
+
+    @staticmethod
+    def test_worker_thread(runner: TestRunner):
+        """Test that fetch runs on a worker and the result comes back on the UI thread"""
+        print("\n  Test: Worker thread")
+        from app.ui.loader import DataLoader
+
+        loader = DataLoader()
+        threads = {}
+
+        def fetch(session):
+            threads["fetch"] = threading.current_thread()
+            return session.execute(text("SELECT 42")).scalar()
+
+        def loaded(result):
+            threads["loaded"] = threading.current_thread()
+            threads["result"] = result
+
+        loader.load(fetch, loaded)
+        runner.wait_for_loads()
+        assert threads["result"] == 42, threads
+        assert threads["fetch"] is not threading.main_thread()
+        assert threads["loaded"] is threading.main_thread()
+        assert not loader.is_loading
+        print("    ✓ Queried on a worker, delivered on the UI thread")
+
+    @staticmethod
+    def test_superseded_load(runner: TestRunner):
+        """Test that a new load interrupts the running query and drops its result"""
+        print("\n  Test: Superseded load")
+        from app.ui.loader import DataLoader
+
+        loader = DataLoader()
+        delivered = []
+        errors = []
+        started = threading.Event()
+        aborted = {}
+
+        def slow(session):
+            started.set()
+            try:
+                return session.execute(SLOW_QUERY).scalar()
+            except Exception as e:
+                aborted["error"] = e
+                raise
+
+        loader.load(slow, delivered.append, errors.append)
+        assert started.wait(5), "Slow load never started"
+        start = time.monotonic()
+        loader.load(lambda session: "filtre", delivered.append, errors.append)
+        runner.wait_for_loads()
+        elapsed = time.monotonic() - start
+
+        assert delivered == ["filtre"], delivered
+        assert errors == [], errors
+        assert "interrupted" in str(aborted.get("error", "")), aborted
+        assert elapsed < 5, f"Superseded query ran {elapsed:.1f}s"
+        print(f"    ✓ Running query interrupted after {elapsed * 1000:.0f} ms, result dropped")
+
+    @staticmethod
+    def test_load_error(runner: TestRunner):
+        """Test that a failing fetch reaches the error callback"""
+        print("\n  Test: Load error")
+        from app.ui.loader import DataLoader
+
+        loader = DataLoader()
+        errors = []
+
+        def failing(session):
+            raise ValueError("fetch")
+
+        loader.load(failing, lambda result: None, errors.append)
+        runner.wait_for_loads()
+        assert len(errors) == 1 and isinstance(errors[0], ValueError), errors
+        print("    ✓ Error delivered on the UI thread")
+
+
+def run_data_loader_tests(runner: TestRunner):
+    """Run all data loader tests"""
+    print("\n" + "="*60)
+    print("  DATA LOADER TESTS")
+    print("="*60)
+
+    runner.run_test("Worker Thread", TestDataLoader.test_worker_thread)
+    runner.run_test("Superseded Load", TestDataLoader.test_superseded_load)
+    runner.run_test("Load Error", TestDataLoader.test_load_error)
+
+
+if __name__ == "__main__":
+    print("Data Loader Tests - Use run_all_ui_tests.py to execute")
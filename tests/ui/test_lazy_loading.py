@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Lazy Loading UI Tests
+Tests keyset paging and SQL-side sorting of the Paiements and Contrats tables
+"""
+import sys
+from pathlib import Path
+from datetime import date, timedelta
+from decimal import Decimal
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtCore import Qt
+from PySide6.QtTest import QTest
+
+from tests.ui.base_ui_test import TestRunner
+from app.ui.widgets.lazy_table_model import PAGE_SIZE
+
+
+class TestLazyLoading:
+    """Test suite for the lazily fetched table models"""
+
+    TEST_LOCATAIRE = "Test Locataire Pagination"
+    NB_PAIEMENTS = PAGE_SIZE * 2 + 50
+
+    @staticmethod
+    def setup_test_data():
+        """Create one contract with more payments than two pages"""
+        from app.database.connection import get_database
+        from app.models.entities import Locataire, Contrat, Paiement, TypePaiement
+
+        db = get_database()
+        with db.session_scope() as session:
+            locataire = Locataire(nom=TestLazyLoading.TEST_LOCATAIRE)
+            session.add(locataire)
+            session.flush()
+            contrat = Contrat(
+                locataire_id=locataire.id,
+                date_debut=date(2020, 1, 1),
+                montant_premier_mois=Decimal("500.000"),
+                montant_mensuel=Decimal("500.000")
+            )
+            session.add(contrat)
+            session.flush()
+            # Several payments share each date so paging must break ties on id
+            for i in range(TestLazyLoading.NB_PAIEMENTS):
+                session.add(Paiement(
+                    locataire_id=locataire.id,
+                    contrat_id=contrat.id,
+                    type_paiement=TypePaiement.CAUTION,
+                    montant_total=Decimal(100 + i),
+                    date_paiement=date(2020, 1, 1) + timedelta(days=i // 3),
+                    commentaire=f"pagination {i}"
+                ))
+            return locataire.id
+
+    @staticmethod
+    def cleanup_test_data(locataire_id):
+        """Remove the data created by setup_test_data"""
+        from app.database.connection import get_database
+        from app.models.entities import Locataire
+
+        db = get_database()
+        with db.session_scope() as session:
+            locataire = session.get(Locataire, locataire_id)
+            if locataire:
+                session.delete(locataire)
+
+    @staticmethod
+    def fetch_all(model):
+        """Fetch every remaining page and return the loaded ids"""
+        from app.ui.loader import wait_for_loads
+
+        while model.canFetchMore():
+            model.fetchMore()
+            wait_for_loads()
+        return [model.row_id(row) for row in range(model.rowCount())]
+
+    @staticmethod
+    def test_paiement_paging(runner: TestRunner):
+        """Test that payments load one page at a time without gaps or duplicates"""
+        print("\n  Test: Paiement paging")
+
+        locataire_id = TestLazyLoading.setup_test_data()
+        try:
+            view = runner.navigate_to_view("paiements")
+            view.search_edit.setText("pagination")
+            runner.app.processEvents()
+            runner.wait_for_loads()
+            model = view.model
+
+            assert model.rowCount() <= PAGE_SIZE, f"Loaded {model.rowCount()} rows up front"
+            assert model.canFetchMore(), "More pages should be available"
+            print(f"    ✓ First page holds {model.rowCount()} rows")
+
+            ids = TestLazyLoading.fetch_all(model)
+            assert len(ids) == TestLazyLoading.NB_PAIEMENTS, f"Expected {TestLazyLoading.NB_PAIEMENTS}, got {len(ids)}"
+            assert len(set(ids)) == len(ids), "Duplicate rows across pages"
+
+            dates = [model.index(row, 5).data() for row in range(model.rowCount())]
+            assert dates == sorted(dates, reverse=True), "Rows not ordered by date"
+            print(f"    ✓ {len(ids)} rows fetched in order")
+
+            view.table.sortByColumn(4, Qt.AscendingOrder)
+            runner.app.processEvents()
+            runner.wait_for_loads()
+            TestLazyLoading.fetch_all(model)
+            montants = [float(model.index(row, 4).data().split()[0]) for row in range(model.rowCount())]
+            assert montants == sorted(montants), "Rows not sorted by montant"
+            print("    ✓ SQL-side sort on Montant")
+
+            view.table.sortByColumn(5, Qt.DescendingOrder)
+            view.search_edit.setText("")
+            QTest.qWait(100)
+        finally:
+            TestLazyLoading.cleanup_test_data(locataire_id)
+
+    @staticmethod
+    def test_contrat_projection(runner: TestRunner):
+        """Test that the contracts table shows aggregated bureaux and selection ids"""
+        print("\n  Test: Contrat projection")
+
+        locataire_id = TestLazyLoading.setup_test_data()
+        try:
+            view = runner.navigate_to_view("contrats")
+            view.search_edit.setText("Pagination")
+            QTest.qWait(500)
+            runner.wait_for_loads()
+            model = view.model
+
+            assert model.rowCount() == 1, f"Expected 1 contract, got {model.rowCount()}"
+            assert model.index(0, 2).data() == "Aucun"
+            view.table.selectRow(0)
+            runner.app.processEvents()
+            assert view.selected_id() == model.row_id(0)
+            print("    ✓ Contract row projected and selectable")
+
+            view.search_edit.setText("")
+            QTest.qWait(500)
+        finally:
+            TestLazyLoading.cleanup_test_data(locataire_id)
+
+
+def run_lazy_loading_tests(runner: TestRunner):
+    """Run all lazy loading tests"""
+    print("\n" + "="*60)
+    print("  LAZY LOADING TESTS")
+    print("="*60)
+
+    runner.run_test("Paiement Paging", TestLazyLoading.test_paiement_paging)
+    runner.run_test("Contrat Projection", TestLazyLoading.test_contrat_projection)
+
+
+if __name__ == "__main__":
+    print("Lazy Loading Tests - Use run_all_ui_tests.py to execute")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Main Window UI Tests
+Tests that views are built on first navigation instead of at startup
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtTest import QTest
+
+from tests.ui.base_ui_test import TestRunner
+
+
+class TestMainWindow:
+    """Test suite for the lazily built views"""
+
+    @staticmethod
+    def test_views_built_on_navigation(runner: TestRunner):
+        """Test that only the dashboard exists at startup and a page is built when opened"""
+        print("\n  Test: Views built on navigation")
+        from main import MainWindow, VIEWS
+        from app.ui.views.paiement_view import PaiementView
+
+        window = MainWindow()
+        try:
+            assert list(window._views) == [0], f"Built at startup: {list(window._views)}"
+            assert window.content.count() == len(VIEWS)
+            assert window.content.currentWidget() is window._views[0]
+            print("    ✓ Only the dashboard is built at startup")
+
+            window.sidebar.setCurrentRow(5)
+            runner.wait_for_loads()
+            view = window.content.currentWidget()
+            assert isinstance(view, PaiementView), type(view)
+            assert window.content.indexOf(view) == 5
+            assert window.paiement_view is view
+            assert sorted(window._views) == [0, 5]
+            print("    ✓ Paiements view built when opened")
+
+            window.sidebar_bottom.setCurrentRow(0)
+            runner.wait_for_loads()
+            assert window.content.currentIndex() == 6
+            assert window.content.currentWidget() is window.audit_view
+            print("    ✓ Bottom sidebar pages built when opened")
+        finally:
+            window.close()
+            window.deleteLater()
+            runner.wait_for_loads()
+
+    @staticmethod
+    def test_warm_up(runner: TestRunner):
+        """Test that the warm-up builds every page, one per event loop turn"""
+        print("\n  Test: Views warm-up")
+        from main import MainWindow, VIEWS
+
+        window = MainWindow()
+        try:
+            window._warm_up_next_view()
+            assert len(window._views) == 2, "Warm-up built more than one view per turn"
+            for _ in range(50):
+                if len(window._views) == len(VIEWS):
+                    break
+                QTest.qWait(20)
+            assert len(window._views) == len(VIEWS), f"Built {len(window._views)} views"
+            for index, (attribute, module, class_name) in enumerate(VIEWS):
+                assert type(window.content.widget(index)).__name__ == class_name, attribute
+            assert window.content.count() == len(VIEWS)
+            assert window.content.currentIndex() == 0
+            print(f"    ✓ {len(VIEWS)} views built in the background")
+        finally:
+            window.close()
+            window.deleteLater()
+            QTest.qWait(200)
+            runner.wait_for_loads()
+
+
+def run_main_window_tests(runner: TestRunner):
+    """Run all main window tests"""
+    print("\n" + "="*60)
+    print("  MAIN WINDOW TESTS")
+    print("="*60)
+
+    runner.run_test("Views Built On Navigation", TestMainWindow.test_views_built_on_navigation)
+    runner.run_test("Views Warm-up", TestMainWindow.test_warm_up)
+
+
+if __name__ == "__main__":
+    print("Main Window Tests - Use run_all_ui_tests.py to execute")
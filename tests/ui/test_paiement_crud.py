@@ -12,7 +12,7 @@ from decimal import Decimal
 project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from PySide6.QtWidgets import QApplication, QTableWidget
+from PySide6.QtWidgets import QApplication, QTableView
 from PySide6.QtTest import QTest
 
 from tests.ui.base_ui_test import TestRunner
@@ -170,13 +170,13 @@ class TestPaiementCRUD:
         
         view = runner.navigate_to_view("paiements")
         
-        tables = view.findChildren(QTableWidget)
+        tables = view.findChildren(QTableView)
         if not tables:
             print("    ⚠ No table found")
             return
         
         table = tables[0]
-        row_count = table.rowCount()
+        row_count = table.model().rowCount()
         print(f"    Table has {row_count} rows")
         
         if row_count == 0:
@@ -192,8 +192,8 @@ class TestPaiementCRUD:
         
         view = runner.navigate_to_view("paiements")
         
-        tables = view.findChildren(QTableWidget)
-        if not tables or tables[0].rowCount() == 0:
+        tables = view.findChildren(QTableView)
+        if not tables or tables[0].model().rowCount() == 0:
             print("    ⚠ No paiements to update")
             return
         
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+Reference Models UI Tests
+Tests the shared immeubles/locataires/contrats/bureaux models bound to the combos
+"""
+import sys
+from pathlib import Path
+from datetime import date
+from decimal import Decimal
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtCore import Qt
+from sqlalchemy import event
+
+from tests.ui.base_ui_test import TestRunner
+
+
+class TestReferenceModels:
+    """Test suite for the shared reference list models"""
+
+    TEST_IMMEUBLE = "Test Immeuble Reference"
+    TEST_LOCATAIRE = "Test Locataire Reference"
+
+    @staticmethod
+    def setup_test_data():
+        """Create an immeuble with one bureau rented by a locataire"""
+        from app.database.connection import get_database
+        from app.models.entities import Immeuble, Bureau, Locataire, Contrat
+
+        db = get_database()
+        with db.session_scope() as session:
+            immeuble = Immeuble(nom=TestReferenceModels.TEST_IMMEUBLE)
+            locataire = Locataire(nom=TestReferenceModels.TEST_LOCATAIRE)
+            session.add_all([immeuble, locataire])
+            session.flush()
+            bureau = Bureau(immeuble_id=immeuble.id, numero="REF-1")
+            session.add(bureau)
+            session.flush()
+            contrat = Contrat(
+                locataire_id=locataire.id,
+                date_debut=date(2024, 1, 1),
+                montant_premier_mois=Decimal("500.000"),
+                montant_mensuel=Decimal("500.000"),
+                bureaux=[bureau]
+            )
+            session.add(contrat)
+            session.flush()
+            return immeuble.id, locataire.id, bureau.id, contrat.id
+
+    @staticmethod
+    def cleanup_test_data(immeuble_id, locataire_id):
+        """Remove the data created by setup_test_data"""
+        from app.database.connection import get_database
+        from app.models.entities import Immeuble, Locataire
+
+        db = get_database()
+        with db.session_scope() as session:
+            for model, entity_id in ((Locataire, locataire_id), (Immeuble, immeuble_id)):
+                entity = session.get(model, entity_id)
+                if entity:
+                    session.delete(entity)
+
+    @staticmethod
+    def test_shared_and_patched(runner: TestRunner):
+        """Test that every combo shares one model patched by commits"""
+        print("\n  Test: Shared models patched on commit")
+        from app.database.connection import get_database
+        from app.models.entities import Immeuble
+        from app.ui.widgets.reference_models import ReferenceData
+
+        reference = ReferenceData.get_instance()
+        paiement_view = runner.navigate_to_view("paiements")
+        contrat_view = runner.navigate_to_view("contrats")
+        assert paiement_view.immeuble_filter.model().sourceModel() is reference.immeubles
+        assert contrat_view.immeuble_filter.model().sourceModel() is reference.immeubles
+        print("    ✓ Immeuble filters bound to the same model")
+
+        immeuble_id, locataire_id, bureau_id, contrat_id = TestReferenceModels.setup_test_data()
+        try:
+            combo = contrat_view.immeuble_filter
+            index = combo.findData(immeuble_id)
+            assert index > 0, "New immeuble not patched into the combos"
+            assert combo.itemText(index) == TestReferenceModels.TEST_IMMEUBLE
+            assert paiement_view.immeuble_filter.findData(immeuble_id) > 0
+            assert reference.contrats.record(contrat_id)["bureau_ids"] == {bureau_id}
+            print("    ✓ Created rows shown without reloading")
+
+            combo.blockSignals(True)
+            combo.setCurrentIndex(index)
+            combo.blockSignals(False)
+            with get_database().session_scope() as session:
+                session.get(Immeuble, immeuble_id).nom = "AAA " + TestReferenceModels.TEST_IMMEUBLE
+            assert combo.currentData() == immeuble_id, "Selection lost when the row moved"
+            assert combo.currentText() == "AAA " + TestReferenceModels.TEST_IMMEUBLE
+            assert combo.currentIndex() == 1, "Renamed row not moved to its sorted position"
+            print("    ✓ Renamed row moved, selection kept")
+
+            assert reference.locataire_ids_in_immeuble(immeuble_id) == {locataire_id}
+            assert reference.immeuble_ids_of_locataire(locataire_id) == {immeuble_id}
+            contrat_view.load_locataires(immeuble_id)
+            locataires = [contrat_view.locataire_combo.itemData(i)
+                          for i in range(contrat_view.locataire_combo.count())]
+            assert locataires == [None, locataire_id], locataires
+            contrat_view.load_locataires()
+            print("    ✓ Locataire combo filtered on the immeuble")
+        finally:
+            TestReferenceModels.cleanup_test_data(immeuble_id, locataire_id)
+
+        assert paiement_view.immeuble_filter.findData(immeuble_id) < 0
+        assert reference.bureaux.record(bureau_id) is None
+        assert reference.contrats.record(contrat_id) is None
+        print("    ✓ Deleted rows and their cascaded children removed")
+
+    @staticmethod
+    def test_dialogs_do_not_read_tables(runner: TestRunner):
+        """Test that opening the payment and contract dialogs reads no reference table"""
+        print("\n  Test: Dialogs without reference queries")
+        from app.database.connection import get_database
+        from app.ui.views.paiement_view import PaiementDialog
+        from app.ui.views.contrat_view import ContratDialog
+
+        immeuble_id, locataire_id, bureau_id, contrat_id = TestReferenceModels.setup_test_data()
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        db = get_database()
+        try:
+            for engine in (db.engine, db.read_engine):
+                event.listen(engine, "before_cursor_execute", before_cursor_execute)
+            try:
+                paiement_dialog = PaiementDialog(runner.main_window.paiement_view)
+                contrat_dialog = ContratDialog(runner.main_window.contrat_view)
+            finally:
+                for engine in (db.engine, db.read_engine):
+                    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+            assert statements == [], f"{len(statements)} queries: {statements[:3]}"
+            assert paiement_dialog.locataire_combo.findData(locataire_id) > 0
+            paiement_dialog.locataire_combo.setCurrentIndex(paiement_dialog.locataire_combo.findData(locataire_id))
+            assert paiement_dialog.contrat_combo.findData(contrat_id) > 0
+            bureaux = [contrat_dialog.bureaux_list.item(i).data(Qt.UserRole)
+                       for i in range(contrat_dialog.bureaux_list.count())]
+            assert bureau_id not in bureaux, "Rented bureau offered for a new contract"
+            paiement_dialog.deleteLater()
+            contrat_dialog.deleteLater()
+            print("    ✓ Dialogs filled from the shared models")
+        finally:
+            TestReferenceModels.cleanup_test_data(immeuble_id, locataire_id)
+
+
+def run_reference_model_tests(runner: TestRunner):
+    """Run all reference model tests"""
+    print("\n" + "="*60)
+    print("  REFERENCE MODEL TESTS")
+    print("="*60)
+
+    runner.run_test("Shared Models Patched", TestReferenceModels.test_shared_and_patched)
+    runner.run_test("Dialogs Without Queries", TestReferenceModels.test_dialogs_do_not_read_tables)
+
+
+if __name__ == "__main__":
+    print("Reference Model Tests - Use run_all_ui_tests.py to execute")